@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+AI Generation Load Test
+Throughput, tail latency and fallback rates of the AI review path, offline
+
+Points the real AIReviewGenerator at fake_openai_server (started in process
+unless --base-url names one already running) and drives the entry points
+the app routes use: concurrent generate_review(use_ai=True) calls, as from
+simultaneous single-review requests, generate_reviews_batch() per product,
+as in the generate-and-import routes, and bulk_generation.generate_bulk(),
+as in /api/generate-bulk. Products are the benchmark's synthetic ones, so
+nothing talks to Shopify or OpenAI; phrase usage goes to an in-memory
+tracker, reviews to a scratch similarity index and image analyses to a
+temporary cache. Every review is counted by
+its generation_method, so the report shows how often the AI path fell back
+to templates under the configured latency and failure rates and, with
+--deadline-ms, the review time budget:
+
+    python ai_load_benchmark.py --latency-ms 800 --jitter-ms 1200 --rate-limit-rate 0.1
+    python ai_load_benchmark.py --base-url http://127.0.0.1:8089/v1 --output ai_load.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import ai_review_generator
+import bulk_generation
+import image_analysis_cache
+import review_generator
+from ai_review_generator import AIClientPool
+from benchmark import DEFAULT_SEED, _git_commit, _scratch_similarity_index, build_products, percentile
+from fake_openai_server import FakeOpenAIServer, add_server_arguments
+from image_analysis_cache import ImageAnalysisCache
+from phrase_tracking import PhraseTracker
+
+DEFAULT_REQUESTS = 200
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REVIEWS_PER_PRODUCT = 5
+FAKE_API_KEY = 'fake-load-test-key'
+
+# generation_method values of reviews written by the model; everything else came from templates
+AI_METHODS = frozenset({'gpt4_primary', 'gpt4_multi', 'gpt4_fallback', 'manual_parse', 'ai_enhanced'})
+
+def with_images(products: Sequence[Dict]) -> List[Dict]:
+    """Products with one image each, so reviews go through the vision analysis as well"""
+    return [
+        dict(product, images=[{'src': f"https://cdn.shopify.com/load-test/{product['id']}.jpg",
+                               'updated_at': '2024-01-01T00:00:00Z'}])
+        for product in products
+    ]
+
+@contextlib.contextmanager
+def _isolated_generation():
+    """
+    In-memory phrase tracking for every thread and no generation chatter on stdout
+
+    Unlike benchmark._isolated_generation(), this replaces the process-wide
+    tracker, as reviews are generated on the driver's threads and on the
+    client pool's template fallback threads.
+    """
+    saved = review_generator.PHRASE_TRACKER
+    review_generator.PHRASE_TRACKER = PhraseTracker()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        review_generator.PHRASE_TRACKER = saved
+
+@contextlib.contextmanager
+def ai_backend(base_url: str, max_concurrency: int = ai_review_generator.AI_MAX_CONCURRENCY,
+               max_retries: int = ai_review_generator.AI_MAX_RETRIES):
+    """
+    Send AI generation to base_url through a fresh client pool and image analysis cache
+
+    The API key and base URL also go into the environment, which generate_review()
+    checks and forked bulk workers build their own pools from.
+    """
+    saved_env = {name: os.environ.get(name) for name in ('OPENAI_API_KEY', 'OPENAI_BASE_URL')}
+    saved = ai_review_generator._client_pool, image_analysis_cache._shared_cache
+    os.environ.update(OPENAI_API_KEY=FAKE_API_KEY, OPENAI_BASE_URL=base_url)
+    pool = AIClientPool(max_concurrency=max_concurrency, max_retries=max_retries,
+                        api_key=FAKE_API_KEY, base_url=base_url)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageAnalysisCache(os.path.join(tmp, 'image_analysis_cache.db'))
+        ai_review_generator._client_pool, image_analysis_cache._shared_cache = pool, cache
+        try:
+            yield pool
+        finally:
+            ai_review_generator._client_pool, image_analysis_cache._shared_cache = saved
+            pool.close()
+            cache.close()
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+def summarize(latencies: List[float], reviews: Iterable[Dict], total: float, calls: int) -> Dict:
+    """Throughput, latency percentiles and generation methods of one scenario"""
+    methods = Counter(review.get('generation_method', 'unknown') for review in reviews)
+    review_count = sum(methods.values())
+    ai_count = sum(count for method, count in methods.items() if method in AI_METHODS)
+    latencies = sorted(latencies)
+    return {
+        'calls': calls,
+        'reviews': review_count,
+        'total_seconds': round(total, 4),
+        'reviews_per_second': round(review_count / total, 2) if total else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        'fallback_rate': round(1 - ai_count / review_count, 4) if review_count else None,
+        'generation_methods': dict(methods.most_common())
+    }
+
+def run_concurrent(func: Callable, args_list: Sequence[tuple], calls: int, concurrency: int) -> Dict:
+    """Call func over args_list (cycled) from concurrency threads, timing every call"""
+    def timed(i):
+        started = time.perf_counter()
+        result = func(*args_list[i % len(args_list)])
+        return time.perf_counter() - started, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        outcomes = list(executor.map(timed, range(calls)))
+    total = time.perf_counter() - started
+
+    reviews = []
+    for _, result in outcomes:
+        reviews.extend(result if isinstance(result, list) else [result])
+    return summarize([latency for latency, _ in outcomes], reviews, total, calls)
+
+def run_bulk(jobs: Sequence[tuple], workers: int) -> Dict:
+    """One bulk job, timing how long each product's result took after the previous one"""
+    latencies, reviews = [], []
+    started = last = time.perf_counter()
+    for result in bulk_generation.iter_generate_bulk(jobs, workers=workers, seed=DEFAULT_SEED):
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+        reviews.extend(result['reviews'])
+    return summarize(latencies, reviews, time.perf_counter() - started, len(jobs))
+
+def run_load_test(base_url: str, requests: int = DEFAULT_REQUESTS, concurrency: int = DEFAULT_CONCURRENCY,
+                  reviews_per_product: int = DEFAULT_REVIEWS_PER_PRODUCT, bulk_workers: int = 1,
+                  images: bool = True, seed: int = DEFAULT_SEED,
+                  scenarios: Sequence[str] = ('generate_review', 'generate_reviews_batch', 'generate_bulk'),
+                  max_concurrency: int = ai_review_generator.AI_MAX_CONCURRENCY,
+                  max_retries: int = ai_review_generator.AI_MAX_RETRIES,
+                  deadline_ms: Optional[int] = None, index_path: Optional[str] = None) -> Dict:
+    """Run the scenarios against base_url and return the results document
+
+    Generated reviews go to a scratch similarity index at index_path, a
+    temporary database by default.
+    """
+    products = build_products(seed)
+    if images:
+        products = with_images(products)
+    results = {}
+    saved_deadline = review_generator.REVIEW_DEADLINE_MS
+    if deadline_ms is not None:
+        # As REVIEW_DEADLINE_MS, so bulk generation uses it too
+        review_generator.REVIEW_DEADLINE_MS = deadline_ms
+
+    try:
+        with _isolated_generation(), _scratch_similarity_index(index_path), \
+                ai_backend(base_url, max_concurrency, max_retries) as pool:
+            if 'generate_review' in scenarios:
+                results['generate_review'] = run_concurrent(
+                    lambda product: review_generator.generate_review(product, use_ai=True),
+                    [(product,) for product in products], requests, concurrency
+                )
+            if 'generate_reviews_batch' in scenarios:
+                calls = max(1, requests // reviews_per_product)
+                results['generate_reviews_batch'] = run_concurrent(
+                    lambda product: review_generator.generate_reviews_batch(product, reviews_per_product, use_ai=True),
+                    [(product,) for product in products], calls, concurrency
+                )
+            if 'generate_bulk' in scenarios:
+                jobs = [(product, reviews_per_product)
+                        for product in products[:max(1, requests // reviews_per_product)]]
+                results['generate_bulk'] = run_bulk(jobs, bulk_workers)
+            pool_stats = pool.get_stats()
+            image_cache_stats = image_analysis_cache._shared_cache.stats()
+    finally:
+        review_generator.REVIEW_DEADLINE_MS = saved_deadline
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'base_url': base_url,
+            'seed': seed,
+            'requests': requests,
+            'concurrency': concurrency,
+            'max_concurrency': max_concurrency,
+            'max_retries': max_retries,
+            'deadline_ms': deadline_ms if deadline_ms is not None else saved_deadline,
+            'reviews_per_product': reviews_per_product,
+            'reviews_per_call': ai_review_generator.AI_REVIEWS_PER_CALL,
+            'bulk_workers': bulk_workers,
+            'images': images
+        },
+        'results': results,
+        'client_pool': pool_stats,
+        'image_cache': image_cache_stats
+    }
+
+def print_results(document: Dict):
+    """Human-readable summary of a results document"""
+    meta = document['meta']
+    print(f"=== AI LOAD TEST ({meta['requests']} requests, concurrency {meta['concurrency']}, "
+          f"commit {meta['commit'] or 'unknown'}) ===")
+    for name, result in document['results'].items():
+        print(f"   {name:24} {result['reviews_per_second']:>8.1f} reviews/s   "
+              f"p50 {result['p50_ms']:.0f} ms   p95 {result['p95_ms']:.0f} ms   "
+              f"p99 {result['p99_ms']:.0f} ms   fallback {result['fallback_rate']:.1%}")
+        print(f"   {'':24} {result['generation_methods']}")
+    pool = document['client_pool']
+    print(f"   client pool: {pool['requests']} requests, {pool['retries']} retries, "
+          f"{pool['rate_limited']} rate limited, {pool['failures']} failures, "
+          f"max {pool['max_in_flight']} in flight")
+    if 'server' in document:
+        print(f"   fake server: {document['server']}")
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline load test of AI review generation')
+    parser.add_argument('--base-url', help='Running OpenAI-compatible server; default starts a fake one')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS,
+                        help='generate_review calls; the batch and bulk scenarios generate as many reviews')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Threads calling the generation functions at once')
+    parser.add_argument('--max-concurrency', type=int, default=ai_review_generator.AI_MAX_CONCURRENCY,
+                        help='Model calls in flight at once (AI_MAX_CONCURRENCY)')
+    parser.add_argument('--max-retries', type=int, default=ai_review_generator.AI_MAX_RETRIES,
+                        help='Retries of rate-limited and failed model calls (AI_MAX_RETRIES)')
+    parser.add_argument('--deadline-ms', type=int,
+                        help='Time budget per review or bulk product (REVIEW_DEADLINE_MS)')
+    parser.add_argument('--reviews-per-product', type=int, default=DEFAULT_REVIEWS_PER_PRODUCT)
+    parser.add_argument('--bulk-workers', type=int, default=1)
+    parser.add_argument('--no-images', action='store_true', help='Skip the vision analysis')
+    parser.add_argument('--scenario', action='append', choices=('generate_review', 'generate_reviews_batch',
+                                                                 'generate_bulk'),
+                        help='Run only this scenario (repeatable)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--index-db', help='Scratch similarity index database (default: a temporary one)')
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    options = dict(
+        requests=args.requests, concurrency=args.concurrency, reviews_per_product=args.reviews_per_product,
+        bulk_workers=args.bulk_workers, images=not args.no_images, seed=args.seed,
+        max_concurrency=args.max_concurrency, max_retries=args.max_retries, deadline_ms=args.deadline_ms,
+        index_path=args.index_db,
+        scenarios=args.scenario or ('generate_review', 'generate_reviews_batch', 'generate_bulk')
+    )
+    if args.base_url:
+        document = run_load_test(args.base_url, **options)
+    else:
+        with FakeOpenAIServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate,
+                              retry_after=args.retry_after, seed=args.seed) as server:
+            document = run_load_test(server.base_url, **options)
+            document['server'] = server.get_stats()
+
+    print_results(document)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,14 +6,22 @@ import os
 import json
 import re
 import math
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from textblob import TextBlob
 import random
+from similarity_index import (batch_max_similarities, estimate_similarity, get_similarity_index,
+                              signature, signature_matrix)
+from language_id import detect_language, get_language_identifier
+from quality_aggregator import QualityAggregator
+from quality_cache import ScoreCache, review_key
+from quality_store import QualityStore
+from sentiment_lexicon import NEGATIVE_WORDS, POSITIVE_WORDS, get_sentiment_lexicon
 
 @dataclass
 class QualityMetrics:
@@ -34,19 +42,340 @@ class QualityMetrics:
     flagged_issues: List[str]
     generation_metadata: Dict
 
+@dataclass
+class ReviewFeatures:
+    """Text features of one review, extracted once and shared by all quality metrics"""
+    title: str
+    content: str
+    text: str  # "title content", as used for language detection
+    content_lower: str
+    content_length: int
+    word_count: int
+    sentence_count: int  # Pieces between periods
+    avg_sentence_length: float  # Words per period-separated piece
+    syllables_per_word: float
+    text_keywords: frozenset  # Authenticity indicators found in title or content
+    content_keywords: frozenset  # Metric keywords found in the content
+    red_flags: Tuple[str, ...]  # Names of matching quality_standards['red_flags'] patterns, in order
+    detail_count: int  # Matching DETAIL_PATTERNS
+    has_emoji: bool
+    excessive_caps: bool  # Runs of 5+ capitals, flagged as an issue
+    excessive_punctuation: bool  # Runs of 4+ ! or ?, flagged as an issue
+
+@dataclass
+class BatchQualityScores:
+    """Columnar quality scores of a batch of reviews, one array entry per review
+
+    Built by ReviewQualityScorer.assess_batch(). Rows are turned into
+    QualityMetrics only when asked for, with their recommendations and issues.
+    """
+    overall_score: np.ndarray
+    metrics: Dict[str, np.ndarray]  # Keyed like QualityMetrics.metrics_breakdown
+    reviews: List[Dict]
+    features: List[ReviewFeatures]
+    assessed_at: str
+    scorer: 'ReviewQualityScorer' = field(repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.overall_score)
+    
+    def metrics_breakdown(self, index: int) -> Dict[str, float]:
+        return {name: float(values[index]) for name, values in self.metrics.items()}
+    
+    def to_quality_metrics(self, index: int) -> QualityMetrics:
+        """QualityMetrics of one review, as assess_review_quality() returns them"""
+        metrics = self.metrics_breakdown(index)
+        review = self.reviews[index]
+        flagged_issues, recommendations = self._messages(index, metrics)
+        return QualityMetrics(
+            overall_score=float(self.overall_score[index]),
+            authenticity_score=metrics['authenticity'],
+            readability_score=metrics['readability'],
+            language_consistency_score=metrics['language_consistency'],
+            sentiment_appropriateness_score=metrics['sentiment_appropriateness'],
+            content_depth_score=metrics['content_depth'],
+            uniqueness_score=metrics['uniqueness'],
+            demographic_alignment_score=metrics['demographic_alignment'],
+            commercial_value_score=metrics['commercial_value'],
+            metrics_breakdown=metrics,
+            recommendations=recommendations,
+            flagged_issues=flagged_issues,
+            generation_metadata={
+                'assessed_at': self.assessed_at,
+                'scorer_version': '1.0',
+                'review_id': review.get('id', 'unknown')
+            }
+        )
+    
+    def to_list(self) -> List[QualityMetrics]:
+        return [self.to_quality_metrics(index) for index in range(len(self))]
+    
+    def _messages(self, index: int, metrics: Dict[str, float]) -> Tuple[List[str], List[str]]:
+        """Flagged issues and recommendations of one review"""
+        features = self.features[index]
+        issues = self.scorer._identify_issues(
+            metrics, features.content_length, features.excessive_caps, features.excessive_punctuation
+        )
+        return issues, self.scorer._generate_recommendations(metrics, self.reviews[index])
+    
+    def aggregate(self, aggregator: QualityAggregator = None) -> QualityAggregator:
+        """Add every review of the batch to an aggregator (a new one by default), without building QualityMetrics"""
+        aggregator = aggregator if aggregator is not None else QualityAggregator()
+        for index in range(len(self)):
+            metrics = self.metrics_breakdown(index)
+            aggregator.add(self.overall_score[index], metrics, *self._messages(index, metrics))
+        return aggregator
+    
+    def to_store(self, store: QualityStore = None) -> QualityStore:
+        """Append the batch to a compact QualityStore (a new one by default)"""
+        store = store if store is not None else QualityStore(capacity=len(self))
+        messages = [self._messages(index, self.metrics_breakdown(index)) for index in range(len(self))]
+        scores = {f'{name}_score': values for name, values in self.metrics.items()}
+        scores['overall_score'] = self.overall_score
+        store.extend_columns(scores, [issues for issues, _ in messages],
+                             [recommendations for _, recommendations in messages],
+                             datetime.fromisoformat(self.assessed_at).timestamp())
+        return store
+
+# Keyword tables of the content metrics; all are substring checks on the lowercased content
+INFO_CATEGORIES = {
+    'quality': ['quality', 'material', 'build', 'construction', 'fabric', 'durable'],
+    'appearance': ['looks', 'color', 'style', 'design', 'attractive', 'beautiful'],
+    'fit': ['fits', 'size', 'comfortable', 'tight', 'loose', 'perfect fit'],
+    'value': ['price', 'value', 'worth', 'money', 'expensive', 'cheap', 'affordable'],
+    'experience': ['delivery', 'shipping', 'packaging', 'arrived', 'ordered', 'bought']
+}
+
+# Specific details (numbers, specific mentions)
+DETAIL_PATTERNS = [
+    re.compile(r'\d+\s*(day|week|month|year)'),  # Time references
+    re.compile(r'\d+\s*(inch|cm|size|xl|large|small)'),  # Size references
+    re.compile(r'\$\d+'),  # Price mentions
+    re.compile(r'\d+\s*star'),  # Star ratings
+    re.compile(r'(exactly|perfectly|slightly|much|very)\s+\w+')  # Qualitative modifiers
+]
+
+# Basic style indicators
+STYLE_INDICATORS = {
+    'gen_z': {
+        'casual_language': ['omg', 'tbh', 'ngl', 'lowkey', 'highkey', 'literally', 'obsessed'],
+        'informal_grammar': True,
+        'emoji_usage': True,
+        'abbreviations': ['ur', 'bc', 'rn', 'fr']
+    },
+    'millennial': {
+        'detailed_reviews': True,
+        'value_conscious': ['worth', 'value', 'price', 'investment'],
+        'experience_focused': ['experience', 'quality', 'recommend'],
+        'moderate_formality': True
+    },
+    'gen_x': {
+        'practical_focus': ['practical', 'functional', 'durable', 'reliable'],
+        'quality_emphasis': ['quality', 'craftsmanship', 'materials'],
+        'formal_language': True
+    }
+}
+
+# Persuasive elements
+PERSUASIVE_ELEMENTS = {
+    'social_proof': ['recommend', 'everyone', 'friends', 'family', 'colleagues'],
+    'specific_benefits': ['comfortable', 'stylish', 'durable', 'versatile', 'perfect'],
+    'usage_scenarios': ['work', 'party', 'casual', 'everyday', 'special occasion'],
+    'comparison': ['better than', 'compared to', 'unlike', 'superior'],
+    'call_to_action': ['buy', 'get', 'purchase', 'try', 'consider']
+}
+CRITICISM_WORDS = ['however', 'but', 'only issue', 'wish', 'could be better']
+VALUE_INDICATORS = ['worth', 'value', 'price', 'investment', 'money', 'affordable']
+
+_CONTENT_KEYWORDS = frozenset(
+    [keyword for keywords in INFO_CATEGORIES.values() for keyword in keywords]
+    + [keyword for indicators in STYLE_INDICATORS.values()
+       for keywords in indicators.values() if isinstance(keywords, list) for keyword in keywords]
+    + [keyword for keywords in PERSUASIVE_ELEMENTS.values() for keyword in keywords]
+    + CRITICISM_WORDS + VALUE_INDICATORS
+)
+# Column of each content keyword in the batch keyword matrix
+_CONTENT_KEYWORD_COLUMNS = {keyword: column for column, keyword in enumerate(sorted(_CONTENT_KEYWORDS))}
+
+# Weight of each metric in the overall score
+METRIC_WEIGHTS = {
+    'authenticity': 0.25,
+    'readability': 0.15,
+    'language_consistency': 0.15,
+    'sentiment_appropriateness': 0.15,
+    'content_depth': 0.10,
+    'uniqueness': 0.10,
+    'demographic_alignment': 0.05,
+    'commercial_value': 0.05
+}
+
+# Identifies the cached scores in quality_cache; bump whenever a cached metric changes
+SCORE_CACHE_VERSION = '3'
+
+# Distance from the threshold within which the quality gate doesn't trust its estimate
+QUALITY_GATE_BAND = float(os.environ.get('QUALITY_GATE_BAND', '0.1'))
+
+# Metrics the quality gate defers until the cheap ones can't decide, with rough
+# starting averages; the averages of actual full assessments replace them
+GATE_DEFERRED_METRICS = {
+    'language_consistency': 0.8,
+    'sentiment_appropriateness': 0.6,
+    'uniqueness': 0.8
+}
+GATE_TIERS = ('bounds', 'estimate', 'full')
+
+# Authenticity penalty of each quality_standards['red_flags'] pattern
+RED_FLAG_PENALTIES = {
+    'excessive_caps': 0.2,
+    'excessive_punctuation': 0.15,
+    'repetitive_phrases': 0.3,
+    'placeholder_text': 0.5
+}
+
+def _has_repeated_window(content: str, width: int = 10, count: int = 3) -> bool:
+    """Whether some width-character window occurs count times, ignoring case
+
+    Necessary for the repetitive_phrases pattern (.{10,})\\1{2,} to match, and
+    much cheaper than running it: the backtracking pattern dominated scoring time.
+    """
+    lowered = content.lower()
+    if len(lowered) != len(content):
+        lowered = ''.join(char.lower()[0] for char in content)
+    # The regex lowercases one character at a time, so final sigma is just sigma
+    lowered = lowered.replace('ς', 'σ')
+    if len(lowered) < width * count:
+        return False
+    windows = Counter(lowered[i:i + width] for i in range(len(lowered) - width + 1))
+    return any(seen >= count for seen in windows.values())
+
+# Cheap checks that must pass before a red flag pattern can match at all
+RED_FLAG_PREFILTERS = {'repetitive_phrases': _has_repeated_window}
+
+_VOWEL_PATTERN = re.compile('[aeiouy]')
+_EMOJI_PATTERN = re.compile(r'[\U0001F600-\U0001F64F]')
+_CAPS_ISSUE_PATTERN = re.compile(r'[A-Z]{5,}')
+_PUNCTUATION_ISSUE_PATTERN = re.compile(r'[!?]{4,}')
+
+class ScorerTimings:
+    """Thread-safe construction and scoring timings for a scorer"""
+    
+    def __init__(self, construction_seconds: float = 0.0):
+        self.construction_seconds = construction_seconds
+        self.assessments = 0
+        self.total_scoring_seconds = 0.0
+        self.max_scoring_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float, count: int = 1):
+        """Record the duration of one assessment, or of a batch of count assessments"""
+        if count < 1:
+            return
+        with self._lock:
+            self.assessments += count
+            self.total_scoring_seconds += seconds
+            self.max_scoring_seconds = max(self.max_scoring_seconds, seconds / count)
+    
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'construction_ms': self.construction_seconds * 1000,
+                'assessments': self.assessments,
+                'total_scoring_ms': self.total_scoring_seconds * 1000,
+                'average_scoring_ms': (self.total_scoring_seconds / self.assessments * 1000
+                                       if self.assessments else 0.0),
+                'max_scoring_ms': self.max_scoring_seconds * 1000
+            }
+
+@dataclass
+class GateDecision:
+    """Outcome of ReviewQualityScorer.gate_review()"""
+    score: float  # Overall score in the full tier, otherwise its estimate
+    passed: bool  # score >= threshold
+    tier: str  # One of GATE_TIERS
+
+def _gate_summary(decisions: Dict[str, int], seconds: Dict[str, float]) -> Dict:
+    """Tier hit rates, average latency and time saved compared to full assessments"""
+    total = sum(decisions.values())
+    average = {tier: seconds[tier] / decisions[tier] if decisions[tier] else 0.0 for tier in GATE_TIERS}
+    time_saved = sum(
+        decisions[tier] * max(0.0, average['full'] - average[tier]) for tier in GATE_TIERS if tier != 'full'
+    ) if decisions['full'] else 0.0
+    return {
+        'decisions': dict(decisions),
+        'decisions_total': total,
+        'hit_rates': {tier: decisions[tier] / total if total else 0.0 for tier in GATE_TIERS},
+        'average_ms': {tier: average[tier] * 1000 for tier in GATE_TIERS},
+        'time_saved_ms': time_saved * 1000
+    }
+
+class QualityGateStats:
+    """Thread-safe tier counts and timings of the quality gate, and averages of its deferred metrics"""
+    
+    def __init__(self):
+        self.decisions = {tier: 0 for tier in GATE_TIERS}
+        self.seconds = {tier: 0.0 for tier in GATE_TIERS}
+        # The starting averages count as one assessment each
+        self.metric_totals = dict(GATE_DEFERRED_METRICS)
+        self.metric_counts = {name: 1 for name in GATE_DEFERRED_METRICS}
+        self._reported = ({tier: 0 for tier in GATE_TIERS}, {tier: 0.0 for tier in GATE_TIERS})
+        self._lock = threading.Lock()
+    
+    def record(self, tier: str, seconds: float):
+        """Record one gate decision"""
+        with self._lock:
+            self.decisions[tier] += 1
+            self.seconds[tier] += seconds
+    
+    def observe(self, metrics: Dict[str, float]):
+        """Fold the deferred metrics of a full assessment into their averages"""
+        with self._lock:
+            for name in GATE_DEFERRED_METRICS:
+                self.metric_totals[name] += metrics[name]
+                self.metric_counts[name] += 1
+    
+    def estimates(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: self.metric_totals[name] / self.metric_counts[name] for name in GATE_DEFERRED_METRICS}
+    
+    def to_dict(self) -> Dict:
+        with self._lock:
+            summary = _gate_summary(self.decisions, self.seconds)
+        summary['deferred_metric_estimates'] = self.estimates()
+        return summary
+    
+    def take_report(self) -> Dict:
+        """Summary of the decisions since the previous report"""
+        with self._lock:
+            reported_decisions, reported_seconds = self._reported
+            decisions = {tier: self.decisions[tier] - reported_decisions[tier] for tier in GATE_TIERS}
+            seconds = {tier: self.seconds[tier] - reported_seconds[tier] for tier in GATE_TIERS}
+            self._reported = (dict(self.decisions), dict(self.seconds))
+        return _gate_summary(decisions, seconds)
+
 class ReviewQualityScorer:
     """Advanced AI-powered review quality assessment system"""
     
     def __init__(self):
+        started = time.perf_counter()
         self.quality_standards = self._load_quality_standards()
         self.language_models = self._initialize_language_models()
-        self.similarity_vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        self.review_history = []  # For similarity checking
-        
+        indicators = self.quality_standards['authenticity_indicators']
+        self._text_keywords = frozenset(word.lower() for words in indicators.values() for word in words)
+        self._text_keyword_columns = {word: column for column, word in enumerate(sorted(self._text_keywords))}
+        self._red_flag_patterns = [
+            (name, re.compile(pattern, re.IGNORECASE), RED_FLAG_PREFILTERS.get(name))
+            for name, pattern in self.quality_standards['red_flags'].items()
+        ]
+        self.score_cache = ScoreCache.open(version=SCORE_CACHE_VERSION)  # Scores of repeated reviews
+        self.gate_stats = QualityGateStats()
+        self.quality_summary = QualityAggregator()  # Every review this scorer fully assessed
+        self.timings = ScorerTimings(construction_seconds=time.perf_counter() - started)
+    
+    @property
+    def similarity_index(self):
+        """Index of every generated review so far, looked up on use so it can be swapped"""
+        return get_similarity_index()
+    
     def _load_quality_standards(self) -> Dict:
         """Load quality standards and thresholds"""
         return {
@@ -104,7 +433,8 @@ class ReviewQualityScorer:
         }
     
     def assess_review_quality(self, review: Dict, product_context: Dict = None, 
-                            historical_reviews: List[Dict] = None) -> QualityMetrics:
+                            historical_reviews: List[Dict] = None,
+                            check_index: bool = True) -> QualityMetrics:
         """
         Comprehensive quality assessment of a review
         
@@ -112,48 +442,36 @@ class ReviewQualityScorer:
             review: Review data dictionary
             product_context: Product information for context-aware scoring
             historical_reviews: Previous reviews for similarity checking
+            check_index: Also check similarity against every generated review in the
+                similarity index; off for reviews that are already indexed themselves
         
         Returns:
             QualityMetrics object with detailed assessment
         """
+        started = time.perf_counter()
         
-        # Extract review components
-        title = review.get('title', '')
-        content = review.get('content', '')
-        rating = review.get('rating', 5)
-        language = review.get('language', 'en')
-        author = review.get('author', '')
-        location = review.get('location', '')
+        # Everything but uniqueness depends only on the review itself
+        cache_key = review_key(review)
+        cached = self.score_cache.get(cache_key)
+        if cached is None:
+            cached = self._assess_review_text(review, product_context)
+            self.score_cache.put(cache_key, cached)
         
-        # Initialize metrics
+        uniqueness = self._assess_uniqueness(review.get('content', ''), historical_reviews, check_index)
         metrics = {
-            'authenticity': self._assess_authenticity(title, content, language, rating),
-            'readability': self._assess_readability(content, language),
-            'language_consistency': self._assess_language_consistency(review),
-            'sentiment_appropriateness': self._assess_sentiment_appropriateness(content, rating, language),
-            'content_depth': self._assess_content_depth(content, title, product_context),
-            'uniqueness': self._assess_uniqueness(content, historical_reviews),
-            'demographic_alignment': self._assess_demographic_alignment(review, product_context),
-            'commercial_value': self._assess_commercial_value(review, product_context)
+            key: uniqueness if key == 'uniqueness' else cached['metrics'][key]
+            for key in METRIC_WEIGHTS
         }
+        self.gate_stats.observe(metrics)
         
         # Calculate overall score
-        weights = {
-            'authenticity': 0.25,
-            'readability': 0.15,
-            'language_consistency': 0.15,
-            'sentiment_appropriateness': 0.15,
-            'content_depth': 0.10,
-            'uniqueness': 0.10,
-            'demographic_alignment': 0.05,
-            'commercial_value': 0.05
-        }
-        
-        overall_score = sum(metrics[key] * weights[key] for key in weights)
+        overall_score = sum(metrics[key] * weight for key, weight in METRIC_WEIGHTS.items())
         
         # Generate recommendations and flag issues
         recommendations = self._generate_recommendations(metrics, review)
-        flagged_issues = self._identify_issues(metrics, review)
+        flagged_issues = self._identify_issues(
+            metrics, cached['content_length'], cached['excessive_caps'], cached['excessive_punctuation']
+        )
         
         # Create quality metrics object
         quality_metrics = QualityMetrics(
@@ -176,16 +494,158 @@ class ReviewQualityScorer:
             }
         )
         
+        self.quality_summary.add(overall_score, metrics, flagged_issues, recommendations)
+        self.timings.record(time.perf_counter() - started)
         return quality_metrics
     
-    def _assess_authenticity(self, title: str, content: str, language: str, rating: int) -> float:
+    def gate_review(self, review: Dict, threshold: float, product_context: Dict = None,
+                    band: float = QUALITY_GATE_BAND, deterministic: bool = False) -> GateDecision:
+        """
+        Whether a review's overall score reaches threshold, computing as little as possible
+        
+        The cheap keyword and regex metrics come first (or all cached metrics for
+        a repeated review); language detection, sentiment and the similarity index
+        lookup are deferred. Tiers, cheapest first:
+            bounds: the known metrics decide it whatever the deferred ones are (exact)
+            estimate: with the deferred metrics at their averages in earlier full
+                assessments, the score is more than band away from the threshold
+            full: everything is computed, like assess_review_quality()
+        
+        A deterministic decision and score depend on the review alone, as seeded
+        generation needs: cached scores, the averages of earlier assessments and
+        the similarity index are left out, so uniqueness is known up front and
+        the estimate tier is skipped.
+        """
+        started = time.perf_counter()
+        cache_key = review_key(review)
+        cached = self.score_cache.get(cache_key)
+        features = None
+        if cached is not None and not deterministic:
+            known = cached['metrics']
+        else:
+            features = self.extract_features(review)
+            known = self._assess_cheap_metrics(features, review, product_context)
+        if deterministic:
+            known['uniqueness'] = self._assess_uniqueness(review.get('content', ''), check_index=False)
+        
+        deferred = [key for key in METRIC_WEIGHTS if key not in known]
+        partial = sum(known[key] * weight for key, weight in METRIC_WEIGHTS.items() if key in known)
+        # Every metric lies between 0 and 1, and so do the averages
+        upper = partial + sum(METRIC_WEIGHTS[key] for key in deferred)
+        # A deterministic bounds score uses the fixed starting averages
+        estimates = dict(GATE_DEFERRED_METRICS) if deterministic else self.gate_stats.estimates()
+        score = partial + sum(estimates[key] * METRIC_WEIGHTS[key] for key in deferred)
+        
+        if partial >= threshold or upper < threshold:
+            tier = 'bounds'
+        elif not deterministic and abs(score - threshold) > band:
+            tier = 'estimate'
+        else:
+            tier = 'full'
+            if cached is None:
+                cached = self._assess_review_text(review, product_context, features)
+                self.score_cache.put(cache_key, cached)
+            uniqueness = self._assess_uniqueness(review.get('content', ''), check_index=not deterministic)
+            metrics = {
+                key: uniqueness if key == 'uniqueness' else cached['metrics'][key]
+                for key in METRIC_WEIGHTS
+            }
+            self.gate_stats.observe(metrics)
+            score = sum(metrics[key] * weight for key, weight in METRIC_WEIGHTS.items())
+        
+        elapsed = time.perf_counter() - started
+        self.gate_stats.record(tier, elapsed)
+        if tier == 'full':
+            self.timings.record(elapsed)
+            self.quality_summary.add(score, metrics, self._identify_issues(
+                metrics, cached['content_length'], cached['excessive_caps'], cached['excessive_punctuation']
+            ), self._generate_recommendations(metrics, review))
+        # Early exits only estimate the score, so they stay out of the quality summary
+        return GateDecision(score=score, passed=score >= threshold, tier=tier)
+    
+    def _assess_cheap_metrics(self, features: ReviewFeatures, review: Dict,
+                              product_context: Dict = None) -> Dict[str, float]:
+        """Metrics computed from the extracted features alone, without any model or index"""
+        rating = review.get('rating', 5)
+        language = review.get('language', 'en')
+        return {
+            'authenticity': self._assess_authenticity(features, language, rating),
+            'readability': self._assess_readability(features, language),
+            'content_depth': self._assess_content_depth(features, product_context),
+            'demographic_alignment': self._assess_demographic_alignment(features, review, product_context),
+            'commercial_value': self._assess_commercial_value(features, rating, product_context)
+        }
+    
+    def _assess_review_text(self, review: Dict, product_context: Dict = None,
+                            features: ReviewFeatures = None) -> Dict:
+        """Metrics that depend only on the review, and the features issues are flagged from
+        
+        The result is cached by review_key(), so it must not depend on anything
+        else; none of these metrics actually uses product_context.
+        """
+        rating = review.get('rating', 5)
+        language = review.get('language', 'en')
+        if features is None:
+            features = self.extract_features(review)
+        
+        return {
+            'metrics': {
+                **self._assess_cheap_metrics(features, review, product_context),
+                'language_consistency': self._assess_language_consistency(features, language),
+                'sentiment_appropriateness': self._assess_sentiment_appropriateness(features, rating, language)
+            },
+            'content_length': features.content_length,
+            'excessive_caps': features.excessive_caps,
+            'excessive_punctuation': features.excessive_punctuation
+        }
+    
+    def extract_features(self, review: Dict) -> ReviewFeatures:
+        """Tokenize and scan a review once for all quality metrics"""
+        title = review.get('title', '')
+        content = review.get('content', '')
+        text = f"{title} {content}"
+        text_lower = text.lower()
+        content_lower = content.lower()
+        
+        words = content_lower.split()
+        sentence_count = content.count('.') + 1
+        # Words of all period-separated pieces together, as sum(len(s.split()) for s in pieces)
+        piece_words = len(content.replace('.', ' ').split())
+        # At least one syllable per word
+        syllables = len(_VOWEL_PATTERN.findall(content_lower)) + sum(
+            1 for word in words if not _VOWEL_PATTERN.search(word)
+        )
+        
+        return ReviewFeatures(
+            title=title,
+            content=content,
+            text=text,
+            content_lower=content_lower,
+            content_length=len(content),
+            word_count=len(words),
+            sentence_count=sentence_count,
+            avg_sentence_length=piece_words / sentence_count,
+            syllables_per_word=syllables / max(len(words), 1),
+            text_keywords=frozenset(word for word in self._text_keywords if word in text_lower),
+            content_keywords=frozenset(word for word in _CONTENT_KEYWORDS if word in content_lower),
+            red_flags=tuple(
+                name for name, pattern, prefilter in self._red_flag_patterns
+                if (prefilter is None or prefilter(content)) and pattern.search(content)
+            ),
+            detail_count=sum(1 for pattern in DETAIL_PATTERNS if pattern.search(content_lower)),
+            has_emoji=_EMOJI_PATTERN.search(content) is not None,
+            excessive_caps=_CAPS_ISSUE_PATTERN.search(content) is not None,
+            excessive_punctuation=_PUNCTUATION_ISSUE_PATTERN.search(content) is not None
+        )
+    
+    def _assess_authenticity(self, features: ReviewFeatures, language: str, rating: int) -> float:
         """Assess how authentic and human-like the review appears"""
         score = 1.0
-        text = f"{title} {content}".lower()
+        found = features.text_keywords
         
         # Check for personal indicators
         personal_indicators = self.quality_standards['authenticity_indicators']['personal_pronouns']
-        personal_count = sum(1 for indicator in personal_indicators if indicator.lower() in text)
+        personal_count = sum(1 for indicator in personal_indicators if indicator.lower() in found)
         if personal_count == 0:
             score -= 0.2
         elif personal_count > 5:
@@ -193,64 +653,47 @@ class ReviewQualityScorer:
         
         # Check for experience words
         experience_words = self.quality_standards['authenticity_indicators']['experience_words']
-        experience_count = sum(1 for word in experience_words if word.lower() in text)
+        experience_count = sum(1 for word in experience_words if word.lower() in found)
         if experience_count == 0:
             score -= 0.15
         
         # Check for emotional language
         emotion_words = self.quality_standards['authenticity_indicators']['emotion_words']
-        emotion_count = sum(1 for word in emotion_words if word.lower() in text)
+        emotion_count = sum(1 for word in emotion_words if word.lower() in found)
         if emotion_count == 0:
             score -= 0.1
         
         # Check for red flags
-        for flag_name, pattern in self.quality_standards['red_flags'].items():
-            if re.search(pattern, content, re.IGNORECASE):
-                if flag_name == 'excessive_caps':
-                    score -= 0.2
-                elif flag_name == 'excessive_punctuation':
-                    score -= 0.15
-                elif flag_name == 'repetitive_phrases':
-                    score -= 0.3
-                elif flag_name == 'placeholder_text':
-                    score -= 0.5
+        for flag_name in features.red_flags:
+            if flag_name in RED_FLAG_PENALTIES:
+                score -= RED_FLAG_PENALTIES[flag_name]
         
         # Length appropriateness
-        content_length = len(content)
+        content_length = features.content_length
         if content_length < 20:
             score -= 0.1
         elif content_length > 500:
             score -= 0.05
         
         # Natural sentence structure (basic check)
-        sentences = content.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
+        avg_sentence_length = features.avg_sentence_length
         if avg_sentence_length < 3 or avg_sentence_length > 30:
             score -= 0.1
         
         return max(0.0, min(1.0, score))
     
-    def _assess_readability(self, content: str, language: str) -> float:
+    def _assess_readability(self, features: ReviewFeatures, language: str) -> float:
         """Assess readability and clarity of the review"""
-        if not content or len(content) < 10:
+        if not features.content or features.content_length < 10:
             return 0.1
         
         # Basic readability metrics
-        words = content.split()
-        sentences = content.split('.')
-        
-        if len(sentences) == 0:
-            return 0.2
-        
-        avg_words_per_sentence = len(words) / len(sentences)
-        avg_syllables_per_word = self._estimate_syllables(words)
+        avg_words_per_sentence = features.word_count / features.sentence_count
+        avg_syllables_per_word = features.syllables_per_word
         
         # Simplified Flesch-Kincaid-like calculation
         readability_score = 206.835 - (1.015 * avg_words_per_sentence) - (84.6 * avg_syllables_per_word)
         
-        # Normalize to 0-1 scale (assume 0-100 input range)
-        normalized_score = max(0, min(100, readability_score)) / 100
-        
         # Adjust for optimal reading level (60-80 is good for reviews)
         if 60 <= readability_score <= 80:
             return 1.0
@@ -259,67 +702,39 @@ class ReviewQualityScorer:
         else:
             return 0.5
     
-    def _estimate_syllables(self, words: List[str]) -> float:
-        """Estimate average syllables per word"""
-        total_syllables = 0
-        for word in words:
-            # Simple syllable estimation
-            vowels = 'aeiouy'
-            syllables = len([char for char in word.lower() if char in vowels])
-            if syllables == 0:
-                syllables = 1
-            total_syllables += syllables
-        
-        return total_syllables / max(len(words), 1)
-    
-    def _assess_language_consistency(self, review: Dict) -> float:
+    def _assess_language_consistency(self, features: ReviewFeatures, target_language: str) -> float:
         """Assess consistency of language usage throughout the review"""
-        content = review.get('content', '')
-        title = review.get('title', '')
-        location = review.get('location', '')
-        target_language = review.get('language', 'en')
-        
-        if not content:
+        if not features.content:
             return 0.0
         
-        # Use TextBlob for language detection
-        try:
-            full_text = f"{title} {content}"
-            blob = TextBlob(full_text)
-            detected_language = blob.detect_language()
-            
-            # Map common language codes
-            lang_mapping = {
-                'en': 'en', 'de': 'de', 'es': 'es', 'fr': 'fr', 
-                'it': 'it', 'pl': 'pl', 'cs': 'cs', 'pt': 'pt'
+        # Local character n-gram identifier, see language_id.py
+        detected_language = None
+        if target_language in get_language_identifier().languages:
+            detected_language = detect_language(features.text)
+        if detected_language is None:
+            # Language without a profile or nothing to classify, use heuristics
+            return self._heuristic_language_check(features.content_lower, target_language)
+        
+        if detected_language == target_language:
+            return 1.0
+        else:
+            # Partial credit for similar languages
+            similar_langs = {
+                'en': ['en'],
+                'de': ['de', 'nl'],
+                'es': ['es', 'pt', 'ca'],
+                'fr': ['fr'],
+                'it': ['it', 'es'],
+                'pl': ['pl', 'cs', 'sk'],
+                'cs': ['cs', 'sk', 'pl']
             }
             
-            target_code = lang_mapping.get(target_language, target_language)
-            
-            if detected_language == target_code:
-                return 1.0
+            if detected_language in similar_langs.get(target_language, []):
+                return 0.7
             else:
-                # Partial credit for similar languages
-                similar_langs = {
-                    'en': ['en'],
-                    'de': ['de', 'nl'],
-                    'es': ['es', 'pt', 'ca'],
-                    'fr': ['fr'],
-                    'it': ['it', 'es'],
-                    'pl': ['pl', 'cs', 'sk'],
-                    'cs': ['cs', 'sk', 'pl']
-                }
-                
-                if detected_language in similar_langs.get(target_code, []):
-                    return 0.7
-                else:
-                    return 0.3
-                    
-        except Exception:
-            # If detection fails, use heuristics
-            return self._heuristic_language_check(content, target_language)
+                return 0.3
     
-    def _heuristic_language_check(self, content: str, target_language: str) -> float:
+    def _heuristic_language_check(self, content_lower: str, target_language: str) -> float:
         """Fallback language consistency check using heuristics"""
         # Simple character-based heuristics
         language_indicators = {
@@ -335,7 +750,6 @@ class ReviewQualityScorer:
         if not indicators:
             return 0.5  # Unknown language
         
-        content_lower = content.lower()
         matches = sum(1 for indicator in indicators if indicator in content_lower)
         
         # Score based on indicator presence
@@ -346,14 +760,13 @@ class ReviewQualityScorer:
         else:
             return 0.3
     
-    def _assess_sentiment_appropriateness(self, content: str, rating: int, language: str) -> float:
+    def _assess_sentiment_appropriateness(self, features: ReviewFeatures, rating: int, language: str) -> float:
         """Assess if sentiment matches the rating"""
-        if not content:
+        if not features.content:
             return 0.0
         
         try:
-            blob = TextBlob(content)
-            sentiment = blob.sentiment.polarity  # -1 to 1
+            sentiment = self._sentiment_polarity(features.content, language)  # -1 to 1
             
             # Expected sentiment ranges for each rating
             expected_ranges = self.quality_standards['rating_sentiment_correlation']
@@ -375,18 +788,27 @@ class ReviewQualityScorer:
                 
         except Exception:
             # If sentiment analysis fails, use keyword-based approach
-            return self._keyword_sentiment_check(content, rating)
+            return self._keyword_sentiment_check(features.content_lower, rating)
     
-    def _keyword_sentiment_check(self, content: str, rating: int) -> float:
-        """Fallback sentiment check using keywords"""
-        positive_words = ['great', 'excellent', 'amazing', 'perfect', 'love', 'awesome', 
-                         'fantastic', 'wonderful', 'outstanding', 'brilliant']
-        negative_words = ['terrible', 'awful', 'horrible', 'disappointing', 'waste', 
-                         'poor', 'bad', 'worst', 'useless', 'regret']
+    def _sentiment_polarity(self, content: str, language: str) -> float:
+        """Polarity from -1 to 1: the multilingual lexicon, TextBlob for other languages
         
-        content_lower = content.lower()
-        positive_count = sum(1 for word in positive_words if word in content_lower)
-        negative_count = sum(1 for word in negative_words if word in content_lower)
+        Content without any sentiment-carrying words is neutral (0.0); only
+        English falls back to TextBlob for it.
+        """
+        lexicon = get_sentiment_lexicon()
+        if language in lexicon.languages:
+            polarity = lexicon.polarity(content)
+            if polarity is not None:
+                return polarity
+            if language != 'en':
+                return 0.0
+        return TextBlob(content).sentiment.polarity
+    
+    def _keyword_sentiment_check(self, content_lower: str, rating: int) -> float:
+        """Fallback sentiment check using keywords"""
+        positive_count = sum(1 for word in POSITIVE_WORDS if word in content_lower)
+        negative_count = sum(1 for word in NEGATIVE_WORDS if word in content_lower)
         
         # Simple sentiment score
         if positive_count > negative_count and rating >= 4:
@@ -398,15 +820,15 @@ class ReviewQualityScorer:
         else:
             return 0.5
     
-    def _assess_content_depth(self, content: str, title: str, product_context: Dict = None) -> float:
+    def _assess_content_depth(self, features: ReviewFeatures, product_context: Dict = None) -> float:
         """Assess the depth and informativeness of the review content"""
-        if not content:
+        if not features.content:
             return 0.0
         
         score = 0.0
         
         # Length appropriateness
-        content_length = len(content)
+        content_length = features.content_length
         if 50 <= content_length <= 300:
             score += 0.3
         elif 20 <= content_length <= 500:
@@ -415,187 +837,98 @@ class ReviewQualityScorer:
             score += 0.1
         
         # Information categories covered
-        info_categories = {
-            'quality': ['quality', 'material', 'build', 'construction', 'fabric', 'durable'],
-            'appearance': ['looks', 'color', 'style', 'design', 'attractive', 'beautiful'],
-            'fit': ['fits', 'size', 'comfortable', 'tight', 'loose', 'perfect fit'],
-            'value': ['price', 'value', 'worth', 'money', 'expensive', 'cheap', 'affordable'],
-            'experience': ['delivery', 'shipping', 'packaging', 'arrived', 'ordered', 'bought']
-        }
-        
-        content_lower = content.lower()
+        found = features.content_keywords
         categories_covered = 0
-        for category, keywords in info_categories.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for category, keywords in INFO_CATEGORIES.items():
+            if any(keyword in found for keyword in keywords):
                 categories_covered += 1
         
         # Score based on coverage
-        score += (categories_covered / len(info_categories)) * 0.4
+        score += (categories_covered / len(INFO_CATEGORIES)) * 0.4
         
         # Specific details (numbers, specific mentions)
-        detail_patterns = [
-            r'\d+\s*(day|week|month|year)',  # Time references
-            r'\d+\s*(inch|cm|size|xl|large|small)',  # Size references
-            r'\$\d+',  # Price mentions
-            r'\d+\s*star',  # Star ratings
-            r'(exactly|perfectly|slightly|much|very)\s+\w+'  # Qualitative modifiers
-        ]
-        
-        detail_count = sum(1 for pattern in detail_patterns 
-                          if re.search(pattern, content_lower))
-        score += min(0.3, detail_count * 0.1)
+        score += min(0.3, features.detail_count * 0.1)
         
         return min(1.0, score)
     
-    def _assess_uniqueness(self, content: str, historical_reviews: List[Dict] = None) -> float:
-        """Assess uniqueness compared to historical reviews"""
-        if not content or not historical_reviews:
-            return 1.0  # Assume unique if no comparison data
-        
-        # Use TF-IDF similarity
-        try:
-            historical_content = [review.get('content', '') for review in historical_reviews[-100:]]  # Last 100 reviews
-            historical_content = [c for c in historical_content if c]  # Filter empty content
-            
-            if not historical_content:
-                return 1.0
-            
-            all_content = historical_content + [content]
-            tfidf_matrix = self.similarity_vectorizer.fit_transform(all_content)
-            
-            # Calculate similarity with historical reviews
-            new_review_vector = tfidf_matrix[-1]
-            historical_vectors = tfidf_matrix[:-1]
-            
-            similarities = cosine_similarity(new_review_vector, historical_vectors).flatten()
-            max_similarity = np.max(similarities) if len(similarities) > 0 else 0.0
-            
-            # Score based on uniqueness (lower similarity = higher uniqueness)
-            uniqueness_score = 1.0 - max_similarity
-            
-            return max(0.0, min(1.0, uniqueness_score))
-            
-        except Exception:
-            # Fallback: simple text comparison
-            return self._simple_uniqueness_check(content, historical_reviews)
-    
-    def _simple_uniqueness_check(self, content: str, historical_reviews: List[Dict]) -> float:
-        """Simple uniqueness check without ML"""
-        if not historical_reviews:
-            return 1.0
-        
-        content_words = set(content.lower().split())
-        similarities = []
-        
-        for review in historical_reviews[-50:]:  # Check last 50 reviews
-            historical_content = review.get('content', '')
-            if not historical_content:
-                continue
-            
-            historical_words = set(historical_content.lower().split())
-            if len(content_words) == 0 or len(historical_words) == 0:
-                continue
-            
-            # Jaccard similarity
-            intersection = content_words.intersection(historical_words)
-            union = content_words.union(historical_words)
-            similarity = len(intersection) / len(union)
-            similarities.append(similarity)
-        
-        if not similarities:
+    def _assess_uniqueness(self, content: str, historical_reviews: List[Dict] = None,
+                           check_index: bool = True) -> float:
+        """Assess uniqueness compared to all indexed reviews and the given historical reviews"""
+        if not content:
             return 1.0
         
-        max_similarity = max(similarities)
-        return 1.0 - max_similarity
+        max_similarity = 0.0
+        if check_index:
+            try:
+                max_similarity = self.similarity_index.max_similarity(content)
+            except Exception:
+                pass  # Index unavailable; fall back to the historical reviews
+        
+        content_signature = signature(content)
+        if historical_reviews and content_signature is not None:
+            for review in historical_reviews:
+                historical_signature = signature(review.get('content') or '')
+                if historical_signature is not None:
+                    max_similarity = max(max_similarity,
+                                         estimate_similarity(content_signature, historical_signature))
+        
+        # Score based on uniqueness (lower similarity = higher uniqueness)
+        return max(0.0, min(1.0, 1.0 - max_similarity))
     
-    def _assess_demographic_alignment(self, review: Dict, product_context: Dict = None) -> float:
+    def _assess_demographic_alignment(self, features: ReviewFeatures, review: Dict,
+                                      product_context: Dict = None) -> float:
         """Assess if review style matches expected demographic"""
         # This is a simplified implementation
         # In a full system, this would use more sophisticated demographic analysis
         
-        content = review.get('content', '')
+        content = features.content
         persona = review.get('persona', 'millennial')
-        language = review.get('language', 'en')
         
         if not content:
             return 0.5
         
-        # Basic style indicators
-        style_indicators = {
-            'gen_z': {
-                'casual_language': ['omg', 'tbh', 'ngl', 'lowkey', 'highkey', 'literally', 'obsessed'],
-                'informal_grammar': True,
-                'emoji_usage': True,
-                'abbreviations': ['ur', 'bc', 'rn', 'fr']
-            },
-            'millennial': {
-                'detailed_reviews': True,
-                'value_conscious': ['worth', 'value', 'price', 'investment'],
-                'experience_focused': ['experience', 'quality', 'recommend'],
-                'moderate_formality': True
-            },
-            'gen_x': {
-                'practical_focus': ['practical', 'functional', 'durable', 'reliable'],
-                'quality_emphasis': ['quality', 'craftsmanship', 'materials'],
-                'formal_language': True
-            }
-        }
-        
-        indicators = style_indicators.get(persona, style_indicators['millennial'])
-        content_lower = content.lower()
+        indicators = STYLE_INDICATORS.get(persona, STYLE_INDICATORS['millennial'])
+        found = features.content_keywords
         
         score = 0.5  # Base score
         
         # Check for presence of demographic indicators
         for indicator_type, keywords in indicators.items():
             if isinstance(keywords, list):
-                if any(keyword in content_lower for keyword in keywords):
+                if any(keyword in found for keyword in keywords):
                     score += 0.1
             elif isinstance(keywords, bool) and keywords:
                 # Style checks that require boolean evaluation
                 if indicator_type == 'informal_grammar' and any(c in content for c in ['!!', '??']):
                     score += 0.1
-                elif indicator_type == 'emoji_usage' and re.search(r'[\U0001F600-\U0001F64F]', content):
+                elif indicator_type == 'emoji_usage' and features.has_emoji:
                     score += 0.1
-                elif indicator_type == 'formal_language' and not re.search(r'[!]{2,}', content):
+                elif indicator_type == 'formal_language' and '!!' not in content:
                     score += 0.1
         
         return min(1.0, score)
     
-    def _assess_commercial_value(self, review: Dict, product_context: Dict = None) -> float:
+    def _assess_commercial_value(self, features: ReviewFeatures, rating: int,
+                                 product_context: Dict = None) -> float:
         """Assess the commercial value and persuasiveness of the review"""
-        content = review.get('content', '')
-        title = review.get('title', '')
-        rating = review.get('rating', 5)
-        
-        if not content:
+        if not features.content:
             return 0.0
         
         score = 0.0
+        found = features.content_keywords
         
         # Persuasive elements
-        persuasive_elements = {
-            'social_proof': ['recommend', 'everyone', 'friends', 'family', 'colleagues'],
-            'specific_benefits': ['comfortable', 'stylish', 'durable', 'versatile', 'perfect'],
-            'usage_scenarios': ['work', 'party', 'casual', 'everyday', 'special occasion'],
-            'comparison': ['better than', 'compared to', 'unlike', 'superior'],
-            'call_to_action': ['buy', 'get', 'purchase', 'try', 'consider']
-        }
-        
-        content_lower = content.lower()
-        for element_type, keywords in persuasive_elements.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for element_type, keywords in PERSUASIVE_ELEMENTS.items():
+            if any(keyword in found for keyword in keywords):
                 score += 0.15
         
         # Balanced perspective (mentions both pros and potential cons)
-        has_minor_criticism = any(word in content_lower for word in 
-                                ['however', 'but', 'only issue', 'wish', 'could be better'])
+        has_minor_criticism = any(word in found for word in CRITICISM_WORDS)
         if has_minor_criticism and rating >= 4:
             score += 0.2  # Balanced reviews are more trustworthy
         
         # Clear value proposition
-        value_indicators = ['worth', 'value', 'price', 'investment', 'money', 'affordable']
-        if any(indicator in content_lower for indicator in value_indicators):
+        if any(indicator in found for indicator in VALUE_INDICATORS):
             score += 0.15
         
         return min(1.0, score)
@@ -624,10 +957,10 @@ class ReviewQualityScorer:
         
         return recommendations
     
-    def _identify_issues(self, metrics: Dict, review: Dict) -> List[str]:
+    def _identify_issues(self, metrics: Dict, content_length: int, excessive_caps: bool,
+                         excessive_punctuation: bool) -> List[str]:
         """Identify specific issues with the review"""
         issues = []
-        content = review.get('content', '')
         
         # Check for critical issues
         if metrics['authenticity'] < 0.5:
@@ -640,76 +973,320 @@ class ReviewQualityScorer:
             issues.append("WARNING: High similarity to existing reviews")
         
         # Check for specific problems
-        if len(content) < 20:
+        if content_length < 20:
             issues.append("Content too short for meaningful review")
         
-        if re.search(r'[A-Z]{5,}', content):
+        if excessive_caps:
             issues.append("Excessive use of capital letters")
         
-        if re.search(r'[!?]{4,}', content):
+        if excessive_punctuation:
             issues.append("Excessive punctuation usage")
         
         return issues
-
-def batch_assess_reviews(reviews: List[Dict], product_context: Dict = None) -> List[QualityMetrics]:
-    """Assess quality for a batch of reviews"""
-    scorer = ReviewQualityScorer()
-    results = []
-    
-    for i, review in enumerate(reviews):
-        # Use previous reviews for uniqueness assessment
-        historical_reviews = reviews[:i] if i > 0 else []
-        quality_metrics = scorer.assess_review_quality(
-            review, 
-            product_context=product_context,
-            historical_reviews=historical_reviews
+    
+    def assess_batch(self, reviews: List[Dict], product_context: Dict = None,
+                     check_index: bool = False) -> BatchQualityScores:
+        """
+        Quality assessment of many reviews at once
+        
+        Scores every review like assess_review_quality(), with features stacked
+        into arrays and each metric computed for the whole batch with NumPy.
+        Sentiment and language detection run once per distinct text, and
+        uniqueness compares each review with the earlier reviews of the batch
+        through their MinHash values instead of pair by pair.
+        
+        Args:
+            reviews: Review data dictionaries
+            product_context: Product information for context-aware scoring
+            check_index: Also look the whole batch up in the similarity index
+        
+        Returns:
+            BatchQualityScores with one entry per review
+        """
+        started = time.perf_counter()
+        
+        features = [self.extract_features(review) for review in reviews]
+        ratings = [review.get('rating', 5) for review in reviews]
+        languages = [review.get('language', 'en') for review in reviews]
+        columns = self._feature_columns(features)
+        
+        metrics = {
+            'authenticity': self._batch_authenticity(columns),
+            'readability': self._batch_readability(columns),
+            'language_consistency': self._batch_language_consistency(features, languages),
+            'sentiment_appropriateness': self._batch_sentiment_appropriateness(features, ratings, languages),
+            'content_depth': self._batch_content_depth(columns),
+            'uniqueness': self._batch_uniqueness(features, check_index),
+            'demographic_alignment': self._batch_demographic_alignment(columns, reviews),
+            'commercial_value': self._batch_commercial_value(columns, ratings)
+        }
+        overall_score = sum(metrics[key] * weight for key, weight in METRIC_WEIGHTS.items())
+        
+        self.timings.record(time.perf_counter() - started, count=len(reviews))
+        return BatchQualityScores(
+            overall_score=np.asarray(overall_score, dtype=float),
+            metrics=metrics,
+            reviews=list(reviews),
+            features=features,
+            assessed_at=datetime.now().isoformat(),
+            scorer=self
         )
-        results.append(quality_metrics)
     
-    return results
-
-def get_quality_summary(quality_metrics_list: List[QualityMetrics]) -> Dict:
-    """Generate summary statistics for a batch of quality assessments"""
-    if not quality_metrics_list:
-        return {}
+    def _feature_columns(self, features: List[ReviewFeatures]) -> Dict[str, np.ndarray]:
+        """Review features as arrays, keyword and red flag hits as boolean matrices"""
+        count = len(features)
+        text_keywords = np.zeros((count, len(self._text_keyword_columns)), dtype=bool)
+        content_keywords = np.zeros((count, len(_CONTENT_KEYWORD_COLUMNS)), dtype=bool)
+        red_flags = np.zeros((count, len(self._red_flag_patterns)), dtype=bool)
+        flag_columns = {name: column for column, (name, _, _) in enumerate(self._red_flag_patterns)}
+        
+        for row, feature in enumerate(features):
+            text_keywords[row, [self._text_keyword_columns[word] for word in feature.text_keywords]] = True
+            content_keywords[row, [_CONTENT_KEYWORD_COLUMNS[word] for word in feature.content_keywords]] = True
+            red_flags[row, [flag_columns[name] for name in feature.red_flags]] = True
+        
+        def column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=count)
+        
+        return {
+            'has_content': column((bool(feature.content) for feature in features), bool),
+            'content_length': column((feature.content_length for feature in features), np.int64),
+            'word_count': column((feature.word_count for feature in features), np.int64),
+            'sentence_count': column((feature.sentence_count for feature in features), np.int64),
+            'avg_sentence_length': column((feature.avg_sentence_length for feature in features), float),
+            'syllables_per_word': column((feature.syllables_per_word for feature in features), float),
+            'detail_count': column((feature.detail_count for feature in features), np.int64),
+            'has_emoji': column((feature.has_emoji for feature in features), bool),
+            'double_exclamation': column(('!!' in feature.content for feature in features), bool),
+            'double_question': column(('??' in feature.content for feature in features), bool),
+            'text_keywords': text_keywords,
+            'content_keywords': content_keywords,
+            'red_flags': red_flags
+        }
+    
+    def _text_keyword_count(self, columns: Dict[str, np.ndarray], words: List[str]) -> np.ndarray:
+        """Per review, how many of the authenticity words appear, as in _assess_authenticity"""
+        return columns['text_keywords'][:, [self._text_keyword_columns[word.lower()] for word in words]].sum(axis=1)
+    
+    def _batch_authenticity(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """_assess_authenticity for every review of a batch"""
+        indicators = self.quality_standards['authenticity_indicators']
+        score = np.ones(len(columns['has_content']))
+        
+        personal_count = self._text_keyword_count(columns, indicators['personal_pronouns'])
+        score = np.where(personal_count == 0, score - 0.2, np.where(personal_count > 5, score - 0.1, score))
+        score = np.where(self._text_keyword_count(columns, indicators['experience_words']) == 0, score - 0.15, score)
+        score = np.where(self._text_keyword_count(columns, indicators['emotion_words']) == 0, score - 0.1, score)
+        
+        for column, (flag_name, _, _) in enumerate(self._red_flag_patterns):
+            if flag_name in RED_FLAG_PENALTIES:
+                score = np.where(columns['red_flags'][:, column], score - RED_FLAG_PENALTIES[flag_name], score)
+        
+        content_length = columns['content_length']
+        score = np.where(content_length < 20, score - 0.1, np.where(content_length > 500, score - 0.05, score))
+        avg_sentence_length = columns['avg_sentence_length']
+        score = np.where((avg_sentence_length < 3) | (avg_sentence_length > 30), score - 0.1, score)
+        
+        return np.clip(score, 0.0, 1.0)
+    
+    def _batch_readability(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """_assess_readability for every review of a batch"""
+        avg_words_per_sentence = columns['word_count'] / columns['sentence_count']
+        readability_score = (206.835 - (1.015 * avg_words_per_sentence)
+                             - (84.6 * columns['syllables_per_word']))
+        
+        score = np.where((60 <= readability_score) & (readability_score <= 80), 1.0,
+                         np.where((40 <= readability_score) & (readability_score <= 90), 0.8, 0.5))
+        return np.where(~columns['has_content'] | (columns['content_length'] < 10), 0.1, score)
+    
+    def _batch_language_consistency(self, features: List[ReviewFeatures], languages: List[str]) -> np.ndarray:
+        """_assess_language_consistency, once per distinct text and target language"""
+        scores = {}
+        result = np.empty(len(features))
+        for row, (feature, language) in enumerate(zip(features, languages)):
+            key = (feature.title, feature.content, language)
+            if key not in scores:
+                scores[key] = self._assess_language_consistency(feature, language)
+            result[row] = scores[key]
+        return result
+    
+    def _batch_sentiment_appropriateness(self, features: List[ReviewFeatures], ratings: List[int],
+                                         languages: List[str]) -> np.ndarray:
+        """_assess_sentiment_appropriateness, with one sentiment analysis per distinct content and language"""
+        polarities = {}
+        keys = [(feature.content, language) for feature, language in zip(features, languages)]
+        for key in keys:
+            if key[0] and key not in polarities:
+                try:
+                    polarities[key] = self._sentiment_polarity(*key)
+                except Exception:
+                    polarities[key] = None
+        
+        expected_ranges = self.quality_standards['rating_sentiment_correlation']
+        expected = np.array([expected_ranges.get(rating, (0.0, 1.0)) for rating in ratings],
+                            dtype=float).reshape(-1, 2)
+        expected_min, expected_max = expected[:, 0], expected[:, 1]
+        sentiment = np.array([polarities.get(key) for key in keys], dtype=float)
+        
+        # NaN rows (empty content or failed analysis) are replaced below
+        distance = np.where(sentiment < expected_min, expected_min - sentiment, sentiment - expected_max)
+        score = np.where((expected_min <= sentiment) & (sentiment <= expected_max), 1.0,
+                         np.maximum(0.0, 1.0 - (distance * 2)))
+        
+        for row, feature in enumerate(features):
+            if not feature.content:
+                score[row] = 0.0
+            elif polarities[keys[row]] is None:
+                score[row] = self._keyword_sentiment_check(feature.content_lower, ratings[row])
+        return score
+    
+    def _batch_content_depth(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """_assess_content_depth for every review of a batch"""
+        content_length = columns['content_length']
+        score = np.where((50 <= content_length) & (content_length <= 300), 0.3,
+                         np.where((20 <= content_length) & (content_length <= 500), 0.2, 0.1))
+        
+        categories_covered = sum(
+            _any_content_keyword(columns, keywords).astype(np.int64) for keywords in INFO_CATEGORIES.values()
+        )
+        score = score + (categories_covered / len(INFO_CATEGORIES)) * 0.4
+        score = score + np.minimum(0.3, columns['detail_count'] * 0.1)
+        
+        return np.where(columns['has_content'], np.minimum(1.0, score), 0.0)
     
-    scores = [qm.overall_score for qm in quality_metrics_list]
-    authenticity_scores = [qm.authenticity_score for qm in quality_metrics_list]
+    def _batch_uniqueness(self, features: List[ReviewFeatures], check_index: bool) -> np.ndarray:
+        """Uniqueness against the earlier reviews of the batch and, optionally, the index"""
+        matrix, has_words = signature_matrix([feature.content for feature in features])
+        max_similarity = np.array(batch_max_similarities(matrix, has_words), dtype=float)
+        
+        if check_index:
+            try:
+                indexed = self.similarity_index.max_similarities([
+                    row if words else None for row, words in zip(matrix.tolist(), has_words.tolist())
+                ])
+                max_similarity = np.maximum(max_similarity, indexed)
+            except Exception:
+                pass  # Index unavailable; only compare within the batch
+        
+        return np.clip(1.0 - max_similarity, 0.0, 1.0)
     
+    def _batch_demographic_alignment(self, columns: Dict[str, np.ndarray], reviews: List[Dict]) -> np.ndarray:
+        """_assess_demographic_alignment for every review of a batch"""
+        personas = [review.get('persona', 'millennial') for review in reviews]
+        personas = np.array([persona if persona in STYLE_INDICATORS else 'millennial' for persona in personas],
+                            dtype=object)
+        score = np.full(len(reviews), 0.5)
+        
+        for persona, indicators in STYLE_INDICATORS.items():
+            persona_score = np.full(len(reviews), 0.5)
+            for indicator_type, keywords in indicators.items():
+                if isinstance(keywords, list):
+                    matched = _any_content_keyword(columns, keywords)
+                elif indicator_type == 'informal_grammar' and keywords:
+                    matched = columns['double_exclamation'] | columns['double_question']
+                elif indicator_type == 'emoji_usage' and keywords:
+                    matched = columns['has_emoji']
+                elif indicator_type == 'formal_language' and keywords:
+                    matched = ~columns['double_exclamation']
+                else:
+                    continue
+                persona_score = np.where(matched, persona_score + 0.1, persona_score)
+            score = np.where(personas == persona, np.minimum(1.0, persona_score), score)
+        
+        return np.where(columns['has_content'], score, 0.5)
+    
+    def _batch_commercial_value(self, columns: Dict[str, np.ndarray], ratings: List[int]) -> np.ndarray:
+        """_assess_commercial_value for every review of a batch"""
+        score = np.zeros(len(ratings))
+        for keywords in PERSUASIVE_ELEMENTS.values():
+            score = np.where(_any_content_keyword(columns, keywords), score + 0.15, score)
+        
+        balanced = _any_content_keyword(columns, CRITICISM_WORDS) & (np.array(ratings).reshape(-1) >= 4)
+        score = np.where(balanced, score + 0.2, score)
+        score = np.where(_any_content_keyword(columns, VALUE_INDICATORS), score + 0.15, score)
+        
+        return np.where(columns['has_content'], np.minimum(1.0, score), 0.0)
+
+def _any_content_keyword(columns: Dict[str, np.ndarray], keywords: List[str]) -> np.ndarray:
+    """Per review, whether any of the keywords appears in the content"""
+    return columns['content_keywords'][:, [_CONTENT_KEYWORD_COLUMNS[keyword] for keyword in keywords]].any(axis=1)
+
+# Process-wide scorer, built on first use or by warm_up_scorer()
+_shared_scorer: Optional[ReviewQualityScorer] = None
+_shared_scorer_lock = threading.Lock()
+
+def get_shared_scorer() -> ReviewQualityScorer:
+    """Get the process-wide quality scorer, building it once"""
+    global _shared_scorer
+    scorer = _shared_scorer
+    if scorer is None:
+        with _shared_scorer_lock:
+            if _shared_scorer is None:
+                _shared_scorer = ReviewQualityScorer()
+            scorer = _shared_scorer
+    return scorer
+
+def warm_up_scorer() -> Dict:
+    """Build the shared scorer and run one assessment so the first request doesn't pay for it"""
+    scorer = get_shared_scorer()
+    scorer.assess_review_quality({
+        'title': 'Great quality',
+        'content': 'I bought this for a concert and the fit is perfect. Would recommend!',
+        'rating': 5,
+        'language': 'en'
+    })
+    return get_scorer_stats()
+
+def get_scorer_stats() -> Dict:
+    """Timings, score cache, quality gate and score summary statistics of the shared scorer"""
+    scorer = _shared_scorer
+    if scorer is None:
+        return {'initialized': False}
     return {
-        'total_reviews': len(quality_metrics_list),
-        'average_quality': np.mean(scores),
-        'quality_std': np.std(scores),
-        'high_quality_count': sum(1 for score in scores if score >= 0.8),
-        'low_quality_count': sum(1 for score in scores if score < 0.6),
-        'average_authenticity': np.mean(authenticity_scores),
-        'quality_distribution': {
-            'excellent': sum(1 for score in scores if score >= 0.9),
-            'good': sum(1 for score in scores if 0.8 <= score < 0.9),
-            'average': sum(1 for score in scores if 0.6 <= score < 0.8),
-            'poor': sum(1 for score in scores if score < 0.6)
-        },
-        'common_issues': _get_common_issues(quality_metrics_list),
-        'top_recommendations': _get_top_recommendations(quality_metrics_list)
+        'initialized': True,
+        **scorer.timings.to_dict(),
+        'cache': scorer.score_cache.stats(),
+        'quality_gate': scorer.gate_stats.to_dict(),
+        'quality_summary': scorer.quality_summary.summary()
     }
 
-def _get_common_issues(quality_metrics_list: List[QualityMetrics]) -> List[Tuple[str, int]]:
-    """Get most common issues across reviews"""
-    issue_counts = {}
-    for qm in quality_metrics_list:
-        for issue in qm.flagged_issues:
-            issue_counts[issue] = issue_counts.get(issue, 0) + 1
+def batch_assess_reviews(reviews: List[Dict], product_context: Dict = None,
+                         check_index: bool = False) -> List[QualityMetrics]:
+    """Assess quality for a batch of reviews
+
+    Reviews are scored together by ReviewQualityScorer.assess_batch() and
+    compared with each other; check_index also compares them with the
+    similarity index, which only makes sense for reviews not generated here
+    (generated reviews are already indexed and would match themselves).
+    """
+    return get_shared_scorer().assess_batch(
+        reviews, product_context=product_context, check_index=check_index
+    ).to_list()
+
+def get_quality_summary(quality_metrics_list: Iterable[QualityMetrics]) -> Dict:
+    """Generate summary statistics for a batch of quality assessments
     
-    return sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    Assessments are aggregated one at a time, so a generator of them is
+    summarized without keeping them all.
+    """
+    aggregator = QualityAggregator()
+    for quality_metrics in quality_metrics_list:
+        aggregator.add_quality(quality_metrics)
+    return aggregator.summary()
 
-def _get_top_recommendations(quality_metrics_list: List[QualityMetrics]) -> List[Tuple[str, int]]:
+def _get_common_issues(quality_metrics_list: Iterable[QualityMetrics]) -> List[Tuple[str, int]]:
+    """Get most common issues across reviews"""
+    aggregator = QualityAggregator()
+    for quality_metrics in quality_metrics_list:
+        aggregator.add(quality_metrics.overall_score, issues=quality_metrics.flagged_issues)
+    return aggregator.common_issues()
+
+def _get_top_recommendations(quality_metrics_list: Iterable[QualityMetrics]) -> List[Tuple[str, int]]:
     """Get most common recommendations across reviews"""
-    rec_counts = {}
-    for qm in quality_metrics_list:
-        for rec in qm.recommendations:
-            rec_counts[rec] = rec_counts.get(rec, 0) + 1
-    
-    return sorted(rec_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    aggregator = QualityAggregator()
+    for quality_metrics in quality_metrics_list:
+        aggregator.add(quality_metrics.overall_score, recommendations=quality_metrics.recommendations)
+    return aggregator.top_recommendations()
 
 # Integration with existing review generation
 def assess_generated_reviews(reviews: List[Dict], product: Dict = None) -> Dict:
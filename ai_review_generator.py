@@ -3,18 +3,23 @@ AI-Powered Review Generator - Phase 1A Implementation
 Advanced review generation using GPT-4 and computer vision
 """
 import os
+import asyncio
+import concurrent.futures
 import json
 import random
 import re
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import openai
 from PIL import Image
 import requests
 from io import BytesIO
 import numpy as np
 from textblob import TextBlob
+from language_id import detect_language, get_language_identifier
+from image_analysis_cache import get_image_analysis_cache, image_cache_key
 
 @dataclass
 class ReviewRequest:
@@ -28,27 +33,189 @@ class ReviewRequest:
     review_style: str  # 'authentic', 'enthusiastic', 'detailed', 'casual'
     customer_persona: str  # 'gen_z', 'millennial', 'gen_x', 'boomer'
     market_context: Dict  # Brand positioning, competitor info, etc.
+    product_image_versions: List[Optional[str]] = field(default_factory=list)  # Shopify updated_at per image
+
+# Requests in flight at once per process; OPENAI_BASE_URL (read by the openai
+# client) points it at another OpenAI-compatible server, e.g. a local fake one
+AI_MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', '8'))
+# Retries of rate-limited (429) and server error responses
+AI_MAX_RETRIES = int(os.environ.get('AI_MAX_RETRIES', '4'))
+AI_BACKOFF_SECONDS = float(os.environ.get('AI_BACKOFF_SECONDS', '1.0'))
+AI_MAX_BACKOFF_SECONDS = 30.0
+AI_REQUEST_TIMEOUT = float(os.environ.get('AI_REQUEST_TIMEOUT', '60'))
+DEFAULT_OPENAI_BASE_URL = 'https://api.openai.com/v1'
+# Reviews asked for in one completion by generate_ai_enhanced_reviews (1 = one call per review)
+AI_REVIEWS_PER_CALL = int(os.environ.get('AI_REVIEWS_PER_CALL', '1'))
+# Completion tokens allowed per review of a multi-review call, and for the whole call
+MULTI_REVIEW_TOKENS_PER_REVIEW = 600
+MULTI_REVIEW_MAX_TOKENS = 4096
+# Shortest review content accepted from a multi-review completion
+MIN_REVIEW_CONTENT_LENGTH = 20
+
+PERSONA_CONTEXT = {
+    'gen_z': 'Write as an 18-24 year old who uses social media actively, casual language, some slang, emoji occasionally',
+    'millennial': 'Write as a 25-40 year old professional, detailed but accessible, references quality and value',
+    'gen_x': 'Write as a 40-55 year old, practical focus, values durability and authenticity',
+    'boomer': 'Write as a 55+ year old, formal language, emphasizes traditional quality markers'
+}
+
+STYLE_CONTEXT = {
+    'authentic': 'Natural, honest tone with both positives and minor critiques',
+    'enthusiastic': 'Very positive, excited tone showing genuine satisfaction',
+    'detailed': 'Comprehensive review covering multiple aspects thoroughly',
+    'casual': 'Brief, conversational style focusing on key impressions'
+}
+
+class AIClientPool:
+    """
+    Process-wide AsyncOpenAI client with a bounded number of requests in flight
+    
+    The client runs on an event loop in a daemon thread, so synchronous code can
+    submit coroutines to it and every review shares one connection pool.
+    Rate-limited and server error responses are retried after the Retry-After
+    the server asks for, or else after exponential backoff with full jitter.
+    """
+    
+    def __init__(self, max_concurrency: int = AI_MAX_CONCURRENCY, max_retries: int = AI_MAX_RETRIES,
+                 backoff: float = AI_BACKOFF_SECONDS, timeout: float = AI_REQUEST_TIMEOUT,
+                 api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.api_key = api_key if api_key is not None else os.environ.get('OPENAI_API_KEY')
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.pid = os.getpid()
+        # An empty OPENAI_BASE_URL, as in .env.example, means the default
+        base_url = base_url or os.environ.get('OPENAI_BASE_URL') or DEFAULT_OPENAI_BASE_URL
+        # Retries are done here, under the in-flight limit, not by the client
+        self.client = openai.AsyncOpenAI(
+            api_key=self.api_key, base_url=base_url, timeout=timeout, max_retries=0
+        ) if self.api_key else None
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0, 'max_in_flight': 0}
+        self._in_flight = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='ai-client-pool', daemon=True)
+        self._thread.start()
+    
+    async def chat_completion(self, **kwargs):
+        """client.chat.completions.create() under the in-flight limit, retrying rate-limited requests"""
+        if self.client is None:
+            raise RuntimeError("OpenAI API key not configured")
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                self._in_flight += 1
+                self.stats['requests'] += 1
+                self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+                try:
+                    return await self.client.chat.completions.create(**kwargs)
+                except (openai.RateLimitError, openai.InternalServerError) as e:
+                    if isinstance(e, openai.RateLimitError):
+                        self.stats['rate_limited'] += 1
+                    if attempt == self.max_retries:
+                        self.stats['failures'] += 1
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                except Exception:
+                    self.stats['failures'] += 1
+                    raise
+                finally:
+                    self._in_flight -= 1
+            # Back off without holding a slot, so other requests can still finish
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, error: openai.APIStatusError, attempt: int) -> float:
+        retry_after = error.response.headers.get('retry-after')
+        try:
+            if retry_after is not None:
+                return min(max(float(retry_after), 0.0), AI_MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass  # An HTTP date; use our own backoff
+        return random.uniform(0, min(AI_MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt))
+    
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the pool's event loop"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+    
+    def run(self, coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the pool's event loop and wait for its result"""
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("AIClientPool.run() called on the pool's own event loop; await instead")
+        return self.submit(coroutine).result(timeout)
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'in_flight': self._in_flight, 'max_concurrency': self.max_concurrency}
+    
+    def close(self):
+        """Close the client and stop the event loop thread"""
+        if self.client is not None:
+            self.run(self.client.close(), timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+_client_pool: Optional[AIClientPool] = None
+_client_pool_lock = threading.Lock()
+
+def get_client_pool() -> AIClientPool:
+    """This process's client pool; forked workers build their own, as threads don't survive fork"""
+    global _client_pool
+    with _client_pool_lock:
+        if _client_pool is None or _client_pool.pid != os.getpid():
+            _client_pool = AIClientPool()
+        return _client_pool
+
+# Image analyses in flight on the client pool's event loop, by image cache key
+_image_analysis_tasks: Dict[str, 'asyncio.Task'] = {}
 
 class AIReviewGenerator:
-    """Advanced AI-powered review generation engine"""
+    """Advanced AI-powered review generation engine
     
-    def __init__(self):
-        self.openai_client = openai.OpenAI(
-            api_key=os.environ.get('OPENAI_API_KEY')
-        )
+    Model calls go through the process's shared AIClientPool. The *_async
+    methods run on its event loop; the synchronous ones wait for them.
+    """
+    
+    def __init__(self, pool: Optional[AIClientPool] = None):
+        self.pool = pool or get_client_pool()
         self.quality_thresholds = {
             'min_authenticity_score': 0.8,
             'min_readability_score': 0.7,
             'max_similarity_threshold': 0.6
         }
-        
-    def analyze_product_from_image(self, image_url: str) -> Dict:
+    
+    def analyze_product_from_image(self, image_url: str, version: Optional[str] = None) -> Dict:
         """Use GPT-4 Vision to analyze product images"""
+        return self.pool.run(self.analyze_product_from_image_async(image_url, version))
+    
+    async def analyze_product_from_image_async(self, image_url: str, version: Optional[str] = None) -> Dict:
+        """
+        analyze_product_from_image() on the client pool's event loop
+        
+        Analyses come from the image analysis cache when it has this version of
+        the image, and reviews analyzing the same image at once share one call.
+        """
+        if not self.pool.api_key:
+            return {'analysis': 'Image analysis unavailable - OpenAI API key not configured'}
+        
+        cache = get_image_analysis_cache()
+        analysis = await asyncio.to_thread(cache.get, image_url, version)
+        if analysis is not None:
+            return analysis
+        
+        key = image_cache_key(image_url, version)
+        task = _image_analysis_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze_image(image_url, version))
+            _image_analysis_tasks[key] = task
+            task.add_done_callback(lambda _: _image_analysis_tasks.pop(key, None))
+        # A cancelled review must not cancel the analysis other reviews wait for
+        analysis, _ = await asyncio.shield(task)
+        return analysis
+    
+    async def _analyze_image(self, image_url: str, version: Optional[str]) -> Tuple[Dict, bool]:
+        """Analyze an image with the vision model, caching and returning (analysis, True) on success"""
         try:
-            if not self.openai_client.api_key:
-                return {'analysis': 'Image analysis unavailable - OpenAI API key not configured'}
-            
-            response = self.openai_client.chat.completions.create(
+            response = await self.pool.chat_completion(
                 model="gpt-4-vision-preview",
                 messages=[
                     {
@@ -82,30 +249,35 @@ class AIReviewGenerator:
             
             # Try to parse JSON response
             try:
-                return json.loads(analysis_text)
+                analysis = json.loads(analysis_text)
             except json.JSONDecodeError:
                 # Fallback: return raw analysis
-                return {'analysis': analysis_text}
+                analysis = {'analysis': analysis_text}
+            
+            await asyncio.to_thread(get_image_analysis_cache().put, image_url, analysis, version)
+            return analysis, True
                 
         except Exception as e:
             print(f"Image analysis error: {str(e)}")
-            return {'analysis': f'Image analysis failed: {str(e)}'}
+            return {'analysis': f'Image analysis failed: {str(e)}'}, False
     
     def generate_ai_review(self, request: ReviewRequest) -> Dict:
         """Generate review using GPT-4 with advanced prompting"""
+        return self.pool.run(self.generate_ai_review_async(request))
+    
+    async def generate_ai_review_async(self, request: ReviewRequest) -> Dict:
+        """generate_ai_review() on the client pool's event loop"""
         try:
-            if not self.openai_client.api_key:
-                return self._fallback_generation(request)
+            if not self.pool.api_key:
+                return await asyncio.to_thread(self._fallback_generation, request)
             
             # Analyze product images if available
-            image_analysis = {}
-            if request.product_images:
-                image_analysis = self.analyze_product_from_image(request.product_images[0])
+            image_analysis = await self._request_image_analysis(request)
             
             # Build sophisticated prompt
             prompt = self._build_advanced_prompt(request, image_analysis)
             
-            response = self.openai_client.chat.completions.create(
+            response = await self.pool.chat_completion(
                 model="gpt-4-turbo",
                 messages=[
                     {"role": "system", "content": self._get_system_prompt(request.target_language)},
@@ -127,7 +299,7 @@ class AIReviewGenerator:
             
             # If quality is below threshold, regenerate with different approach
             if quality_score < self.quality_thresholds['min_authenticity_score']:
-                return self._regenerate_with_fallback(request, image_analysis)
+                return await self._regenerate_with_fallback(request, image_analysis)
             
             structured_review['ai_quality_score'] = quality_score
             structured_review['generation_method'] = 'gpt4_primary'
@@ -136,24 +308,150 @@ class AIReviewGenerator:
             
         except Exception as e:
             print(f"AI generation error: {str(e)}")
-            return self._fallback_generation(request)
+            return await asyncio.to_thread(self._fallback_generation, request)
     
-    def _build_advanced_prompt(self, request: ReviewRequest, image_analysis: Dict) -> str:
-        """Build sophisticated prompt for GPT-4"""
+    async def _request_image_analysis(self, request: ReviewRequest) -> Dict:
+        """Analysis of the request's first product image, {} without images"""
+        if not request.product_images:
+            return {}
+        versions = request.product_image_versions
+        return await self.analyze_product_from_image_async(
+            request.product_images[0], versions[0] if versions else None
+        )
+    
+    def generate_ai_reviews(self, requests: List[ReviewRequest]) -> List[Dict]:
+        """Generate several reviews of one product with a single completion"""
+        return self.pool.run(self.generate_ai_reviews_async(requests))
+    
+    async def generate_ai_reviews_async(self, requests: List[ReviewRequest]) -> List[Dict]:
+        """
+        generate_ai_reviews() on the client pool's event loop
         
-        persona_context = {
-            'gen_z': 'Write as an 18-24 year old who uses social media actively, casual language, some slang, emoji occasionally',
-            'millennial': 'Write as a 25-40 year old professional, detailed but accessible, references quality and value',
-            'gen_x': 'Write as a 40-55 year old, practical focus, values durability and authenticity',
-            'boomer': 'Write as a 55+ year old, formal language, emphasizes traditional quality markers'
-        }
+        The product context and system prompt are sent once for all reviews,
+        each with its own language, rating, persona and style, and the model
+        answers with a JSON array. Every item is validated and scored on its
+        own; items that are missing, malformed or of low quality, and all of
+        them if the call fails, are replaced by _fallback_generation().
+        """
+        if not requests:
+            return []
+        if len(requests) == 1:
+            return [await self.generate_ai_review_async(requests[0])]
         
-        style_context = {
-            'authentic': 'Natural, honest tone with both positives and minor critiques',
-            'enthusiastic': 'Very positive, excited tone showing genuine satisfaction',
-            'detailed': 'Comprehensive review covering multiple aspects thoroughly',
-            'casual': 'Brief, conversational style focusing on key impressions'
-        }
+        items = [None] * len(requests)
+        if self.pool.api_key:
+            try:
+                image_analysis = await self._request_image_analysis(requests[0])
+                response = await self.pool.chat_completion(
+                    model="gpt-4-turbo",
+                    messages=[
+                        {"role": "system", "content": self._get_system_prompt(None)},
+                        {"role": "user", "content": self._build_multi_review_prompt(requests, image_analysis)}
+                    ],
+                    temperature=0.8,
+                    max_tokens=min(MULTI_REVIEW_MAX_TOKENS, MULTI_REVIEW_TOKENS_PER_REVIEW * len(requests)),
+                    presence_penalty=0.6,
+                    frequency_penalty=0.4
+                )
+                items = self._parse_multi_review_response(response.choices[0].message.content, len(requests))
+            except Exception as e:
+                print(f"AI multi-review generation error: {str(e)}")
+        
+        reviews = []
+        for item, request in zip(items, requests):
+            review = self._validate_review_item(item, request)
+            if review is not None:
+                quality_score = self._assess_review_quality(review, request)
+                if quality_score >= self.quality_thresholds['min_authenticity_score']:
+                    review['ai_quality_score'] = quality_score
+                    review['generation_method'] = 'gpt4_multi'
+                    reviews.append(review)
+                    continue
+            reviews.append(await asyncio.to_thread(self._fallback_generation, request))
+        return reviews
+    
+    def _build_multi_review_prompt(self, requests: List[ReviewRequest], image_analysis: Dict) -> str:
+        """Prompt for len(requests) reviews of the same product"""
+        product = requests[0]
+        image_context = ""
+        if image_analysis:
+            image_context = f"\nBased on product image analysis: {json.dumps(image_analysis, indent=2)}"
+        
+        specifications = "\n".join(
+            f"        {index}. Language: {request.target_language}; Rating: {request.target_rating}/5 stars; "
+            f"Customer Persona: {PERSONA_CONTEXT.get(request.customer_persona, 'General customer')}; "
+            f"Style: {STYLE_CONTEXT.get(request.review_style, 'Natural and authentic')}"
+            for index, request in enumerate(requests, 1)
+        )
+        
+        return f"""
+        Generate {len(requests)} different authentic product reviews for: {product.product_title}
+        
+        Product Description: {product.product_description}
+        {image_context}
+        
+        Write one review for each of these requirements, each entirely in its own language:
+{specifications}
+        
+        Each review should include specific details about product quality and materials, fit,
+        comfort or usability, styling, value for money and personal experience. Make every review
+        feel authentic, with natural language, believable details, a personality matching its
+        persona and honest minor critiques. The reviews must not repeat each other's phrasing.
+        
+        Format the response as a JSON array with one object per requirement, in the same order:
+        [
+            {{
+                "title": "Review title (short, engaging)",
+                "content": "Full review content",
+                "rating": <the required rating>,
+                "author_name": "Realistic name for persona",
+                "author_location": "Appropriate location",
+                "verified_purchase": true,
+                "helpful_votes": 0,
+                "review_date": "Recent date",
+                "key_points": ["list", "of", "main", "points"]
+            }}
+        ]
+        """
+    
+    @staticmethod
+    def _parse_multi_review_response(response_text: str, count: int) -> List[Optional[Dict]]:
+        """The count review objects of a multi-review response, None where one is missing"""
+        text = response_text.strip()
+        # Strip a Markdown code fence around the JSON
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            print("AI multi-review response is not valid JSON")
+            return [None] * count
+        
+        # JSON mode answers with an object, e.g. {"reviews": [...]}
+        if isinstance(parsed, dict):
+            parsed = next((value for value in parsed.values() if isinstance(value, list)), [])
+        if not isinstance(parsed, list):
+            return [None] * count
+        items = parsed[:count]
+        return items + [None] * (count - len(items))
+    
+    def _validate_review_item(self, item, request: ReviewRequest) -> Optional[Dict]:
+        """One review of a multi-review response in structured format, None if it's unusable"""
+        if not isinstance(item, dict):
+            return None
+        content, title = item.get('content'), item.get('title', '')
+        if not isinstance(content, str) or len(content.strip()) < MIN_REVIEW_CONTENT_LENGTH:
+            return None
+        if not isinstance(title, str):
+            return None
+        try:
+            if int(item.get('rating', request.target_rating)) != request.target_rating:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return self._complete_review(dict(item, rating=request.target_rating), request)
+    
+    def _build_advanced_prompt(self, request: ReviewRequest, image_analysis: Dict) -> str:
+        """Build sophisticated prompt for GPT-4"""
         
         image_context = ""
         if image_analysis:
@@ -168,8 +466,8 @@ class AIReviewGenerator:
         Review Requirements:
         - Language: {request.target_language}
         - Rating: {request.target_rating}/5 stars
-        - Customer Persona: {persona_context.get(request.customer_persona, 'General customer')}
-        - Style: {style_context.get(request.review_style, 'Natural and authentic')}
+        - Customer Persona: {PERSONA_CONTEXT.get(request.customer_persona, 'General customer')}
+        - Style: {STYLE_CONTEXT.get(request.review_style, 'Natural and authentic')}
         
         Include specific details about:
         1. Product quality and materials (refer to image analysis if available)
@@ -230,25 +528,28 @@ Always respond in valid JSON format."""
         try:
             # Try to parse as JSON first
             parsed = json.loads(response_text)
-            
-            # Ensure all required fields are present
-            required_fields = ['title', 'content', 'rating', 'author_name', 'author_location']
-            for field in required_fields:
-                if field not in parsed:
-                    parsed[field] = self._generate_fallback_field(field, request)
-            
-            # Add metadata
-            parsed['generated_at'] = datetime.now().isoformat()
-            parsed['language'] = request.target_language
-            parsed['persona'] = request.customer_persona
-            parsed['style'] = request.review_style
-            
-            return parsed
+            return self._complete_review(parsed, request)
             
         except json.JSONDecodeError:
             # Fallback: try to extract components manually
             return self._manual_parse_response(response_text, request)
     
+    def _complete_review(self, parsed: Dict, request: ReviewRequest) -> Dict:
+        """Fill in missing required fields of a parsed review and add metadata"""
+        # Ensure all required fields are present
+        required_fields = ['title', 'content', 'rating', 'author_name', 'author_location']
+        for field in required_fields:
+            if field not in parsed:
+                parsed[field] = self._generate_fallback_field(field, request)
+        
+        # Add metadata
+        parsed['generated_at'] = datetime.now().isoformat()
+        parsed['language'] = request.target_language
+        parsed['persona'] = request.customer_persona
+        parsed['style'] = request.review_style
+        
+        return parsed
+    
     def _manual_parse_response(self, response_text: str, request: ReviewRequest) -> Dict:
         """Manually parse response if JSON parsing fails"""
         # Extract title (first line or quoted text)
@@ -312,14 +613,16 @@ Always respond in valid JSON format."""
         if content:
             # Check if content contains appropriate language patterns
             blob = TextBlob(content)
-            try:
-                detected_lang = blob.detect_language()
-                if detected_lang == request.target_language[:2]:  # Compare language codes
-                    score += 0.3
-                else:
-                    score += 0.1
-            except:
+            target_code = request.target_language[:2]  # Compare language codes
+            detected_lang = None
+            if target_code in get_language_identifier().languages:
+                detected_lang = detect_language(content)
+            if detected_lang is None:
                 score += 0.15  # Partial credit if detection fails
+            elif detected_lang == target_code:
+                score += 0.3
+            else:
+                score += 0.1
         
         # Sentiment appropriateness (0.25 weight)
         if content:
@@ -341,7 +644,7 @@ Always respond in valid JSON format."""
         
         return min(1.0, score)
     
-    def _regenerate_with_fallback(self, request: ReviewRequest, image_analysis: Dict) -> Dict:
+    async def _regenerate_with_fallback(self, request: ReviewRequest, image_analysis: Dict) -> Dict:
         """Regenerate with different approach if quality is low"""
         # Try with different temperature and style
         try:
@@ -356,7 +659,7 @@ Always respond in valid JSON format."""
             Tone: {request.review_style}
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = await self.pool.chat_completion(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Write authentic product reviews in the specified language."},
@@ -387,7 +690,7 @@ Always respond in valid JSON format."""
             
         except Exception as e:
             print(f"Fallback generation error: {str(e)}")
-            return self._fallback_generation(request)
+            return await asyncio.to_thread(self._fallback_generation, request)
     
     def _fallback_generation(self, request: ReviewRequest) -> Dict:
         """Ultimate fallback using template-based generation"""
@@ -401,8 +704,8 @@ Always respond in valid JSON format."""
             'handle': request.product_title.lower().replace(' ', '-')
         }
         
-        # Generate using existing system
-        legacy_review = generate_review(legacy_product, existing_reviews=0)
+        # Generate using existing system; without AI, which would call back in here
+        legacy_review = generate_review(legacy_product, existing_reviews=0, use_ai=False)
         
         # Add AI metadata
         legacy_review['generation_method'] = 'template_fallback'
@@ -412,15 +715,18 @@ Always respond in valid JSON format."""
         
         return legacy_review
 
+def _product_images(product: Dict) -> Tuple[List[str], List[Optional[str]]]:
+    """Image URLs of a Shopify product and their updated_at versions"""
+    images = [img for img in product.get('images') or [] if img.get('src')]
+    return [img['src'] for img in images], [img.get('updated_at') for img in images]
+
 def create_ai_review_request(product: Dict, target_language: str = 'en', 
                            target_rating: int = 5, review_style: str = 'authentic',
                            customer_persona: str = 'millennial') -> ReviewRequest:
     """Create an AI review request from product data"""
     
     # Extract product images
-    images = []
-    if product.get('images'):
-        images = [img.get('src', '') for img in product['images'] if img.get('src')]
+    images, image_versions = _product_images(product)
     
     # Clean product description
     description = product.get('body_html', '')
@@ -434,6 +740,7 @@ def create_ai_review_request(product: Dict, target_language: str = 'en',
         product_title=product.get('title', ''),
         product_description=description,
         product_images=images,
+        product_image_versions=image_versions,
         target_language=target_language,
         target_rating=target_rating,
         review_style=review_style,
@@ -441,42 +748,34 @@ def create_ai_review_request(product: Dict, target_language: str = 'en',
         market_context={}
     )
 
-# Integration function for existing codebase
-def generate_ai_enhanced_review(product: Dict, existing_reviews: int = 0) -> Dict:
-    """
-    Enhanced review generation function that integrates with existing codebase
-    Falls back to template-based generation if AI is unavailable
-    """
+def draw_review_request(product: Dict, rng=random) -> ReviewRequest:
+    """AI review request with the language, persona, rating and style drawn at random"""
     
     # Determine target language and persona based on existing logic
     languages = ['en', 'de', 'es', 'fr', 'it', 'pl', 'cs']
-    target_language = random.choice(languages)
+    target_language = rng.choice(languages)
     
     personas = ['gen_z', 'millennial', 'gen_x']
     weights = [0.4, 0.4, 0.2]  # Bias towards younger demographics
-    customer_persona = random.choices(personas, weights=weights)[0]
+    customer_persona = rng.choices(personas, weights=weights)[0]
     
     # Rating distribution (matching existing logic)
     rating_distribution = [5, 5, 5, 5, 5, 5, 4, 4, 4, 3]
-    target_rating = random.choice(rating_distribution)
+    target_rating = rng.choice(rating_distribution)
     
     review_styles = ['authentic', 'enthusiastic', 'detailed', 'casual']
-    review_style = random.choice(review_styles)
+    review_style = rng.choice(review_styles)
     
-    # Create AI request
-    ai_request = create_ai_review_request(
+    return create_ai_review_request(
         product=product,
         target_language=target_language,
         target_rating=target_rating,
         review_style=review_style,
         customer_persona=customer_persona
     )
-    
-    # Generate with AI
-    ai_generator = AIReviewGenerator()
-    ai_review = ai_generator.generate_ai_review(ai_request)
-    
-    # Convert to format expected by existing codebase
+
+def to_review_format(ai_review: Dict, request: ReviewRequest) -> Dict:
+    """Convert an AI review to the format expected by existing codebase"""
     return {
         'author': ai_review.get('author_name', 'Anonymous'),
         'email': f"{ai_review.get('author_name', 'user').lower().replace(' ', '')}@example.com",
@@ -486,9 +785,119 @@ def generate_ai_enhanced_review(product: Dict, existing_reviews: int = 0) -> Dic
         'date': ai_review.get('review_date', datetime.now().strftime('%Y-%m-%d')),
         'rating': ai_review.get('rating', 5),
         'verified': 'Yes' if ai_review.get('verified_purchase', True) else 'No',
-        'language': ai_review.get('language', target_language),
+        'language': ai_review.get('language', request.target_language),
         'generation_method': ai_review.get('generation_method', 'ai_enhanced'),
         'ai_quality_score': ai_review.get('ai_quality_score', 0.8),
-        'persona': ai_review.get('persona', customer_persona),
-        'style': ai_review.get('style', review_style)
-    }
\ No newline at end of file
+        'persona': ai_review.get('persona', request.customer_persona),
+        'style': ai_review.get('style', request.review_style)
+    }
+
+# Integration function for existing codebase
+def generate_ai_enhanced_review(product: Dict, existing_reviews: int = 0) -> Dict:
+    """
+    Enhanced review generation function that integrates with existing codebase
+    Falls back to template-based generation if AI is unavailable
+    """
+    request = draw_review_request(product)
+    ai_review = AIReviewGenerator().generate_ai_review(request)
+    return to_review_format(ai_review, request)
+
+def generate_ai_enhanced_reviews(jobs: List[Tuple[Dict, int]],
+                                 reviews_per_call: int = AI_REVIEWS_PER_CALL,
+                                 timeout: Optional[float] = None) -> List[List[Optional[Dict]]]:
+    """
+    generate_ai_enhanced_review() for many reviews at once
+    
+    Generates count reviews for each (product, count) job concurrently, with at
+    most AI_MAX_CONCURRENCY model calls in flight. With reviews_per_call above
+    1, each call asks for up to that many reviews of a product at once.
+    Reviews are returned per job in order; a review whose generation raised
+    or didn't finish within timeout seconds is None.
+    """
+    return submit_ai_enhanced_reviews(jobs, reviews_per_call, timeout).result()
+
+def submit_ai_enhanced_reviews(jobs: List[Tuple[Dict, int]],
+                               reviews_per_call: int = AI_REVIEWS_PER_CALL,
+                               timeout: Optional[float] = None) -> concurrent.futures.Future:
+    """
+    Start generate_ai_enhanced_reviews() on the client pool without waiting for it
+    
+    Model calls still running after timeout seconds are cancelled and their
+    reviews are None; cancelling the returned future cancels all of them.
+    """
+    generator = AIReviewGenerator()
+    reviews_per_call = max(1, reviews_per_call)
+    requests_by_job = [[draw_review_request(product) for _ in range(count)] for product, count in jobs]
+    chunks = [
+        requests[start:start + reviews_per_call]
+        for requests in requests_by_job for start in range(0, len(requests), reviews_per_call)
+    ]
+    
+    async def generate_all():
+        tasks = [asyncio.ensure_future(generator.generate_ai_reviews_async(chunk)) for chunk in chunks]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Calls past the timeout, or all of them when the caller gave up
+            for task in tasks:
+                task.cancel()
+        
+        results = []
+        for chunk, task in zip(chunks, tasks):
+            if not task.done() or task.cancelled():
+                chunk_reviews = [None] * len(chunk)
+            elif task.exception() is not None:
+                print(f"AI generation error: {str(task.exception())}")
+                chunk_reviews = [None] * len(chunk)
+            else:
+                chunk_reviews = task.result()
+            results.extend(chunk_reviews)
+        
+        results = iter(results)
+        reviews = []
+        for requests in requests_by_job:
+            job_reviews = []
+            for request in requests:
+                ai_review = next(results)
+                job_reviews.append(to_review_format(ai_review, request) if ai_review is not None else None)
+            reviews.append(job_reviews)
+        return reviews
+    
+    return generator.pool.submit(generate_all())
+
+def pre_analyze_catalog_images(products: List[Dict], all_images: bool = False) -> Dict:
+    """
+    Analyze product images ahead of review generation
+    
+    Fills the image analysis cache with the first image of every product (the
+    one generation analyzes), or all their images, concurrently. Images the
+    cache already has are skipped.
+    
+    Returns:
+        Counts of images found, already cached, analyzed and failed
+    """
+    images = {}
+    for product in products:
+        urls, versions = _product_images(product)
+        pairs = list(zip(urls, versions))
+        for url, version in (pairs if all_images else pairs[:1]):
+            images[image_cache_key(url, version)] = (url, version)
+    
+    cache = get_image_analysis_cache()
+    missing = [(url, version) for url, version in images.values() if cache.get(url, version) is None]
+    summary = {'images': len(images), 'cached': len(images) - len(missing), 'analyzed': 0, 'failed': 0}
+    if not missing:
+        return summary
+    
+    generator = AIReviewGenerator()
+    if not generator.pool.api_key:
+        summary['failed'] = len(missing)
+        return summary
+    
+    async def analyze_all():
+        return await asyncio.gather(*[generator._analyze_image(url, version) for url, version in missing])
+    
+    for _, analyzed in generator.pool.run(analyze_all()):
+        summary['analyzed' if analyzed else 'failed'] += 1
+    return summary
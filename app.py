@@ -8,10 +8,9 @@ import hmac
 import hashlib
 import base64
 from urllib.parse import urlparse, parse_qs
-from flask import Flask, request, redirect, session, render_template, jsonify, send_file
+from flask import Flask, request, redirect, session, render_template, jsonify, send_file, Response, stream_with_context
 import requests
 from datetime import datetime, timedelta
-import csv
 import random
 from review_distribution import get_natural_review_count, get_age_based_review_count, generate_bulk_review_distribution
 from dotenv import load_dotenv
@@ -597,7 +596,7 @@ def generate_reviews(product_id):
         
         # Generate reviews using the advanced algorithm
         start_time = datetime.now()
-        reviews = generate_advanced_reviews(product, review_count)
+        reviews = generate_advanced_reviews(product, review_count, seed=data.get('seed'))
         generation_time = (datetime.now() - start_time).total_seconds() * 1000  # Convert to milliseconds
         
         # Log analytics data
@@ -618,6 +617,9 @@ def generate_reviews(product_id):
                         'review_id': f"{product_id}_{i}"
                     }
                 )
+            
+            from review_generator import log_quality_gate_metrics
+            log_quality_gate_metrics(dashboard)
         except Exception as e:
             print(f"Analytics logging failed: {str(e)}")
         
@@ -666,17 +668,22 @@ def generate_reviews(product_id):
         return jsonify({'error': str(e)}), 500
 
 # Review Generation Logic (ported from old_review.py)
-def generate_advanced_reviews(product, count=5):
+def generate_advanced_reviews(product, count=5, seed=None):
     """Generate sophisticated reviews using the original algorithm"""
     # Import review generation components
-    from review_generator import generate_review
+    from review_generator import generate_reviews_batch, make_rng
+    
+    # Each product gets its own random stream, derived from the job seed if one was given
+    rng = make_rng(seed, product['id'])
     
+    # Product analysis is shared across the whole batch
+    return format_review_rows(product, generate_reviews_batch(product, count, rng=rng))
+
+def format_review_rows(product, generated_reviews):
+    """Turn generated reviews into CSV rows for a product"""
     reviews = []
     
-    for i in range(count):
-        # Generate review using the new comprehensive function
-        review_data = generate_review(product, existing_reviews=i)
-        
+    for review_data in generated_reviews:
         reviews.append({
             'product_id': str(product['id']),
             'product_handle': product['handle'],
@@ -767,18 +774,23 @@ def save_review_tracking(data):
     with open('review_tracking.json', 'w') as f:
         json.dump(data, f, indent=2)
 
-def save_reviews_csv(reviews, product_id):
+def save_reviews_csv(reviews, product_id, compress=False):
     """Save reviews to CSV file"""
-    filename = f'reviews_{product_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-    os.makedirs('exports', exist_ok=True)
+    from csv_export import save_csv
     
-    with open(f'exports/{filename}', 'w', newline='', encoding='utf-8') as f:
-        if reviews:
-            writer = csv.DictWriter(f, fieldnames=reviews[0].keys())
-            writer.writeheader()
-            writer.writerows(reviews)
+    filename = f'reviews_{product_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return save_csv(reviews, filename, compress=compress)
+
+def update_review_tracking_counts(product_review_counts):
+    """Add newly generated review counts per product to the review tracking file"""
+    review_tracking = load_review_tracking()
     
-    return filename
+    for product_id, count in product_review_counts.items():
+        if product_id not in review_tracking:
+            review_tracking[product_id] = {'count': 0}
+        review_tracking[product_id]['count'] += count
+        review_tracking[product_id]['last_generated'] = datetime.now().isoformat()
+    save_review_tracking(review_tracking)
 
 def post_reviews_to_klaviyo(reviews):
     """Klaviyo Reviews integration - CSV workflow only (API is read-only)"""
@@ -1171,9 +1183,18 @@ def generate_bulk_reviews():
         post_to_reviews_io = data.get('post_to_reviews_io', False)
         post_to_klaviyo = data.get('post_to_klaviyo', False)
         
+        # Optional job seed for reproducible output; each product gets a stream derived from it
+        job_seed = data.get('seed')
+        
         if not product_ids:
             return jsonify({'error': 'No products specified'}), 400
         
+        from bulk_generation import iter_generate_bulk, requested_worker_count
+        try:
+            workers = requested_worker_count(data.get('workers'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         all_reviews = []
         success_count = 0
         error_count = 0
@@ -1204,67 +1225,82 @@ def generate_bulk_reviews():
         else:
             review_distribution = {}
         
-        # Now generate reviews for each product
+        # Determine review count for each fetched product
+        jobs = []
+        products_by_id = {str(product['id']): product for product in products}
         for product_id in product_ids:
-            try:
-                # Fetch product details
-                url = f"https://{shop}/admin/api/2024-01/products/{product_id}.json"
-                response = requests.get(url, headers=headers)
-                
-                if response.status_code != 200:
-                    errors.append(f"Product {product_id}: Failed to fetch product details")
+            product = products_by_id.get(str(product_id))
+            if product is None:
+                errors.append(f"Product {product_id}: Failed to fetch product details")
+                error_count += 1
+                continue
+            
+            if use_variable_count and str(product_id) in review_distribution:
+                # Use smart distribution
+                product_review_count = review_distribution[str(product_id)]
+            elif use_variable_count:
+                # Fallback to natural distribution
+                product_review_count = get_natural_review_count(min_reviews, max_reviews)
+            else:
+                product_review_count = fixed_count
+            
+            jobs.append((product, product_review_count))
+        
+        # Generate reviews for all products, across worker processes if configured
+        from csv_export import ReviewCSVWriter, iter_csv_chunks
+        
+        results = iter_generate_bulk(jobs, workers=workers, seed=job_seed)
+        compress = data.get('compress', False)
+        filename = f'bulk_reviews_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        product_review_counts = {}
+        
+        def product_rows():
+            """CSV rows per product, recording counts and errors as products finish"""
+            nonlocal success_count, error_count
+            for result in results:
+                product = result['product']
+                if result['error']:
+                    errors.append(f"Product {product['id']}: {result['error']}")
                     error_count += 1
                     continue
                 
-                product = response.json()['product']
-                
-                # Determine review count for this product
-                if use_variable_count and str(product_id) in review_distribution:
-                    # Use smart distribution
-                    product_review_count = review_distribution[str(product_id)]
-                elif use_variable_count:
-                    # Fallback to natural distribution
-                    product_review_count = get_natural_review_count(min_reviews, max_reviews)
-                else:
-                    product_review_count = fixed_count
-                
-                # Generate reviews for this product
-                product_reviews = generate_advanced_reviews(product, product_review_count)
-                all_reviews.extend(product_reviews)
+                rows = format_review_rows(product, result['reviews'])
+                pid = str(product['id'])
+                product_review_counts[pid] = product_review_counts.get(pid, 0) + len(rows)
                 success_count += 1
-                
-            except Exception as e:
-                errors.append(f"Product {product_id}: {str(e)}")
-                error_count += 1
-        
-        if not all_reviews:
-            return jsonify({'error': 'No reviews were generated'}), 500
+                yield rows
         
-        # Save all reviews to one combined CSV file
-        filename = f'bulk_reviews_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        os.makedirs('exports', exist_ok=True)
+        if data.get('stream', False):
+            # Send the CSV while it is generated; tracking is updated once the last product is done
+            def stream():
+                yield from iter_csv_chunks(product_rows(), compress=compress)
+                update_review_tracking_counts(product_review_counts)
+            
+            if compress:
+                filename += '.gz'
+            return Response(
+                stream_with_context(stream()),
+                mimetype='application/gzip' if compress else 'text/csv',
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
         
-        with open(f'exports/{filename}', 'w', newline='', encoding='utf-8') as f:
-            if all_reviews:
-                writer = csv.DictWriter(f, fieldnames=all_reviews[0].keys())
-                writer.writeheader()
-                writer.writerows(all_reviews)
+        # Write each product's reviews as soon as they are generated; rows are only
+        # kept in memory when they still have to be posted to a platform
+        keep_rows = post_to_reviews_io or post_to_klaviyo
+        with ReviewCSVWriter(filename, compress=compress) as writer:
+            for rows in product_rows():
+                writer.write_rows(rows)
+                if keep_rows:
+                    all_reviews.extend(rows)
+        filename = writer.filename
+        total_reviews = writer.rows_written
+        
+        if not total_reviews:
+            os.remove(writer.path)
+            return jsonify({'error': 'No reviews were generated'}), 500
         
         # Update tracking for all products
-        review_tracking = load_review_tracking()
-        
-        # Count reviews per product for accurate tracking
-        product_review_counts = {}
-        for review in all_reviews:
-            pid = review['product_id']
-            product_review_counts[pid] = product_review_counts.get(pid, 0) + 1
-        
-        for product_id, count in product_review_counts.items():
-            if product_id not in review_tracking:
-                review_tracking[product_id] = {'count': 0}
-            review_tracking[product_id]['count'] += count
-            review_tracking[product_id]['last_generated'] = datetime.now().isoformat()
-        save_review_tracking(review_tracking)
+        update_review_tracking_counts(product_review_counts)
         
         # Handle API posting if requested
         reviews_io_result = None
@@ -1280,7 +1316,7 @@ def generate_bulk_reviews():
         response_data = {
             'success': True,
             'filename': filename,
-            'total_reviews': len(all_reviews),
+            'total_reviews': total_reviews,
             'success_count': success_count,
             'error_count': error_count,
             'errors': errors
@@ -1325,7 +1361,7 @@ def import_reviews():
 @app.route('/api/generate-and-import/<product_id>', methods=['POST'])
 def generate_and_import(product_id):
     """Generate reviews and automatically import them"""
-    from review_generator import generate_review
+    from review_generator import generate_reviews_batch, make_rng
     from automatic_import import import_reviews_automatically
     
     try:
@@ -1358,10 +1394,7 @@ def generate_and_import(product_id):
         product = response.json()['product']
         
         # Generate reviews
-        reviews = []
-        for i in range(review_count):
-            review_data = generate_review(product, existing_reviews=i)
-            reviews.append(review_data)
+        reviews = generate_reviews_batch(product, review_count, rng=make_rng(data.get('seed'), product['id']))
         
         # Save as CSV first
         csv_filename = save_reviews_csv(reviews, product_id)
@@ -1433,7 +1466,7 @@ def generate_and_import(product_id):
 @app.route('/api/generate-bulk-and-import', methods=['POST'])
 def generate_bulk_and_import():
     """Generate reviews for multiple products and import automatically"""
-    from review_generator import generate_review
+    from review_generator import generate_reviews_batch, make_rng
     from automatic_import import import_reviews_automatically
     
     try:
@@ -1472,9 +1505,9 @@ def generate_bulk_and_import():
                 product = response.json()['product']
                 
                 # Generate reviews for this product
-                for i in range(review_count):
-                    review_data = generate_review(product, existing_reviews=i)
-                    all_reviews.append(review_data)
+                all_reviews.extend(generate_reviews_batch(
+                    product, review_count, rng=make_rng(data.get('seed'), product['id'])
+                ))
         
         if not all_reviews:
             return jsonify({'error': 'No reviews could be generated'}), 400
@@ -1493,6 +1526,46 @@ def generate_bulk_and_import():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/images/pre-analyze', methods=['POST'])
+def pre_analyze_images():
+    """Analyze product images ahead of AI review generation, filling the image analysis cache"""
+    from ai_review_generator import pre_analyze_catalog_images
+    
+    try:
+        data = request.json
+        product_ids = data.get('product_ids', [])
+        
+        if not product_ids:
+            return jsonify({'error': 'No product IDs provided'}), 400
+        
+        shop = session.get('shop')
+        access_token = session.get('access_token')
+        
+        # Fallback for testing
+        if not shop:
+            shop = request.args.get('shop', 'fugafashion.myshopify.com')
+        
+        # Temporary: For fugafashion, use the existing access token
+        if shop == 'fugafashion.myshopify.com' and not access_token:
+            access_token = os.environ.get('SHOPIFY_ACCESS_TOKEN')
+        
+        if not access_token:
+            return jsonify({'error': 'Not authenticated'}), 401
+        
+        products = []
+        headers = {'X-Shopify-Access-Token': access_token}
+        for product_id in product_ids:
+            url = f"https://{shop}/admin/api/2024-01/products/{product_id}.json"
+            response = requests.get(url, headers=headers)
+            if response.status_code == 200:
+                products.append(response.json()['product'])
+        
+        summary = pre_analyze_catalog_images(products, all_images=data.get('all_images', False))
+        return jsonify({'success': True, 'total_products': len(products), **summary})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/import-status')
 def import_status():
     """Get import status for progress tracking"""
@@ -1689,6 +1762,16 @@ def assess_review_quality():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/analytics/scorer-stats')
+def get_scorer_timings():
+    """Construction and scoring timings of this worker's quality scorer"""
+    try:
+        from ai_quality_scorer import get_scorer_stats
+        
+        return jsonify(get_scorer_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/analytics/sample-data', methods=['POST'])
 def create_sample_data():
     """Create sample analytics data for testing"""
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Generation and Scoring Benchmarks
+Offline throughput and latency numbers for the review hot paths
+
+Runs against synthetic Shopify products only; nothing talks to Shopify,
+Klaviyo or OpenAI, phrase usage goes to an in-memory tracker and reviews go
+to a scratch similarity index, so the tracking file and the review index are
+left alone. Results are written as JSON so a baseline from
+one commit can be compared with another:
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import review_generator
+from phrase_tracking import PhraseTracker
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+DEFAULT_SEED = 1234
+DEFAULT_ITERATIONS = 300
+# Slowdown (relative p50 or throughput change) reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+# Product ages in days: new, recent, regular and established products
+PRODUCT_AGES = (5, 60, 200, 800)
+
+SHORT_BODY = '<p>{term} in {color}.</p>'
+LONG_BODY = (
+    '<div><h2>{title}</h2><p>Our {term} is made from premium {material} with {feature} '
+    'details and a {fit} fit. Perfect for concerts, festivals and everyday wear.</p>'
+    '<ul><li>Material: {material}</li><li>Color: {color}</li><li>Care: hand wash cold</li></ul>'
+    '<p>Designed for the alternative scene, this piece pairs well with boots, chains and '
+    'layered accessories. Model is 175 cm and wears size M.</p></div>'
+)
+MATERIALS = ('cotton', 'polyester', 'leather', 'velvet', 'mesh', 'lace')
+FEATURES = ('zipper', 'pockets', 'buckles', 'chains', 'hood')
+COLORS = ('black', 'red', 'purple', 'white', 'grey')
+FITS = ('oversized', 'fitted', 'stretchy', 'comfortable')
+
+def build_products(seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Synthetic Shopify products covering every category, both body lengths and all ages"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    categories = list(review_generator.PRODUCT_CATEGORY_KEYWORDS) + ['general']
+    products = []
+    for category in categories:
+        keywords = review_generator.PRODUCT_CATEGORY_KEYWORDS.get(category, ('item',))
+        for age in PRODUCT_AGES:
+            for body in (SHORT_BODY, LONG_BODY):
+                term = rng.choice(keywords)
+                title = f"{rng.choice(('Dark', 'Classic', 'Basic'))} {term.title()}"
+                fields = {
+                    'title': title, 'term': term, 'color': rng.choice(COLORS),
+                    'material': rng.choice(MATERIALS), 'feature': rng.choice(FEATURES),
+                    'fit': rng.choice(FITS)
+                }
+                products.append({
+                    'id': len(products) + 1,
+                    'title': title,
+                    'handle': title.lower().replace(' ', '-'),
+                    'body_html': body.format(**fields),
+                    'product_type': category,
+                    'created_at': (now - timedelta(days=age)).isoformat() + 'Z'
+                })
+    return products
+
+def build_reviews(products: Sequence[Dict], seed: int = DEFAULT_SEED) -> List[Dict]:
+    """One template review per product, used as input for the scoring benchmarks"""
+    rng = random.Random(seed)
+    with _isolated_generation():
+        return [
+            review_generator.generate_review(product, use_ai=False, rng=rng)
+            for product in products
+        ]
+
+@contextlib.contextmanager
+def _isolated_generation():
+    """Fresh in-memory phrase tracker and no regeneration chatter on stdout"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with review_generator.use_phrase_tracker(PhraseTracker()):
+            yield
+
+@contextlib.contextmanager
+def _scratch_similarity_index(index_path: Optional[str] = None):
+    """Record and look up reviews in index_path, or in a temporary database without one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(index_path or os.path.join(tmp, 'review_similarity.db'))
+        try:
+            with use_similarity_index(index):
+                yield index
+        finally:
+            index.close()
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def measure(func: Callable, args_list: Sequence[tuple], iterations: int,
+            items_per_call: int = 1) -> Dict:
+    """Time func over args_list (cycled) and summarize throughput and latency"""
+    func(*args_list[0])  # Warm-up call, not timed
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        args = args_list[i % len(args_list)]
+        call_started = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'calls': iterations,
+        'items': iterations * items_per_call,
+        'total_seconds': round(total, 6),
+        'items_per_second': round(iterations * items_per_call / total, 2) if total else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 4),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 4)
+    }
+
+def _load_scorer():
+    """The quality scorer module, or None without its ML dependencies"""
+    try:
+        import ai_quality_scorer
+    except ImportError:
+        return None
+    return ai_quality_scorer
+
+def run_benchmarks(iterations: int = DEFAULT_ITERATIONS, seed: int = DEFAULT_SEED,
+                   batch_size: int = 10, index_path: Optional[str] = None) -> Dict:
+    """Run every benchmark and return the results document
+
+    Generated reviews go to a scratch similarity index at index_path, a
+    temporary database by default.
+    """
+    products = build_products(seed)
+
+    with _scratch_similarity_index(index_path):
+        reviews = build_reviews(products, seed)
+        results = {}
+
+        with _isolated_generation():
+            rng = random.Random(seed)
+            results['generate_review'] = measure(
+                lambda product: review_generator.generate_review(product, use_ai=False, rng=rng),
+                [(product,) for product in products], iterations
+            )
+            results['extract_product_features'] = measure(
+                review_generator.extract_product_features,
+                [(product,) for product in products], iterations
+            )
+            analyses = [review_generator.analyze_product(product) for product in products]
+            results['generate_review_content'] = measure(
+                lambda product, analysis, rating, language: review_generator.generate_review_content(
+                    product, rating, language, product_analysis=analysis, rng=rng
+                ),
+                [
+                    (product, analysis, review['rating'], review['language'])
+                    for product, analysis, review in zip(products, analyses, reviews)
+                ],
+                iterations
+            )
+
+        scorer_module = _load_scorer()
+        if scorer_module is None:
+            skipped = {'skipped': 'ai_quality_scorer dependencies not installed'}
+            results['assess_review_quality'] = dict(skipped)
+            results['batch_assess_reviews'] = dict(skipped)
+        else:
+            scorer = scorer_module.get_shared_scorer()
+            results['assess_review_quality'] = measure(
+                scorer.assess_review_quality,
+                [(review, product) for review, product in zip(reviews, products)],
+                iterations
+            )
+            batches = [
+                (reviews[start:start + batch_size], products[start])
+                for start in range(0, len(reviews) - batch_size + 1, batch_size)
+            ]
+            results['batch_assess_reviews'] = measure(
+                scorer_module.batch_assess_reviews, batches,
+                max(1, iterations // batch_size), items_per_call=batch_size
+            )
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'iterations': iterations,
+            'products': len(products)
+        },
+        'results': results
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare_results(baseline: Dict, current: Dict,
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict]:
+    """Per-benchmark p50 and throughput changes against a baseline"""
+    comparison = []
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or 'skipped' in before or 'skipped' in result:
+            continue
+        p50_change = result['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        rate_change = (result['items_per_second'] / before['items_per_second'] - 1
+                       if before['items_per_second'] else 0.0)
+        comparison.append({
+            'benchmark': name,
+            'p50_change': round(p50_change, 4),
+            'throughput_change': round(rate_change, 4),
+            'regression': p50_change > threshold or rate_change < -threshold
+        })
+    return comparison
+
+def print_results(document: Dict, comparison: Optional[List[Dict]] = None):
+    """Human-readable summary of a results document"""
+    print(f"=== BENCHMARKS ({document['meta']['iterations']} iterations, "
+          f"commit {document['meta']['commit'] or 'unknown'}) ===")
+    for name, result in document['results'].items():
+        if 'skipped' in result:
+            print(f"   {name:26} skipped: {result['skipped']}")
+            continue
+        print(f"   {name:26} {result['items_per_second']:>10.1f}/s   "
+              f"p50 {result['p50_ms']:.3f} ms   p95 {result['p95_ms']:.3f} ms   "
+              f"p99 {result['p99_ms']:.3f} ms")
+    for entry in comparison or []:
+        flag = '❌ regression' if entry['regression'] else '✅'
+        print(f"   {entry['benchmark']:26} p50 {entry['p50_change']:+.1%}   "
+              f"throughput {entry['throughput_change']:+.1%}   {flag}")
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline review generation and scoring benchmarks')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON to compare the results with')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--index-db', help='Scratch similarity index database (default: a temporary one)')
+    args = parser.parse_args(argv)
+
+    document = run_benchmarks(args.iterations, args.seed, index_path=args.index_db)
+    comparison = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(json.load(f), document, args.threshold)
+        document['comparison'] = {'baseline': args.compare, 'results': comparison}
+
+    print_results(document, comparison)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    return 1 if comparison and any(entry['regression'] for entry in comparison) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Parallel Bulk Review Generation
+Spreads per-product review generation across a pool of worker processes
+
+With one worker, products are generated in order against the live phrase
+tracker, so products in a job don't reuse each other's phrases. With
+several, each product is sent the phrase usage at the time it is
+dispatched, and its usage deltas are applied to the main tracker (in
+product order) before the next product goes out: only the products being
+generated at the same time can draw the same phrases. Each product has its
+own random stream derived from the job seed, so a seeded job gives the
+same output from the same tracking state and worker count. A product's
+reviews are added to the similarity index as soon as it is done.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import review_generator
+from phrase_tracking import PhraseDeltaLog, PhraseTracker
+
+# Worker processes for bulk generation; 0 means one per CPU core
+BULK_GENERATION_WORKERS = int(os.environ.get('BULK_GENERATION_WORKERS', '1'))
+
+def resolve_worker_count(workers: Optional[int] = None) -> int:
+    """Number of worker processes to use, falling back to BULK_GENERATION_WORKERS"""
+    if workers is None:
+        workers = BULK_GENERATION_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+def requested_worker_count(requested) -> Optional[int]:
+    """
+    Worker count asked for by a client, clamped to 1..resolve_worker_count()
+
+    None keeps the configured count. Raises ValueError for anything but an
+    integer, so a request can't start more processes than configured.
+    """
+    if requested is None:
+        return None
+    if isinstance(requested, bool) or not isinstance(requested, int):
+        raise ValueError('workers must be an integer')
+    return min(max(requested, 1), resolve_worker_count())
+
+def _init_worker():
+    """Build this process's quality scorer once"""
+    review_generator._get_quality_scorer()
+
+def _generate_product(product: Dict, count: int, seed, use_ai: bool,
+                      used_phrases: Dict[str, List[str]]) -> Tuple[List[Dict], list, Optional[str]]:
+    """Generate one product's reviews in a worker against the phrase usage it was sent, recording deltas"""
+    deltas = PhraseDeltaLog()
+    tracker = PhraseTracker(used_phrases, deltas)
+    try:
+        with review_generator.use_phrase_tracker(tracker):
+            reviews = review_generator.generate_reviews_batch(
+                product, count, use_ai=use_ai, rng=review_generator.make_rng(seed, product.get('id')),
+                record=False
+            )
+    except Exception as e:
+        return [], [], str(e)
+    return reviews, deltas.entries, None
+
+def _mp_context():
+    """Prefer fork so workers start with the template corpus already imported"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def iter_generate_bulk(jobs: Sequence[Tuple[Dict, int]], workers: Optional[int] = None,
+                       seed=None, use_ai: bool = True) -> Iterator[Dict]:
+    """
+    Generate reviews for many products, yielding each product's result as soon as it is ready
+
+    Results come in job order. Each product's reviews are added to the
+    similarity index before its result is yielded, so memory use doesn't
+    grow with the number of products.
+
+    Args:
+        jobs: (product, review count) pairs
+        workers: Worker processes; None uses BULK_GENERATION_WORKERS, 0 one per core
+        seed: Job seed for reproducible output; None for unseeded streams
+        use_ai: Whether to attempt AI generation
+
+    Yields:
+        One dict per job with 'product', 'reviews' and 'error'
+    """
+    if not jobs:
+        return
+
+    workers = min(resolve_worker_count(workers), len(jobs))
+    tracker = review_generator.get_phrase_tracker()
+
+    try:
+        if workers <= 1:
+            for product, count in jobs:
+                try:
+                    # Each review goes to the similarity index as soon as it is generated
+                    reviews = review_generator.generate_reviews_batch(
+                        product, count, use_ai=use_ai, rng=review_generator.make_rng(seed, product.get('id'))
+                    )
+                    error = None
+                except Exception as e:
+                    reviews, error = [], str(e)
+                yield {'product': product, 'reviews': reviews, 'error': error}
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(), initializer=_init_worker)
+            pending = deque()
+            remaining = iter(jobs)
+
+            def dispatch():
+                job = next(remaining, None)
+                if job is not None:
+                    product, count = job
+                    future = pool.submit(_generate_product, product, count, seed, use_ai, tracker.to_dict())
+                    pending.append((product, future))
+
+            try:
+                for _ in range(workers):
+                    dispatch()
+                while pending:
+                    product, future = pending.popleft()
+                    reviews, product_deltas, error = future.result()
+                    tracker.apply_deltas(product_deltas)
+                    dispatch()
+                    review_generator._record_review_texts([review.get('content', '') for review in reviews])
+                    yield {'product': product, 'reviews': reviews, 'error': error}
+            finally:
+                # Don't generate products nobody will read when the consumer stopped early
+                pool.shutdown(cancel_futures=True)
+    finally:
+        tracker.flush()
+
+def generate_bulk(jobs: Sequence[Tuple[Dict, int]], workers: Optional[int] = None,
+                  seed=None, use_ai: bool = True) -> List[Dict]:
+    """Generate reviews for many products, see iter_generate_bulk()"""
+    return list(iter_generate_bulk(jobs, workers, seed, use_ai))
@@ -0,0 +1,105 @@
+"""
+Streaming CSV Export
+Writes review rows to CSV as they are generated, optionally gzip-compressed
+
+Rows are written product by product and never collected, so memory use
+doesn't grow with the number of exported reviews. The same encoder backs
+both the on-disk writer and chunked HTTP responses.
+"""
+import csv
+import io
+import os
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+EXPORT_DIR = 'exports'
+
+class CSVRowEncoder:
+    """Incrementally encodes dict rows into CSV bytes, gzip-compressed if requested"""
+
+    def __init__(self, fieldnames: Optional[List[str]] = None, compress: bool = False):
+        self.fieldnames = fieldnames
+        self.rows_written = 0
+        self._buffer = io.StringIO()
+        self._writer = None
+        # wbits=31 writes a gzip header and trailer, so the output is a regular .gz file
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def encode(self, rows: Iterable[Dict]) -> bytes:
+        """Encode a batch of rows, writing the header before the first one"""
+        for row in rows:
+            if self._writer is None:
+                if self.fieldnames is None:
+                    self.fieldnames = list(row.keys())
+                self._writer = csv.DictWriter(self._buffer, fieldnames=self.fieldnames)
+                self._writer.writeheader()
+            self._writer.writerow(row)
+            self.rows_written += 1
+
+        data = self._buffer.getvalue().encode('utf-8')
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        return data
+
+    def finish(self) -> bytes:
+        """Bytes still held back by the compressor"""
+        if self._compressor is None:
+            return b''
+        data = self._compressor.flush()
+        self._compressor = None
+        return data
+
+class ReviewCSVWriter:
+    """CSV file in the exports folder that review rows are appended to as they arrive"""
+
+    def __init__(self, filename: str, compress: bool = False,
+                 fieldnames: Optional[List[str]] = None, export_dir: str = EXPORT_DIR):
+        if compress and not filename.endswith('.gz'):
+            filename += '.gz'
+        self.filename = filename
+        self.path = os.path.join(export_dir, filename)
+        self._encoder = CSVRowEncoder(fieldnames, compress)
+        os.makedirs(export_dir, exist_ok=True)
+        self._file = open(self.path, 'wb')
+
+    @property
+    def rows_written(self) -> int:
+        return self._encoder.rows_written
+
+    def write_rows(self, rows: Iterable[Dict]):
+        """Append rows and push them to disk"""
+        self._file.write(self._encoder.encode(rows))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(self._encoder.finish())
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'ReviewCSVWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def iter_csv_chunks(row_batches: Iterable[Iterable[Dict]], compress: bool = False,
+                    fieldnames: Optional[List[str]] = None) -> Iterator[bytes]:
+    """Yield CSV bytes batch by batch, for chunked HTTP responses"""
+    encoder = CSVRowEncoder(fieldnames, compress)
+    for rows in row_batches:
+        chunk = encoder.encode(rows)
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if tail:
+        yield tail
+
+def save_csv(rows: List[Dict], filename: str, compress: bool = False,
+             export_dir: str = EXPORT_DIR) -> str:
+    """Write a complete list of rows, returning the filename actually used"""
+    with ReviewCSVWriter(filename, compress, export_dir=export_dir) as writer:
+        writer.write_rows(rows)
+    return writer.filename
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI Server
+Local OpenAI-compatible chat completions stub for offline AI load tests
+
+Answers POST /v1/chat/completions the way the AI review generator expects:
+vision requests get a product image analysis, review prompts get review JSON
+(an array for multi-review prompts) written from the template corpus in the
+requested language and rating, and regeneration prompts get plain review
+text. Latency, rate-limit (429) and server error (500) rates are
+configurable, so the real client pool, retries and fallbacks can be load
+tested without an API key or network access:
+
+    python fake_openai_server.py --port 8089 --latency-ms 800 --jitter-ms 400 --error-rate 0.02
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python app.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+from template_corpus import DEFAULT_LANGUAGE, available_languages, language_table
+
+DEFAULT_PORT = 8089
+VISION_MODEL_PREFIX = 'gpt-4-vision'
+
+# Prompt lines naming the language and rating of the requested reviews
+MULTI_REVIEW_LINE = re.compile(r'^\s*\d+\.\s*Language:\s*([\w-]+);\s*Rating:\s*(\d)/5', re.MULTILINE)
+SINGLE_LANGUAGE_LINE = re.compile(r'^\s*-\s*Language:\s*([\w-]+)', re.MULTILINE)
+SINGLE_RATING_LINE = re.compile(r'^\s*-\s*Rating:\s*(\d)/5', re.MULTILINE)
+FALLBACK_LANGUAGE_LINE = re.compile(r'^\s*Language:\s*([\w-]+)', re.MULTILINE)
+FALLBACK_RATING = re.compile(r'Write an? (\d)-star review')
+
+IMAGE_ANALYSIS = {
+    'materials': 'soft black velvet with lace trim',
+    'style': 'gothic',
+    'features': ['lace details', 'silver buckles', 'fitted waist'],
+    'demographic': 'alternative fashion fans, 18-35',
+    'quality_indicators': ['even stitching', 'lined bodice'],
+    'selling_points': ['statement look', 'comfortable stretch fabric']
+}
+
+def _corpus_language(language: str) -> str:
+    language = (language or DEFAULT_LANGUAGE).lower()[:2]
+    return language if language in available_languages() else DEFAULT_LANGUAGE
+
+def canned_review(language: str, rating: int, rng=random) -> Dict:
+    """Review JSON in the format the review prompts ask for, written from the language's phrase pack"""
+    language = _corpus_language(language)
+    rating = min(max(int(rating), 1), 5)
+    table = lambda name: language_table(language, name)
+    if rating >= 3:
+        title = rng.choice(table('titles')[rating])
+        phrases = [rng.choice(table('opening_reactions')), rng.choice(table('quality_comments')),
+                   rng.choice(table('fit_comments')), rng.choice(table('usage_scenarios'))]
+    else:
+        title = rng.choice(table('fallback_titles'))
+        phrases = [rng.choice(table('generic_comments')), rng.choice(table('fit_comments'))]
+    ending = rng.choice(table('review_endings')[max(rating, 3)])
+    content = '. '.join(phrase[:1].upper() + phrase[1:] for phrase in phrases) + '. ' + ending
+    names = table('names')
+    return {
+        'title': title,
+        'content': content,
+        'rating': rating,
+        'author_name': f"{rng.choice(names['first'])} {rng.choice(names['last'])[:1]}.",
+        'author_location': rng.choice(table('locations')),
+        'verified_purchase': True,
+        'helpful_votes': rng.randint(0, 12),
+        'key_points': phrases[1:3]
+    }
+
+def _prompt_text(messages: Sequence[Dict]) -> str:
+    """Text of the last user message, including the text parts of a multimodal one"""
+    for message in reversed(messages):
+        if message.get('role') != 'user':
+            continue
+        content = message.get('content')
+        if isinstance(content, list):
+            return '\n'.join(part.get('text', '') for part in content if part.get('type') == 'text')
+        return content or ''
+    return ''
+
+def completion_content(body: Dict, rng=random) -> str:
+    """Assistant message content for a chat completions request body"""
+    messages = body.get('messages') or []
+    has_image = any(
+        isinstance(message.get('content'), list)
+        and any(part.get('type') == 'image_url' for part in message['content'])
+        for message in messages
+    )
+    if has_image or str(body.get('model', '')).startswith(VISION_MODEL_PREFIX):
+        return json.dumps(IMAGE_ANALYSIS)
+
+    prompt = _prompt_text(messages)
+    items = MULTI_REVIEW_LINE.findall(prompt)
+    if items:
+        return json.dumps([canned_review(language, int(rating), rng) for language, rating in items],
+                          ensure_ascii=False)
+
+    language, rating = SINGLE_LANGUAGE_LINE.search(prompt), SINGLE_RATING_LINE.search(prompt)
+    if language and rating:
+        return json.dumps(canned_review(language.group(1), int(rating.group(1)), rng), ensure_ascii=False)
+
+    # Regeneration prompts ask for the review text only
+    language, rating = FALLBACK_LANGUAGE_LINE.search(prompt), FALLBACK_RATING.search(prompt)
+    review = canned_review(language.group(1) if language else DEFAULT_LANGUAGE,
+                           int(rating.group(1)) if rating else 5, rng)
+    return review['content']
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """
+    OpenAI-compatible chat completions server with configurable latency and failures
+
+    Every request waits latency_ms plus up to jitter_ms, then fails with a 429
+    (asking for a retry after retry_after seconds) with probability
+    rate_limit_rate, with a 500 with probability error_rate, or else answers
+    with completion_content().
+    """
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, rate_limit_rate: float = 0.0, error_rate: float = 0.0,
+                 retry_after: float = 0.0, seed: Optional[int] = None):
+        super().__init__((host, port), FakeOpenAIHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.models = Counter()
+        self.statuses = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self) -> 'FakeOpenAIServer':
+        """Serve from a daemon thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'FakeOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw(self) -> tuple:
+        """(delay in seconds, status) of the next response"""
+        with self.lock:
+            delay = (self.latency_ms + self.rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 500
+        return delay, 200
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'requests': sum(self.statuses.values()),
+                'rate_limited': self.statuses[429],
+                'server_errors': self.statuses[500],
+                'by_model': dict(self.models),
+                'max_in_flight': self.max_in_flight
+            }
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.rstrip('/') != '/v1/chat/completions':
+            self._send(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+            return
+        try:
+            body = json.loads(body)
+        except json.JSONDecodeError:
+            self._send(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+            return
+
+        delay, status = server._draw()
+        with server.lock:
+            server.models[body.get('model', '')] += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(delay)
+            with server.lock:
+                server.statuses[status] += 1  # Counted before answering, so clients see up to date stats
+            if status == 429:
+                self._send(429, {'error': {'message': 'Rate limit reached', 'type': 'requests',
+                                           'code': 'rate_limit_exceeded'}},
+                           {'retry-after': str(server.retry_after)})
+            elif status == 500:
+                self._send(500, {'error': {'message': 'The server had an error processing your request',
+                                           'type': 'server_error'}})
+            else:
+                with server.lock:
+                    content = completion_content(body, server.rng)
+                self._send(200, {
+                    'id': f'chatcmpl-fake-{time.monotonic_ns()}', 'object': 'chat.completion',
+                    'created': int(time.time()), 'model': body.get('model', ''),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': content}}],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+                })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Latency and failure options shared with the load test driver"""
+    parser.add_argument('--latency-ms', type=float, default=500.0, help='Base response latency')
+    parser.add_argument('--jitter-ms', type=float, default=250.0, help='Uniform extra latency, up to this much')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 500')
+    parser.add_argument('--retry-after', type=float, default=0.0, help='Retry-After of 429 responses, in seconds')
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible chat completions stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--seed', type=int)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                              args.rate_limit_rate, args.error_rate, args.retry_after, args.seed)
+    print(f"🤖 Fake OpenAI server on {server.base_url}")
+    print(f"   export OPENAI_API_KEY=fake OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(server.get_stats())}")
+
+if __name__ == "__main__":
+    main()
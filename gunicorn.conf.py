@@ -0,0 +1,21 @@
+"""
+Gunicorn Configuration
+Warms up per-worker state so the first requests don't pay for it
+"""
+import os
+
+def post_fork(server, worker):
+    """Build the shared quality scorer in each worker right after fork"""
+    if os.environ.get('QUALITY_SCORER_WARM_UP', 'true').lower() not in ('1', 'true', 'yes'):
+        return
+
+    try:
+        from ai_quality_scorer import warm_up_scorer
+    except ImportError:
+        return  # ML dependencies not installed; review_generator uses basic scoring
+
+    stats = warm_up_scorer()
+    server.log.info(
+        f"Worker {worker.pid}: quality scorer ready "
+        f"(construction {stats['construction_ms']:.1f} ms, first assessment {stats['max_scoring_ms']:.1f} ms)"
+    )
@@ -0,0 +1,160 @@
+"""
+Image Analysis Cache
+Persistent cache of vision-model product image analyses
+
+AI review generation analyzes the first product image for every review,
+although the image hardly ever changes. Analyses are stored in SQLite under
+a hash of the image URL and its version (Shopify's image updated_at), so a
+replaced image is analyzed again while every other review reuses the stored
+result. Entries expire after IMAGE_ANALYSIS_TTL_DAYS, and the least recently
+used ones are evicted beyond IMAGE_ANALYSIS_CACHE_SIZE. Use times are only
+written when they are IMAGE_ANALYSIS_TOUCH_SECONDS old, so cache hits are
+plain reads. The database is shared by all worker processes, like the
+review similarity index.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from phrase_tracking import SQLITE_BUSY_TIMEOUT
+
+IMAGE_ANALYSIS_DB = os.environ.get('IMAGE_ANALYSIS_DB', 'image_analysis_cache.db')
+IMAGE_ANALYSIS_TTL_DAYS = float(os.environ.get('IMAGE_ANALYSIS_TTL_DAYS', '30'))
+IMAGE_ANALYSIS_CACHE_SIZE = int(os.environ.get('IMAGE_ANALYSIS_CACHE_SIZE', '5000'))
+# Granularity of the least recently used order; hits within it don't write
+IMAGE_ANALYSIS_TOUCH_SECONDS = float(os.environ.get('IMAGE_ANALYSIS_TOUCH_SECONDS', '3600'))
+
+def image_cache_key(image_url: str, version: Optional[str] = None) -> str:
+    """Hash of an image URL and version; Shopify URLs also carry a ?v= version of their own"""
+    return hashlib.blake2b(f"{image_url}\n{version or ''}".encode('utf-8'), digest_size=16).hexdigest()
+
+class ImageAnalysisCache:
+    """Persistent, size-bounded image analysis cache with a time to live, shared through SQLite"""
+
+    def __init__(self, db_path: str, ttl_days: float = IMAGE_ANALYSIS_TTL_DAYS,
+                 max_entries: int = IMAGE_ANALYSIS_CACHE_SIZE, busy_timeout: int = SQLITE_BUSY_TIMEOUT,
+                 touch_seconds: float = IMAGE_ANALYSIS_TOUCH_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.touch_seconds = touch_seconds
+        self.busy_timeout = busy_timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    @classmethod
+    def open(cls, db_path: str = IMAGE_ANALYSIS_DB) -> 'ImageAnalysisCache':
+        """Open the shared cache, closing it at exit"""
+        cache = cls(db_path)
+        atexit.register(cache.close)
+        return cache
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened in forked worker processes"""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._local = threading.local()
+            self._pid = pid
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS image_analyses (
+                    cache_key TEXT PRIMARY KEY,
+                    image_url TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    analyzed_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_image_analyses_last_used ON image_analyses (last_used);
+            """)
+            self._local.conn = conn
+        return conn
+
+    def get(self, image_url: str, version: Optional[str] = None) -> Optional[Dict]:
+        """Stored analysis of an image version, None if missing or expired"""
+        key = image_cache_key(image_url, version)
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT analysis, last_used FROM image_analyses WHERE cache_key = ? AND analyzed_at >= ?",
+            (key, now - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        if now - row[1] >= self.touch_seconds:
+            # Only stale use times take the write lock; the WHERE skips entries another worker just touched
+            conn.execute("UPDATE image_analyses SET last_used = ? WHERE cache_key = ? AND last_used <= ?",
+                         (now, key, now - self.touch_seconds))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, image_url: str, analysis: Dict, version: Optional[str] = None):
+        """Store an analysis, then drop expired entries and the least recently used beyond max_entries"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO image_analyses (cache_key, image_url, analysis, analyzed_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (image_cache_key(image_url, version), image_url, json.dumps(analysis, ensure_ascii=False), now, now)
+            )
+            conn.execute("DELETE FROM image_analyses WHERE analyzed_at < ?", (now - self.ttl_seconds,))
+            conn.execute("""
+                DELETE FROM image_analyses WHERE cache_key IN (
+                    SELECT cache_key FROM image_analyses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (max(self.max_entries, 0),))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM image_analyses").fetchone()[0]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self),
+            'max_size': self.max_entries,
+            'ttl_days': self.ttl_seconds / 86400,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+# Process-wide cache, opened on first use
+_shared_cache: Optional[ImageAnalysisCache] = None
+_shared_cache_lock = threading.Lock()
+
+def get_image_analysis_cache() -> ImageAnalysisCache:
+    """Get the process-wide image analysis cache, opening it once"""
+    global _shared_cache
+    cache = _shared_cache
+    if cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ImageAnalysisCache.open(IMAGE_ANALYSIS_DB)
+            cache = _shared_cache
+    return cache
@@ -0,0 +1,129 @@
+"""
+Offline Language Identification
+Character n-gram language identifier trained on the review template corpus
+
+Replaces TextBlob.detect_language(), which called a web service for every
+review. The identifier is a multinomial naive Bayes model over character
+1- to 3-grams of space-padded words. Its log-probabilities are precomputed
+from the phrase packs in review_corpus/ and shipped in
+language_profiles.json; rebuild them after changing the corpus with:
+
+    python language_id.py
+"""
+import json
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'language_profiles.json')
+
+# Languages with full template translations (review_generator.REVIEW_LANGUAGES)
+PROFILE_LANGUAGES = ('de', 'en', 'es', 'fr', 'it', 'pl', 'cs')
+NGRAM_SIZES = (1, 2, 3)
+# Most frequent n-grams kept per language; the profile is the union of them
+NGRAMS_PER_LANGUAGE = 600
+
+# Corpus tables that aren't text in the pack's language
+_NON_TEXT_TABLES = frozenset({'email_domains', 'names', 'locations', 'connectors', 'youth_endings'})
+_PLACEHOLDER_PATTERN = re.compile(r'\{[^}]*\}')
+_WORD_PATTERN = re.compile(r'[^\W\d_]+')
+
+def text_ngrams(text: str) -> List[str]:
+    """Character n-grams of every word, padded with spaces so word edges count"""
+    ngrams = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f' {word} '
+        for size in NGRAM_SIZES:
+            ngrams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return ngrams
+
+def corpus_texts(pack) -> Iterable[str]:
+    """All phrases of a language pack (or a table of it), placeholders removed"""
+    if isinstance(pack, str):
+        yield _PLACEHOLDER_PATTERN.sub(' ', pack)
+    elif isinstance(pack, dict):
+        for key, value in pack.items():
+            if key not in _NON_TEXT_TABLES:
+                yield from corpus_texts(value)
+    elif isinstance(pack, (list, tuple)):
+        for value in pack:
+            yield from corpus_texts(value)
+
+def build_profiles(texts_by_language: Dict[str, Iterable[str]],
+                   ngrams_per_language: int = NGRAMS_PER_LANGUAGE) -> Dict:
+    """Naive Bayes log-probabilities for the most frequent n-grams of each language"""
+    languages = sorted(texts_by_language)
+    counts = {
+        language: Counter(ngram for text in texts for ngram in text_ngrams(text))
+        for language, texts in texts_by_language.items()
+    }
+    vocabulary = sorted({
+        ngram for counter in counts.values()
+        for ngram, _ in counter.most_common(ngrams_per_language)
+    })
+
+    ngrams = {}
+    for language in languages:
+        counter = counts[language]
+        # Add-one smoothing over the shared vocabulary
+        denominator = sum(counter[ngram] for ngram in vocabulary) + len(vocabulary)
+        for ngram in vocabulary:
+            ngrams.setdefault(ngram, []).append(round(math.log((counter[ngram] + 1) / denominator), 4))
+
+    return {'languages': languages, 'ngram_sizes': list(NGRAM_SIZES), 'ngrams': ngrams}
+
+def build_corpus_profiles() -> Dict:
+    """Profiles for PROFILE_LANGUAGES from the template corpus"""
+    from template_corpus import load_language_pack
+    return build_profiles({
+        language: list(corpus_texts(load_language_pack(language))) for language in PROFILE_LANGUAGES
+    })
+
+class LanguageIdentifier:
+    """Classifies text into one of the profile languages without any network access"""
+
+    def __init__(self, profiles: Dict):
+        if tuple(profiles['ngram_sizes']) != NGRAM_SIZES:
+            raise ValueError(f"Profile uses n-gram sizes {profiles['ngram_sizes']}, expected {list(NGRAM_SIZES)}")
+        self.languages: Tuple[str, ...] = tuple(profiles['languages'])
+        self.ngrams: Dict[str, Tuple[float, ...]] = {
+            ngram: tuple(scores) for ngram, scores in profiles['ngrams'].items()
+        }
+
+    @classmethod
+    def load(cls, path: str = PROFILE_PATH) -> 'LanguageIdentifier':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def scores(self, text: str) -> Optional[List[float]]:
+        """Log-likelihood per language, None when the text has no known n-grams"""
+        ngrams = self.ngrams
+        rows = [ngrams[ngram] for ngram in text_ngrams(text) if ngram in ngrams]
+        if not rows:
+            return None
+        return [sum(column) for column in zip(*rows)]
+
+    def detect(self, text: str) -> Optional[str]:
+        """Most likely language code, None if the text can't be classified"""
+        totals = self.scores(text)
+        if totals is None:
+            return None
+        return self.languages[max(range(len(totals)), key=totals.__getitem__)]
+
+@lru_cache(maxsize=1)
+def get_language_identifier() -> LanguageIdentifier:
+    """Process-wide identifier, loaded from the shipped profile on first use"""
+    return LanguageIdentifier.load()
+
+def detect_language(text: str) -> Optional[str]:
+    """Language code of a text, or None if it can't be classified"""
+    return get_language_identifier().detect(text)
+
+if __name__ == "__main__":
+    profiles = build_corpus_profiles()
+    with open(PROFILE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"✅ Wrote {len(profiles['ngrams'])} n-grams for {', '.join(profiles['languages'])} to {PROFILE_PATH}")
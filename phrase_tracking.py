@@ -0,0 +1,621 @@
+"""
+Phrase Usage Tracking
+Constant-time anti-repetition pools for template phrases, keyed by (language, category)
+
+Usage is persisted as a compact JSON snapshot plus an append-only journal of
+deltas. The journal is folded back into the snapshot in a background thread.
+Deployments with several worker processes use SQLitePhraseTracker instead,
+which shares one WAL-mode database between all of them.
+"""
+import atexit
+import json
+import os
+import random
+import sqlite3
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Recycle used phrases once fewer than this share of a pool is still unused
+RECYCLE_THRESHOLD = 0.3
+
+# Journal entries written before a background compaction is started
+COMPACT_AFTER = 5000
+
+# Milliseconds a worker waits for another worker's draw to commit
+SQLITE_BUSY_TIMEOUT = 5000
+
+# Journal operations
+USED = 'u'
+RECYCLED = 'r'
+
+def apply_entries(state: Dict[str, Dict[str, None]], entries) -> int:
+    """Apply [op, category_key, phrase] deltas to per-category ordered used phrases"""
+    count = 0
+    for op, key, phrase in entries:
+        used = state.setdefault(key, {})
+        used.pop(phrase, None)
+        if op == USED:
+            used[phrase] = None  # Re-inserting keeps oldest-first order
+        count += 1
+    return count
+
+class PhrasePool:
+    """Unused/used bookkeeping for one phrase list
+
+    Unused phrase indexes live in a swap-remove array so drawing a random
+    unused phrase is O(1). Used indexes go into a ring buffer in the order
+    they were drawn, so the oldest ones can be recycled in O(1) each.
+    """
+
+    def __init__(self, phrases: Sequence[str], used: Sequence[str] = ()):
+        self.source = phrases
+        # Duplicates in a phrase list share one slot, like the old set-based tracking
+        self.phrases = list(dict.fromkeys(phrases))
+        self._index = {phrase: i for i, phrase in enumerate(self.phrases)}
+        self._available = list(range(len(self.phrases)))
+        self._position = list(range(len(self.phrases)))  # -1 once used
+        self._recent = deque()
+
+        for phrase in used:
+            index = self._index.get(phrase)
+            if index is not None and self._position[index] >= 0:
+                self._take(index)
+
+    def matches(self, phrases: Sequence[str]) -> bool:
+        """Check whether this pool was built for the given phrase list"""
+        return phrases is self.source or list(dict.fromkeys(phrases)) == self.phrases
+
+    @property
+    def available_count(self) -> int:
+        return len(self._available)
+
+    def used_phrases(self) -> List[str]:
+        """Used phrases, oldest first"""
+        return [self.phrases[i] for i in self._recent]
+
+    def draw(self, rng=random) -> str:
+        """Draw a random unused phrase and mark it as used"""
+        if not self.phrases:
+            raise IndexError("Cannot draw from an empty phrase pool")
+
+        self.recycle_if_low()
+
+        if not self._available:
+            # Single-phrase pools can't avoid repetition
+            return self.phrases[rng.randrange(len(self.phrases))]
+
+        index = self._available[rng.randrange(len(self._available))]
+        self._take(index)
+        return self.phrases[index]
+
+    def mark_used(self, phrase: str) -> bool:
+        """Mark a phrase as used without drawing it"""
+        index = self._index.get(phrase)
+        if index is None or self._position[index] < 0:
+            return False
+        self._take(index)
+        return True
+
+    def recycle_if_low(self) -> List[str]:
+        """If we've used many phrases, recycle the oldest half of them"""
+        if len(self._available) < len(self.phrases) * RECYCLE_THRESHOLD:
+            return self.recycle_oldest(len(self._recent) // 2)
+        return []
+
+    def recycle_oldest(self, count: int = 1) -> List[str]:
+        """Return the oldest used phrases to the unused pool"""
+        recycled = []
+        for _ in range(min(count, len(self._recent))):
+            index = self._recent.popleft()
+            self._position[index] = len(self._available)
+            self._available.append(index)
+            recycled.append(self.phrases[index])
+        return recycled
+
+    def _take(self, index: int):
+        """Swap-remove an index from the unused array and record its use"""
+        position = self._position[index]
+        last = self._available.pop()
+        if last != index:
+            self._available[position] = last
+            self._position[last] = position
+        self._position[index] = -1
+        self._recent.append(index)
+
+class PhraseJournal:
+    """Compact JSON snapshot plus an append-only journal of usage deltas
+
+    Each journal line is a JSON array [op, category_key, phrase] where op is
+    USED or RECYCLED. Compaction rotates the journal to a side file, writes a
+    fresh snapshot and then drops the rotated file. Replaying a journal on
+    top of a snapshot that already contains it is harmless, so a crash at
+    any point of a compaction loses nothing.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: Optional[str] = None,
+                 compact_after: int = COMPACT_AFTER):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.rotated_path = self.journal_path + '.old'
+        self.compact_after = compact_after
+        self.entries = 0
+        self._file = None
+
+    def load(self) -> Dict[str, List[str]]:
+        """Read the snapshot and replay any journal entries on top of it"""
+        state = {}
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    state = {key: dict.fromkeys(phrases) for key, phrases in json.load(f).items()}
+            except (OSError, ValueError):
+                state = {}
+
+        self.entries = 0
+        for path in (self.rotated_path, self.journal_path):
+            self.entries += self._replay(path, state)
+
+        return {key: list(phrases) for key, phrases in state.items()}
+
+    def _replay(self, path: str, state: Dict[str, Dict[str, None]]) -> int:
+        """Apply journal entries from a file to a snapshot state"""
+        if not os.path.exists(path):
+            return 0
+
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # Torn write at the end of the file
+        return apply_entries(state, entries)
+
+    def append(self, entries: List[Tuple[str, str, str]]):
+        """Append usage deltas to the journal"""
+        if not entries:
+            return
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._file.write(''.join(
+            json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n' for entry in entries
+        ))
+        self._file.flush()
+        self.entries += len(entries)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.entries >= self.compact_after
+
+    def rotate(self):
+        """Move the current journal aside so new deltas go to a fresh file"""
+        self.close()
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.rotated_path):
+                # An earlier compaction didn't finish; keep both sets of deltas
+                with open(self.rotated_path, 'a', encoding='utf-8') as old, \
+                        open(self.journal_path, 'r', encoding='utf-8') as current:
+                    old.write(current.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+        self.entries = 0
+
+    def write_snapshot(self, data: Dict[str, List[str]]):
+        """Write a compact snapshot atomically and drop the rotated journal"""
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.snapshot_path)
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def flush(self):
+        """Flush buffered journal writes"""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the journal file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove_files(self):
+        """Delete snapshot and journals"""
+        self.close()
+        for path in (self.snapshot_path, self.journal_path, self.rotated_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.entries = 0
+
+class PhraseDeltaLog:
+    """In-memory stand-in for a PhraseJournal that only records deltas
+
+    Used by bulk generation workers, whose deltas are merged into the main
+    tracker with PhraseTracker.apply_deltas() once they are done.
+    """
+
+    needs_compaction = False
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str, str]] = []
+
+    def append(self, entries: List[Tuple[str, str, str]]):
+        self.entries.extend(entries)
+
+    def rotate(self):
+        pass
+
+    def write_snapshot(self, data: Dict[str, List[str]]):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def remove_files(self):
+        self.entries = []
+
+class PhraseTracker:
+    """Registry of phrase pools with optional journal persistence"""
+
+    def __init__(self, used_phrases: Optional[Dict[str, Sequence[str]]] = None,
+                 journal: Optional[PhraseJournal] = None):
+        self.pools: Dict[str, PhrasePool] = {}
+        # Used phrases loaded from disk for pools whose phrase list isn't known yet
+        self._pending: Dict[str, List[str]] = {
+            key: list(phrases) for key, phrases in (used_phrases or {}).items()
+        }
+        self.journal = journal
+        self._lock = threading.RLock()
+        self._compaction = None
+
+    @classmethod
+    def open(cls, snapshot_path: str, journal_path: Optional[str] = None,
+             compact_after: int = COMPACT_AFTER) -> 'PhraseTracker':
+        """Load tracking state from a snapshot and journal and keep journaling to it"""
+        journal = PhraseJournal(snapshot_path, journal_path, compact_after)
+        tracker = cls(journal.load(), journal)
+        atexit.register(tracker.close)
+        if journal.needs_compaction:
+            tracker.compact(background=True)
+        return tracker
+
+    def get_pool(self, category_key: str, phrase_list: Sequence[str]) -> PhrasePool:
+        """Get the pool for a category, rebuilding it if the phrase list changed"""
+        pool = self.pools.get(category_key)
+        if pool is None:
+            pool = PhrasePool(phrase_list, self._pending.pop(category_key, ()))
+            self.pools[category_key] = pool
+        elif not pool.matches(phrase_list):
+            pool = PhrasePool(phrase_list, pool.used_phrases())
+            self.pools[category_key] = pool
+        else:
+            pool.source = phrase_list
+        return pool
+
+    def draw(self, category_key: str, phrase_list: Sequence[str], rng=random) -> str:
+        """Draw an unused phrase for a category and journal the change"""
+        with self._lock:
+            pool = self.get_pool(category_key, phrase_list)
+            recycled = pool.recycle_if_low()
+            available_before = pool.available_count
+            phrase = pool.draw(rng)
+
+            if self.journal is not None:
+                entries = [(RECYCLED, category_key, p) for p in recycled]
+                if pool.available_count < available_before:
+                    entries.append((USED, category_key, phrase))
+                self.journal.append(entries)
+                if self.journal.needs_compaction:
+                    self.compact(background=True)
+
+        return phrase
+
+    def apply_deltas(self, entries: Sequence[Tuple[str, str, str]]):
+        """Merge usage deltas recorded by another tracker and journal them"""
+        if not entries:
+            return
+        with self._lock:
+            state = {key: dict.fromkeys(phrases) for key, phrases in self.to_dict().items()}
+            apply_entries(state, entries)
+            # Pools are rebuilt from the merged state on their next use
+            self.pools = {}
+            self._pending = {key: list(phrases) for key, phrases in state.items()}
+
+            if self.journal is not None:
+                self.journal.append(list(entries))
+                if self.journal.needs_compaction:
+                    self.compact(background=True)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Used phrases per category, oldest first"""
+        with self._lock:
+            data = {key: list(phrases) for key, phrases in self._pending.items()}
+            for key, pool in self.pools.items():
+                data[key] = pool.used_phrases()
+        return data
+
+    def compact(self, background: bool = False):
+        """Fold the journal into a fresh snapshot"""
+        if self.journal is None:
+            return
+
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                if not background:
+                    self._compaction.join()
+                else:
+                    return
+            data = self.to_dict()
+            self.journal.rotate()
+
+            if background:
+                self._compaction = threading.Thread(
+                    target=self.journal.write_snapshot, args=(data,),
+                    name='phrase-tracking-compaction', daemon=True
+                )
+                self._compaction.start()
+                return
+
+        self.journal.write_snapshot(data)
+
+    def flush(self):
+        """Make sure journaled deltas are on disk"""
+        with self._lock:
+            if self.journal is not None:
+                self.journal.flush()
+
+    def close(self):
+        """Wait for a running compaction and close the journal"""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            if self.journal is not None:
+                self.journal.close()
+
+    def reset(self):
+        """Forget all usage and remove the persisted files"""
+        self.close()
+        with self._lock:
+            self.pools = {}
+            self._pending = {}
+            if self.journal is not None:
+                self.journal.remove_files()
+
+class SQLitePhraseTracker:
+    """Phrase pools shared between worker processes through SQLite
+
+    Every draw is one short BEGIN IMMEDIATE transaction, so mark-used and
+    recycle are atomic across processes. Each pool has a version that is
+    bumped on every change; a worker only reloads a pool's used phrases
+    when another worker changed it since its last draw, so the write lock
+    is normally held for a version lookup plus one or two row writes.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: int = SQLITE_BUSY_TIMEOUT):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pools: Dict[str, Tuple[int, PhrasePool]] = {}
+        self._pid = os.getpid()
+
+    @classmethod
+    def open(cls, db_path: str, seed: Optional[Dict[str, Sequence[str]]] = None,
+             busy_timeout: int = SQLITE_BUSY_TIMEOUT) -> 'SQLitePhraseTracker':
+        """Open the shared database, seeding it with existing usage if it is empty"""
+        tracker = cls(db_path, busy_timeout)
+        if seed:
+            tracker.import_used(seed)
+        atexit.register(tracker.close)
+        return tracker
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened in forked worker processes"""
+        pid = os.getpid()
+        if pid != self._pid:
+            # Connections and cached pools must not be shared with the parent
+            self._local = threading.local()
+            self._pools = {}
+            self._pid = pid
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS phrase_pools (
+                    category_key TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS phrase_usage (
+                    category_key TEXT NOT NULL,
+                    phrase TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    PRIMARY KEY (category_key, phrase)
+                );
+                CREATE INDEX IF NOT EXISTS idx_phrase_usage_seq ON phrase_usage (category_key, seq);
+            """)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, conn: sqlite3.Connection, work):
+        """Run work(conn) inside an immediate write transaction"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def _load_pool(self, conn: sqlite3.Connection, category_key: str,
+                   phrase_list: Sequence[str]) -> PhrasePool:
+        """Rebuild a pool from the used phrases stored for it"""
+        used = [row[0] for row in conn.execute(
+            "SELECT phrase FROM phrase_usage WHERE category_key = ? ORDER BY seq", (category_key,)
+        )]
+        pool = PhrasePool(phrase_list, used)
+        stale = set(used).difference(pool.phrases)
+        if stale:
+            conn.executemany(
+                "DELETE FROM phrase_usage WHERE category_key = ? AND phrase = ?",
+                [(category_key, phrase) for phrase in stale]
+            )
+        return pool
+
+    def get_pool(self, category_key: str, phrase_list: Sequence[str]) -> PhrasePool:
+        """Current pool for a category, as seen by the database"""
+        with self._lock:
+            conn = self._connection()
+            return self._transaction(conn, lambda c: self._sync_pool(c, category_key, phrase_list)[1])
+
+    def _sync_pool(self, conn: sqlite3.Connection, category_key: str,
+                   phrase_list: Sequence[str]) -> Tuple[int, PhrasePool]:
+        """Return the cached pool, reloading it if another worker changed it"""
+        row = conn.execute(
+            "SELECT version FROM phrase_pools WHERE category_key = ?", (category_key,)
+        ).fetchone()
+        version = row[0] if row else 0
+
+        cached = self._pools.get(category_key)
+        if cached is not None and cached[0] == version and cached[1].matches(phrase_list):
+            cached[1].source = phrase_list
+            return cached
+
+        cached = (version, self._load_pool(conn, category_key, phrase_list))
+        self._pools[category_key] = cached
+        return cached
+
+    def draw(self, category_key: str, phrase_list: Sequence[str], rng=random) -> str:
+        """Atomically draw an unused phrase for a category"""
+        def work(conn):
+            version, pool = self._sync_pool(conn, category_key, phrase_list)
+            recycled = pool.recycle_if_low()
+            available_before = pool.available_count
+            phrase = pool.draw(rng)
+
+            version += 1
+            if recycled:
+                conn.executemany(
+                    "DELETE FROM phrase_usage WHERE category_key = ? AND phrase = ?",
+                    [(category_key, p) for p in recycled]
+                )
+            if pool.available_count < available_before:
+                conn.execute(
+                    "INSERT OR REPLACE INTO phrase_usage (category_key, phrase, seq) VALUES (?, ?, ?)",
+                    (category_key, phrase, version)
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO phrase_pools (category_key, version) VALUES (?, ?)",
+                (category_key, version)
+            )
+            self._pools[category_key] = (version, pool)
+            return phrase
+
+        with self._lock:
+            conn = self._connection()
+            try:
+                return self._transaction(conn, work)
+            except BaseException:
+                # The cached pool may hold changes that were rolled back
+                self._pools.pop(category_key, None)
+                raise
+
+    def import_used(self, used_phrases: Dict[str, Sequence[str]]) -> bool:
+        """Seed an empty database with used phrases, e.g. from the JSON snapshot"""
+        def work(conn):
+            if conn.execute("SELECT 1 FROM phrase_usage LIMIT 1").fetchone():
+                return False
+            for key, phrases in used_phrases.items():
+                phrases = list(dict.fromkeys(phrases))
+                conn.executemany(
+                    "INSERT INTO phrase_usage (category_key, phrase, seq) VALUES (?, ?, ?)",
+                    [(key, phrase, seq) for seq, phrase in enumerate(phrases, 1)]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO phrase_pools (category_key, version) VALUES (?, ?)",
+                    (key, len(phrases))
+                )
+            return True
+
+        with self._lock:
+            return self._transaction(self._connection(), work)
+
+    def apply_deltas(self, entries: Sequence[Tuple[str, str, str]]):
+        """Merge usage deltas recorded by another tracker in one transaction"""
+        if not entries:
+            return
+
+        def work(conn):
+            versions = {}
+            for op, key, phrase in entries:
+                if key not in versions:
+                    row = conn.execute(
+                        "SELECT version FROM phrase_pools WHERE category_key = ?", (key,)
+                    ).fetchone()
+                    versions[key] = row[0] if row else 0
+                versions[key] += 1
+                if op == USED:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO phrase_usage (category_key, phrase, seq) VALUES (?, ?, ?)",
+                        (key, phrase, versions[key])
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM phrase_usage WHERE category_key = ? AND phrase = ?", (key, phrase)
+                    )
+            conn.executemany(
+                "INSERT OR REPLACE INTO phrase_pools (category_key, version) VALUES (?, ?)",
+                list(versions.items())
+            )
+
+        with self._lock:
+            self._transaction(self._connection(), work)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Used phrases per category, oldest first"""
+        data: Dict[str, List[str]] = {}
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT category_key, phrase FROM phrase_usage ORDER BY category_key, seq"
+            )
+            for key, phrase in rows:
+                data.setdefault(key, []).append(phrase)
+        return data
+
+    def compact(self, background: bool = False):
+        """Checkpoint the write-ahead log into the database file"""
+        with self._lock:
+            self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def flush(self):
+        """Draws are committed as they happen; nothing is buffered"""
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+    def reset(self):
+        """Forget all usage for every worker"""
+        def work(conn):
+            conn.execute("DELETE FROM phrase_usage")
+            # Bump versions instead of deleting them so other workers drop their caches
+            conn.execute("UPDATE phrase_pools SET version = version + 1")
+
+        with self._lock:
+            self._transaction(self._connection(), work)
+            self._pools = {}
@@ -0,0 +1,205 @@
+"""
+Streaming Quality Aggregator
+Summary statistics of quality assessments without keeping them
+
+Reviews are added one at a time: running means and variances use Welford's
+algorithm, overall scores are counted into fixed histogram buckets, and
+issues and recommendations into counters (both come from fixed message
+sets). Memory stays the same however many reviews a run scores, and the
+summary has the shape of ai_quality_scorer.get_quality_summary().
+"""
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HISTOGRAM_BUCKETS = 10
+# (name, lowest score) of the quality distribution, best first
+QUALITY_BANDS = (('excellent', 0.9), ('good', 0.8), ('average', 0.6), ('poor', float('-inf')))
+HIGH_QUALITY_SCORE = 0.8
+LOW_QUALITY_SCORE = 0.6
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of numbers (Welford's algorithm)"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningStats'):
+        """Fold in the stats of another stream (Chan et al.'s parallel update)"""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Population variance, like numpy.var"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict:
+        if not self.count:
+            return {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+        return {'count': self.count, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max}
+
+class QualityAggregator:
+    """Thread-safe running summary of quality assessments, fed one review at a time"""
+
+    def __init__(self, buckets: int = HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.overall = RunningStats()
+        self.metrics: Dict[str, RunningStats] = {}
+        self.histogram = [0] * self.buckets
+        self.bands = {name: 0 for name, _ in QUALITY_BANDS}
+        self.high_quality_count = 0
+        self.low_quality_count = 0
+        self.issues = Counter()
+        self.recommendations = Counter()
+
+    def add(self, overall_score: float, metrics: Optional[Dict[str, float]] = None,
+            issues: Iterable[str] = (), recommendations: Iterable[str] = ()):
+        """
+        Add one assessment
+
+        Args:
+            overall_score: Overall quality score from 0 to 1
+            metrics: Individual metric scores by name, if they were computed
+            issues: Flagged issues of the review
+            recommendations: Recommendations for the review
+        """
+        overall_score = float(overall_score)
+        bucket = min(max(int(overall_score * self.buckets), 0), self.buckets - 1)
+        band = next(name for name, lowest in QUALITY_BANDS if overall_score >= lowest)
+        with self._lock:
+            self.overall.add(overall_score)
+            self.histogram[bucket] += 1
+            self.bands[band] += 1
+            self.high_quality_count += overall_score >= HIGH_QUALITY_SCORE
+            self.low_quality_count += overall_score < LOW_QUALITY_SCORE
+            for name, value in (metrics or {}).items():
+                stats = self.metrics.get(name)
+                if stats is None:
+                    stats = self.metrics[name] = RunningStats()
+                stats.add(float(value))
+            self.issues.update(issues)
+            self.recommendations.update(recommendations)
+
+    def add_quality(self, quality_metrics):
+        """Add a QualityMetrics assessment"""
+        self.add(
+            quality_metrics.overall_score,
+            {
+                'authenticity': quality_metrics.authenticity_score,
+                'readability': quality_metrics.readability_score,
+                'language_consistency': quality_metrics.language_consistency_score,
+                'sentiment_appropriateness': quality_metrics.sentiment_appropriateness_score,
+                'content_depth': quality_metrics.content_depth_score,
+                'uniqueness': quality_metrics.uniqueness_score,
+                'demographic_alignment': quality_metrics.demographic_alignment_score,
+                'commercial_value': quality_metrics.commercial_value_score
+            },
+            quality_metrics.flagged_issues,
+            quality_metrics.recommendations
+        )
+
+    def merge(self, other: 'QualityAggregator'):
+        """Fold in another aggregator, e.g. of a worker's batch"""
+        if other.buckets != self.buckets:
+            raise ValueError(f"Cannot merge {other.buckets} histogram buckets into {self.buckets}")
+        with other._lock:
+            overall = RunningStats()
+            overall.merge(other.overall)
+            metrics = {}
+            for name, stats in other.metrics.items():
+                metrics[name] = RunningStats()
+                metrics[name].merge(stats)
+            histogram = list(other.histogram)
+            bands = dict(other.bands)
+            counts = (other.high_quality_count, other.low_quality_count)
+            issues = Counter(other.issues)
+            recommendations = Counter(other.recommendations)
+        with self._lock:
+            self.overall.merge(overall)
+            for name, stats in metrics.items():
+                self.metrics.setdefault(name, RunningStats()).merge(stats)
+            self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, histogram)]
+            for name, count in bands.items():
+                self.bands[name] += count
+            self.high_quality_count += counts[0]
+            self.low_quality_count += counts[1]
+            self.issues.update(issues)
+            self.recommendations.update(recommendations)
+
+    def __len__(self) -> int:
+        return self.overall.count
+
+    def common_issues(self, top: int = 5) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self.issues.most_common(top)
+
+    def top_recommendations(self, top: int = 5) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self.recommendations.most_common(top)
+
+    def summary(self, top: int = 5) -> Dict:
+        """Summary statistics of everything added, {} before the first review"""
+        with self._lock:
+            return self._summary(top)
+
+    def take_summary(self, top: int = 5) -> Dict:
+        """Summary of everything added since the previous take_summary(), then start over"""
+        with self._lock:
+            summary = self._summary(top)
+            self._reset()
+        return summary
+
+    def _summary(self, top: int) -> Dict:
+        if not self.overall.count:
+            return {}
+        authenticity = self.metrics.get('authenticity', RunningStats())
+        width = 1.0 / self.buckets
+        return {
+            'total_reviews': self.overall.count,
+            'average_quality': self.overall.mean,
+            'quality_std': self.overall.std,
+            'high_quality_count': self.high_quality_count,
+            'low_quality_count': self.low_quality_count,
+            'average_authenticity': authenticity.mean,
+            'quality_distribution': dict(self.bands),
+            'common_issues': self.issues.most_common(top),
+            'top_recommendations': self.recommendations.most_common(top),
+            'score_histogram': [
+                {'from': round(i * width, 4), 'to': round((i + 1) * width, 4), 'count': count}
+                for i, count in enumerate(self.histogram)
+            ],
+            'metrics': {name: stats.to_dict() for name, stats in self.metrics.items()}
+        }
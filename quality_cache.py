@@ -0,0 +1,131 @@
+"""
+Quality Score Cache
+Bounded LRU cache of the quality scores that depend only on a review's text
+
+Template reviews repeat the same title and content pools, so the scorer sees
+identical reviews over and over. Scores that only depend on the review itself
+are cached under a hash of (title, content, rating, language, persona).
+Uniqueness depends on the reviews seen before and is never cached. Set
+QUALITY_CACHE_FILE to keep the cache between restarts; it is written at exit.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+QUALITY_CACHE_SIZE = int(os.environ.get('QUALITY_CACHE_SIZE', '20000'))
+QUALITY_CACHE_FILE = os.environ.get('QUALITY_CACHE_FILE', '')
+
+def review_key(review: Dict) -> str:
+    """Hash of the review fields the cached scores depend on"""
+    fields = (
+        review.get('title', ''),
+        review.get('content', ''),
+        review.get('rating', 5),
+        review.get('language', 'en'),
+        review.get('persona', 'millennial')
+    )
+    # repr keeps the fields apart and tells 5 from '5'
+    encoded = repr(fields).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+class ScoreCache:
+    """Thread-safe LRU mapping of review keys to JSON-serializable scores
+
+    version identifies the scoring code; a persisted cache written by another
+    version is ignored on load, so changed scoring never serves stale scores.
+    """
+
+    def __init__(self, max_size: int = QUALITY_CACHE_SIZE, version: str = '1',
+                 path: Optional[str] = None):
+        self.max_size = max_size
+        self.version = version
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, max_size: int = QUALITY_CACHE_SIZE, version: str = '1',
+             path: str = QUALITY_CACHE_FILE) -> 'ScoreCache':
+        """Cache loaded from path, and saved there at exit; not persisted without a path"""
+        cache = cls(max_size, version, path or None)
+        if cache.path:
+            cache.load()
+            atexit.register(cache.save)
+        return cache
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Dict):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'persistent': bool(self.path)
+            }
+
+    def save(self, path: Optional[str] = None):
+        """Write the entries, least recently used first, atomically"""
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            data = {'version': self.version, 'entries': list(self._entries.items())}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None) -> int:
+        """Load persisted entries written by the same version, returning how many were loaded"""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable quality cache {path}: {e}")
+            return 0
+        if data.get('version') != self.version:
+            return 0
+        entries = data.get('entries', [])
+        for key, value in entries:
+            self.put(key, value)
+        return min(len(entries), max(self.max_size, 0))
@@ -0,0 +1,234 @@
+"""
+Compact Quality Result Storage
+Array-backed storage of many quality assessments
+
+A QualityMetrics object holds three dicts, two lists of message strings and
+an ISO timestamp string, which is too much for analytics over long review
+histories. QualityStore keeps the nine scores of each assessment as float32
+columns of one NumPy structured array, its issues and recommendations as
+bitmasks over interned message tables, and its assessment time as epoch
+seconds: 52 bytes per review. QualityRecord is the matching __slots__ record
+for one row, and stores are saved to and loaded from a binary file.
+"""
+import json
+import os
+import struct
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+
+# QualityMetrics score fields, in their order there
+SCORE_FIELDS = (
+    'overall_score', 'authenticity_score', 'readability_score', 'language_consistency_score',
+    'sentiment_appropriateness_score', 'content_depth_score', 'uniqueness_score',
+    'demographic_alignment_score', 'commercial_value_score'
+)
+QUALITY_DTYPE = np.dtype(
+    [(name, '<f4') for name in SCORE_FIELDS]
+    + [('issues', '<u4'), ('recommendations', '<u4'), ('assessed_at', '<f8')]
+)
+# Bits of the issue and recommendation masks
+MAX_CODES = 32
+
+STORE_MAGIC = b'FQS1'
+STORE_VERSION = 1
+_HEADER_LENGTH = struct.Struct('<I')
+
+class CodeTable:
+    """Interned messages and their bit in a uint32 mask"""
+
+    def __init__(self, messages: Iterable[str] = ()):
+        self.messages: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for message in messages:
+            self.code(message)
+
+    def code(self, message: str) -> int:
+        """Bit number of a message, interning it on first use"""
+        code = self._codes.get(message)
+        if code is None:
+            if len(self.messages) >= MAX_CODES:
+                raise ValueError(f"More than {MAX_CODES} distinct messages: {message!r}")
+            code = self._codes[message] = len(self.messages)
+            self.messages.append(sys.intern(message))
+        return code
+
+    def encode(self, messages: Iterable[str]) -> int:
+        mask = 0
+        for message in messages:
+            mask |= 1 << self.code(message)
+        return mask
+
+    def decode(self, mask: int) -> Tuple[str, ...]:
+        """Messages of a mask, in code order"""
+        return tuple(message for code, message in enumerate(self.messages) if mask >> code & 1)
+
+    def counts(self, masks: np.ndarray) -> List[Tuple[str, int]]:
+        """How often each message is set in an array of masks, most common first"""
+        counts = [(message, int(np.count_nonzero(masks & np.uint32(1 << code))))
+                  for code, message in enumerate(self.messages)]
+        return sorted((item for item in counts if item[1]), key=lambda item: item[1], reverse=True)
+
+class QualityRecord:
+    """One quality assessment without per-review dicts or lists"""
+
+    __slots__ = SCORE_FIELDS + ('flagged_issues', 'recommendations', 'assessed_at')
+
+    def __init__(self, scores: Iterable[float], flagged_issues: Tuple[str, ...] = (),
+                 recommendations: Tuple[str, ...] = (), assessed_at: float = 0.0):
+        for name, score in zip(SCORE_FIELDS, scores):
+            setattr(self, name, float(score))
+        self.flagged_issues = tuple(flagged_issues)
+        self.recommendations = tuple(recommendations)
+        self.assessed_at = assessed_at  # Epoch seconds
+
+    @classmethod
+    def from_quality_metrics(cls, quality_metrics) -> 'QualityRecord':
+        assessed_at = quality_metrics.generation_metadata.get('assessed_at')
+        return cls(
+            (getattr(quality_metrics, name) for name in SCORE_FIELDS),
+            quality_metrics.flagged_issues,
+            quality_metrics.recommendations,
+            datetime.fromisoformat(assessed_at).timestamp() if assessed_at else 0.0
+        )
+
+    def to_quality_metrics(self):
+        """The record as a QualityMetrics object"""
+        from ai_quality_scorer import QualityMetrics
+        scores = {name: getattr(self, name) for name in SCORE_FIELDS}
+        return QualityMetrics(
+            **scores,
+            metrics_breakdown={name[:-len('_score')]: score for name, score in scores.items()
+                               if name != 'overall_score'},
+            recommendations=list(self.recommendations),
+            flagged_issues=list(self.flagged_issues),
+            generation_metadata={
+                'assessed_at': datetime.fromtimestamp(self.assessed_at).isoformat(),
+                'scorer_version': '1.0'
+            }
+        )
+
+    def __repr__(self) -> str:
+        return f"QualityRecord(overall_score={self.overall_score:.3f}, flagged_issues={self.flagged_issues})"
+
+class QualityStore:
+    """Growable structured array of quality assessments, one row per review"""
+
+    def __init__(self, capacity: int = 1024):
+        self._rows = np.zeros(max(capacity, 1), dtype=QUALITY_DTYPE)
+        self._size = 0
+        self.issue_codes = CodeTable()
+        self.recommendation_codes = CodeTable()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def rows(self) -> np.ndarray:
+        """The stored rows (a view, not a copy)"""
+        return self._rows[:self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._rows[name][:self._size]
+
+    def _reserve(self, count: int):
+        needed = self._size + count
+        if needed > len(self._rows):
+            rows = np.zeros(max(needed, 2 * len(self._rows)), dtype=QUALITY_DTYPE)
+            rows[:self._size] = self._rows[:self._size]
+            self._rows = rows
+
+    def append(self, scores: Iterable[float], flagged_issues: Iterable[str] = (),
+               recommendations: Iterable[str] = (), assessed_at: float = 0.0):
+        """Add one assessment from its nine scores, in SCORE_FIELDS order"""
+        self._reserve(1)
+        self._rows[self._size] = (
+            *scores,
+            self.issue_codes.encode(flagged_issues),
+            self.recommendation_codes.encode(recommendations),
+            assessed_at
+        )
+        self._size += 1
+
+    def append_record(self, record: QualityRecord):
+        self.append((getattr(record, name) for name in SCORE_FIELDS),
+                    record.flagged_issues, record.recommendations, record.assessed_at)
+
+    def append_quality_metrics(self, quality_metrics):
+        self.append_record(QualityRecord.from_quality_metrics(quality_metrics))
+
+    def extend(self, quality_metrics_list: Iterable):
+        """Add QualityMetrics objects, e.g. from a generator, one at a time"""
+        for quality_metrics in quality_metrics_list:
+            self.append_quality_metrics(quality_metrics)
+
+    def extend_columns(self, scores: Dict[str, np.ndarray], issues: Iterable[Iterable[str]],
+                       recommendations: Iterable[Iterable[str]], assessed_at: float = 0.0):
+        """Add many assessments at once from a score array per SCORE_FIELDS name"""
+        count = len(scores['overall_score'])
+        self._reserve(count)
+        rows = self._rows[self._size:self._size + count]
+        for name in SCORE_FIELDS:
+            rows[name] = scores[name]
+        rows['issues'] = [self.issue_codes.encode(messages) for messages in issues]
+        rows['recommendations'] = [self.recommendation_codes.encode(messages) for messages in recommendations]
+        rows['assessed_at'] = assessed_at
+        self._size += count
+
+    def __getitem__(self, index: int) -> QualityRecord:
+        if not -self._size <= index < self._size:
+            raise IndexError(f"Quality store index {index} out of range")
+        row = self._rows[index % self._size]
+        return QualityRecord(
+            (row[name] for name in SCORE_FIELDS),
+            self.issue_codes.decode(int(row['issues'])),
+            self.recommendation_codes.decode(int(row['recommendations'])),
+            float(row['assessed_at'])
+        )
+
+    def __iter__(self) -> Iterator[QualityRecord]:
+        return (self[index] for index in range(self._size))
+
+    def common_issues(self, top: int = 5) -> List[Tuple[str, int]]:
+        return self.issue_codes.counts(self.column('issues'))[:top]
+
+    def top_recommendations(self, top: int = 5) -> List[Tuple[str, int]]:
+        return self.recommendation_codes.counts(self.column('recommendations'))[:top]
+
+    def save(self, path: str):
+        """Write the store atomically: magic, header length, JSON header, then the raw rows"""
+        header = json.dumps({
+            'version': STORE_VERSION,
+            'fields': QUALITY_DTYPE.names,
+            'count': self._size,
+            'issues': self.issue_codes.messages,
+            'recommendations': self.recommendation_codes.messages
+        }, ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(STORE_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(self.rows.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'QualityStore':
+        with open(path, 'rb') as f:
+            if f.read(len(STORE_MAGIC)) != STORE_MAGIC:
+                raise ValueError(f"{path} is not a quality store file")
+            (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+            if header['version'] != STORE_VERSION or tuple(header['fields']) != QUALITY_DTYPE.names:
+                raise ValueError(f"{path} has an unsupported quality store layout")
+            rows = np.fromfile(f, dtype=QUALITY_DTYPE, count=header['count'])
+        if len(rows) != header['count']:
+            raise ValueError(f"{path} is truncated: {len(rows)} of {header['count']} rows")
+
+        store = cls(capacity=len(rows))
+        store._rows[:len(rows)] = rows
+        store._size = len(rows)
+        store.issue_codes = CodeTable(header['issues'])
+        store.recommendation_codes = CodeTable(header['recommendations'])
+        return store
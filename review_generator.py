@@ -3,654 +3,83 @@ Advanced Review Generation Engine - Improved Version
 Fixes repetition issues and ensures better language distribution
 """
 import random
+import hashlib
 from datetime import datetime, timedelta
 import re
-import json
 import os
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from phrase_tracking import PhraseJournal, PhraseTracker, SQLitePhraseTracker
+from similarity_index import get_similarity_index
+from template_corpus import build_table, language_table
 
 # Persistent phrase tracking across sessions
 PHRASE_TRACKING_FILE = "phrase_usage_tracking.json"
 
+# "sqlite" shares one tracking database between all gunicorn workers
+PHRASE_TRACKING_BACKEND = os.environ.get('PHRASE_TRACKING_BACKEND', 'file').lower()
+PHRASE_TRACKING_DB = os.environ.get('PHRASE_TRACKING_DB', 'phrase_usage_tracking.db')
+
 def load_phrase_tracking():
-    """Load phrase usage tracking from file"""
-    if os.path.exists(PHRASE_TRACKING_FILE):
-        try:
-            with open(PHRASE_TRACKING_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Convert lists back to sets
-                return {lang: set(phrases) for lang, phrases in data.items()}
-        except:
-            pass
-    return defaultdict(set)
+    """Load phrase usage tracking from the configured backend"""
+    if PHRASE_TRACKING_BACKEND == 'sqlite':
+        # Existing file-based usage carries over into a fresh database
+        seed = None if os.path.exists(PHRASE_TRACKING_DB) else PhraseJournal(PHRASE_TRACKING_FILE).load()
+        return SQLitePhraseTracker.open(PHRASE_TRACKING_DB, seed)
+    return PhraseTracker.open(PHRASE_TRACKING_FILE)
 
 def save_phrase_tracking(tracking):
-    """Save phrase usage tracking to file"""
-    # Convert sets to lists for JSON serialization
-    data = {lang: list(phrases) for lang, phrases in tracking.items()}
-    with open(PHRASE_TRACKING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Fold journaled phrase usage into the persisted state"""
+    tracking.compact()
 
 # Global phrase tracking with persistence
-USED_PHRASES = load_phrase_tracking()
-
-# Extended review components with more variety
-REVIEW_COMPONENTS = {
-    "opening_reactions": {
-        "de": [
-            "bin absolut verliebt in dieses", "total begeistert von diesem Teil", "so happy mit dem Kauf",
-            "richtig zufrieden damit", "komplett überzeugt", "voll happy mit meinem neuen Teil",
-            "super zufrieden", "echt beeindruckt", "bin total verliebt",
-            "richtig stolz auf den Kauf", "mega glücklich", "voll überzeugt",
-            "komplett zufrieden", "absolut happy", "total verliebt in mein neues Teil",
-            "richtig begeistert", "mega zufrieden", "voll beeindruckt",
-            "komplett happy mit dem neuen Teil", "absolut überzeugt"
-        ],
-        "en": [
-            "absolutely in love with this", "totally obsessed with my new", "super happy with this",
-            "really satisfied with my", "completely convinced by this", "so pleased with my new",
-            "extremely happy with this", "genuinely impressed by this", "totally in love with my",
-            "really proud of this", "incredibly happy with my", "fully convinced by this",
-            "completely satisfied with my", "absolutely thrilled with this", "totally smitten with my new",
-            "really excited about my", "super satisfied with this", "genuinely impressed with my",
-            "completely happy with my new", "absolutely convinced by this"
-        ],
-        "es": [
-            "absolutamente enamorada de este", "totalmente obsesionada con mi nuevo", "súper feliz con este",
-            "realmente satisfecha con mi", "completamente convencida por este", "muy contenta con mi nuevo",
-            "extremadamente feliz con este", "genuinamente impresionada por este", "totalmente enamorada de mi",
-            "realmente orgullosa de este", "increíblemente feliz con mi", "totalmente convencida por este"
-        ],
-        "fr": [
-            "absolument amoureuse de ce", "totalement obsédée par mon nouveau", "super heureuse avec ce",
-            "vraiment satisfaite de mon", "complètement convaincue par ce", "très contente de mon nouveau",
-            "extrêmement heureuse avec ce", "vraiment impressionnée par ce", "totalement amoureuse de mon",
-            "vraiment fière de ce", "incroyablement heureuse avec mon", "entièrement convaincue par ce"
-        ],
-        "it": [
-            "assolutamente innamorata di questo", "totalmente ossessionata dal mio nuovo", "super felice con questo",
-            "davvero soddisfatta del mio", "completamente convinta da questo", "molto contenta del mio nuovo",
-            "estremamente felice con questo", "davvero colpita da questo", "totalmente innamorata del mio",
-            "davvero orgogliosa di questo", "incredibilmente felice con il mio", "pienamente convinta da questo"
-        ],
-        "pl": [
-            "absolutnie zakochana w tym", "jestem zachwycona moim nowym", "super szczęśliwa z tym",
-            "naprawdę zadowolona", "całkowicie przekonana", "bardzo zadowolona z nowego",
-            "niesamowicie szczęśliwa", "naprawdę pod wrażeniem", "totalnie zakochana",
-            "naprawdę dumna z zakupu", "niewiarygodnie szczęśliwa", "w pełni przekonana",
-            "całkowicie usatysfakcjonowana", "absolutnie zachwycona", "totalnie oczarowana",
-            "naprawdę podekscytowana", "super zadowolona", "naprawdę pod wrażeniem",
-            "całkowicie szczęśliwa z nowego", "absolutnie przekonana"
-        ],
-        "cs": [
-            "absolutně zamilovaná do tohoto", "jsem nadšená mým novým", "super šťastná s tímto",
-            "opravdu spokojená", "úplně přesvědčená", "velmi spokojená s novým",
-            "extrémně šťastná", "opravdu ohromená", "totálně zamilovaná",
-            "opravdu hrdá na nákup", "neuvěřitelně šťastná", "plně přesvědčená",
-            "kompletně spokojená s mým", "absolutně nadšená tímto", "totálně okouzlená mým novým"
-        ]
-    },
-    "quality_comments": {
-        "de": [
-            "qualität ist der wahnsinn", "verarbeitung ist erstklassig", "material fühlt sich premium an",
-            "haptik ist unglaublich gut", "stoff ist super hochwertig", "nähte sind perfekt verarbeitet",
-            "details sind liebevoll gemacht", "material ist robust aber weich", "fühlt sich teurer an als es war",
-            "qualität übertrifft den preis", "verarbeitung ist perfekt", "material ist erstklassig",
-            "haptik ist einfach premium", "stoff fühlt sich luxuriös an", "nähte halten bombenfest",
-            "details machen den unterschied", "material ist langlebig", "fühlt sich wertig an",
-            "qualität ist überraschend gut", "verarbeitung lässt nichts zu wünschen übrig",
-            "material ist mega nice", "qualität stimmt zu 100%", "verarbeitung ist erstklassig",
-            "stoff hat eine tolle struktur", "material ist angenehm schwer", "nähte sind sauber gesetzt",
-            "haptik ist butterweich", "qualität rechtfertigt jeden cent", "material ist richtig edel",
-            "verarbeitung ist makellos", "stoff ist dick und stabil", "details sind perfekt durchdacht",
-            "material hat gewicht", "qualität ist jeden euro wert", "verarbeitung zeigt handwerkskunst"
-        ],
-        "en": [
-            "quality is insane", "construction is top notch", "material feels premium",
-            "texture is incredibly good", "fabric is super high quality", "seams are perfectly done",
-            "details are thoughtfully made", "material is sturdy yet soft", "feels more expensive than it was",
-            "quality exceeds the price", "construction is on point", "material is first class",
-            "texture is just premium", "fabric feels luxurious", "seams hold up perfectly",
-            "details make the difference", "material is durable", "feels high-end",
-            "quality is surprisingly good", "construction leaves nothing to be desired"
-        ],
-        "es": [
-            "la calidad es increíble", "la construcción es de primera", "el material se siente premium",
-            "la textura es increíblemente buena", "la tela es súper alta calidad", "las costuras están perfectamente hechas",
-            "los detalles están cuidadosamente hechos", "el material es resistente pero suave", "se siente más caro de lo que fue",
-            "la calidad supera el precio", "la construcción está en su punto", "el material es de primera clase"
-        ],
-        "fr": [
-            "la qualité est incroyable", "la construction est top", "le matériau est premium",
-            "la texture est incroyablement bonne", "le tissu est de super haute qualité", "les coutures sont parfaitement faites",
-            "les détails sont soigneusement réalisés", "le matériau est solide mais doux", "ça semble plus cher que c'était",
-            "la qualité dépasse le prix", "la construction est parfaite", "le matériau est de première classe"
-        ],
-        "it": [
-            "la qualità è pazzesca", "la costruzione è di prima classe", "il materiale sembra premium",
-            "la texture è incredibilmente buona", "il tessuto è di altissima qualità", "le cuciture sono perfettamente fatte",
-            "i dettagli sono fatti con cura", "il materiale è robusto ma morbido", "sembra più costoso di quanto fosse",
-            "la qualità supera il prezzo", "la costruzione è perfetta", "il materiale è di prima classe"
-        ],
-        "pl": [
-            "jakość jest niesamowita", "wykonanie pierwsza klasa", "materiał czuje się premium",
-            "tekstura jest niewiarygodnie dobra", "tkanina super wysokiej jakości", "szwy są perfekcyjnie wykonane",
-            "detale są przemyślane", "materiał jest mocny ale miękki", "czuje się drożej niż kosztował",
-            "jakość przewyższa cenę", "wykonanie na poziomie", "materiał pierwszej klasy",
-            "dotyk jest po prostu premium", "tkanina czuje się luksusowo", "szwy trzymają się idealnie",
-            "detale robią różnicę", "materiał jest trwały", "czuje się ekskluzywnie",
-            "jakość jest zaskakująco dobra", "wykonanie nie pozostawia nic do życzenia"
-        ],
-        "cs": [
-            "kvalita je šílená", "konstrukce je prvotřídní", "materiál působí prémiově",
-            "textura je neuvěřitelně dobrá", "látka je super vysoké kvality", "švy jsou perfektně provedené",
-            "detaily jsou pečlivě zpracované", "materiál je pevný ale měkký", "působí dráž než stál",
-            "kvalita převyšuje cenu", "konstrukce je na úrovni", "materiál je první třídy",
-            "na dotek je prostě prémiový", "látka působí luxusně", "švy drží perfektně"
-        ]
-    },
-    "fit_comments": {
-        "de": [
-            "passt wie angegossen", "größe stimmt perfekt", "schnitt ist mega schmeichelhaft",
-            "sitzt an allen richtigen stellen", "fällt true to size aus", "passform ist ein traum",
-            "größentabelle war spot on", "schnitt betont die figur perfekt", "sitzt wie maßgeschneidert",
-            "passform übertrifft erwartungen", "größe passt wie erwartet", "schnitt ist durchdacht",
-            "sitzt bequem aber nicht zu locker", "passform ist genau richtig", "größe war perfekte wahl",
-            "schnitt ist super flattering", "sitzt wie eine zweite haut", "passform könnte nicht besser sein"
-        ],
-        "en": [
-            "fits like a glove", "size is perfect", "cut is super flattering",
-            "sits in all the right places", "runs true to size", "fit is a dream",
-            "size chart was spot on", "cut accentuates perfectly", "fits like it's tailored",
-            "fit exceeds expectations", "size fits as expected", "cut is well thought out",
-            "sits comfortably but not loose", "fit is just right", "size was perfect choice",
-            "cut is super flattering", "fits like a second skin", "fit couldn't be better"
-        ],
-        "es": [
-            "queda como un guante", "la talla es perfecta", "el corte es súper favorecedor",
-            "se ajusta en todos los lugares correctos", "la talla es fiel", "el ajuste es un sueño",
-            "la tabla de tallas fue exacta", "el corte acentúa perfectamente", "queda como a medida",
-            "el ajuste supera las expectativas", "la talla queda como se esperaba", "el corte está bien pensado"
-        ],
-        "fr": [
-            "va comme un gant", "la taille est parfaite", "la coupe est super flatteuse",
-            "s'ajuste à tous les bons endroits", "taille normalement", "l'ajustement est un rêve",
-            "le guide des tailles était exact", "la coupe accentue parfaitement", "va comme sur mesure",
-            "l'ajustement dépasse les attentes", "la taille va comme prévu", "la coupe est bien pensée"
-        ],
-        "it": [
-            "calza come un guanto", "la taglia è perfetta", "il taglio è super lusinghiero",
-            "si adatta in tutti i punti giusti", "veste fedele alla taglia", "la vestibilità è un sogno",
-            "la tabella taglie era precisa", "il taglio accentua perfettamente", "veste come su misura",
-            "la vestibilità supera le aspettative", "la taglia veste come previsto", "il taglio è ben pensato"
-        ],
-        "pl": [
-            "pasuje jak ulał", "rozmiar jest idealny", "krój jest super pochlebny",
-            "leży we wszystkich właściwych miejscach", "rozmiar zgodny z opisem", "dopasowanie jest wymarzone",
-            "tabela rozmiarów była dokładna", "krój podkreśla idealnie", "pasuje jakby szyte na miarę",
-            "dopasowanie przekracza oczekiwania", "rozmiar pasuje jak należy", "krój jest przemyślany",
-            "siedzi wygodnie ale nie luźno", "dopasowanie jest w sam raz", "rozmiar był idealnym wyborem",
-            "krój jest super pochlebny", "pasuje jak druga skóra", "dopasowanie nie mogłoby być lepsze"
-        ],
-        "cs": [
-            "sedí jako ulité", "velikost je perfektní", "střih je super lichotivý",
-            "sedí na všech správných místech", "velikost odpovídá", "střih je sen",
-            "tabulka velikostí byla přesná", "střih zdůrazňuje perfektně", "sedí jako na míru",
-            "střih překonává očekávání", "velikost sedí jak má", "střih je promyšlený"
-        ]
-    },
-    "style_comments": {
-        "de": [
-            "style ist genau mein ding", "design ist einzigartig", "look ist edgy aber tragbar",
-            "ästhetik trifft meinen geschmack", "style ist zeitlos modern", "design hebt sich ab",
-            "look ist sophisticated", "ästhetik ist on point", "style macht statement",
-            "design ist durchdacht", "look ist vielseitig", "ästhetik ist genau richtig",
-            "style ist perfekt ausbalanciert", "design ist eye-catching", "look ist mühellos cool",
-            "optik ist der hammer", "schnitt ist modern", "style ist voll meins",
-            "design spricht mich an", "look passt perfekt zu mir", "stil ist unverwechselbar",
-            "aussehen ist top", "design hat das gewisse etwas", "style ist fresh",
-            "optik überzeugt total", "look ist genau mein vibe", "design ist next level"
-        ],
-        "en": [
-            "style is exactly my thing", "design is unique", "look is edgy but wearable",
-            "aesthetic hits my taste", "style is timelessly modern", "design stands out",
-            "look is sophisticated", "aesthetic is on point", "style makes a statement",
-            "design is well thought out", "look is versatile", "aesthetic is just right",
-            "style is perfectly balanced", "design is eye-catching", "look is effortlessly cool"
-        ],
-        "es": [
-            "el estilo es exactamente lo mío", "el diseño es único", "el look es atrevido pero ponible",
-            "la estética coincide con mi gusto", "el estilo es atemporal y moderno", "el diseño destaca",
-            "el look es sofisticado", "la estética está en su punto", "el estilo hace una declaración"
-        ],
-        "fr": [
-            "le style est exactement mon truc", "le design est unique", "le look est edgy mais portable",
-            "l'esthétique correspond à mon goût", "le style est intemporel et moderne", "le design se démarque",
-            "le look est sophistiqué", "l'esthétique est parfaite", "le style fait une déclaration"
-        ],
-        "it": [
-            "lo stile è esattamente il mio genere", "il design è unico", "il look è edgy ma indossabile",
-            "l'estetica colpisce il mio gusto", "lo stile è senza tempo e moderno", "il design si distingue",
-            "il look è sofisticato", "l'estetica è perfetta", "lo stile fa una dichiarazione"
-        ],
-        "pl": [
-            "styl jest dokładnie w moim typie", "design jest unikalny", "wygląd jest edgy ale do noszenia",
-            "estetyka trafia w mój gust", "styl jest ponadczasowo nowoczesny", "design się wyróżnia",
-            "wygląd jest wyrafinowany", "estetyka jest na miejscu", "styl robi wrażenie",
-            "design jest przemyślany", "wygląd jest wszechstronny", "estetyka jest w sam raz",
-            "styl jest idealnie wyważony", "design przyciąga wzrok", "wygląd jest bezproblemowo fajny"
-        ],
-        "cs": [
-            "styl je přesně můj šálek kávy", "design je jedinečný", "vzhled je odvážný ale nositelný",
-            "estetika sedí mému vkusu", "styl je nadčasově moderní", "design vyčnívá",
-            "vzhled je sofistikovaný", "estetika je na místě", "styl dělá dojem"
-        ]
-    },
-    "usage_scenarios": {
-        "de": [
-            "perfekt für festivals", "ideal für clubbing", "great für alltag", "super für dates",
-            "genial für konzerte", "klasse für parties", "toll für photoshoots", "spitze für events",
-            "optimal für ausgehen", "bestens für feiern", "wunderbar für treffen", "exzellent für auftritte"
-        ],
-        "en": [
-            "perfect for festivals", "ideal for clubbing", "great for everyday", "super for dates",
-            "awesome for concerts", "brilliant for parties", "amazing for photoshoots", "excellent for events",
-            "optimal for going out", "best for celebrations", "wonderful for meetups", "excellent for performances"
-        ],
-        "es": [
-            "perfecto para festivales", "ideal para ir de clubes", "genial para el día a día", "súper para citas",
-            "increíble para conciertos", "brillante para fiestas", "asombroso para sesiones de fotos", "excelente para eventos"
-        ],
-        "fr": [
-            "parfait pour les festivals", "idéal pour le clubbing", "génial pour tous les jours", "super pour les rendez-vous",
-            "génial pour les concerts", "brillant pour les fêtes", "incroyable pour les séances photo", "excellent pour les événements"
-        ],
-        "it": [
-            "perfetto per i festival", "ideale per il clubbing", "ottimo per tutti i giorni", "super per gli appuntamenti",
-            "fantastico per i concerti", "brillante per le feste", "incredibile per i servizi fotografici", "eccellente per gli eventi"
-        ],
-        "pl": [
-            "idealny na festiwale", "świetny do klubu", "super na co dzień", "genialny na randki",
-            "niesamowity na koncerty", "rewelacyjny na imprezy", "bomba na sesje zdjęciowe", "doskonały na eventy",
-            "optymalny na wyjścia", "najlepszy na celebracje", "wspaniały na spotkania", "wybitny na występy"
-        ],
-        "cs": [
-            "perfektní na festivaly", "ideální na kluby", "skvělý na každý den", "super na rande",
-            "úžasný na koncerty", "brilantní na párty", "bombový na focení", "vynikající na eventy"
-        ]
-    },
-    "personal_reactions": {
-        "de": [
-            "bin komplett verliebt", "könnte nicht glücklicher sein", "übertrifft alle erwartungen",
-            "genau was ich gesucht hab", "besser als erwartet", "macht mich total glücklich",
-            "erfüllt alle wünsche", "bin total begeistert", "hätte nicht gedacht dass es so gut ist",
-            "bin positiv überrascht", "macht richtig spaß zu tragen", "fühle mich super darin"
-        ],
-        "en": [
-            "i'm completely in love", "couldn't be happier", "exceeds all expectations",
-            "exactly what i was looking for", "better than expected", "makes me so happy",
-            "fulfills all wishes", "i'm totally thrilled", "didn't think it would be this good",
-            "i'm positively surprised", "really fun to wear", "feel amazing in it"
-        ],
-        "es": [
-            "estoy completamente enamorada", "no podría estar más feliz", "supera todas las expectativas",
-            "exactamente lo que buscaba", "mejor de lo esperado", "me hace tan feliz",
-            "cumple todos los deseos", "estoy totalmente emocionada", "no pensé que sería tan bueno"
-        ],
-        "fr": [
-            "je suis complètement amoureuse", "je ne pourrais pas être plus heureuse", "dépasse toutes les attentes",
-            "exactement ce que je cherchais", "mieux que prévu", "me rend si heureuse",
-            "remplit tous les souhaits", "je suis totalement ravie", "je ne pensais pas que ce serait si bien"
-        ],
-        "it": [
-            "sono completamente innamorata", "non potrei essere più felice", "supera tutte le aspettative",
-            "esattamente quello che cercavo", "meglio del previsto", "mi rende così felice",
-            "soddisfa tutti i desideri", "sono totalmente entusiasta", "non pensavo sarebbe stato così buono"
-        ],
-        "pl": [
-            "jestem kompletnie zakochana", "nie mogłabym być szczęśliwsza", "przekracza wszystkie oczekiwania",
-            "dokładnie to czego szukałam", "lepsze niż się spodziewałam", "sprawia że jestem taka szczęśliwa",
-            "spełnia wszystkie życzenia", "jestem totalnie zachwycona", "nie myślałam że będzie tak dobre",
-            "jestem pozytywnie zaskoczona", "naprawdę fajnie się nosi", "czuję się w tym super"
-        ],
-        "cs": [
-            "jsem úplně zamilovaná", "nemohla bych být šťastnější", "překonává všechna očekávání",
-            "přesně to co jsem hledala", "lepší než jsem čekala", "dělá mi takovou radost",
-            "splňuje všechna přání", "jsem totálně nadšená", "nemyslela jsem že to bude tak dobré"
-        ]
-    }
-}
+PHRASE_TRACKER = load_phrase_tracking()
 
-# Extended short reviews with more variety
-EXTENDED_SHORT_REVIEWS = {
-    "de": [
-        # Pure German youth expressions with unique cultural flavor
-        "krass gut", "neues lieblingsstück", "sofort gekauft", "total verliebt",
-        "absolut genial", "brauche das in allen farben", "danke fuga für dieses teil", "mein neuer favorit",
-        "bin richtig zufrieden", "fuga ist einfach top", "nimm mein geld", "würde sofort wieder kaufen",
-        "mega zufrieden damit", "genau was ich wollte", "könnte nicht besser sein", "macht mich glücklich",
-        "lebe für diesen style", "einfach perfekt", "total obsessed", "bestelle gleich mehr",
-        "teuer aber jeden cent wert", "qualität überzeugt total", "glück pur", "fashion ziele erreicht",
-        "style komplett verwandelt", "selbstbewusstsein durch die decke", "komplimente garantiert", "outfit highlight",
-        "kleiderschrank essential", "perfekte ergänzung", "style ziele", "fashion gewinn",
-        "sieht teurer aus", "premium qualität", "absolut stunning", "erwartungen übertroffen",
-        "foto ready", "perfekt für anlässe", "ästhetik on point", "traumhaft schön",
-        "basis garderobe", "style investment", "qualität spricht bände", "statement piece",
-        "sofortiger confidence boost", "magnet für komplimente", "outfit perfektion", "style zufriedenheit",
-        "premium feeling", "luxus gefühl", "designer qualität", "absolut gorgeous",
-        "perfekte passform", "genau wie beschrieben", "qualität beeindruckend", "style revolution",
-        "absoluter kaufrausch", "geld gut investiert", "hundert prozent zufrieden", "definitiv empfehlenswert"
-    ],
-    "en": [
-        # Natural youth expressions without forced slang
-        "obsessed with this piece", "new favorite item", "bought instantly", "so happy with this",
-        "absolutely love it", "need this in every color", "thank you fuga for this", "my new go-to piece",
-        "feels so premium", "worth every penny", "take my money", "would buy again instantly",
-        "blessed with this purchase", "exactly what I wanted", "couldn't be happier", "makes me so confident",
-        "living for this style", "no regrets buying this", "obsession level max", "ordering more colors",
-        "expensive but worth it", "quality exceeded expectations", "happiness delivered", "fashion goals achieved",
-        "style transformation complete", "confidence boost secured", "compliments guaranteed", "outfit game strong",
-        "wardrobe essential now", "perfect addition", "style goals", "fashion win",
-        "looks more expensive", "premium quality feel", "absolutely stunning", "exceeded expectations",
-        "photo ready", "perfect for occasions", "aesthetic on point", "vision board material",
-        "wardrobe staple", "style investment", "quality speaks volumes", "fashion statement piece",
-        "instant confidence boost", "compliment magnet", "outfit perfection", "style satisfaction",
-        "premium vibes", "luxury feel", "designer quality", "absolutely gorgeous",
-        "perfect fit achieved", "exactly as described", "quality impressive", "style revolution"
-    ],
-    "es": [
-        "obsesionada con esto", "nueva pieza favorita", "comprado al instante", "muy feliz con esto",
-        "absolutamente genial", "necesito esto en todos los colores", "gracias fuga por esto", "mi nueva obsesión",
-        "calidad increíble", "supremacía fuga", "toma mi dinero", "compraría de nuevo",
-        "perfecta compra", "exactamente lo que quería", "no podría estar más feliz", "me hace tan feliz",
-        "viviendo para este estilo", "sin dudas la mejor compra", "obsesión total", "pidiendo más colores",
-        "caro pero vale la pena", "calidad superó expectativas", "felicidad pura", "objetivos de moda",
-        "transformación completa", "confianza por las nubes", "cumplidos asegurados", "protagonista del outfit",
-        "esencial en el armario", "adición perfecta", "objetivos de estilo", "victoria de moda",
-        "parece más caro", "calidad premium", "absolutamente hermoso", "superó expectativas",
-        "listo para fotos", "perfecto para ocasiones", "estética perfecta", "material de sueños",
-        "básico del guardarropa", "inversión de estilo", "calidad habla por sí", "pieza declaración",
-        "confianza instantánea", "imán de cumplidos", "perfección de outfit", "satisfacción total",
-        "vibras premium", "sensación de lujo", "calidad de diseñador", "absolutamente hermoso",
-        "ajuste perfecto", "exactamente como describían", "calidad impresionante", "revolución de estilo"
-    ],
-    "fr": [
-        # French with Parisian and francophone cultural expressions
-        "obsédée avec cette pièce", "nouvelle pièce préférée", "acheté sans hésiter🔥", "trop contente de cet achat",
-        "vraiment génial", "j'en veux dans tous les coloris", "merci fuga pour cette merveille",
-        "confiance au maximum", "fuga toujours au top", "prends mes sous", "achat réussi à cent pour cent",
-        "super heureuse avec ça", "exactement ce qu'il me fallait", "pile ce que je cherchais", "style qui me va à merveille",
-        "qualité qui déchire", "livraison au poil merci", "taille nickel", "matière très douce",
-        "coupe qui sublime", "couleur de ouf", "finitions au top", "rapport qualité prix imbattable",
-        "finition vraiment propre", "hyper confortable", "style indémodable", "conforme à la description",
-        "zéro regret sur ce coup", "bon placement mode", "pièce incontournable", "tenue complète",
-        "look transformé direct", "boost de confiance assuré", "compliments à gogo", "dressing enrichi",
-        "achat très malin", "qualité de folie", "résultat parfait", "satisfaction maximale"
-    ],
-    "it": [
-        # Italian with authentic Italian expressions and cultural flavor
-        "ossessionata con questo pezzo", "nuovo pezzo del cuore", "comprato subito senza pensarci🔥", "davvero contentissima",
-        "assolutamente fantastico", "lo voglio in tutti i colori", "grazie fuga per questa meraviglia",
-        "autostima alle stelle", "fuga sempre una garanzia", "ecco i miei soldi", "ricomprerei ad occhi chiusi",
-        "felicissima di questo acquisto", "proprio quello che cercavo", "esattamente come lo volevo", "stile che mi calza a pennello",
-        "qualità che spacca", "spedizione rapidissima grazie", "taglia che veste benissimo", "tessuto piacevolissimo",
-        "taglio che valorizza", "colore stupendo", "rifinizioni perfette", "prezzo onestissimo",
-        "lavorazione impeccabile", "comodissimo da portare", "stile intramontabile", "fedele alla descrizione",
-        "acquisto senza pentimenti", "investimento azzeccato", "capo fondamentale", "outfit completato",
-        "look rivoluzionato", "sicurezza raddoppiata", "complimenti a raffica", "armadio valorizzato",
-        "scelta davvero furba", "qualità da urlo", "effetto perfetto", "soddisfazione al massimo"
-    ],
-    "pl": [
-        # Polish with authentic Polish slang and cultural expressions
-        "obsesja z tym elementem", "nowy ulubiony element", "kupione od razu bez zastanowienia🔥", "mega zadowolona",
-        "absolutnie zajebiste", "potrzebuję tego w każdym kolorze", "dzięki fuga za ten cud",
-        "pewność siebie w kosmos", "fuga zawsze strzela w dziesiątkę", "bierz całą kasę", "kupiłabym jeszcze raz bez myślenia",
-        "bardzo szczęśliwa z tym", "dokładnie to o czym marzyłam", "idealnie to co chciałam", "pasuje do mnie jak ulał",
-        "jakość na medal", "paczka przyszła błyskawicznie", "rozmiar perfekcyjny", "materiał super miękki",
-        "krój bardzo schlebiający", "kolor obłędny", "wykończenie na piękę", "cena adekwatna do jakości",
-        "solidnie zrobione", "super wygodne", "styl klasyczny", "wszystko się zgadza z opisem",
-        "nie żałuję ani grosza", "dobra inwestycja", "must have w szafie", "cały outfit gotów",
-        "cały look się zmienił", "pewność siebie poszła w górę", "komplementy lecą seryjnie", "szafa się wzbogaciła",
-        "bardzo przemyślany zakup", "jakość pierwsza klasa", "efekt bombowy", "jestem bardzo zadowolona"
-    ],
-    "cs": [
-        # Czech with authentic Czech expressions and cultural flavor
-        "posedlá tímto kouskem", "nový srdcový kousek", "koupila jsem to hned jak jsem to viděla🔥", "mega spokojená",
-        "absolutně géniovské", "chci to ve všech barvách", "díky fuga za tenhle počin",
-        "sebevědomí až po strop", "fuga prostě vždy zasáhne", "tady máš prachy", "koupila bych to znovu bez přemýšlení",
-        "neskutečně šťastná s tím", "přesně to co jsem si přála", "přesně co jsem potřebovala", "styl co mi sedí jako ulitý",
-        "kvalita na jedničku", "doručeno rychle jako blesk", "velikost sedí pefektně", "látka příjemně hebká",
-        "střih který schlebcuje", "barva je nádherá", "zpracování na výbornou", "cena úměrná kvalitě",
-        "opravdu pořádně udělané", "super pohodlné", "nikdy nevyjde z módy", "vše sedí s popisem",
-        "ani za mák toho nelituju", "dobrá investice", "poklad v šatníku", "outfit mám kompletní",
-        "můj styl se úplně změnil", "cítím se v tom skvěle", "komplimenty jen přišijí", "šatník se rozrostl o skvost",
-        "opravdu rozumný nákup", "kvalita top", "výsledek je super", "jsem maximálně spokojená"
-    ]
-}
+# Per-thread override of PHRASE_TRACKER, see use_phrase_tracker()
+_active_tracker = threading.local()
 
-# Review titles with more variety
-REVIEW_TITLES = {
-    "de": {
-        5: [
-            "Absolut fantastisch!", "Perfektes Produkt!", "Begeistert!", "Übertrifft alle Erwartungen!",
-            "Einfach traumhaft!", "Ein Muss für jeden!", "Kann ich nur empfehlen!", "Bestes Produkt ever!",
-            "Erstklassige Qualität!", "Liebe es!", "Top Produkt!", "Hervorragende Wahl!", "Mega Teil!",
-            "Voll cool!", "Krass gut!", "Einfach nur wow!", "Beste Entscheidung ever!", "Absolut genial!",
-            "Traumhaft schön!", "Überragend!", "Spitzenklasse!", "Unglaublich gut!", "Hammer!",
-            "Bombastisch!", "Phänomenal!", "Außergewöhnlich!", "Grandios!", "Spektakulär!"
-        ],
-        4: [
-            "Sehr gutes Produkt", "Fast perfekt", "Wirklich schön", "Bin sehr zufrieden", "Gute Qualität",
-            "Macht einen tollen Eindruck", "Empfehlenswert", "Positiv überrascht", "Toller Kauf",
-            "Gutes Preis-Leistungs-Verhältnis", "Schönes Design", "Überzeugt mich", "Richtig nice",
-            "Voll gut", "Echt cool", "Gefällt mir sehr", "Ziemlich gut", "Echt gelungen", "Super Sache",
-            "Richtig schön", "Sehr zufriedenstellend", "Klasse Teil", "Echt empfehlenswert"
-        ],
-        3: [
-            "Ganz okay", "Erfüllt seinen Zweck", "Im Großen und Ganzen zufrieden", "Mittelmäßig",
-            "Entspricht den Erwartungen", "Nicht schlecht", "Könnte besser sein", "Durchschnittlich",
-            "Für den Preis in Ordnung", "Brauchbar", "Mittelklasse", "Okay für den Alltag", "Ganz nett",
-            "Passt schon", "Akzeptabel", "Befriedigend", "Standard", "Normal"
-        ]
-    },
-    "en": {
-        5: [
-            "Absolutely amazing!", "Perfect product!", "Love it so much!", "Exceeds all expectations!",
-            "Simply wonderful!", "A must-have!", "Highly recommend!", "Best product ever!",
-            "First-class quality!", "Love it!", "Top product!", "Excellent choice!", "Obsessed with this!",
-            "Literally perfect!", "Totally in love!", "So freaking good!", "Mind-blowing!", "Incredible!",
-            "Outstanding!", "Phenomenal!", "Exceptional!", "Magnificent!", "Spectacular!", "Game changer!",
-            "Life changing!", "Beyond amazing!", "Absolutely stellar!", "Pure perfection!"
-        ],
-        4: [
-            "Very good product", "Almost perfect", "Really nice", "Very satisfied", "Good quality",
-            "Makes a great impression", "Recommendable", "Positively surprised", "Great purchase",
-            "Good value for money", "Beautiful design", "Convincing", "Really cool", "Pretty nice",
-            "Very pleased with it", "Quite good", "Really well done", "Great item", "Pretty awesome",
-            "Very satisfying", "Great piece", "Definitely recommend", "Solid choice"
-        ],
-        3: [
-            "Decent", "Serves its purpose", "Satisfied overall", "Average", "Meets expectations",
-            "Not bad", "Could be better", "Average", "Okay for the price", "Usable", "Middle-range",
-            "Okay for everyday", "Pretty decent", "It's fine", "Acceptable", "Satisfactory", "Standard",
-            "Regular", "Fair enough", "Reasonable"
-        ]
-    },
-    "pl": {
-        5: [
-            "Absolutnie niesamowite!", "Perfekcyjny produkt!", "Kocham to!", "Przekracza wszystkie oczekiwania!",
-            "Po prostu wspaniałe!", "Must-have!", "Gorąco polecam!", "Najlepszy produkt!",
-            "Jakość pierwsza klasa!", "Uwielbiam!", "Topowy produkt!", "Doskonały wybór!", "Obsesja!",
-            "Literalnie perfekcyjne!", "Totalnie zakochana!", "Tak cholernie dobre!", "Niesamowite!", "Niewiarygodne!",
-            "Wybitne!", "Fenomenalne!", "Wyjątkowe!", "Wspaniałe!", "Spektakularne!", "Zmienia grę!",
-            "Zmienia życie!", "Ponad niesamowite!", "Absolutnie genialne!", "Czysta perfekcja!"
-        ],
-        4: [
-            "Bardzo dobry produkt", "Prawie perfekcyjny", "Naprawdę ładny", "Bardzo zadowolona", "Dobra jakość",
-            "Robi świetne wrażenie", "Godny polecenia", "Pozytywnie zaskoczona", "Świetny zakup",
-            "Dobry stosunek jakości do ceny", "Piękny design", "Przekonujący", "Naprawdę fajny", "Całkiem ładny",
-            "Bardzo zadowolona", "Całkiem dobry", "Naprawdę dobrze zrobiony", "Świetna rzecz", "Całkiem niesamowity",
-            "Bardzo satysfakcjonujący", "Świetny element", "Zdecydowanie polecam", "Solidny wybór"
-        ],
-        3: [
-            "W porządku", "Spełnia swoje zadanie", "Ogólnie zadowolona", "Średni", "Spełnia oczekiwania",
-            "Nieźle", "Mogłoby być lepiej", "Przeciętny", "Ok jak na cenę", "Używalny", "Średnia półka",
-            "Ok na co dzień", "Całkiem przyzwoity", "Jest ok", "Akceptowalny", "Satysfakcjonujący", "Standardowy",
-            "Zwykły", "Wystarczająco dobry", "Rozsądny"
-        ]
-    },
-    "cs": {
-        5: [
-            "Absolutně úžasné!", "Perfektní produkt!", "Miluji to!", "Překonává všechna očekávání!",
-            "Prostě nádherné!", "Musíte mít!", "Vřele doporučuji!", "Nejlepší produkt!",
-            "Prvotřídní kvalita!", "Zbožňuji to!", "Top produkt!", "Vynikající volba!", "Posedlost!",
-            "Doslova perfektní!", "Totálně zamilovaná!", "Tak zatraceně dobré!", "Ohromující!", "Neuvěřitelné!",
-            "Vynikající!", "Fenomenální!", "Výjimečné!", "Skvělé!", "Spektakulární!"
-        ],
-        4: [
-            "Velmi dobrý produkt", "Téměř perfektní", "Opravdu pěkné", "Velmi spokojená", "Dobrá kvalita",
-            "Dělá skvělý dojem", "Doporučitelné", "Pozitivně překvapená", "Skvělý nákup",
-            "Dobrý poměr cena/výkon", "Krásný design", "Přesvědčivé", "Opravdu cool", "Docela pěkné",
-            "Velmi spokojená", "Docela dobré", "Opravdu dobře zpracované", "Skvělá věc", "Docela úžasné"
-        ],
-        3: [
-            "V pořádku", "Splňuje svůj účel", "Celkově spokojená", "Průměrné", "Splňuje očekávání",
-            "Není špatné", "Mohlo by být lepší", "Průměrné", "Ok za tu cenu", "Použitelné", "Střední třída",
-            "Ok na každý den", "Docela slušné", "Je to ok", "Přijatelné", "Uspokojivé", "Standardní"
-        ]
-    },
-    "es": {
-        5: [
-            "¡Absolutamente increíble!", "¡Producto perfecto!", "¡Me encanta!", "¡Supera todas las expectativas!",
-            "¡Simplemente maravilloso!", "¡Imprescindible!", "¡Lo recomiendo mucho!", "¡El mejor producto!",
-            "¡Calidad de primera!", "¡Lo amo!", "¡Producto top!", "¡Excelente elección!", "¡Obsesionada con esto!",
-            "¡Literalmente perfecto!", "¡Totalmente enamorada!", "¡Increíblemente bueno!", "¡Espectacular!",
-            "¡Fenomenal!", "¡Excepcional!", "¡Magnífico!", "¡Extraordinario!"
-        ],
-        4: [
-            "Muy buen producto", "Casi perfecto", "Realmente bonito", "Muy satisfecha", "Buena calidad",
-            "Causa una gran impresión", "Recomendable", "Positivamente sorprendida", "Gran compra",
-            "Buena relación calidad-precio", "Diseño hermoso", "Me convence", "Realmente genial",
-            "Bastante bueno", "Muy contenta con esto", "Bastante bueno", "Realmente bien hecho"
-        ],
-        3: [
-            "Decente", "Cumple su propósito", "Satisfecha en general", "Promedio", "Cumple las expectativas",
-            "No está mal", "Podría ser mejor", "Promedio", "Bien por el precio", "Utilizable",
-            "Gama media", "Bien para el día a día", "Bastante decente", "Está bien"
-        ]
-    },
-    "fr": {
-        5: [
-            "Absolument incroyable!", "Produit parfait!", "Je l'adore!", "Dépasse toutes les attentes!",
-            "Tout simplement merveilleux!", "Un incontournable!", "Je le recommande vivement!",
-            "Le meilleur produit!", "Qualité de première classe!", "Je l'aime!", "Produit top!",
-            "Excellent choix!", "Obsédée par ça!", "Littéralement parfait!", "Totalement amoureuse!",
-            "Vraiment génial!", "Spectaculaire!", "Phénoménal!", "Exceptionnel!", "Magnifique!"
-        ],
-        4: [
-            "Très bon produit", "Presque parfait", "Vraiment beau", "Très satisfaite", "Bonne qualité",
-            "Fait une grande impression", "Recommandable", "Positivement surprise", "Excellent achat",
-            "Bon rapport qualité-prix", "Beau design", "Me convainc", "Vraiment cool", "Assez bien",
-            "Très contente", "Assez bon", "Vraiment bien fait"
-        ],
-        3: [
-            "Correct", "Remplit son rôle", "Satisfaite dans l'ensemble", "Moyen", "Répond aux attentes",
-            "Pas mal", "Pourrait être mieux", "Moyen", "Correct pour le prix", "Utilisable",
-            "Milieu de gamme", "Correct pour tous les jours", "Assez correct", "Ça va"
-        ]
-    },
-    "it": {
-        5: [
-            "Assolutamente incredibile!", "Prodotto perfetto!", "Lo adoro!", "Supera tutte le aspettative!",
-            "Semplicemente meraviglioso!", "Un must-have!", "Lo raccomando vivamente!", "Il miglior prodotto!",
-            "Qualità di prima classe!", "Lo amo!", "Prodotto top!", "Scelta eccellente!",
-            "Ossessionata da questo!", "Letteralmente perfetto!", "Totalmente innamorata!",
-            "Davvero fantastico!", "Spettacolare!", "Fenomenale!", "Eccezionale!", "Magnifico!"
-        ],
-        4: [
-            "Prodotto molto buono", "Quasi perfetto", "Davvero bello", "Molto soddisfatta", "Buona qualità",
-            "Fa una grande impressione", "Raccomandabile", "Positivamente sorpresa", "Ottimo acquisto",
-            "Buon rapporto qualità-prezzo", "Design bellissimo", "Mi convince", "Davvero cool",
-            "Abbastanza buono", "Molto contenta", "Abbastanza buono", "Davvero ben fatto"
-        ],
-        3: [
-            "Decente", "Serve al suo scopo", "Soddisfatta nel complesso", "Nella media",
-            "Soddisfa le aspettative", "Non male", "Potrebbe essere meglio", "Nella media",
-            "Va bene per il prezzo", "Utilizzabile", "Fascia media", "Va bene per tutti i giorni",
-            "Abbastanza decente", "Va bene"
-        ]
-    }
-}
+def get_phrase_tracker():
+    """Phrase tracker used by the current thread"""
+    return getattr(_active_tracker, 'tracker', None) or PHRASE_TRACKER
 
-# Additional languages with basic phrases
-ADDITIONAL_LANGUAGES = {
-    "ru": {
-        "greetings": ["привет", "здравствуйте", "добрый день"],
-        "quality": ["качество отличное", "хорошее качество", "качество супер"],
-        "satisfaction": ["очень довольна", "полностью удовлетворена", "счастлива с покупкой"],
-        "recommendation": ["рекомендую", "советую всем", "стоит купить"]
-    },
-    "pl": {
-        "greetings": ["cześć", "dzień dobry", "witam"],
-        "quality": ["jakość świetna", "dobra jakość", "jakość super"],
-        "satisfaction": ["bardzo zadowolona", "w pełni usatysfakcjonowana", "szczęśliwa z zakupu"],
-        "recommendation": ["polecam", "polecam wszystkim", "warto kupić"]
-    },
-    "nl": {
-        "greetings": ["hallo", "goedendag", "hoi"],
-        "quality": ["kwaliteit uitstekend", "goede kwaliteit", "kwaliteit super"],
-        "satisfaction": ["zeer tevreden", "volledig tevreden", "blij met aankoop"],
-        "recommendation": ["aanbevelen", "raad iedereen aan", "de moeite waard"]
-    },
-    "sv": {
-        "greetings": ["hej", "god dag", "hallå"],
-        "quality": ["kvalitet utmärkt", "bra kvalitet", "kvalitet super"],
-        "satisfaction": ["mycket nöjd", "helt nöjd", "glad med köp"],
-        "recommendation": ["rekommenderar", "rekommenderar alla", "värt att köpa"]
-    },
-    "ja": {
-        "greetings": ["こんにちは", "はじめまして"],
-        "quality": ["品質最高", "良い品質", "クオリティ高い"],
-        "satisfaction": ["とても満足", "完全に満足", "購入して良かった"],
-        "recommendation": ["おすすめ", "みんなにおすすめ", "買う価値あり"]
-    },
-    "ko": {
-        "greetings": ["안녕하세요", "안녕"],
-        "quality": ["품질 최고", "좋은 품질", "퀄리티 굿"],
-        "satisfaction": ["매우 만족", "완전 만족", "구매 만족"],
-        "recommendation": ["추천", "모두에게 추천", "살 만한 가치"]
-    },
-    "zh": {
-        "greetings": ["你好", "您好"],
-        "quality": ["质量很好", "品质优秀", "质量超赞"],
-        "satisfaction": ["非常满意", "完全满意", "购买满意"],
-        "recommendation": ["推荐", "推荐给大家", "值得购买"]
-    }
+@contextmanager
+def use_phrase_tracker(tracker):
+    """Route this thread's phrase draws to another tracker, e.g. an isolated one for bulk workers"""
+    previous = getattr(_active_tracker, 'tracker', None)
+    _active_tracker.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        _active_tracker.tracker = previous
+
+# Review components in the order they were listed in the old REVIEW_COMPONENTS dict
+REVIEW_COMPONENT_NAMES = (
+    "opening_reactions", "quality_comments", "fit_comments",
+    "style_comments", "usage_scenarios", "personal_reactions"
+)
+
+# Old all-language tables, now built from the per-language packs on access
+_LEGACY_CORPUS_TABLES = {
+    'EXTENDED_SHORT_REVIEWS': 'short_reviews',
+    'REVIEW_TITLES': 'titles',
+    'ADDITIONAL_LANGUAGES': 'basic_phrases'
 }
 
-def extract_product_features(product, language="en"):
-    """Extract key features from product description for targeted reviews"""
-    title = product.get('title', '').lower()
-    description = product.get('body_html', '').lower() if product.get('body_html') else ''
-    
-    # Remove HTML tags from description
-    import re
-    description = re.sub(r'<[^>]+>', ' ', description)
-    
-    # Combine title and description for analysis
-    content = f"{title} {description}"
-    
-    insights = {
-        'material': [],
-        'style': [],
-        'features': [],
-        'occasions': [],
-        'colors': [],
-        'fit': []
-    }
-    
-    # Material detection
-    materials = {
+def __getattr__(name):
+    """Keep REVIEW_COMPONENTS, REVIEW_TITLES etc. importable for existing callers"""
+    if name == 'REVIEW_COMPONENTS':
+        return {component: build_table(component) for component in REVIEW_COMPONENT_NAMES}
+    if name in _LEGACY_CORPUS_TABLES:
+        return build_table(_LEGACY_CORPUS_TABLES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Keyword tables for product feature detection, keyed by insight type.
+# Label order matters: insights are reported in table order.
+PRODUCT_FEATURE_KEYWORDS = {
+    'material': {
         'cotton': ['cotton', 'baumwolle', 'coton', 'cotone', 'algodón'],
         'polyester': ['polyester', 'poly'],
         'leather': ['leather', 'leder', 'cuir', 'cuero', 'pelle'],
@@ -660,28 +89,16 @@ def extract_product_features(product, language="en"):
         'mesh': ['mesh', 'netz'],
         'velvet': ['velvet', 'samt', 'velours', 'velluto'],
         'satin': ['satin', 'raso']
-    }
-    
-    for material, keywords in materials.items():
-        if any(keyword in content for keyword in keywords):
-            insights['material'].append(material)
-    
-    # Style detection
-    styles = {
+    },
+    'style': {
         'gothic': ['gothic', 'goth', 'dark', 'black', 'dunkel', 'noir', 'nero'],
         'punk': ['punk', 'rock', 'metal', 'spike', 'stud'],
         'vintage': ['vintage', 'retro', 'classic', 'klassisch'],
         'elegant': ['elegant', 'classy', 'sophisticated', 'chic'],
         'casual': ['casual', 'everyday', 'comfort', 'lässig'],
         'party': ['party', 'club', 'night', 'festive', 'celebration']
-    }
-    
-    for style, keywords in styles.items():
-        if any(keyword in content for keyword in keywords):
-            insights['style'].append(style)
-    
-    # Feature detection
-    features = {
+    },
+    'features': {
         'pockets': ['pocket', 'tasche', 'poche', 'tasca', 'bolsillo'],
         'zipper': ['zipper', 'zip', 'reißverschluss', 'cremallera'],
         'buttons': ['button', 'knopf', 'bouton', 'bottone', 'botón'],
@@ -689,27 +106,15 @@ def extract_product_features(product, language="en"):
         'hood': ['hood', 'kapuze', 'capuche', 'cappuccio', 'capucha'],
         'belt': ['belt', 'gürtel', 'ceinture', 'cintura'],
         'adjustable': ['adjustable', 'verstellbar', 'réglable', 'regolabile']
-    }
-    
-    for feature, keywords in features.items():
-        if any(keyword in content for keyword in keywords):
-            insights['features'].append(feature)
-    
-    # Occasions
-    occasions = {
+    },
+    'occasions': {
         'party': ['party', 'club', 'night', 'evening', 'celebration'],
         'casual': ['casual', 'everyday', 'daily', 'comfortable'],
         'work': ['work', 'office', 'professional', 'business'],
         'date': ['date', 'romantic', 'dinner', 'special'],
         'festival': ['festival', 'concert', 'music', 'event']
-    }
-    
-    for occasion, keywords in occasions.items():
-        if any(keyword in content for keyword in keywords):
-            insights['occasions'].append(occasion)
-    
-    # Colors
-    colors = {
+    },
+    'colors': {
         'black': ['black', 'schwarz', 'noir', 'nero', 'negro'],
         'white': ['white', 'weiß', 'blanc', 'bianco', 'blanco'],
         'red': ['red', 'rot', 'rouge', 'rosso', 'rojo'],
@@ -717,1091 +122,226 @@ def extract_product_features(product, language="en"):
         'green': ['green', 'grün', 'vert', 'verde'],
         'purple': ['purple', 'violet', 'lila', 'viola', 'morado'],
         'pink': ['pink', 'rosa', 'rose']
-    }
-    
-    for color, keywords in colors.items():
-        if any(keyword in content for keyword in keywords):
-            insights['colors'].append(color)
-    
-    # Fit information
-    fits = {
+    },
+    'fit': {
         'oversized': ['oversized', 'loose', 'baggy', 'weit'],
         'fitted': ['fitted', 'tight', 'slim', 'eng', 'ajusté'],
         'stretchy': ['stretch', 'elastic', 'flexible', 'dehnbar'],
         'comfortable': ['comfortable', 'comfort', 'bequem', 'confortable']
     }
+}
+
+def _compile_feature_matcher(keyword_tables):
+    """Compile all feature keywords into one alternation regex.
+
+    Every keyword maps to the (insight, label) pairs of all keywords it
+    contains, so a match on 'comfortable' also reports the hits for
+    'comfort'. The lookahead makes matches zero-width, so overlapping
+    keywords starting at different positions are all found in one scan.
+    """
+    keyword_hits = defaultdict(set)
+    for insight, labels in keyword_tables.items():
+        for label, keywords in labels.items():
+            for keyword in keywords:
+                keyword_hits[keyword].add((insight, label))
+    
+    closure = {}
+    for keyword in keyword_hits:
+        hits = set()
+        for other, other_hits in keyword_hits.items():
+            if other in keyword:
+                hits |= other_hits
+        closure[keyword] = frozenset(hits)
+    
+    # Longest first so the alternation prefers the keyword with the most hits
+    alternation = '|'.join(re.escape(k) for k in sorted(closure, key=len, reverse=True))
+    return re.compile(f'(?=({alternation}))'), closure
+
+_FEATURE_PATTERN, _FEATURE_KEYWORD_HITS = _compile_feature_matcher(PRODUCT_FEATURE_KEYWORDS)
+
+# All keywords are plain letter runs, so a keyword can only ever match inside a
+# single word. Descriptions are split into words in one pass (skipping HTML
+# tags, which the old implementation replaced with spaces) and each distinct
+# word is run through the compiled matcher once per process. Words without
+# hits are remembered too, so repeat lookups stay in C-level set operations.
+# The caches are shared by every generating thread and cleared when full, so
+# they are only read and written under _FEATURE_WORDS_LOCK.
+_FEATURE_WORD_PATTERN = re.compile(r'[^\W\d_]+')
+_FEATURE_HTML_WORD_PATTERN = re.compile(r'<[^>]+>|([^\W\d_]+)')
+_FEATURE_WORD_HITS = {}
+_FEATURE_HIT_WORDS = set()
+_FEATURE_SEEN_WORDS = set()
+_FEATURE_WORD_CACHE_LIMIT = 100000
+_FEATURE_WORDS_LOCK = threading.Lock()
+
+def _learn_feature_words(words):
+    """
+    Run the compiled matcher over the words not seen before; call with _FEATURE_WORDS_LOCK held
     
-    for fit, keywords in fits.items():
-        if any(keyword in content for keyword in keywords):
-            insights['fit'].append(fit)
-    
-    return insights
+    The caches are cleared first when the new words would overflow them,
+    and then all of words are learned, so the caller's lookup finds them.
+    """
+    unseen = words - _FEATURE_SEEN_WORDS
+    if not unseen:
+        return
+    if len(_FEATURE_SEEN_WORDS) + len(unseen) > _FEATURE_WORD_CACHE_LIMIT:
+        _FEATURE_SEEN_WORDS.clear()
+        _FEATURE_HIT_WORDS.clear()
+        _FEATURE_WORD_HITS.clear()
+        unseen = words
+    for word in unseen:
+        hits = set()
+        for match in _FEATURE_PATTERN.finditer(word):
+            hits |= _FEATURE_KEYWORD_HITS[match.group(1)]
+        if hits:
+            _FEATURE_WORD_HITS[word] = frozenset(hits)
+            _FEATURE_HIT_WORDS.add(word)
+        _FEATURE_SEEN_WORDS.add(word)
 
-def generate_product_specific_comment(product_insights, language="en"):
-    """Generate comments based on actual product features with anti-repetition"""
-    comments = []
+def extract_product_features(product, language="en"):
+    """Extract key features from product description for targeted reviews"""
+    title = product.get('title', '').lower()
+    description = product.get('body_html', '').lower() if product.get('body_html') else ''
     
-    # Material comments with variety and tracking
-    if product_insights['material']:
-        material_phrases = {
-            'de': {
-                'cotton': [
-                    'aus Baumwolle und super angenehm', 'Baumwoll-Material fühlt sich toll an', 
-                    'Baumwolle ist mega comfortable', 'tolles Baumwoll-Gefühl auf der Haut',
-                    'weiche Baumwolle liebt die Haut', 'Baumwolle in bester Qualität'
-                ],
-                'leather': [
-                    'Leder fühlt sich hochwertig an', 'echtes Leder in top Qualität',
-                    'Lederverarbeitung ist erstklassig', 'das Leder riecht so gut',
-                    'hochwertiges Leder überzeugt total', 'Leder wirkt sehr edel'
-                ],
-                'lace': [
-                    'die Spitze ist wunderschön verarbeitet', 'Spitzen-Details sind ein Traum',
-                    'Spitze verleiht den perfect touch', 'edle Spitze macht den Unterschied',
-                    'filigrane Spitzenarbeit beeindruckt', 'Spitze sieht richtig teuer aus'
-                ],
-                'denim': [
-                    'Denim Qualität ist top', 'perfekter Jeansstoff mit tollem Fall',
-                    'Denim hat die ideale Dicke', 'hochwertiger Jeansstoff überzeugt',
-                    'Denim fühlt sich authentisch an', 'klassischer Denim in bester Qualität'
-                ],
-                'velvet': [
-                    'Samt fühlt sich luxuriös an', 'samtweich und total edel',
-                    'Velvet bringt Luxus-Feeling', 'Samt-Material ist ein Traum',
-                    'weicher Samt strahlt Eleganz aus', 'Samtoberfläche ist butterweich'
-                ]
-            },
-            'en': {
-                'cotton': [
-                    'cotton feels so comfortable', 'cotton material is amazing quality',
-                    'soft cotton against the skin', 'breathable cotton fabric',
-                    'premium cotton construction', 'cotton texture is perfect'
-                ],
-                'leather': [
-                    'leather quality is amazing', 'genuine leather feels luxurious',
-                    'leather craftsmanship is top-tier', 'leather has that rich smell',
-                    'high-quality leather throughout', 'leather looks expensive'
-                ],
-                'lace': [
-                    'lace detailing is gorgeous', 'lace work is intricate and beautiful',
-                    'delicate lace adds perfect touch', 'lace pattern is stunning',
-                    'fine lace craftsmanship shows', 'lace details elevate the whole piece'
-                ],
-                'denim': [
-                    'denim is perfect weight', 'denim quality exceeds expectations',
-                    'substantial denim fabric', 'authentic denim feel',
-                    'premium denim construction', 'denim has great structure'
-                ],
-                'velvet': [
-                    'velvet texture is so soft', 'luxurious velvet material',
-                    'velvet adds elegance', 'plush velvet finish',
-                    'rich velvet texture', 'velvet feels expensive'
-                ]
-            },
-            'pl': {
-                'cotton': [
-                    'bawełna jest bardzo wygodna', 'materiał bawełniany w super jakości',
-                    'miękka bawełna na skórze', 'oddychająca tkanina bawełniana',
-                    'premium bawełna zachwyca', 'bawełna ma idealną strukturę'
-                ],
-                'leather': [
-                    'skóra jest wysokiej jakości', 'prawdziwa skóra luksusowa',
-                    'rzemiosło skórzane na najwyższym poziomie', 'skóra ma bogaty zapach',
-                    'wysokiej jakości skóra wszędzie', 'skóra wygląda drogo'
-                ],
-                'lace': [
-                    'koronka jest pięknie wykonana', 'koronkowa robota jest skomplikowana i piękna',
-                    'delikatna koronka dodaje idealny akcent', 'wzór koronki jest oszałamiający',
-                    'subtelne rzemiosło koronkowe', 'detale koronkowe podnoszą całość'
-                ],
-                'denim': [
-                    'denim ma idealną wagę', 'jakość denimu przewyższa oczekiwania',
-                    'solidna tkanina denim', 'autentyczne uczucie denimu',
-                    'premium konstrukcja denim', 'denim ma świetną strukturę'
-                ],
-                'velvet': [
-                    'aksamit jest tak miękki', 'luksusowy materiał aksamitny',
-                    'aksamit dodaje elegancji', 'pluszowe wykończenie aksamitne',
-                    'bogata tekstura aksamitu', 'aksamit wydaje się drogi'
-                ]
-            },
-            'it': {
-                'cotton': [
-                    'cotone molto confortevole', 'materiale cotone qualità eccellente',
-                    'cotone morbido sulla pelle', 'tessuto cotone traspirante',
-                    'cotone premium stupendo', 'cotone texture perfetta'
-                ],
-                'leather': [
-                    'pelle di ottima qualità', 'pelle genuina lussuosa',
-                    'lavorazione pelle di alto livello', 'pelle profumo ricco',
-                    'pelle alta qualità ovunque', 'pelle sembra costosa'
-                ],
-                'lace': [
-                    'pizzo bellissimo', 'lavorazione pizzo intricata e bella',
-                    'pizzo delicato aggiunge tocco perfetto', 'motivo pizzo stupendo',
-                    'artigianato pizzo sottile', 'dettagli pizzo elevano tutto'
-                ],
-                'denim': [
-                    'denim peso perfetto', 'qualità denim supera aspettative',
-                    'tessuto denim sostanziale', 'sensazione denim autentica',
-                    'costruzione denim premium', 'denim struttura ottima'
-                ],
-                'velvet': [
-                    'velluto così morbido', 'materiale velluto lussuoso',
-                    'velluto aggiunge eleganza', 'finitura velluto morbida',
-                    'texture velluto ricca', 'velluto sembra costoso'
-                ]
-            },
-            'fr': {
-                'cotton': [
-                    'coton très confortable', 'matériau coton qualité excellente',
-                    'coton doux sur la peau', 'tissu coton respirant',
-                    'coton premium magnifique', 'coton texture parfaite'
-                ],
-                'leather': [
-                    'cuir de qualité incroyable', 'cuir véritable luxueux',
-                    'artisanat cuir haut niveau', 'cuir odeur riche',
-                    'cuir haute qualité partout', 'cuir semble cher'
-                ],
-                'lace': [
-                    'dentelle magnifique', 'travail dentelle complexe et beau',
-                    'dentelle délicate ajoute touche parfaite', 'motif dentelle époustouflant',
-                    'artisanat dentelle fin', 'détails dentelle élèvent tout'
-                ],
-                'denim': [
-                    'denim poids parfait', 'qualité denim dépasse attentes',
-                    'tissu denim substantiel', 'sensation denim authentique',
-                    'construction denim premium', 'denim excellente structure'
-                ],
-                'velvet': [
-                    'velours si doux', 'matériau velours luxueux',
-                    'velours ajoute élégance', 'finition velours moelleuse',
-                    'texture velours riche', 'velours semble cher'
-                ]
-            },
-            'es': {
-                'cotton': [
-                    'algodón muy cómodo', 'material algodón calidad excelente',
-                    'algodón suave en la piel', 'tejido algodón transpirable',
-                    'algodón premium magnífico', 'algodón textura perfecta'
-                ],
-                'leather': [
-                    'cuero de calidad increíble', 'cuero genuino lujoso',
-                    'artesanía cuero alto nivel', 'cuero olor rico',
-                    'cuero alta calidad en todo', 'cuero parece caro'
-                ],
-                'lace': [
-                    'encaje hermoso', 'trabajo encaje intrincado y bello',
-                    'encaje delicado añade toque perfecto', 'patrón encaje impresionante',
-                    'artesanía encaje fino', 'detalles encaje elevan todo'
-                ],
-                'denim': [
-                    'denim peso perfecto', 'calidad denim supera expectativas',
-                    'tejido denim sustancial', 'sensación denim auténtica',
-                    'construcción denim premium', 'denim excelente estructura'
-                ],
-                'velvet': [
-                    'terciopelo tan suave', 'material terciopelo lujoso',
-                    'terciopelo añade elegancia', 'acabado terciopelo suave',
-                    'textura terciopelo rica', 'terciopelo parece caro'
-                ]
-            },
-            'cs': {
-                'cotton': [
-                    'bavlna velmi pohodlná', 'bavlněný materiál vynikající kvality',
-                    'bavlna měkká na kůži', 'bavlněná látka prodyšná',
-                    'prémiová bavlna nádherná', 'bavlna textura dokonalá'
-                ],
-                'leather': [
-                    'kůže skvělé kvality', 'pravá kůže luxusní',
-                    'kožené řemeslo vysoké úrovně', 'kůže bohatá vůně',
-                    'vysoká kvalita kůže všude', 'kůže vypadá draho'
-                ],
-                'lace': [
-                    'krajka nádherná', 'krajková práce složitá a krásná',
-                    'jemná krajka dodává dokonalý dotek', 'vzor krajky úžasný',
-                    'jemné krajkové řemeslo', 'detaily krajky povyšují vše'
-                ],
-                'denim': [
-                    'denim perfektní váha', 'kvalita denim překračuje očekávání',
-                    'podstatná džínová látka', 'autentický pocit denim',
-                    'prémiová konstrukce denim', 'denim vynikající struktura'
-                ],
-                'velvet': [
-                    'samet tak měkký', 'luxusní sametový materiál',
-                    'samet dodává eleganci', 'plyšové sametové povrchová úprava',
-                    'bohatá sametová textura', 'samet vypadá draho'
-                ]
-            }
-        }
-        
-        for material in product_insights['material']:
-            lang_phrases = material_phrases.get(language, material_phrases['en'])
-            if material in lang_phrases:
-                phrase = get_unique_phrase(lang_phrases[material], language, f"material_{material}")
-                if phrase:
-                    comments.append(phrase)
+    # Collect distinct words from title and description (tags are dropped)
+    words = set(_FEATURE_WORD_PATTERN.findall(title))
+    words.update(_FEATURE_HTML_WORD_PATTERN.findall(description))
+    words.discard('')
     
-    # Feature comments with variety and tracking
-    if product_insights['features']:
-        feature_phrases = {
-            'de': {
-                'pockets': [
-                    'Taschen sind praktisch', 'die Taschen sind mega funktional',
-                    'praktische Taschen erleichtern alles', 'Taschen perfekt platziert',
-                    'genügend Taschen für alles wichtige', 'durchdachte Taschen-Lösung'
-                ],
-                'zipper': [
-                    'Reißverschluss läuft smooth', 'Zipper Qualität überzeugt total',
-                    'Reißverschluss funktioniert einwandfrei', 'hochwertiger Zipper verbaut',
-                    'Reißverschluss läuft wie Butter', 'stabiler Zipper hält ewig'
-                ],
-                'hood': [
-                    'Kapuze ist perfekt geschnitten', 'Hoodie-Form sitzt ideal',
-                    'Kapuze bietet optimalen Schutz', 'Kapuze hat die richtige Größe',
-                    'Kapuze fällt schön natürlich', 'durchdachte Kapuzen-Konstruktion'
-                ],
-                'sleeves': [
-                    'Ärmel haben die perfekte Länge', 'Ärmellänge sitzt genau richtig',
-                    'Ärmel enden an der idealen Stelle', 'Ärmel-Schnitt überzeugt',
-                    'Ärmellänge passt wie angegossen', 'Ärmel sind optimal proportioniert'
-                ]
-            },
-            'en': {
-                'pockets': [
-                    'pockets are so useful', 'pockets functionality is amazing',
-                    'practical pockets make life easier', 'pockets perfectly placed',
-                    'enough pockets for all essentials', 'thoughtful pocket design'
-                ],
-                'zipper': [
-                    'zipper quality is great', 'zipper operates smoothly',
-                    'zipper works flawlessly', 'high-quality zipper hardware',
-                    'zipper glides like butter', 'sturdy zipper built to last'
-                ],
-                'hood': [
-                    'hood fits perfectly', 'hoodie shape sits ideally',
-                    'hood provides optimal coverage', 'hood has the right proportions',
-                    'hood drapes naturally', 'thoughtful hood construction'
-                ],
-                'sleeves': [
-                    'sleeve length is perfect', 'sleeve length sits just right',
-                    'sleeves end at ideal spot', 'sleeve cut is convincing',
-                    'sleeve length fits like a glove', 'sleeves optimally proportioned'
-                ]
-            },
-            'pl': {
-                'pockets': [
-                    'kieszenie są bardzo praktyczne', 'funkcjonalność kieszeni jest niesamowita',
-                    'praktyczne kieszenie ułatwiają życie', 'kieszenie idealnie umieszczone',
-                    'wystarczająco kieszeni na wszystko', 'przemyślany design kieszeni'
-                ],
-                'zipper': [
-                    'zamek błyskawiczny działa świetnie', 'zamek błyskawiczny działa gładko',
-                    'zamek błyskawiczny działa bez zarzutu', 'wysokiej jakości hardware zamka',
-                    'zamek ślizga się jak masło', 'mocny zamek zbudowany na lata'
-                ],
-                'hood': [
-                    'kaptur pasuje idealnie', 'kształt bluzy siedzi idealnie',
-                    'kaptur zapewnia optymalne pokrycie', 'kaptur ma właściwe proporcje',
-                    'kaptur układa się naturalnie', 'przemyślana konstrukcja kaptura'
-                ],
-                'sleeves': [
-                    'długość rękawów jest idealna', 'długość rękawów siedzi w sam raz',
-                    'rękawy kończą się w idealnym miejscu', 'krój rękawów przekonuje',
-                    'długość rękawów pasuje jak ulał', 'rękawy optymalnie proporcjonalne'
-                ]
-            },
-            'it': {
-                'pockets': [
-                    'tasche molto utili', 'funzionalità tasche incredibile',
-                    'tasche pratiche rendono vita più facile', 'tasche perfettamente posizionate',
-                    'abbastanza tasche per tutto essenziale', 'design tasche ponderato'
-                ],
-                'zipper': [
-                    'qualità della cerniera ottima', 'cerniera funziona liscia',
-                    'cerniera funziona perfettamente', 'hardware cerniera alta qualità',
-                    'cerniera scivola come burro', 'cerniera robusta costruita per durare'
-                ],
-                'hood': [
-                    'cappuccio veste perfettamente', 'forma felpa siedeidealmente',
-                    'cappuccio fornisce copertura ottimale', 'cappuccio ha proporzioni giuste',
-                    'cappuccio cade naturalmente', 'costruzione cappuccio ponderata'
-                ],
-                'sleeves': [
-                    'lunghezza maniche perfetta', 'lunghezza maniche siede giusto',
-                    'maniche finiscono punto ideale', 'taglio maniche convincente',
-                    'lunghezza maniche calza guanto', 'maniche ottimamente proporzionate'
-                ]
-            },
-            'fr': {
-                'pockets': [
-                    'poches très utiles', 'fonctionnalité poches incroyable',
-                    'poches pratiques facilitent vie', 'poches parfaitement placées',
-                    'assez poches pour tout essentiel', 'design poches réfléchi'
-                ],
-                'zipper': [
-                    'qualité de la fermeture éclair excellente', 'fermeture éclair fonctionne lisse',
-                    'fermeture éclair fonctionne parfaitement', 'hardware fermeture éclair haute qualité',
-                    'fermeture éclair glisse comme beurre', 'fermeture éclair robuste construite durer'
-                ],
-                'hood': [
-                    'capuche s\'ajuste parfaitement', 'forme sweat siège idéalement',
-                    'capuche fournit couverture optimale', 'capuche a bonnes proportions',
-                    'capuche tombe naturellement', 'construction capuche réfléchie'
-                ],
-                'sleeves': [
-                    'longueur des manches parfaite', 'longueur manches siège juste',
-                    'manches finissent endroit idéal', 'coupe manches convaincante',
-                    'longueur manches ajuste gant', 'manches optimalement proportionnées'
-                ]
-            },
-            'es': {
-                'pockets': [
-                    'bolsillos muy útiles', 'funcionalidad bolsillos increíble',
-                    'bolsillos prácticos facilitan vida', 'bolsillos perfectamente ubicados',
-                    'suficientes bolsillos para todo esencial', 'diseño bolsillos considerado'
-                ],
-                'zipper': [
-                    'calidad de la cremallera excelente', 'cremallera funciona suave',
-                    'cremallera funciona perfectamente', 'hardware cremallera alta calidad',
-                    'cremallera desliza como mantequilla', 'cremallera robusta construida durar'
-                ],
-                'hood': [
-                    'capucha ajusta perfectamente', 'forma sudadera sienta idealmente',
-                    'capucha proporciona cobertura óptima', 'capucha tiene proporciones correctas',
-                    'capucha cae naturalmente', 'construcción capucha considerada'
-                ],
-                'sleeves': [
-                    'longitud de mangas perfecta', 'longitud mangas sienta justo',
-                    'mangas terminan lugar ideal', 'corte mangas convincente',
-                    'longitud mangas ajusta guante', 'mangas óptimamente proporcionadas'
-                ]
-            },
-            'cs': {
-                'pockets': [
-                    'kapsy velmi praktické', 'funkcionalita kapes neuvěřitelná',
-                    'praktické kapsy usnadňují život', 'kapsy dokonale umístěné',
-                    'dostatek kapes pro vše podstatné', 'promyšlený design kapes'
-                ],
-                'zipper': [
-                    'kvalita zipu vynikající', 'zip funguje hladce',
-                    'zip funguje bezchybně', 'hardware zip vysoká kvalita',
-                    'zip klouzá jako máslo', 'robustní zip postavený vydržet'
-                ],
-                'hood': [
-                    'kapuce sedí dokonale', 'tvar mikiny sedí ideálně',
-                    'kapuce poskytuje optimální pokrytí', 'kapuce má správné proporce',
-                    'kapuce padá přirozeně', 'promyšlená konstrukce kapuce'
-                ],
-                'sleeves': [
-                    'délka rukávů perfektní', 'délka rukávů sedí správně',
-                    'rukávy končí ideálním místě', 'střih rukávů přesvědčivý',
-                    'délka rukávů sedí jako rukavice', 'rukávy optimálně proporcionální'
-                ]
-            }
-        }
-        
-        for feature in product_insights['features']:
-            lang_phrases = feature_phrases.get(language, feature_phrases['en'])
-            if feature in lang_phrases:
-                phrase = get_unique_phrase(lang_phrases[feature], language, f"feature_{feature}")
-                if phrase:
-                    comments.append(phrase)
+    hits = set()
+    with _FEATURE_WORDS_LOCK:
+        _learn_feature_words(words)
+        for word in words & _FEATURE_HIT_WORDS:
+            hits.update(_FEATURE_WORD_HITS[word])
     
-    # Style comments with variety and tracking  
-    if product_insights['style']:
-        style_phrases = {
-            'de': {
-                'gothic': [
-                    'der Gothic Style ist genau mein Ding', 'Gothic Ästhetik trifft meinen Geschmack',
-                    'düstere Eleganz überzeugt total', 'Gothic Vibe ist authentisch dark',
-                    'perfekte Gothic Atmosphäre eingefangen', 'dark aesthetic passt perfect zu mir'
-                ],
-                'punk': [
-                    'Punk Vibe ist authentisch', 'echter Punk Spirit spürbar',
-                    'rebellische Energie strahlt aus', 'Punk Ästhetik on point',
-                    'raw punk attitude eingefangen', 'underground Feeling perfekt getroffen'
-                ],
-                'vintage': [
-                    'Vintage Look ist zeitlos', 'retro Charme überzeugt',
-                    'nostalgischer Vibe trifft genau', 'vintage Ästhetik perfekt umgesetzt',
-                    'klassischer vintage spirit', 'zeitlose Eleganz eingefangen'
-                ],
-                'elegant': [
-                    'elegant und raffiniert', 'sophisticated und stilvoll',
-                    'edle Ausstrahlung guaranteed', 'klassische Eleganz überzeugt',
-                    'zeitlos elegant designed', 'noble Ästhetik perfect'
-                ]
-            },
-            'en': {
-                'gothic': [
-                    'gothic aesthetic is perfect', 'gothic vibe hits different',
-                    'dark elegance captured beautifully', 'authentic gothic atmosphere',
-                    'gothic mood perfectly executed', 'dark aesthetic speaks to my soul'
-                ],
-                'punk': [
-                    'punk vibe is authentic', 'real punk spirit shines through',
-                    'rebellious energy radiates', 'punk aesthetic on point',
-                    'raw punk attitude captured', 'underground feeling perfectly hit'
-                ],
-                'vintage': [
-                    'vintage style is timeless', 'retro charm convinces',
-                    'nostalgic vibe hits exactly', 'vintage aesthetic perfectly executed',
-                    'classic vintage spirit', 'timeless elegance captured'
-                ],
-                'elegant': [
-                    'elegant and classy', 'sophisticated and stylish',
-                    'refined aura guaranteed', 'classic elegance convinces',
-                    'timelessly elegant designed', 'noble aesthetic perfect'
-                ]
-            },
-            'pl': {
-                'gothic': [
-                    'gotycki styl jest idealny', 'gotycki klimat trafia inaczej',
-                    'mroczna elegancja pięknie uchwycona', 'autentyczna gotycka atmosfera',
-                    'gotycki nastrój perfekcyjnie wykonany', 'mroczna estetyka przemawia do duszy'
-                ],
-                'punk': [
-                    'punkowy klimat jest autentyczny', 'prawdziwy duch punk świeci',
-                    'buntownicza energia promieniuje', 'estetyka punk na miejscu',
-                    'surowa postawa punk uchwycona', 'podziemne uczucie idealnie trafione'
-                ],
-                'vintage': [
-                    'vintage styl jest ponadczasowy', 'retro urok przekonuje',
-                    'nostalgiczny klimat trafia dokładnie', 'vintage estetyka perfekcyjnie wykonana',
-                    'klasyczny vintage duch', 'ponadczasowa elegancja uchwycona'
-                ],
-                'elegant': [
-                    'elegancki i stylowy', 'wyrafinowany i stylowy',
-                    'wyrafinowana aura gwarantowana', 'klasyczna elegancja przekonuje',
-                    'ponadczasowo elegancko zaprojektowany', 'szlachetna estetyka idealna'
-                ]
-            },
-            'it': {
-                'gothic': [
-                    'estetica gotica è perfetta', 'vibe gotico colpisce diversamente',
-                    'eleganza oscura catturata bellamente', 'atmosfera gotica autentica',
-                    'umore gotico perfettamente eseguito', 'estetica oscura parla anima'
-                ],
-                'punk': [
-                    'vibe punk è autentico', 'vero spirito punk risplende',
-                    'energia ribelle irradia', 'estetica punk sul punto',
-                    'atteggiamento punk crudo catturato', 'sensazione underground perfettamente colpita'
-                ],
-                'vintage': [
-                    'stile vintage è senza tempo', 'fascino retro convince',
-                    'vibe nostalgico colpisce esattamente', 'estetica vintage perfettamente eseguita',
-                    'spirito vintage classico', 'eleganza senza tempo catturata'
-                ],
-                'elegant': [
-                    'elegante e di classe', 'sofisticato e elegante',
-                    'aura raffinata garantita', 'eleganza classica convince',
-                    'elegantemente senza tempo progettato', 'estetica nobile perfetta'
-                ]
-            },
-            'fr': {
-                'gothic': [
-                    'esthétique gothique est parfaite', 'vibe gothique frappe différemment',
-                    'élégance sombre capturée magnifiquement', 'atmosphère gothique authentique',
-                    'humeur gothique parfaitement exécutée', 'esthétique sombre parle âme'
-                ],
-                'punk': [
-                    'vibe punk est authentique', 'vrai esprit punk brille',
-                    'énergie rebelle rayonne', 'esthétique punk sur point',
-                    'attitude punk brute capturée', 'sensation underground parfaitement frappée'
-                ],
-                'vintage': [
-                    'style vintage est intemporel', 'charme rétro convainc',
-                    'vibe nostalgique frappe exactement', 'esthétique vintage parfaitement exécutée',
-                    'esprit vintage classique', 'élégance intemporelle capturée'
-                ],
-                'elegant': [
-                    'élégant et chic', 'sophistiqué et élégant',
-                    'aura raffinée garantie', 'élégance classique convainc',
-                    'élégamment intemporel conçu', 'esthétique noble parfaite'
-                ]
-            },
-            'es': {
-                'gothic': [
-                    'estética gótica es perfecta', 'vibe gótico golpea diferente',
-                    'elegancia oscura capturada hermosamente', 'atmósfera gótica auténtica',
-                    'estado ánimo gótico perfectamente ejecutado', 'estética oscura habla alma'
-                ],
-                'punk': [
-                    'vibe punk es auténtico', 'verdadero espíritu punk brilla',
-                    'energía rebelde irradia', 'estética punk en punto',
-                    'actitud punk cruda capturada', 'sensación underground perfectamente golpeada'
-                ],
-                'vintage': [
-                    'estilo vintage es atemporal', 'encanto retro convence',
-                    'vibe nostálgico golpea exactamente', 'estética vintage perfectamente ejecutada',
-                    'espíritu vintage clásico', 'elegancia atemporal capturada'
-                ],
-                'elegant': [
-                    'elegante y con clase', 'sofisticado y elegante',
-                    'aura refinada garantizada', 'elegancia clásica convence',
-                    'elegantemente atemporal diseñado', 'estética noble perfecta'
-                ]
-            },
-            'cs': {
-                'gothic': [
-                    'gotický styl je perfektní', 'gotický vibe zasahuje jinak',
-                    'temná elegance krásně zachycena', 'autentická gotická atmosféra',
-                    'gotická nálada dokonale provedena', 'temná estetika mluví k duši'
-                ],
-                'punk': [
-                    'punkový vibe je autentický', 'skutečný punk duch svítí',
-                    'rebelská energie vyzařuje', 'punk estetika na místě',
-                    'surový punk postoj zachycen', 'underground pocit dokonale zasažen'
-                ],
-                'vintage': [
-                    'vintage styl je nadčasový', 'retro kouzlo přesvědčuje',
-                    'nostalgický vibe zasahuje přesně', 'vintage estetika dokonale provedena',
-                    'klasický vintage duch', 'nadčasová elegance zachycena'
-                ],
-                'elegant': [
-                    'elegantní a stylový', 'sofistikovaný a stylový',
-                    'rafinovaná aura zaručena', 'klasická elegance přesvědčuje',
-                    'nadčasově elegantně navrženo', 'ušlechtilá estetika dokonalá'
-                ]
-            }
-        }
-        
-        for style in product_insights['style']:
-            lang_phrases = style_phrases.get(language, style_phrases['en'])
-            if style in lang_phrases:
-                phrase = get_unique_phrase(lang_phrases[style], language, f"style_{style}")
-                if phrase:
-                    comments.append(phrase)
+    insights = {}
+    for insight, labels in PRODUCT_FEATURE_KEYWORDS.items():
+        insights[insight] = [label for label in labels if (insight, label) in hits]
     
-    # Fit comments with variety and tracking
-    if product_insights['fit']:
-        fit_phrases = {
-            'de': {
-                'oversized': [
-                    'oversized Fit ist mega gemütlich', 'lockerer Schnitt sitzt perfekt',
-                    'oversized Style bringt Komfort', 'weiter Schnitt ist so bequem',
-                    'relaxed Fit ist super bequem', 'oversized Schnitt ist perfekt'
-                ],
-                'fitted': [
-                    'tailliert und schmeichelt der Figur', 'enger Schnitt betont Silhouette',
-                    'figurbetont und mega schmeichelnd', 'perfekt anliegend geschnitten',
-                    'körpernah und vorteilhaft', 'fitted Style zeigt tolle Form'
-                ],
-                'stretchy': [
-                    'Material ist schön dehnbar', 'elastischer Stoff gibt nach',
-                    'stretch Material bewegt sich mit', 'dehnbares Gewebe ist angenehm',
-                    'flexible Materialien überzeugen', 'stretch Eigenschaft ist perfekt'
-                ],
-                'comfortable': [
-                    'unglaublich bequem zu tragen', 'so comfortable den ganzen Tag',
-                    'mega gemütlich und weich', 'trägt sich wie eine zweite Haut',
-                    'comfort Level ist outstanding', 'bequemer geht es nicht'
-                ]
-            },
-            'en': {
-                'oversized': [
-                    'oversized fit is so comfy', 'loose cut fits perfectly',
-                    'oversized style brings comfort', 'relaxed fit feels amazing',
-                    'roomy fit accommodates everything', 'oversized silhouette works great'
-                ],
-                'fitted': [
-                    'fitted perfectly to my body', 'snug cut emphasizes silhouette',
-                    'form-fitting and flattering', 'perfectly contoured design',
-                    'body-hugging and advantageous', 'fitted style shows great shape'
-                ],
-                'stretchy': [
-                    'material has great stretch', 'elastic fabric gives flexibility',
-                    'stretch material moves with you', 'stretchable fabric feels nice',
-                    'flexible materials convince', 'stretch property is perfect'
-                ],
-                'comfortable': [
-                    'incredibly comfortable to wear', 'so comfortable all day long',
-                    'extremely cozy and soft', 'wears like a second skin',
-                    'comfort level is outstanding', 'can\'t get more comfortable'
-                ]
-            },
-            'pl': {
-                'oversized': [
-                    'oversized krój jest bardzo wygodny', 'luźny krój pasuje idealnie',
-                    'oversized styl zapewnia komfort', 'relaxed fit czuje się niesamowicie',
-                    'przestronny krój pomieści wszystko', 'oversized sylwetka działa świetnie'
-                ],
-                'fitted': [
-                    'dopasowany idealnie do ciała', 'obcisły krój podkreśla sylwetkę',
-                    'dopasowany i schlebiający', 'perfekcyjnie wyprofilowany design',
-                    'przylegający do ciała i korzystny', 'dopasowany styl pokazuje świetny kształt'
-                ],
-                'stretchy': [
-                    'materiał ma świetną elastyczność', 'elastyczna tkanina daje elastyczność',
-                    'stretch materiał porusza się z tobą', 'rozciągliwa tkanina jest miła',
-                    'elastyczne materiały przekonują', 'właściwość stretch jest idealna'
-                ],
-                'comfortable': [
-                    'niesamowicie wygodny do noszenia', 'tak wygodny przez cały dzień',
-                    'bardzo przytulny i miękki', 'nosi się jak druga skóra',
-                    'poziom komfortu jest wspaniały', 'nie może być wygodniej'
-                ]
-            },
-            'it': {
-                'oversized': [
-                    'vestibilità oversized è comoda', 'taglio largo veste perfettamente',
-                    'stile oversized porta comfort', 'vestibilità rilassata è incredibile',
-                    'taglio spazioso accoglie tutto', 'silhouette oversized funziona benissimo'
-                ],
-                'fitted': [
-                    'aderente perfettamente al corpo', 'taglio aderente enfatizza silhouette',
-                    'aderente e lusinghiero', 'design perfettamente sagomato',
-                    'aderente al corpo e vantaggioso', 'stile aderente mostra forma ottima'
-                ],
-                'stretchy': [
-                    'materiale ha ottima elasticità', 'tessuto elastico dà flessibilità',
-                    'materiale stretch si muove con te', 'tessuto estensibile è piacevole',
-                    'materiali flessibili convincono', 'proprietà stretch è perfetta'
-                ],
-                'comfortable': [
-                    'incredibilmente comodo da indossare', 'così comodo tutto il giorno',
-                    'estremamente accogliente e morbido', 'indossa come seconda pelle',
-                    'livello comfort è eccezionale', 'non può essere più comodo'
-                ]
-            },
-            'fr': {
-                'oversized': [
-                    'coupe oversized est confortable', 'coupe ample s\'ajuste parfaitement',
-                    'style oversized apporte confort', 'coupe décontractée est incroyable',
-                    'coupe spacieuse accueille tout', 'silhouette oversized fonctionne très bien'
-                ],
-                'fitted': [
-                    'ajusté parfaitement au corps', 'coupe ajustée met en valeur silhouette',
-                    'ajusté et flatteur', 'design parfaitement galbé',
-                    'près du corps et avantageux', 'style ajusté montre belle forme'
-                ],
-                'stretchy': [
-                    'matériau a une grande élasticité', 'tissu élastique donne flexibilité',
-                    'matériau stretch bouge avec vous', 'tissu extensible est agréable',
-                    'matériaux flexibles convainquent', 'propriété stretch est parfaite'
-                ],
-                'comfortable': [
-                    'incroyablement confortable à porter', 'si confortable toute la journée',
-                    'extrêmement douillet et doux', 'porte comme seconde peau',
-                    'niveau confort est exceptionnel', 'ne peut pas être plus confortable'
-                ]
-            },
-            'es': {
-                'oversized': [
-                    'ajuste oversized es cómodo', 'corte holgado ajusta perfectamente',
-                    'estilo oversized trae comodidad', 'ajuste relajado es increíble',
-                    'corte espacioso acomoda todo', 'silueta oversized funciona genial'
-                ],
-                'fitted': [
-                    'ajustado perfectamente al cuerpo', 'corte ajustado enfatiza silueta',
-                    'ajustado y favorecedor', 'diseño perfectamente contorneado',
-                    'pegado al cuerpo y ventajoso', 'estilo ajustado muestra forma genial'
-                ],
-                'stretchy': [
-                    'material tiene gran elasticidad', 'tela elástica da flexibilidad',
-                    'material stretch se mueve contigo', 'tela extensible es agradable',
-                    'materiales flexibles convencen', 'propiedad stretch es perfecta'
-                ],
-                'comfortable': [
-                    'increíblemente cómodo de usar', 'tan cómodo todo el día',
-                    'extremadamente acogedor y suave', 'se usa como segunda piel',
-                    'nivel comodidad es excepcional', 'no puede ser más cómodo'
-                ]
-            },
-            'cs': {
-                'oversized': [
-                    'oversized střih je pohodlný', 'volný střih sedí dokonale',
-                    'oversized styl přináší pohodlí', 'relaxed střih je neuvěřitelný',
-                    'prostorný střih pojme všechno', 'oversized silueta funguje skvěle'
-                ],
-                'fitted': [
-                    'přiléhavý dokonale k tělu', 'těsný střih zdůrazňuje siluetu',
-                    'přiléhavý a lichotivý', 'dokonale tvarovaný design',
-                    'těsně k tělu a výhodný', 'přiléhavý styl ukazuje skvělý tvar'
-                ],
-                'stretchy': [
-                    'materiál má skvělou pružnost', 'elastická látka dává flexibilitu',
-                    'stretch materiál se pohybuje s vámi', 'roztažitelná látka je příjemná',
-                    'flexibilní materiály přesvědčují', 'vlastnost stretch je dokonalá'
-                ],
-                'comfortable': [
-                    'neuvěřitelně pohodlný na nošení', 'tak pohodlný celý den',
-                    'extrémně útulný a měkký', 'nosí se jako druhá kůže',
-                    'úroveň pohodlí je výjimečná', 'nemůže být pohodlnější'
-                ]
-            }
-        }
-        
-        for fit in product_insights['fit']:
-            lang_phrases = fit_phrases.get(language, fit_phrases['en'])
-            if fit in lang_phrases:
-                phrase = get_unique_phrase(lang_phrases[fit], language, f"fit_{fit}")
-                if phrase:
-                    comments.append(phrase)
+    return insights
+
+# Product insight -> phrase table and phrase pool prefix, in the order comments are collected
+PRODUCT_COMMENT_TABLES = (
+    ('material', 'material_phrases', 'material'),
+    ('features', 'feature_phrases', 'feature'),
+    ('style', 'style_phrases', 'style'),
+    ('fit', 'fit_phrases', 'fit'),
+    ('occasions', 'occasion_phrases', 'occasion')
+)
+
+def generate_product_specific_comment(product_insights, language="en", rng=random):
+    """Generate comments based on actual product features with anti-repetition"""
+    comments = []
     
-    # Occasion comments with variety and tracking
-    if product_insights['occasions']:
-        occasion_phrases = {
-            'de': {
-                'party': [
-                    'perfekt für Partys', 'ideal zum Feiern',
-                    'party-ready und stylish', 'macht auf jeder Party eine gute Figur',
-                    'Clubbing Outfit complete', 'für Events einfach perfect'
-                ],
-                'casual': [
-                    'ideal für den Alltag', 'perfekt für jeden Tag',
-                    'casual Style on point', 'everyday Look guaranteed',
-                    'alltagstauglich und bequem', 'für entspannte Tage ideal'
-                ],
-                'date': [
-                    'super für Dates', 'date night ready',
-                    'romantic Look achieved', 'für romantische Abende perfect',
-                    'date Outfit approved', 'macht Eindruck beim Date'
-                ],
-                'work': [
-                    'auch fürs Büro geeignet', 'business casual approved',
-                    'workplace appropriate', 'für die Arbeit totally fine',
-                    'office Look möglich', 'professional und stylish'
-                ]
-            },
-            'en': {
-                'party': [
-                    'perfect for parties', 'ideal for celebrations',
-                    'party-ready and stylish', 'makes great impression at parties',
-                    'clubbing outfit complete', 'event-ready and gorgeous'
-                ],
-                'casual': [
-                    'great for everyday wear', 'perfect for daily use',
-                    'casual style on point', 'everyday look guaranteed',
-                    'suitable for daily activities', 'ideal for relaxed days'
-                ],
-                'date': [
-                    'amazing for date nights', 'date night ready',
-                    'romantic look achieved', 'perfect for romantic evenings',
-                    'date outfit approved', 'makes impression on dates'
-                ],
-                'work': [
-                    'works for office too', 'business casual approved',
-                    'workplace appropriate', 'totally fine for work',
-                    'office look possible', 'professional and stylish'
-                ]
-            },
-            'pl': {
-                'party': [
-                    'idealne na imprezy', 'idealne na celebrację',
-                    'gotowe na imprezę i stylowe', 'robi świetne wrażenie na imprezach',
-                    'strój na clubbing kompletny', 'gotowe na wydarzenia i wspaniałe'
-                ],
-                'casual': [
-                    'świetne na co dzień', 'idealne do codziennego użytku',
-                    'casual styl na miejscu', 'codzienny look gwarantowany',
-                    'odpowiednie na codzienne aktywności', 'idealne na spokojne dni'
-                ],
-                'date': [
-                    'super na randki', 'gotowe na randkę',
-                    'romantyczny look osiągnięty', 'idealne na romantyczne wieczory',
-                    'strój na randkę zatwierdzony', 'robi wrażenie na randkach'
-                ],
-                'work': [
-                    'sprawdza się też w pracy', 'biznes casual zatwierdzone',
-                    'odpowiednie do miejsca pracy', 'całkowicie w porządku do pracy',
-                    'biurowy look możliwy', 'profesjonalne i stylowe'
-                ]
-            },
-            'it': {
-                'party': [
-                    'perfetto per le feste', 'ideale per celebrazioni',
-                    'pronto per la festa e stiloso', 'fa ottima impressione alle feste',
-                    'outfit clubbing completo', 'pronto per eventi e stupendo'
-                ],
-                'casual': [
-                    'ottimo per tutti i giorni', 'perfetto per uso quotidiano',
-                    'stile casual centrato', 'look quotidiano garantito',
-                    'adatto per attività quotidiane', 'ideale per giorni rilassati'
-                ],
-                'date': [
-                    'fantastico per gli appuntamenti', 'pronto per appuntamento',
-                    'look romantico raggiunto', 'perfetto per serate romantiche',
-                    'outfit appuntamento approvato', 'fa impressione agli appuntamenti'
-                ],
-                'work': [
-                    'va bene anche per l\'ufficio', 'business casual approvato',
-                    'appropriato per posto lavoro', 'totalmente bene per lavoro',
-                    'look ufficio possibile', 'professionale e stiloso'
-                ]
-            },
-            'fr': {
-                'party': [
-                    'parfait pour les fêtes', 'idéal pour célébrations',
-                    'prêt pour fête et stylé', 'fait excellente impression aux fêtes',
-                    'tenue clubbing complète', 'prêt pour événements et magnifique'
-                ],
-                'casual': [
-                    'excellent pour tous les jours', 'parfait pour usage quotidien',
-                    'style décontracté au point', 'look quotidien garanti',
-                    'approprié pour activités quotidiennes', 'idéal pour jours détendus'
-                ],
-                'date': [
-                    'génial pour les rendez-vous', 'prêt pour rendez-vous',
-                    'look romantique atteint', 'parfait pour soirées romantiques',
-                    'tenue rendez-vous approuvée', 'fait impression aux rendez-vous'
-                ],
-                'work': [
-                    'convient aussi au bureau', 'business décontracté approuvé',
-                    'approprié pour lieu travail', 'totalement bien pour travail',
-                    'look bureau possible', 'professionnel et stylé'
-                ]
-            },
-            'es': {
-                'party': [
-                    'perfecto para fiestas', 'ideal para celebraciones',
-                    'listo para fiesta y estiloso', 'hace gran impresión en fiestas',
-                    'outfit clubbing completo', 'listo para eventos y hermoso'
-                ],
-                'casual': [
-                    'genial para el día a día', 'perfecto para uso diario',
-                    'estilo casual en punto', 'look cotidiano garantizado',
-                    'apropiado para actividades diarias', 'ideal para días relajados'
-                ],
-                'date': [
-                    'increíble para citas', 'listo para cita',
-                    'look romántico logrado', 'perfecto para noches románticas',
-                    'outfit cita aprobado', 'hace impresión en citas'
-                ],
-                'work': [
-                    'funciona para la oficina también', 'business casual aprobado',
-                    'apropiado para lugar trabajo', 'totalmente bien para trabajo',
-                    'look oficina posible', 'profesional y estiloso'
-                ]
-            },
-            'cs': {
-                'party': [
-                    'perfektní na večírky', 'ideální na oslavy',
-                    'připraveno na párty a stylové', 'dělá skvělý dojem na večírcích',
-                    'clubbing outfit kompletní', 'připraveno na události a nádherné'
-                ],
-                'casual': [
-                    'skvělé na každý den', 'perfektní pro denní použití',
-                    'casual styl na místě', 'každodenní look zaručený',
-                    'vhodné pro denní aktivity', 'ideální pro uvolněné dny'
-                ],
-                'date': [
-                    'úžasné na rande', 'připraveno na rande',
-                    'romantický look dosažen', 'perfektní pro romantické večery',
-                    'rande outfit schváleno', 'dělá dojem na randích'
-                ],
-                'work': [
-                    'hodí se i do kanceláře', 'business casual schváleno',
-                    'vhodné pro pracoviště', 'zcela v pořádku pro práci',
-                    'kancelářský look možný', 'profesionální a stylové'
-                ]
-            }
-        }
-        
-        for occasion in product_insights['occasions']:
-            lang_phrases = occasion_phrases.get(language, occasion_phrases['en'])
-            if occasion in lang_phrases:
-                phrase = get_unique_phrase(lang_phrases[occasion], language, f"occasion_{occasion}")
+    # Material, feature, style, fit and occasion comments with variety and tracking
+    for insight, table, prefix in PRODUCT_COMMENT_TABLES:
+        if not product_insights[insight]:
+            continue
+        lang_phrases = language_table(language, table)
+        for value in product_insights[insight]:
+            if value in lang_phrases:
+                phrase = get_unique_phrase(lang_phrases[value], language, f"{prefix}_{value}", rng=rng)
                 if phrase:
                     comments.append(phrase)
     
     # Always return a comment if we have any insights, otherwise create a generic one
     if comments:
-        return random.choice(comments)
+        return rng.choice(comments)
     
     # Fallback generic product-specific comments if no specific insights found
-    generic_comments = {
-        'de': ['genau was ich gesucht hab', 'entspricht der Beschreibung', 'wie auf den Bildern'],
-        'en': ['exactly what I was looking for', 'matches the description', 'just like in the pictures'],
-        'pl': ['dokładnie tego szukałam', 'zgodne z opisem', 'jak na zdjęciach'],
-        'it': ['esattamente quello che cercavo', 'corrisponde alla descrizione', 'come nelle foto'],
-        'fr': ['exactement ce que je cherchais', 'correspond à la description', 'comme sur les photos'],
-        'es': ['exactamente lo que buscaba', 'coincide con la descripción', 'como en las fotos'],
-        'cs': ['přesně to co jsem hledala', 'odpovídá popisu', 'jako na fotkách']
-    }
-    
-    fallback = generic_comments.get(language, generic_comments['en'])
-    return random.choice(fallback)
+    return rng.choice(language_table(language, 'generic_comments'))
+
+# Simple, normal usernames
+NORMAL_USERNAMES = (
+    "sarah_m", "alex_k", "emma_95", "mike_j", "lea_s", "tom_b", "nina_x", "ben_l",
+    "mia_2024", "luke_s", "anna_k", "max_t", "lara_m", "finn_b", "zoe_l", "jan_s",
+    "lily_r", "noah_k", "maya_s", "erik_m", "luna_j", "dean_b", "ivy_x", "cole_s",
+    "ruby_k", "jude_m", "sage_l", "kai_b", "nova_s", "cruz_k", "rain_j", "fox_m",
+    "user12345", "reviewer99", "customer2024", "shopper_x", "buyer123", "guest_user"
+)
+
+# Trendy username parts; empty entries keep most usernames unprefixed
+USERNAME_PREFIXES = (
+    "", "", "", "", "lil", "big", "the", "its", "my", "ur", "x", ""
+)
 
-def generate_youthful_username():
+USERNAME_THEMES = (
+    "style", "fashion", "vibe", "mood", "aesthetic", "trend", "look", "fit", "drip",
+    "music", "beat", "rhythm", "melody", "dance", "party", "fun", "cool", "chill",
+    "star", "moon", "sun", "sky", "dream", "hope", "joy", "love", "peace",
+    "free", "art", "photo", "travel", "nature", "ocean", "forest", "mountain", "city",
+    "home", "book", "game", "tech", "digital", "online", "web", "net", "social",
+    "connect", "rebel", "wild", "free", "chaos", "storm", "fire", "ice", "thunder",
+    "shadow", "light"
+)
+
+USERNAME_SUFFIXES = (
+    "", "", "", "", "", "x", "2024", "23", "24", "99", "00", "01", "02", "03"
+)
+
+def generate_youthful_username(rng=random):
     """Generate trendy, youth-oriented usernames with more variety and realism"""
     
     # 40% chance for simple, normal usernames
-    if random.random() < 0.4:
-        normal_usernames = [
-            "sarah_m", "alex_k", "emma_95", "mike_j", "lea_s", "tom_b", "nina_x", "ben_l",
-            "mia_2024", "luke_s", "anna_k", "max_t", "lara_m", "finn_b", "zoe_l", "jan_s",
-            "lily_r", "noah_k", "maya_s", "erik_m", "luna_j", "dean_b", "ivy_x", "cole_s",
-            "ruby_k", "jude_m", "sage_l", "kai_b", "nova_s", "cruz_k", "rain_j", "fox_m",
-            "user12345", "reviewer99", "customer2024", "shopper_x", "buyer123", "guest_user"
-        ]
-        return random.choice(normal_usernames)
-    
-    # For the rest, generate trendy usernames but less obvious
-    prefixes = ["", "", "", "", "lil", "big", "the", "its", "my", "ur", "x", ""]  # More empty prefixes
-    
-    themes = [
-        # Reduced dark/gothic themes, added more normal ones
-        "style", "fashion", "vibe", "mood", "aesthetic", "trend", "look", "fit", "drip",
-        "music", "beat", "rhythm", "melody", "dance", "party", "fun", "cool", "chill",
-        "star", "moon", "sun", "sky", "dream", "hope", "joy", "love", "peace", "free",
-        "art", "photo", "travel", "nature", "ocean", "forest", "mountain", "city", "home",
-        "book", "game", "tech", "digital", "online", "web", "net", "social", "connect",
-        # Keep some edgy but less obvious
-        "rebel", "wild", "free", "chaos", "storm", "fire", "ice", "thunder", "shadow", "light"
-    ]
-    
-    suffixes = ["", "", "", "", "", "x", "2024", "23", "24", "99", "00", "01", "02", "03"]
+    if rng.random() < 0.4:
+        return rng.choice(NORMAL_USERNAMES)
     
     # Add some birth years (less obvious)
     current_year = datetime.now().year
-    for year in range(current_year - 24, current_year - 18):
-        suffixes.append(str(year % 100))
+    suffixes = USERNAME_SUFFIXES + tuple(str(year % 100) for year in range(current_year - 24, current_year - 18))
     
     # Generate username - simpler structure
-    if random.random() < 0.2:  # 20% chance for complex username (reduced from 30%)
-        return f"{random.choice(prefixes)}{random.choice(themes)}_{random.choice(themes)}{random.choice(suffixes)}"
+    if rng.random() < 0.2:  # 20% chance for complex username (reduced from 30%)
+        return f"{rng.choice(USERNAME_PREFIXES)}{rng.choice(USERNAME_THEMES)}_{rng.choice(USERNAME_THEMES)}{rng.choice(suffixes)}"
     else:
-        return f"{random.choice(themes)}{random.choice(suffixes)}"
+        return f"{rng.choice(USERNAME_THEMES)}{rng.choice(suffixes)}"
+
+# Email domains for reviewers shown with their real name
+REAL_NAME_EMAIL_DOMAINS = ("gmail.com", "outlook.com", "icloud.com", "yahoo.com", "hotmail.com")
+
+# Locations for languages without a location table
+DEFAULT_LOCATIONS = ("US", "UK", "CA", "AU")
 
-def generate_reviewer_info(language="en"):
+def generate_reviewer_info(language="en", rng=random):
     """Generate realistic reviewer information with better name variety"""
     # 70% chance for username vs real name (increased from 60%)
-    if random.random() < 0.7:
-        reviewer_name = generate_youthful_username()
+    if rng.random() < 0.7:
+        reviewer_name = generate_youthful_username(rng=rng)
         
         # Email domains by region
-        email_domains = {
-            "de": ["gmail.com", "web.de", "gmx.de", "gmx.net", "outlook.com", "yahoo.de", "icloud.com"],
-            "en": ["gmail.com", "outlook.com", "icloud.com", "yahoo.com", "hotmail.com", "protonmail.com"],
-            "es": ["gmail.com", "hotmail.com", "yahoo.es", "outlook.es", "icloud.com"],
-            "fr": ["gmail.com", "orange.fr", "free.fr", "yahoo.fr", "outlook.fr", "laposte.net"],
-            "it": ["gmail.com", "libero.it", "alice.it", "yahoo.it", "outlook.it", "virgilio.it"],
-            "ru": ["gmail.com", "yandex.ru", "mail.ru", "rambler.ru", "outlook.com"],
-            "pl": ["gmail.com", "wp.pl", "onet.pl", "interia.pl", "o2.pl", "outlook.com"],
-            "ja": ["gmail.com", "yahoo.co.jp", "docomo.ne.jp", "ezweb.ne.jp", "outlook.jp"],
-            "ko": ["gmail.com", "naver.com", "daum.net", "hanmail.net", "kakao.com"],
-            "zh": ["gmail.com", "qq.com", "163.com", "126.com", "sina.com", "outlook.com"]
-        }
-        
-        domains = email_domains.get(language, email_domains["en"])
-        email = f"{reviewer_name.lower().replace(' ', '').replace('_', '.')}@{random.choice(domains)}"
+        domains = language_table(language, 'email_domains')
+        email = f"{reviewer_name.lower().replace(' ', '').replace('_', '.')}@{rng.choice(domains)}"
     else:
         # Real names with much more variety
-        name_database = {
-            "de": {
-                "first": ["Max", "Leon", "Felix", "Paul", "Ben", "Luca", "Noah", "Tim", "Jonas", "Luis",
-                         "Finn", "Nico", "Jan", "Tom", "Alex", "Moritz", "David", "Simon", "Erik", "Marvin",
-                         "Sophie", "Marie", "Emma", "Mia", "Hannah", "Lea", "Anna", "Lina", "Clara", "Zoe",
-                         "Maja", "Lisa", "Sarah", "Julia", "Nina", "Laura", "Alina", "Amelie", "Emilia", "Mila"],
-                "last": ["S.", "M.", "K.", "L.", "B.", "T.", "R.", "H.", "C.", "J.", "W.", "P.", "F.", "G.",
-                        "N.", "D.", "V.", "Z.", "E.", "A.", "O.", "U.", "I.", "Q."]
-            },
-            "en": {
-                "first": ["Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Sophia", "Mason", "Isabella", "Logan",
-                         "Mia", "Lucas", "Charlotte", "Oliver", "Amelia", "Elijah", "Harper", "James", "Evelyn", "Benjamin",
-                         "Emily", "Jacob", "Madison", "Michael", "Elizabeth", "Alexander", "Sofia", "William", "Victoria", "Daniel",
-                         "Aiden", "Jackson", "Abigail", "Sebastian", "Aria", "Jack", "Scarlett", "Carter", "Grace", "Wyatt"],
-                "last": ["S.", "M.", "K.", "L.", "B.", "T.", "R.", "H.", "C.", "J.", "W.", "P.", "D.", "A.",
-                        "N.", "G.", "V.", "Z.", "E.", "F.", "O.", "U.", "I.", "Q."]
-            },
-            "es": {
-                "first": ["Sofía", "Mateo", "Valentina", "Santiago", "Isabella", "Sebastián", "Camila", "Diego", "Lucía", "Nicolás",
-                         "María", "Alejandro", "Martina", "Daniel", "Daniela", "Gabriel", "Victoria", "Samuel", "Natalia", "David"],
-                "last": ["G.", "R.", "M.", "F.", "L.", "S.", "P.", "D.", "C.", "V.", "H.", "J.", "B.", "N."]
-            },
-            "fr": {
-                "first": ["Emma", "Lucas", "Chloé", "Hugo", "Léa", "Louis", "Manon", "Nathan", "Camille", "Enzo",
-                         "Sarah", "Mathis", "Inès", "Tom", "Jade", "Théo", "Louise", "Raphaël", "Zoé", "Arthur"],
-                "last": ["M.", "B.", "D.", "L.", "R.", "P.", "C.", "F.", "G.", "H.", "V.", "J.", "S.", "T."]
-            },
-            "it": {
-                "first": ["Giulia", "Francesco", "Sofia", "Alessandro", "Aurora", "Lorenzo", "Ginevra", "Matteo", "Alice", "Leonardo",
-                         "Emma", "Gabriele", "Giorgia", "Riccardo", "Martina", "Tommaso", "Chiara", "Edoardo", "Anna", "Marco"],
-                "last": ["R.", "B.", "C.", "F.", "G.", "M.", "P.", "S.", "V.", "D.", "L.", "T.", "N.", "A."]
-            },
-            "pl": {
-                "first": ["Maja", "Jakub", "Zuzanna", "Kacper", "Julia", "Szymon", "Lena", "Filip", "Aleksandra", "Jan",
-                         "Zofia", "Antoni", "Oliwia", "Franciszek", "Natalia", "Mikołaj", "Maria", "Wojciech", "Alicja", "Adam",
-                         "Wiktoria", "Michał", "Emilia", "Marcel", "Hanna", "Wiktor", "Amelia", "Piotr", "Nikola", "Igor"],
-                "last": ["K.", "W.", "N.", "L.", "Z.", "S.", "M.", "B.", "G.", "P.", "C.", "J.", "D.", "R.",
-                        "T.", "A.", "O.", "E.", "F.", "H."]
-            },
-            "cs": {
-                "first": ["Tereza", "Jakub", "Eliška", "Jan", "Anna", "Tomáš", "Adéla", "Matyáš", "Natálie", "Vojtěch",
-                         "Sofie", "Adam", "Viktorie", "Ondřej", "Karolína", "Filip", "Kristýna", "Lukáš", "Barbora", "David"],
-                "last": ["N.", "K.", "P.", "S.", "V.", "M.", "H.", "D.", "C.", "B.", "L.", "T.", "J.", "R."]
-            }
-        }
-        
-        if language in name_database:
-            names = name_database[language]
-        else:
-            names = name_database["en"]
+        names = language_table(language, 'names')
         
-        first_name = random.choice(names["first"])
-        last_initial = random.choice(names["last"])
+        first_name = rng.choice(names["first"])
+        last_initial = rng.choice(names["last"])
         reviewer_name = f"{first_name} {last_initial}"
         
         # Generate email
-        domains = ["gmail.com", "outlook.com", "icloud.com", "yahoo.com", "hotmail.com"]
-        email = f"{first_name.lower()}.{last_initial[0].lower()}{random.randint(1, 999)}@{random.choice(domains)}"
+        email = f"{first_name.lower()}.{last_initial[0].lower()}{rng.randint(1, 999)}@{rng.choice(REAL_NAME_EMAIL_DOMAINS)}"
     
     # Location based on real Shopify ORDER data (only languages with full translations)
-    locations = {
-        "de": ["DE", "DE", "DE", "DE", "DE", "AT", "CH"],  # German speakers
-        "pl": ["PL", "PL", "PL"],  # Polish speakers  
-        "en": ["US", "US", "US", "UK", "UK", "CA", "AU", "NZ", "IE"],  # English speakers
-        "it": ["IT", "IT", "IT", "IT"],  # Italian speakers
-        "fr": ["FR", "FR", "BE", "CH", "MC"],  # French speakers
-        "es": ["ES", "ES", "MX", "AR"],  # Spanish speakers
-        "cs": ["CZ", "CZ", "SK"]  # Czech/Slovak speakers (similar languages)
-    }
-    
-    location = random.choice(locations.get(language, ["US", "UK", "CA", "AU"]))
+    locations = language_table(language, 'locations', fallback=None) or DEFAULT_LOCATIONS
+    location = rng.choice(locations)
     
     return reviewer_name, email, location
 
-def get_simplified_product_name(product_title, language="en"):
+# Common adjectives and brand names that don't make a good product name
+PRODUCT_NAME_SKIP_WORDS = frozenset(["black", "white", "dark", "gothic", "punk", "vintage", "new", "best", "top", "premium"])
+
+def get_simplified_product_name(product_title, language="en", rng=random):
     """Extract a natural, shorter product name from the full title with better variety"""
     if not product_title:
         # More variety in fallback terms
-        fallbacks = {
-            "en": ["piece", "item", "product", "article"],
-            "de": ["Teil", "Stück", "Artikel", "Produkt"],
-            "es": ["pieza", "artículo", "producto"],
-            "fr": ["pièce", "article", "produit"],
-            "it": ["pezzo", "articolo", "prodotto"],
-            "pl": ["element", "rzecz", "artykuł", "produkt"],
-            "cs": ["kousek", "věc", "produkt", "zboží"]
-        }
-        return random.choice(fallbacks.get(language, fallbacks["en"]))
-    
-    # Extended clothing terms
-    clothing_terms = {
-        "en": [
-            "belt", "chain", "necklace", "ring", "bracelet", "bag", "hat", "cap", "beanie", "bandana",
-            "pants", "jeans", "leggings", "shorts", "skirt", "dress", "gown", "jumpsuit", "romper",
-            "top", "shirt", "tee", "tank", "blouse", "crop", "bra", "corset", "bodysuit", "cami",
-            "jacket", "coat", "hoodie", "cardigan", "sweater", "sweatshirt", "vest", "blazer", "bomber",
-            "boots", "shoes", "sneakers", "heels", "sandals", "flats", "platforms", "docs",
-            "socks", "tights", "stockings", "gloves", "scarf", "mask", "choker", "harness"
-        ],
-        "de": [
-            "gürtel", "kette", "halskette", "ring", "armband", "tasche", "hut", "mütze", "cap",
-            "hose", "jeans", "leggings", "shorts", "rock", "kleid", "jumpsuit", "overall",
-            "top", "shirt", "t-shirt", "tanktop", "bluse", "croptop", "bh", "korsett", "bodysuit",
-            "jacke", "mantel", "hoodie", "strickjacke", "pullover", "sweatshirt", "weste",
-            "stiefel", "schuhe", "sneaker", "heels", "sandalen", "ballerinas", "plateaus"
-        ]
-    }
+        return rng.choice(language_table(language, 'name_fallbacks'))
     
     words = product_title.split()
     title_lower = product_title.lower()
     
     # Try to find clothing terms
-    terms = clothing_terms.get(language, clothing_terms["en"])
+    terms = language_table(language, 'clothing_terms')
     
     for term in terms:
         if term in title_lower:
@@ -1813,60 +353,45 @@ def get_simplified_product_name(product_title, language="en"):
     
     # Handle specific brands or styles
     if "opium" in title_lower:
-        style_terms = {
-            "en": ["piece", "style", "design", "item"],
-            "de": ["Teil", "Style", "Design", "Stück"]
-        }
-        return random.choice(style_terms.get(language, style_terms["en"]))
+        return rng.choice(language_table(language, 'style_terms'))
     
     # Try to find any reasonable noun
     if len(words) >= 2:
         # Skip common adjectives and brand names
-        skip_words = ["black", "white", "dark", "gothic", "punk", "vintage", "new", "best", "top", "premium"]
         for word in reversed(words):  # Start from end
-            if word.lower() not in skip_words and len(word) > 3:
+            if word.lower() not in PRODUCT_NAME_SKIP_WORDS and len(word) > 3:
                 return word
     
     # Final fallback
     return words[-1] if words else "item"
 
+# Expanded category detection
+PRODUCT_CATEGORY_KEYWORDS = {
+    'tops': ['top', 'shirt', 'blouse', 'tshirt', 't-shirt', 'tank', 'crop', 'tee', 'cami', 'tube'],
+    'bottoms': ['pants', 'jeans', 'leggings', 'shorts', 'skirt', 'trousers', 'joggers', 'sweatpants'],
+    'dresses': ['dress', 'gown', 'midi', 'maxi', 'mini'],
+    'outerwear': ['jacket', 'coat', 'hoodie', 'cardigan', 'sweater', 'sweatshirt', 'blazer', 'bomber', 'parka'],
+    'accessories': ['belt', 'bag', 'chain', 'necklace', 'ring', 'bracelet', 'hat', 'cap', 'choker', 'harness', 'jewelry'],
+    'footwear': ['boots', 'shoes', 'sneakers', 'heels', 'sandals', 'platforms', 'docs', 'martens'],
+    'gothic': ['gothic', 'goth', 'dark', 'black', 'mesh', 'lace', 'net', 'opium', 'pentagram', 'cross'],
+    'punk': ['punk', 'rebel', 'studs', 'leather', 'tartan', 'plaid', 'chains', 'spikes', 'safety'],
+    'vintage': ['vintage', 'retro', 'y2k', '90s', '80s', '70s', 'throwback', 'nostalgic']
+}
+
 def get_product_category(product_info):
     """Determine product category with better detection"""
     title = product_info.get('title', '').lower()
     
     categories = []
     
-    # Expanded category detection
-    category_keywords = {
-        'tops': ['top', 'shirt', 'blouse', 'tshirt', 't-shirt', 'tank', 'crop', 'tee', 'cami', 'tube'],
-        'bottoms': ['pants', 'jeans', 'leggings', 'shorts', 'skirt', 'trousers', 'joggers', 'sweatpants'],
-        'dresses': ['dress', 'gown', 'midi', 'maxi', 'mini'],
-        'outerwear': ['jacket', 'coat', 'hoodie', 'cardigan', 'sweater', 'sweatshirt', 'blazer', 'bomber', 'parka'],
-        'accessories': ['belt', 'bag', 'chain', 'necklace', 'ring', 'bracelet', 'hat', 'cap', 'choker', 'harness', 'jewelry'],
-        'footwear': ['boots', 'shoes', 'sneakers', 'heels', 'sandals', 'platforms', 'docs', 'martens'],
-        'gothic': ['gothic', 'goth', 'dark', 'black', 'mesh', 'lace', 'net', 'opium', 'pentagram', 'cross'],
-        'punk': ['punk', 'rebel', 'studs', 'leather', 'tartan', 'plaid', 'chains', 'spikes', 'safety'],
-        'vintage': ['vintage', 'retro', 'y2k', '90s', '80s', '70s', 'throwback', 'nostalgic']
-    }
-    
-    for category, keywords in category_keywords.items():
+    for category, keywords in PRODUCT_CATEGORY_KEYWORDS.items():
         if any(keyword in title for keyword in keywords):
             categories.append(category)
     
     return categories if categories else ['general']
 
-def get_dynamic_review_length_distribution(product, rating, language="en"):
-    """Calculate dynamic review length distribution based on multiple factors"""
-    from datetime import datetime, timedelta
-    import re
-    
-    # Base percentages (realistic e-commerce patterns)
-    base_empty = 0.12    # 12% empty reviews
-    base_short = 0.35    # 35% short reviews  
-    base_medium = 0.40   # 40% medium reviews
-    base_long = 0.13     # 13% long reviews
-    
-    # Product age factor
+def get_product_age_days(product):
+    """Days since the product was created (0 if unknown, 365 if unparseable)"""
     product_age_days = 0
     if product.get('created_at'):
         try:
@@ -1874,6 +399,18 @@ def get_dynamic_review_length_distribution(product, rating, language="en"):
             product_age_days = (datetime.now() - created_date.replace(tzinfo=None)).days
         except:
             product_age_days = 365  # Default to 1 year if parsing fails
+    return product_age_days
+
+def get_product_length_profile(product, categories=None):
+    """Base review length weights adjusted for product age and category"""
+    # Base percentages (realistic e-commerce patterns)
+    base_empty = 0.12    # 12% empty reviews
+    base_short = 0.35    # 35% short reviews  
+    base_medium = 0.40   # 40% medium reviews
+    base_long = 0.13     # 13% long reviews
+    
+    # Product age factor
+    product_age_days = get_product_age_days(product)
     
     # Age adjustments (newer products have more empty/short reviews)
     if product_age_days < 30:       # New product (0-30 days)
@@ -1892,6 +429,40 @@ def get_dynamic_review_length_distribution(product, rating, language="en"):
         base_medium += 0.05         # 45% medium
         base_long += 0.02           # 15% long
     
+    # Category adjustments
+    if categories is None:
+        categories = get_product_category(product)
+    if 'clothing' in categories:
+        base_medium += 0.05         # Clothing gets more detailed reviews
+        base_short -= 0.05
+    elif 'accessories' in categories:
+        base_short += 0.05          # Accessories get shorter reviews
+        base_medium -= 0.05
+    elif 'gothic' in categories or 'punk' in categories:
+        base_long += 0.03           # Niche styles get more passionate reviews
+        base_short -= 0.03
+    
+    return {
+        'empty': base_empty,
+        'short': base_short,
+        'medium': base_medium,
+        'long': base_long
+    }
+
+def get_dynamic_review_length_distribution(product, rating, language="en", length_profile=None):
+    """Calculate dynamic review length distribution based on multiple factors
+    
+    length_profile can be passed in from analyze_product() to skip the
+    product age and category analysis.
+    """
+    if length_profile is None:
+        length_profile = get_product_length_profile(product)
+    
+    base_empty = length_profile['empty']
+    base_short = length_profile['short']
+    base_medium = length_profile['medium']
+    base_long = length_profile['long']
+    
     # Rating adjustments (higher ratings get longer, more detailed reviews)
     if rating >= 5:                 # 5-star reviews
         base_empty -= 0.03          # Less empty
@@ -1904,18 +475,6 @@ def get_dynamic_review_length_distribution(product, rating, language="en"):
         base_medium -= 0.10         # Less medium
         base_long -= 0.05           # Less long
     
-    # Category adjustments
-    categories = get_product_category(product)
-    if 'clothing' in categories:
-        base_medium += 0.05         # Clothing gets more detailed reviews
-        base_short -= 0.05
-    elif 'accessories' in categories:
-        base_short += 0.05          # Accessories get shorter reviews
-        base_medium -= 0.05
-    elif 'gothic' in categories or 'punk' in categories:
-        base_long += 0.03           # Niche styles get more passionate reviews
-        base_short -= 0.03
-    
     # Language/cultural adjustments
     if language == 'de':            # Germans tend to write longer reviews
         base_long += 0.05
@@ -1942,28 +501,78 @@ def get_dynamic_review_length_distribution(product, rating, language="en"):
         'long': base_long / total
     }
 
-def generate_review_content(product, rating, language="en", product_insights=None):
-    """Generate authentic review content with dynamic length distribution"""
-    global USED_PHRASES
-    
+def analyze_product(product, product_insights=None):
+    """Compute everything review generation needs that depends only on the product"""
     if product_insights is None:
-        product_insights = extract_product_features(product, language)
-    
+        product_insights = extract_product_features(product)
     categories = get_product_category(product)
-    simplified_name = get_simplified_product_name(product.get('title', ''), language)
+    
+    return {
+        'insights': product_insights,
+        'categories': categories,
+        'length_profile': get_product_length_profile(product, categories),
+        'simplified_names': {}  # Filled per language on first use
+    }
+
+def _get_analysis_simplified_name(product, product_analysis, language, rng=random):
+    """Simplified product name for a language, computed once per analysis"""
+    names = product_analysis['simplified_names']
+    if language not in names:
+        names[language] = get_simplified_product_name(product.get('title', ''), language, rng=rng)
+    return names[language]
+
+# Component patterns for long reviews (4-6 components)
+LONG_REVIEW_PATTERNS = (
+    ("opening", "product_specific", "quality", "fit", "personal", "ending"),
+    ("product_specific", "quality", "style", "usage", "personal", "ending"),
+    ("opening", "product_specific", "fit", "quality", "style", "personal"),
+    ("quality", "product_specific", "fit", "usage", "style", "ending"),
+    ("opening", "product_specific", "quality", "personal", "usage", "ending"),
+    ("product_specific", "quality", "fit", "style", "personal", "usage")
+)
+
+# Component patterns for medium reviews (2-4 components)
+MEDIUM_REVIEW_PATTERNS = (
+    ("opening", "product_specific", "quality"),
+    ("product_specific", "fit", "personal"),
+    ("opening", "product_specific", "personal"),
+    ("quality", "product_specific", "style"),
+    ("product_specific", "quality", "usage"),
+    ("opening", "fit", "product_specific"),
+    ("style", "product_specific", "personal"),
+    ("usage", "product_specific", "quality"),
+    ("product_specific", "quality", "style"),
+    ("personal", "product_specific", "fit"),
+    ("product_specific", "style", "usage"),
+    ("opening", "product_specific", "ending")
+)
+
+# Weights for the language's connectors, from ". " down to "... "
+CONNECTOR_WEIGHTS = (30, 20, 15, 10, 10, 5, 5, 5)
+
+def generate_review_content(product, rating, language="en", product_insights=None, product_analysis=None, rng=random):
+    """Generate authentic review content with dynamic length distribution"""
+    if product_analysis is None:
+        product_analysis = analyze_product(product, product_insights)
+    product_insights = product_analysis['insights']
+    
+    categories = product_analysis['categories']
+    simplified_name = _get_analysis_simplified_name(product, product_analysis, language, rng=rng)
     
     # Get dynamic length distribution
-    length_dist = get_dynamic_review_length_distribution(product, rating, language)
+    length_dist = get_dynamic_review_length_distribution(
+        product, rating, language, product_analysis['length_profile']
+    )
     
     # Determine review length based on dynamic distribution
-    rand = random.random()
+    rand = rng.random()
     
     if rand < length_dist['empty']:
         return ""  # Empty review
     elif rand < length_dist['empty'] + length_dist['short']:
         # Short review (1-2 sentences)
-        short_reviews = EXTENDED_SHORT_REVIEWS.get(language, EXTENDED_SHORT_REVIEWS["en"])
-        return get_unique_phrase(short_reviews, language, "short")
+        short_reviews = language_table(language, 'short_reviews')
+        return get_unique_phrase(short_reviews, language, "short", rng=rng)
     
     # Build review with varied components based on target length
     review_parts = []
@@ -1972,95 +581,48 @@ def generate_review_content(product, rating, language="en", product_insights=Non
     is_long_review = rand >= (length_dist['empty'] + length_dist['short'] + length_dist['medium'])
     
     # Component patterns based on review length
-    if is_long_review:
-        # Long reviews (4-6 components)
-        component_patterns = [
-            ["opening", "product_specific", "quality", "fit", "personal", "ending"],
-            ["product_specific", "quality", "style", "usage", "personal", "ending"],
-            ["opening", "product_specific", "fit", "quality", "style", "personal"],
-            ["quality", "product_specific", "fit", "usage", "style", "ending"],
-            ["opening", "product_specific", "quality", "personal", "usage", "ending"],
-            ["product_specific", "quality", "fit", "style", "personal", "usage"]
-        ]
-    else:
-        # Medium reviews (2-4 components)
-        component_patterns = [
-            ["opening", "product_specific", "quality"],
-            ["product_specific", "fit", "personal"],
-            ["opening", "product_specific", "personal"],
-            ["quality", "product_specific", "style"],
-            ["product_specific", "quality", "usage"],
-            ["opening", "fit", "product_specific"],
-            ["style", "product_specific", "personal"],
-            ["usage", "product_specific", "quality"],
-            ["product_specific", "quality", "style"],
-            ["personal", "product_specific", "fit"],
-            ["product_specific", "style", "usage"],
-            ["opening", "product_specific", "ending"]
-        ]
+    component_patterns = LONG_REVIEW_PATTERNS if is_long_review else MEDIUM_REVIEW_PATTERNS
     
-    pattern = random.choice(component_patterns)
+    pattern = rng.choice(component_patterns)
     
     for component in pattern:
-        if component == "opening" and random.random() < 0.7:
-            openings = REVIEW_COMPONENTS["opening_reactions"].get(language, REVIEW_COMPONENTS["opening_reactions"]["en"])
-            opening = random.choice(openings)
+        if component == "opening" and rng.random() < 0.7:
+            openings = language_table(language, "opening_reactions")
+            opening = rng.choice(openings)
             
-            # Better logic: use generic product terms instead of specific product names to avoid grammar issues
-            # and reduce awkward long product names
-            generic_product_terms = {
-                "de": "Teil",  # piece/item
-                "en": "piece",
-                "es": "pieza", 
-                "fr": "pièce",
-                "it": "pezzo",
-                "pl": "element",
-                "cs": "kousek"
-            }
-            
-            # Standalone openings that don't need any product reference
-            standalone_openings = {
-                "de": ["super zufrieden", "echt beeindruckt", "bin total verliebt", "mega glücklich", "voll überzeugt", "komplett zufrieden", "absolut happy", "richtig begeistert", "mega zufrieden", "voll beeindruckt", "komplett überzeugt", "absolut überzeugt", "komplett überzeugt", "richtig zufrieden damit", "so happy mit dem Kauf", "richtig stolz auf den Kauf", "komplett happy mit dem neuen Teil"],
-                "en": ["absolutely convinced by this", "super happy with this", "extremely happy with this", "super satisfied with this"],
-                "es": ["completamente convencida por este", "súper feliz con este", "extremadamente feliz con este"],
-                "fr": ["complètement convaincue par ce", "super heureuse avec ce", "extrêmement heureuse avec ce"],
-                "it": ["completamente convinta da questo", "super felice con questo", "estremamente felice con questo"],
-                "pl": ["naprawdę zadowolona", "całkowicie przekonana", "niesamowicie szczęśliwa", "totalnie zakochana", "w pełni przekonana", "całkowicie usatysfakcjonowana", "absolutnie zachwycona", "totalnie oczarowana", "super zadowolona", "absolutnie przekonana"],
-                "cs": ["opravdu spokojená", "úplně přesvědčená", "extrémně šťastná", "totálně zamilovaná", "plně přesvědčená"]
-            }
-            
-            if opening in standalone_openings.get(language, []):
+            # Standalone openings don't need any product reference
+            if opening in (language_table(language, 'standalone_openings', fallback=None) or ()):
                 review_parts.append(opening)
             else:
                 # Use generic product term instead of actual product name to avoid long/awkward constructions
-                generic_term = generic_product_terms.get(language, "piece")
+                generic_term = language_table(language, 'generic_product_term')
                 review_parts.append(f"{opening} {generic_term}")
         
-        elif component == "quality" and random.random() < 0.6:
-            quality_comments = REVIEW_COMPONENTS["quality_comments"].get(language, REVIEW_COMPONENTS["quality_comments"]["en"])
-            review_parts.append(random.choice(quality_comments))
+        elif component == "quality" and rng.random() < 0.6:
+            quality_comments = language_table(language, "quality_comments")
+            review_parts.append(rng.choice(quality_comments))
         
-        elif component == "fit" and random.random() < 0.5:
-            fit_comments = REVIEW_COMPONENTS["fit_comments"].get(language, REVIEW_COMPONENTS["fit_comments"]["en"])
-            review_parts.append(random.choice(fit_comments))
+        elif component == "fit" and rng.random() < 0.5:
+            fit_comments = language_table(language, "fit_comments")
+            review_parts.append(rng.choice(fit_comments))
         
-        elif component == "product_specific" and random.random() < 0.95:
+        elif component == "product_specific" and rng.random() < 0.95:
             # Add product-specific insights from description (increased from 80% to 95%)
-            specific_comment = generate_product_specific_comment(product_insights, language)
+            specific_comment = generate_product_specific_comment(product_insights, language, rng=rng)
             if specific_comment:
                 review_parts.append(specific_comment)
         
-        elif component == "style" and random.random() < 0.6:
-            style_comments = REVIEW_COMPONENTS["style_comments"].get(language, REVIEW_COMPONENTS["style_comments"]["en"])
-            review_parts.append(random.choice(style_comments))
+        elif component == "style" and rng.random() < 0.6:
+            style_comments = language_table(language, "style_comments")
+            review_parts.append(rng.choice(style_comments))
         
-        elif component == "usage" and random.random() < 0.4:
-            usage_scenarios = REVIEW_COMPONENTS["usage_scenarios"].get(language, REVIEW_COMPONENTS["usage_scenarios"]["en"])
-            review_parts.append(random.choice(usage_scenarios))
+        elif component == "usage" and rng.random() < 0.4:
+            usage_scenarios = language_table(language, "usage_scenarios")
+            review_parts.append(rng.choice(usage_scenarios))
         
-        elif component == "personal" and random.random() < 0.5:
-            personal_reactions = REVIEW_COMPONENTS["personal_reactions"].get(language, REVIEW_COMPONENTS["personal_reactions"]["en"])
-            review_parts.append(random.choice(personal_reactions))
+        elif component == "personal" and rng.random() < 0.5:
+            personal_reactions = language_table(language, "personal_reactions")
+            review_parts.append(rng.choice(personal_reactions))
     
     # Join parts with varied punctuation
     if review_parts:
@@ -2070,135 +632,126 @@ def generate_review_content(product, rating, language="en", product_insights=Non
                 review = part
             else:
                 # Language-specific connectors
-                if language == "de":
-                    connectors = [". ", "! ", ", ", " - ", " und ", ". Dazu ", "!! ", "... "]
-                elif language == "pl":
-                    connectors = [". ", "! ", ", ", " - ", " i ", ". Dodatkowo ", "!! ", "... "]
-                elif language == "cs":
-                    connectors = [". ", "! ", ", ", " - ", " a ", ". Také ", "!! ", "... "]
-                elif language == "it":
-                    connectors = [". ", "! ", ", ", " - ", " e ", ". Inoltre ", "!! ", "... "]
-                elif language == "fr":
-                    connectors = [". ", "! ", ", ", " - ", " et ", ". De plus ", "!! ", "... "]
-                elif language == "es":
-                    connectors = [". ", "! ", ", ", " - ", " y ", ". Además ", "!! ", "... "]
-                else:  # English default
-                    connectors = [". ", "! ", ", ", " - ", " and ", ". Also ", "!! ", "... "]
-                    
-                weights = [30, 20, 15, 10, 10, 5, 5, 5]
-                connector = random.choices(connectors, weights=weights, k=1)[0]
+                connectors = language_table(language, 'connectors')
+                connector = rng.choices(connectors, weights=CONNECTOR_WEIGHTS, k=1)[0]
                 review += connector + part
         
         # Youth writing style (20% chance)
-        if random.random() < 0.20:
+        if rng.random() < 0.20:
             # Lowercase variations
-            if random.random() < 0.3:
+            if rng.random() < 0.3:
                 review = review.lower()
             
             # Add emojis/special characters with language-appropriate slang
-            if random.random() < 0.4:
-                if language == "en":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤"]
-                elif language == "de":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤"]
-                elif language == "pl":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤"]
-                elif language == "cs":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤", " fakt", " super", " paráda"]
-                elif language == "it":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤", " davvero", " pazzesco", " top"]
-                elif language == "fr":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤", " grave", " trop bien", " chanmé"]
-                elif language == "es":
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤", " literal", " que guay", " brutal"]
-                else:
-                    endings = ["!!!", "!!", "!", "...", "💖", "✨", "🔥", "👌", "💯", "🖤"]
-                review += random.choice(endings)
+            if rng.random() < 0.4:
+                endings = language_table(language, 'youth_endings')
+                review += rng.choice(endings)
     else:
         # Fallback to simple review with proper grammar that doesn't depend on product names
-        simple_reviews = {
-            "en": ["love this piece", "amazing quality", "perfect purchase", "so happy with this", "absolutely worth it", "exceeded expectations", "couldn’t be happier", "style perfection"],
-            "de": ["bin total begeistert", "qualität überzeugt", "perfekter kauf", "mega zufrieden", "absolut empfehlenswert", "erwartungen übertroffen", "könnte nicht glücklicher sein", "style perfektion"],
-            "es": ["totalmente enamorada", "calidad increíble", "compra perfecta", "muy feliz con esto", "vale la pena", "superó expectativas", "no podría estar más feliz", "perfección de estilo"],
-            "fr": ["totalement conquise", "qualité au top", "achat parfait", "super contente", "ça vaut le coup", "dépassé les attentes", "je ne pourrais pas être plus heureuse", "perfection de style"],
-            "it": ["totalmente innamorata", "qualità fantastica", "acquisto perfetto", "super contenta", "ne vale la pena", "ha superato le aspettative", "non potrei essere più felice", "perfezione di stile"],
-            "pl": ["jestem zachwycona", "jakość fantastyczna", "idealny zakup", "bardzo zadowolona", "warto było", "przekroczyło oczekiwania", "nie mogłabym być szczęśliwsza", "perfekcja stylu"],
-            "cs": ["jsem nadšená", "kvalita skvělá", "perfektní nákup", "velmi spokojená", "stálo to za to", "překonalo očekávání", "nemohla bych být šťastnější", "dokonalost stylu"]
-        }
-        review = random.choice(simple_reviews.get(language, simple_reviews["en"]))
+        review = rng.choice(language_table(language, 'simple_reviews'))
     
     return review
 
-def generate_rating_distribution():
+def generate_rating_distribution(rng=random):
     """Generate realistic rating distribution with slight variation"""
     # Base: 60% 5-star, 30% 4-star, 10% 3-star
     # Add small random variation
-    weights = [60 + random.randint(-5, 5), 30 + random.randint(-5, 5), 10 + random.randint(-2, 2)]
+    weights = [60 + rng.randint(-5, 5), 30 + rng.randint(-5, 5), 10 + rng.randint(-2, 2)]
     # Normalize weights
     total = sum(weights)
     weights = [w/total * 100 for w in weights]
     
-    return random.choices([5, 4, 3], weights=weights, k=1)[0]
+    return rng.choices([5, 4, 3], weights=weights, k=1)[0]
 
-def generate_review_date(max_months_back=36):
+def generate_review_date(max_months_back=36, rng=random):
     """Generate random review date with realistic distribution"""
     # More recent reviews are more likely
-    if random.random() < 0.4:  # 40% from last 3 months
-        days_back = random.randint(1, 90)
-    elif random.random() < 0.7:  # 30% from 3-12 months
-        days_back = random.randint(91, 365)
+    if rng.random() < 0.4:  # 40% from last 3 months
+        days_back = rng.randint(1, 90)
+    elif rng.random() < 0.7:  # 30% from 3-12 months
+        days_back = rng.randint(91, 365)
     else:  # 30% from 12-36 months
-        days_back = random.randint(366, max_months_back * 30)
+        days_back = rng.randint(366, max_months_back * 30)
     
     review_date = datetime.now() - timedelta(days=days_back)
     return review_date.strftime('%Y-%m-%d')
 
-def select_language():
+# Focus on languages with complete translations: DE, PL, EN, IT, FR, ES, CS
+# Redistribute the remaining percentages to these core languages
+REVIEW_LANGUAGES = ("de", "pl", "en", "it", "fr", "es", "cs")
+
+# Adjusted weights to total 100% across translated languages
+# Original: 37% DE, 11% PL, 13% EN, 6% IT, 2% FR, 2% ES, 2% CS = 73%
+# Redistributed remaining 27% proportionally
+REVIEW_LANGUAGE_WEIGHTS = (42, 13, 16, 8, 6, 6, 9)  # Totals 100%
+
+def select_language(rng=random):
     """Select language based on real Shopify ORDER data (only languages with full translations)"""
-    # Focus on languages with complete translations: DE, PL, EN, IT, FR, ES, CS
-    # Redistribute the remaining percentages to these core languages
-    languages = ["de", "pl", "en", "it", "fr", "es", "cs"]
+    return rng.choices(REVIEW_LANGUAGES, weights=REVIEW_LANGUAGE_WEIGHTS, k=1)[0]
+
+def generate_ratings(n, rng=random):
+    """Draw n ratings at once; the weight variation is shared by the batch"""
+    weights = [60 + rng.randint(-5, 5), 30 + rng.randint(-5, 5), 10 + rng.randint(-2, 2)]
+    return rng.choices([5, 4, 3], weights=weights, k=n)
+
+def select_languages(n, rng=random):
+    """Draw n review languages at once using the select_language() weights"""
+    return rng.choices(REVIEW_LANGUAGES, weights=REVIEW_LANGUAGE_WEIGHTS, k=n)
+
+def generate_review_dates(n, max_months_back=36, rng=random):
+    """Draw n review dates at once with the generate_review_date() distribution"""
+    # Same buckets as generate_review_date: 40% / 42% / 18%
+    buckets = rng.choices(
+        [(1, 90), (91, 365), (366, max_months_back * 30)],
+        weights=[40, 42, 18],
+        k=n
+    )
+    now = datetime.now()
+    return [
+        (now - timedelta(days=rng.randint(low, high))).strftime('%Y-%m-%d')
+        for low, high in buckets
+    ]
+
+class SeededRandom(random.Random):
+    """Random stream from an explicit job seed, whose output must be reproducible"""
+
+def make_rng(seed=None, product_id=None):
+    """
+    Create an independent random stream for a generation job
     
-    # Adjusted weights to total 100% across translated languages
-    # Original: 37% DE, 11% PL, 13% EN, 6% IT, 2% FR, 2% ES, 2% CS = 73%
-    # Redistributed remaining 27% proportionally
-    weights = [42, 13, 16, 8, 6, 6, 9]  # Totals 100%
+    The same seed gives the same stream, and with a product_id each product
+    gets its own stream derived from the job seed. Reviews for a product then
+    don't depend on which products were generated before it or on which
+    thread or process generated them. Template output also depends on the
+    phrase tracking state, so runs compare equal from the same tracking state.
+    Seeded streams are SeededRandom instances, so generation knows to leave
+    history-dependent checks out of their quality scores.
     
-    return random.choices(languages, weights=weights, k=1)[0]
+    Args:
+        seed: Job seed (int or str); None seeds from system entropy
+        product_id: Optional product id to split the job seed per product
+    """
+    if seed is None:
+        return random.Random()
+    if product_id is None:
+        return SeededRandom(seed)
+    digest = hashlib.sha256(f"{seed}:{product_id}".encode('utf-8')).digest()
+    return SeededRandom(int.from_bytes(digest[:8], 'big'))
 
-def get_unique_phrase(phrase_list, language, category="general"):
+def get_unique_phrase(phrase_list, language, category="general", rng=random):
     """Get a unique phrase with better tracking"""
-    global USED_PHRASES
-    
-    # Create category-specific tracking
-    category_key = f"{language}_{category}"
-    if category_key not in USED_PHRASES:
-        USED_PHRASES[category_key] = set()
-    
-    available_phrases = [p for p in phrase_list if p not in USED_PHRASES[category_key]]
-    
-    # If we've used many phrases, clear some old ones
-    if len(available_phrases) < len(phrase_list) * 0.3:
-        # Clear half of the used phrases
-        used_list = list(USED_PHRASES[category_key])
-        random.shuffle(used_list)
-        for phrase in used_list[:len(used_list)//2]:
-            USED_PHRASES[category_key].discard(phrase)
-        available_phrases = [p for p in phrase_list if p not in USED_PHRASES[category_key]]
-    
-    if not available_phrases:
-        available_phrases = phrase_list
-    
-    phrase = random.choice(available_phrases)
-    USED_PHRASES[category_key].add(phrase)
-    
-    # Persist tracking periodically
-    if random.random() < 0.1:  # 10% chance to save
-        save_phrase_tracking(USED_PHRASES)
-    
-    return phrase
+    # Category-specific pools draw unused phrases in constant time and
+    # recycle the oldest used ones when a pool runs low. Usage deltas are
+    # journaled as they happen, so there is no full-file save here.
+    return get_phrase_tracker().draw(f"{language}_{category}", phrase_list, rng)
+
+# Time budget for AI generation in milliseconds; once it runs out, templates written
+# in the meantime are used instead (0 waits for the AI however long it takes)
+REVIEW_DEADLINE_MS = int(os.environ.get('REVIEW_DEADLINE_MS', '0'))
+# How much earlier than the deadline the model calls are stopped
+AI_DEADLINE_MARGIN_SECONDS = 0.05
 
-def generate_review(product, existing_reviews=0, use_ai=True):
+def generate_review(product, existing_reviews=0, use_ai=True, rng=random, deadline_ms=None):
     """
     Generate a single review for a product using AI when available or fallback to templates
     
@@ -2206,80 +759,194 @@ def generate_review(product, existing_reviews=0, use_ai=True):
         product: Product information dictionary
         existing_reviews: Number of existing reviews for phrase tracking
         use_ai: Whether to attempt AI generation (default: True)
+        rng: Random stream for template generation, see make_rng() (default: global random)
+        deadline_ms: Time budget for AI generation, see generate_reviews_batch()
+            (default: REVIEW_DEADLINE_MS)
     """
     
     # Try AI-enhanced generation first if enabled and configured
     if use_ai and os.environ.get('OPENAI_API_KEY'):
-        try:
-            from ai_review_generator import generate_ai_enhanced_review
-            ai_review = generate_ai_enhanced_review(product, existing_reviews)
-            
-            # Add generation metadata
-            ai_review['generation_method'] = ai_review.get('generation_method', 'ai_enhanced')
-            ai_review['ai_enabled'] = True
-            
-            # Quality check - if AI review quality is good, use it
-            if ai_review.get('ai_quality_score', 0) >= 0.7:
-                print(f"✨ Generated AI review with quality score: {ai_review.get('ai_quality_score', 'N/A')}")
-                return ai_review
-            else:
-                print(f"⚠️ AI review quality low ({ai_review.get('ai_quality_score', 'N/A')}), falling back to templates")
-        
-        except Exception as e:
-            print(f"🔄 AI generation failed: {str(e)}, falling back to template generation")
+        if _resolve_deadline(deadline_ms) > 0:
+            return generate_reviews_batch(product, 1, existing_reviews, use_ai=True, rng=rng,
+                                          deadline_ms=deadline_ms)[0]
+        ai_review = _try_ai_review(product, existing_reviews)
+        if ai_review:
+            _record_review_texts([ai_review.get('content', '')])
+            return ai_review
     
     # Fallback to original template-based generation
-    language = select_language()
-    rating = generate_rating_distribution()
-    reviewer_name, reviewer_email, reviewer_location = generate_reviewer_info(language)
+    language = select_language(rng=rng)
+    rating = generate_rating_distribution(rng=rng)
+    review_date = generate_review_date(rng=rng)
+    review = _generate_template_review(product, analyze_product(product), language, rating, review_date, rng=rng)
+    _record_review_texts([review['content']])
+    return review
+
+def generate_reviews_batch(product, n, existing_reviews=0, use_ai=True, rng=random, record=True,
+                           deadline_ms=None):
+    """
+    Generate n reviews for one product
+    
+    Product analysis (features, categories, length profile) is done once for
+    the whole batch and ratings, languages and dates are drawn in one go,
+    instead of redoing all of it for every generate_review() call.
     
-    # Extract product insights from description
-    product_insights = extract_product_features(product, language)
+    With a deadline, template reviews are written while the AI reviews are in
+    flight, and every AI review that hasn't passed the quality check when the
+    deadline is reached is replaced by its template; the remaining model calls
+    are cancelled. Phrases drawn for templates that lost to an AI review still
+    count as used.
+    
+    Args:
+        product: Product information dictionary
+        n: Number of reviews to generate
+        existing_reviews: Index of the first review, for phrase tracking
+        use_ai: Whether to attempt AI generation (default: True)
+        rng: Random stream for template generation, see make_rng() (default: global random)
+        record: Add each review to the similarity index as soon as it is generated,
+            so later reviews are scored against it (default: True)
+        deadline_ms: Time budget for AI generation in milliseconds; 0 waits for the
+            AI reviews however long they take (default: REVIEW_DEADLINE_MS)
+    """
+    if n <= 0:
+        return []
+    
+    product_analysis = analyze_product(product)
+    languages = select_languages(n, rng=rng)
+    ratings = generate_ratings(n, rng=rng)
+    dates = generate_review_dates(n, rng=rng)
+    ai_available = use_ai and os.environ.get('OPENAI_API_KEY')
+    deadline_ms = _resolve_deadline(deadline_ms)
+    templates = [None] * n
+    if ai_available and deadline_ms > 0:
+        deadline = time.monotonic() + deadline_ms / 1000
+        ai_future = _submit_ai_reviews(product, n, deadline_ms / 1000)
+        templates = [
+            _generate_template_review(product, product_analysis, languages[i], ratings[i], dates[i], rng=rng)
+            for i in range(n)
+        ]
+        ai_reviews = _collect_ai_reviews(ai_future, n, deadline)
+    else:
+        # AI reviews are requested concurrently; templates fill in where they fail
+        ai_reviews = _try_ai_reviews(product, n) if ai_available else [None] * n
+    
+    reviews = []
+    for i in range(n):
+        if ai_reviews[i]:
+            reviews.append(ai_reviews[i])
+            if record:
+                _record_review_texts([ai_reviews[i].get('content', '')])
+            continue
+        
+        reviews.append(templates[i] or _generate_template_review(
+            product, product_analysis, languages[i], ratings[i], dates[i], rng=rng
+        ))
+        if record:
+            _record_review_texts([reviews[-1]['content']])
+    
+    return reviews
+
+def _try_ai_review(product, existing_reviews):
+    """Attempt AI generation, returning None when templates should be used"""
+    try:
+        from ai_review_generator import generate_ai_enhanced_review
+        return _accept_ai_review(generate_ai_enhanced_review(product, existing_reviews))
+    except Exception as e:
+        print(f"🔄 AI generation failed: {str(e)}, falling back to template generation")
+    
+    return None
+
+def _try_ai_reviews(product, n):
+    """Attempt n AI reviews concurrently, with None for each one templates should replace"""
+    try:
+        from ai_review_generator import generate_ai_enhanced_reviews
+        [ai_reviews] = generate_ai_enhanced_reviews([(product, n)])
+    except Exception as e:
+        print(f"🔄 AI generation failed: {str(e)}, falling back to template generation")
+        return [None] * n
+    return [_accept_ai_review(ai_review) if ai_review else None for ai_review in ai_reviews]
+
+def _resolve_deadline(deadline_ms):
+    """AI time budget in milliseconds, REVIEW_DEADLINE_MS when not given"""
+    return max(0, REVIEW_DEADLINE_MS if deadline_ms is None else deadline_ms)
+
+def _submit_ai_reviews(product, n, timeout):
+    """Start n AI reviews that give up after timeout seconds, None if they couldn't be started"""
+    try:
+        from ai_review_generator import submit_ai_enhanced_reviews
+        # The calls stop a little early, so reviews finished in time get back before the deadline
+        return submit_ai_enhanced_reviews([(product, n)], timeout=max(0.0, timeout - AI_DEADLINE_MARGIN_SECONDS))
+    except Exception as e:
+        print(f"🔄 AI generation failed: {str(e)}, falling back to template generation")
+        return None
+
+def _collect_ai_reviews(future, n, deadline):
+    """Accepted reviews of a _submit_ai_reviews() future by the deadline (time.monotonic()), None for the rest"""
+    if future is None:
+        return [None] * n
+    try:
+        [ai_reviews] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        future.cancel()
+        print("⏱️ AI generation missed its deadline, using template reviews")
+        return [None] * n
+    except Exception as e:
+        print(f"🔄 AI generation failed: {str(e)}, falling back to template generation")
+        return [None] * n
+    return [_accept_ai_review(ai_review) if ai_review else None for ai_review in ai_reviews]
+
+def _accept_ai_review(ai_review):
+    """The AI review with generation metadata if its quality is good enough, else None"""
+    # Add generation metadata
+    ai_review['generation_method'] = ai_review.get('generation_method', 'ai_enhanced')
+    ai_review['ai_enabled'] = True
+    
+    # Quality check - if AI review quality is good, use it
+    if ai_review.get('ai_quality_score', 0) >= 0.7:
+        print(f"✨ Generated AI review with quality score: {ai_review.get('ai_quality_score', 'N/A')}")
+        return ai_review
+    
+    print(f"⚠️ AI review quality low ({ai_review.get('ai_quality_score', 'N/A')}), falling back to templates")
+    return None
+
+# Languages tried when a low-quality review is regenerated
+REGENERATION_LANGUAGES = ('en', 'de', 'es', 'fr', 'it', 'pl', 'cs')
+
+# Quality score below which a template review may be regenerated
+QUALITY_THRESHOLD = 0.6
+
+# "tiered" only computes the full quality score for reviews the cheap metrics
+# can't place clearly above or below QUALITY_THRESHOLD; "full" always does
+QUALITY_GATE = os.environ.get('QUALITY_GATE', 'tiered')
+
+def _generate_template_review(product, product_analysis, language, rating, review_date, rng=random):
+    """Template-based review generation for already drawn language, rating and date"""
+    reviewer_name, reviewer_email, reviewer_location = generate_reviewer_info(language, rng=rng)
     
     # Title generation with better consistency
-    if random.random() < 0.12:  # 12% no title (slightly increased)
+    if rng.random() < 0.12:  # 12% no title (slightly increased)
         review_title = ""
     else:
-        titles = REVIEW_TITLES.get(language, REVIEW_TITLES["en"])
+        titles = language_table(language, 'titles')
         if rating in titles and titles[rating]:
-            review_title = get_unique_phrase(titles[rating], language, f"title_{rating}")
+            review_title = get_unique_phrase(titles[rating], language, f"title_{rating}", rng=rng)
         else:
             # Fallback titles for missing ratings
-            fallback_titles = {
-                "de": ["Gute Qualität", "Zufrieden", "Okay", "Top!", "Empfehlenswert"],
-                "en": ["Good quality", "Satisfied", "Nice!", "Great!", "Recommended"],
-                "es": ["Buena calidad", "Satisfecho", "¡Bien!", "¡Genial!", "Recomendado"],
-                "fr": ["Bonne qualité", "Satisfait", "Sympa!", "Super!", "Recommandé"],
-                "it": ["Buona qualità", "Soddisfatto", "Bello!", "Ottimo!", "Consigliato"]
-            }
-            fallback = fallback_titles.get(language, fallback_titles["en"])
-            review_title = random.choice(fallback)
-    
-    review_content = generate_review_content(product, rating, language, product_insights)
+            fallback = language_table(language, 'fallback_titles')
+            review_title = rng.choice(fallback)
+    
+    review_content = generate_review_content(product, rating, language, product_analysis=product_analysis, rng=rng)
     
     # Less frequent endings to reduce repetition
-    if len(review_content) > 100 and random.random() < 0.15:  # Only 15% chance for longer reviews
-        endings = {
-            "de": {
-                5: ["Klare Empfehlung!", "Top Kauf!", "Mega zufrieden!", "Immer wieder gerne!"],
-                4: ["Guter Kauf.", "Bin zufrieden.", "Kann man kaufen.", "Solide Wahl."],
-                3: ["Geht so.", "Okay.", "Mittelmäßig.", "Akzeptabel."]
-            },
-            "en": {
-                5: ["Highly recommend!", "Great buy!", "Super satisfied!", "Would buy again!"],
-                4: ["Good purchase.", "Satisfied.", "Worth buying.", "Solid choice."],
-                3: ["It's okay.", "Average.", "Decent.", "Acceptable."]
-            }
-        }
+    if len(review_content) > 100 and rng.random() < 0.15:  # Only 15% chance for longer reviews
+        endings = language_table(language, 'review_endings', fallback=None)
         
-        if language in endings and rating in endings[language]:
-            ending = random.choice(endings[language][rating])
+        if endings and rating in endings:
+            ending = rng.choice(endings[rating])
             review_content += f" {ending}"
     
-    review_date = generate_review_date()
-    
     # 7% chance for unverified
-    verified = 'Yes' if random.random() > 0.07 else 'No'
+    verified = 'Yes' if rng.random() > 0.07 else 'No'
     
     review_data = {
         'rating': rating,
@@ -2296,40 +963,96 @@ def generate_review(product, existing_reviews=0, use_ai=True):
     }
     
     # Enhanced quality integration - assess and potentially regenerate
-    quality_score = _assess_review_quality_inline(review_data, product)
+    # A seeded stream must give the same reviews whatever was generated before
+    reproducible = isinstance(rng, SeededRandom)
+    quality_score, review_data['quality_score_tier'] = _assess_review_quality_inline(review_data, product, reproducible)
     review_data['quality_score'] = quality_score
     
     # If quality is below threshold, try to regenerate once
-    if quality_score < 0.6 and random.random() < 0.3:  # 30% chance to regenerate low-quality reviews
+    if quality_score < QUALITY_THRESHOLD and rng.random() < 0.3:  # 30% chance to regenerate low-quality reviews
         print(f"🔄 Regenerating low-quality review (score: {quality_score:.2f})")
         
         # Try different component pattern for regeneration
-        alternative_language = random.choice(['en', 'de', 'es', 'fr', 'it', 'pl', 'cs'])
-        alternative_content = generate_review_content(product, rating, alternative_language, product_insights)
+        alternative_language = rng.choice(REGENERATION_LANGUAGES)
+        alternative_content = generate_review_content(product, rating, alternative_language, product_analysis=product_analysis, rng=rng)
         
         if alternative_content and len(alternative_content) > len(review_content):
             # Use better alternative
             review_data['content'] = alternative_content
             review_data['language'] = alternative_language
             review_data['regenerated'] = True
-            review_data['quality_score'] = _assess_review_quality_inline(review_data, product)
+            review_data['quality_score'], review_data['quality_score_tier'] = _assess_review_quality_inline(
+                review_data, product, reproducible
+            )
             print(f"✨ Regenerated review quality improved to: {review_data['quality_score']:.2f}")
     
     return review_data
 
-def _assess_review_quality_inline(review, product):
-    """Quick inline quality assessment for review generation"""
+# get_shared_scorer from ai_quality_scorer, False once its import failed
+_quality_scorer_factory = None
+
+def _get_quality_scorer():
+    """Process-wide quality scorer, or None without the ML dependencies"""
+    global _quality_scorer_factory
+    if _quality_scorer_factory is None:
+        try:
+            from ai_quality_scorer import get_shared_scorer
+            _quality_scorer_factory = get_shared_scorer
+        except ImportError:
+            # Failed imports aren't cached by Python; don't retry for every review
+            _quality_scorer_factory = False
+    return _quality_scorer_factory() if _quality_scorer_factory else None
+
+def _record_review_texts(texts):
+    """Add generated review texts to the similarity index the quality scorer checks uniqueness against"""
+    # Nothing reads the index without the scorer, so don't pay for signatures then
+    if _get_quality_scorer() is None:
+        return
     try:
-        # Import the quality scorer if available
-        from ai_quality_scorer import ReviewQualityScorer
-        
-        scorer = ReviewQualityScorer()
-        quality_metrics = scorer.assess_review_quality(review, product_context=product)
-        return quality_metrics.overall_score
-        
-    except ImportError:
+        get_similarity_index().add_many(texts)
+    except Exception as e:
+        print(f"⚠️ Could not index generated reviews: {str(e)}")
+
+def _assess_review_quality_inline(review, product, reproducible=False):
+    """
+    Quick inline quality assessment for review generation
+    
+    Returns (score, tier): the tier is 'full' for a complete assessment,
+    'basic' without the quality scorer, and otherwise the quality gate's tier,
+    so early-exit estimates aren't mistaken for measured scores.
+    A reproducible assessment depends on the review alone, not on the
+    persistent similarity index or on what the scorer has seen before.
+    """
+    scorer = _get_quality_scorer()
+    if scorer is None:
         # Fallback: basic quality scoring without ML dependencies
-        return _basic_quality_assessment(review)
+        return _basic_quality_assessment(review), 'basic'
+    
+    if QUALITY_GATE == 'full':
+        return scorer.assess_review_quality(review, product_context=product,
+                                            check_index=not reproducible).overall_score, 'full'
+    # An estimate unless the review is close to the threshold
+    decision = scorer.gate_review(review, QUALITY_THRESHOLD, product_context=product,
+                                  deterministic=reproducible)
+    return decision.score, decision.tier
+
+def log_quality_gate_metrics(dashboard):
+    """Log the quality gate's tier hit rates and time saved since the last call as analytics metrics"""
+    scorer = _get_quality_scorer()
+    if scorer is None:
+        return
+    report = scorer.gate_stats.take_report()
+    if not report['decisions_total']:
+        return
+    for tier, rate in report['hit_rates'].items():
+        dashboard.log_performance_metric(
+            f'quality_gate_{tier}_rate', rate, category='quality_gate',
+            metadata={'decisions': report['decisions'][tier], 'average_ms': report['average_ms'][tier]}
+        )
+    dashboard.log_performance_metric(
+        'quality_gate_time_saved_ms', report['time_saved_ms'], category='quality_gate',
+        metadata={'decisions_total': report['decisions_total']}
+    )
 
 def _basic_quality_assessment(review):
     """Basic quality assessment without external dependencies"""
@@ -2365,35 +1088,31 @@ def _basic_quality_assessment(review):
     
     return min(1.0, score)
 
-def generate_reviews_for_product(product_info, num_reviews=5):
-    """Generate multiple reviews for a product"""
+def generate_reviews_for_product(product_info, num_reviews=5, seed=None):
+    """Generate multiple reviews for a product, reproducibly when a job seed is given"""
+    rng = make_rng(seed, product_info.get('id'))
     reviews = []
     
     # Ensure language variety within product reviews
     min_languages = min(3, num_reviews)
     languages_used = set()
     
-    for i in range(num_reviews):
-        review = generate_review(product_info, existing_reviews=i)
-        
+    for review in generate_reviews_batch(product_info, num_reviews, rng=rng):
         # Track language diversity
         review_lang = review.get('location', 'US')[:2]
         languages_used.add(review_lang)
         
         reviews.append(review)
     
-    # Save phrase tracking at the end
-    save_phrase_tracking(USED_PHRASES)
+    # Deltas are already journaled; just make sure they reached the file
+    PHRASE_TRACKER.flush()
     
     return reviews
 
 # Clean up function to reset tracking if needed
 def reset_phrase_tracking():
     """Reset all phrase tracking - use sparingly"""
-    global USED_PHRASES
-    USED_PHRASES = defaultdict(set)
-    if os.path.exists(PHRASE_TRACKING_FILE):
-        os.remove(PHRASE_TRACKING_FILE)
+    PHRASE_TRACKER.reset()
     print("Phrase tracking reset")
 
 # Testing function to validate language consistency
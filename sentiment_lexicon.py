@@ -0,0 +1,219 @@
+"""
+Multilingual Sentiment Lexicon
+Polarity of review texts from a precompiled token weight map
+
+Replaces TextBlob's English-only polarity for the generated languages. Each
+word and word pair of the rating-tagged phrase tables in review_corpus/
+(titles and review endings per star rating) gets the average polarity of the
+ratings it appears under, pulled towards the corpus average when it is rare.
+Tokens that say nothing about the rating are dropped. The corpus only has 3 to
+5 star phrases, so per-language seed words fix the weights of common positive
+and negative words. The rest are shipped as a single token -> weight map in
+sentiment_lexicon.json, along with the negation words. A text's polarity is
+the average weight of its known tokens, found in one pass, with the words
+shortly after a negation counted with the opposite sign. Rebuild the lexicon after changing the corpus with:
+
+    python sentiment_lexicon.py
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sentiment_lexicon.json')
+
+# Languages with rating-tagged phrase tables (review_generator.REVIEW_LANGUAGES)
+LEXICON_LANGUAGES = ('de', 'en', 'es', 'fr', 'it', 'pl', 'cs')
+RATING_TABLES = ('titles', 'review_endings')
+
+# Polarity each star rating stands for: the middle of the range the quality
+# scorer expects for it (ReviewQualityScorer rating_sentiment_correlation)
+RATING_POLARITY = {1: -0.75, 2: -0.3, 3: 0.05, 4: 0.4, 5: 0.8}
+
+# Generic English sentiment words, also the scorer's keyword fallback
+POSITIVE_WORDS = ['great', 'excellent', 'amazing', 'perfect', 'love', 'awesome',
+                  'fantastic', 'wonderful', 'outstanding', 'brilliant']
+NEGATIVE_WORDS = ['terrible', 'awful', 'horrible', 'disappointing', 'waste',
+                  'poor', 'bad', 'worst', 'useless', 'regret']
+
+# Seed words per language, weighted like 5 and 1 star reviews whatever the corpus says
+SEED_WORDS = {
+    'en': {
+        'positive': POSITIVE_WORDS + ['recommend', 'beautiful', 'comfortable'],
+        'negative': NEGATIVE_WORDS + ['disappointed', 'broken', 'ugly', 'cheaply', 'flimsy']
+    },
+    'de': {
+        'positive': ['super', 'toll', 'perfekt', 'empfehlen', 'empfehlenswert', 'begeistert', 'zufrieden',
+                     'fantastisch', 'hervorragend', 'wunderschön', 'klasse', 'liebe'],
+        'negative': ['schlecht', 'schlechte', 'schlechter', 'schlechtes', 'enttäuscht', 'enttäuschend',
+                     'enttäuschung', 'mangelhaft', 'furchtbar', 'schrecklich', 'kaputt', 'unzufrieden',
+                     'billig', 'nie wieder']
+    },
+    'es': {
+        'positive': ['excelente', 'perfecto', 'perfecta', 'encanta', 'recomiendo', 'genial', 'increíble',
+                     'maravilloso', 'feliz'],
+        'negative': ['malo', 'mala', 'pésimo', 'pésima', 'terrible', 'horrible', 'decepcionado',
+                     'decepcionada', 'decepción', 'roto', 'rota', 'defectuoso']
+    },
+    'fr': {
+        'positive': ['excellent', 'parfait', 'parfaite', 'adore', 'recommande', 'génial', 'superbe',
+                     'magnifique', 'ravi', 'ravie'],
+        'negative': ['mauvais', 'mauvaise', 'nul', 'nulle', 'horrible', 'déçu', 'déçue', 'décevant',
+                     'décevante', 'cassé', 'médiocre']
+    },
+    'it': {
+        'positive': ['ottimo', 'ottima', 'perfetto', 'perfetta', 'consiglio', 'adoro', 'fantastico',
+                     'bellissimo', 'bellissima', 'soddisfatto', 'soddisfatta'],
+        'negative': ['pessimo', 'pessima', 'scadente', 'deluso', 'delusa', 'deludente', 'brutto',
+                     'brutta', 'orribile', 'rotto']
+    },
+    'pl': {
+        'positive': ['świetna', 'świetny', 'świetnie', 'polecam', 'idealna', 'idealny', 'super',
+                     'doskonała', 'doskonały', 'zadowolona', 'zadowolony', 'piękna'],
+        'negative': ['słaba', 'słaby', 'słabo', 'zła', 'zły', 'kiepska', 'kiepski', 'fatalna', 'fatalny',
+                     'rozczarowana', 'rozczarowany', 'rozczarowanie', 'okropna', 'okropny', 'beznadziejna']
+    },
+    'cs': {
+        'positive': ['skvělá', 'skvělý', 'skvěle', 'doporučuji', 'perfektní', 'výborná', 'výborný',
+                     'spokojená', 'spokojený', 'krásná'],
+        'negative': ['špatná', 'špatný', 'špatně', 'hrozná', 'hrozný', 'zklamaná', 'zklamaný', 'zklamání',
+                     'nekvalitní', 'nedoporučuji', 'otřesná', 'příšerná']
+    }
+}
+
+# Words turning the sentiment of the next few words around ("nie polecam", "no lo recomiendo")
+NEGATION_WORDS = {
+    'en': ['not', 'no', 'never', 'dont', 'don', 'doesn', 'didn', 'isn', 'wasn', 'won'],
+    'de': ['nicht', 'kein', 'keine', 'keinen', 'nie', 'niemals'],
+    'es': ['no', 'nunca', 'ni'],
+    'fr': ['ne', 'pas', 'jamais'],
+    'it': ['non', 'mai'],
+    'pl': ['nie', 'nigdy'],
+    'cs': ['ne', 'nikdy']
+}
+# Words after a negation word whose weight is turned around, within the same clause
+NEGATION_WINDOW = 3
+
+# Pseudo-occurrences at the corpus average added to every token
+SMOOTHING = 0.5
+# Tokens whose weight is closer than this to the corpus average are dropped
+MIN_DEVIATION = 0.05
+
+_PLACEHOLDER_PATTERN = re.compile(r'\{[^}]*\}')
+_WORD_PATTERN = re.compile(r'[^\W\d_]+')
+_CLAUSE_PATTERN = re.compile(r'[.,;:!?()]+')
+
+def text_tokens(text: str) -> List[str]:
+    """Lowercased words and adjacent word pairs"""
+    words = _WORD_PATTERN.findall(text.lower())
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+def rating_phrases(pack: Dict) -> Iterable[Tuple[int, str]]:
+    """(rating, phrase) pairs of a language pack's rating-tagged tables, placeholders removed"""
+    for table in RATING_TABLES:
+        for rating, phrases in pack.get(table, {}).items():
+            for phrase in phrases:
+                yield int(rating), _PLACEHOLDER_PATTERN.sub(' ', phrase)
+
+def build_lexicon(labelled: Iterable[Tuple[int, str]], smoothing: float = SMOOTHING,
+                  min_deviation: float = MIN_DEVIATION) -> Dict[str, float]:
+    """Token weights from (rating, text) examples"""
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    polarities = []
+    for rating, text in labelled:
+        polarity = RATING_POLARITY[rating]
+        polarities.append(polarity)
+        for token in set(text_tokens(text)):
+            totals[token] = totals.get(token, 0.0) + polarity
+            counts[token] = counts.get(token, 0) + 1
+    if not polarities:
+        return {}
+
+    average = sum(polarities) / len(polarities)
+    weights = {}
+    for token, total in totals.items():
+        weight = (total + smoothing * average) / (counts[token] + smoothing)
+        if abs(weight - average) >= min_deviation:
+            weights[token] = round(weight, 4)
+    return dict(sorted(weights.items()))
+
+def build_corpus_lexicon() -> Dict:
+    """Lexicon for LEXICON_LANGUAGES from the template corpus and the seed words"""
+    from template_corpus import load_language_pack
+    labelled = [pair for language in LEXICON_LANGUAGES for pair in rating_phrases(load_language_pack(language))]
+    weights = build_lexicon(labelled)
+    negations = sorted({word for language in LEXICON_LANGUAGES for word in NEGATION_WORDS[language]})
+    for language in LEXICON_LANGUAGES:
+        weights.update((word, RATING_POLARITY[5]) for word in SEED_WORDS[language]['positive'])
+        weights.update((word, RATING_POLARITY[1]) for word in SEED_WORDS[language]['negative'])
+    for word in negations:
+        weights.pop(word, None)
+    return {'languages': list(LEXICON_LANGUAGES), 'negations': negations, 'weights': dict(sorted(weights.items()))}
+
+class SentimentLexicon:
+    """Scores text polarity from -1 to 1 with one dictionary lookup per token"""
+
+    def __init__(self, lexicon: Dict):
+        self.languages: Tuple[str, ...] = tuple(lexicon['languages'])
+        self.weights: Dict[str, float] = lexicon['weights']
+        self.negations = frozenset(lexicon.get('negations', ()))
+
+    @classmethod
+    def load(cls, path: str = LEXICON_PATH) -> 'SentimentLexicon':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def polarity(self, text: str) -> Optional[float]:
+        """
+        Average weight of the known tokens, None (neutral) if no token carries sentiment
+
+        Up to NEGATION_WINDOW words after a negation word in the same clause
+        count with the opposite sign, as do word pairs ending in one of them;
+        pairs starting with the negation word ("nie wieder") keep their weight.
+        """
+        weights, negations = self.weights, self.negations
+        total = 0.0
+        count = 0
+        for clause in _CLAUSE_PATTERN.split(text.lower()):
+            previous = None
+            negated = 0  # Words left in the current negation window
+            for word in _WORD_PATTERN.findall(clause):
+                if word in negations:
+                    if previous is not None:
+                        weight = weights.get(f'{previous} {word}')
+                        if weight is not None:
+                            total += -weight if negated else weight
+                            count += 1
+                    previous, negated = word, NEGATION_WINDOW
+                    continue
+                sign = -1.0 if negated else 1.0
+                weight = weights.get(word)
+                if weight is not None:
+                    total += sign * weight
+                    count += 1
+                if previous is not None:
+                    weight = weights.get(f'{previous} {word}')
+                    if weight is not None:
+                        # The pair's own weight already covers its negation word
+                        total += weight if previous in negations else sign * weight
+                        count += 1
+                previous = word
+                negated = max(0, negated - 1)
+        return total / count if count else None
+
+@lru_cache(maxsize=1)
+def get_sentiment_lexicon() -> SentimentLexicon:
+    """Process-wide lexicon, loaded from the shipped file on first use"""
+    return SentimentLexicon.load()
+
+def text_polarity(text: str) -> Optional[float]:
+    """Polarity of a text from -1 to 1, or None if it has no known tokens"""
+    return get_sentiment_lexicon().polarity(text)
+
+if __name__ == "__main__":
+    lexicon = build_corpus_lexicon()
+    with open(LEXICON_PATH, 'w', encoding='utf-8') as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"✅ Wrote {len(lexicon['weights'])} token weights for {', '.join(lexicon['languages'])} to {LEXICON_PATH}")
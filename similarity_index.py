@@ -0,0 +1,396 @@
+"""
+Review Similarity Index
+Near-duplicate detection across every generated review with MinHash and LSH
+
+Each review is reduced to a MinHash signature over word shingles. The
+signature is split into bands, and every band is stored as a bucket key in
+SQLite. Reviews sharing a bucket with a new review are its candidates, so
+inserts are a constant number of row writes and lookups only touch the few
+reviews that share a band, no matter how large the history grows. The
+database is shared by all worker processes, like SQLitePhraseTracker.
+"""
+import atexit
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import struct
+import threading
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from phrase_tracking import SQLITE_BUSY_TIMEOUT
+
+REVIEW_SIMILARITY_DB = os.environ.get('REVIEW_SIMILARITY_DB', 'review_similarity.db')
+
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard similarity almost always share a band
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+# Candidates compared per lookup; bounds the cost of very common short reviews
+MAX_CANDIDATES = 500
+
+# Shingles hashed together by signature_matrix(); bounds its temporary arrays to a few MB
+MATRIX_CHUNK_SHINGLES = 16384
+# Bound parameters per batched lookup query, below SQLite's default limit of 999
+LOOKUP_CHUNK_KEYS = 900
+
+# PRAGMA user_version of an up to date database; bump it with every change to _SCHEMA
+SCHEMA_VERSION = 2
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS review_signatures (
+        id INTEGER PRIMARY KEY,
+        digest BLOB NOT NULL UNIQUE,
+        signature BLOB NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS review_bands (
+        band_key INTEGER NOT NULL,
+        review_id INTEGER NOT NULL
+    )""",
+    # Version 2: newest candidates first, straight from the index
+    "DROP INDEX IF EXISTS idx_review_bands_key",
+    "CREATE INDEX IF NOT EXISTS idx_review_bands_key_review ON review_bands (band_key, review_id)"
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _permutations(seed: int = 1) -> Tuple[Tuple[int, int], ...]:
+    """Fixed (a, b) coefficients of the universal hash permutations"""
+    rng = random.Random(seed)
+    return tuple(
+        (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+        for _ in range(NUM_PERMUTATIONS)
+    )
+
+# Signatures must stay comparable with the ones already stored, never change the seed
+_PERMUTATIONS = _permutations()
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+def shingles(text: str) -> List[str]:
+    """Word n-grams of the normalized text; short texts form a single shingle"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+@lru_cache(maxsize=4096)
+def signature(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of a text, None for texts without words"""
+    hashes = {zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text)}
+    if not hashes:
+        return None
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+def signature_matrix(texts: Sequence[str]):
+    """MinHash signatures of many texts at once, computed with NumPy
+
+    Returns a (len(texts), NUM_PERMUTATIONS) uint32 array with the same values as
+    signature(), and a boolean array marking the texts that have words (rows of
+    the others are zero). The permutations are evaluated for all shingles of a
+    chunk of texts in a handful of array operations, with the products reduced
+    modulo the Mersenne prime in 64-bit pieces. Needs NumPy, which the quality
+    scorer depends on.
+    """
+    import numpy as np
+
+    a = np.array([first for first, _ in _PERMUTATIONS], dtype=np.uint64)
+    b = np.array([second for _, second in _PERMUTATIONS], dtype=np.uint64)
+    a_high, a_low = a >> np.uint64(32), a & np.uint64(_MAX_HASH)
+    prime = np.uint64(_MERSENNE_PRIME)
+    bits, low_29 = np.uint64(61), np.uint64((1 << 29) - 1)
+
+    def reduce(values):
+        # x mod (2**61 - 1) up to a small multiple of the prime, as 2**61 == 1
+        return (values & prime) + (values >> bits)
+
+    matrix = np.zeros((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+    has_words = np.zeros(len(texts), dtype=bool)
+    rows, hashes, offsets = [], [], []
+
+    def flush():
+        values = np.array(hashes, dtype=np.uint64)[:, None]
+        # a * v == a_high * v * 2**32 + a_low * v; neither product overflows 64 bits
+        high = a_high * values
+        high = (high >> np.uint64(29)) + ((high & low_29) << np.uint64(32))
+        products = reduce(high + reduce(a_low * values))
+        products = reduce(products + b)
+        products = np.where(products >= prime, products - prime, products)
+        minimums = np.minimum.reduceat(products, offsets, axis=0)
+        matrix[rows] = (minimums & np.uint64(_MAX_HASH)).astype(np.uint32)
+        has_words[rows] = True
+        rows.clear()
+        hashes.clear()
+        offsets.clear()
+
+    for row, text in enumerate(texts):
+        text_shingles = shingles(text) if text else []
+        if not text_shingles:
+            continue
+        rows.append(row)
+        offsets.append(len(hashes))
+        hashes.extend(zlib.crc32(shingle.encode('utf-8')) for shingle in text_shingles)
+        if len(hashes) >= MATRIX_CHUNK_SHINGLES:
+            flush()
+    if rows:
+        flush()
+    return matrix, has_words
+
+def batch_max_similarities(matrix, has_words) -> List[float]:
+    """Highest estimated similarity of every row of signature_matrix() to any earlier row
+
+    Rows are bucketed by each of their MinHash values, and the number of
+    buckets two rows share is the number of equal signature values, so this
+    gives estimate_similarity() against every earlier row without comparing
+    all pairs. Only the MAX_CANDIDATES most recent rows of a bucket are
+    counted, which bounds the cost of very common short reviews.
+    """
+    best = [0.0] * len(matrix)
+    columns = matrix.T.tolist()
+    buckets = [{} for _ in range(NUM_PERMUTATIONS)]
+    for row, words in enumerate(has_words.tolist()):
+        if not words:
+            continue
+        earlier = []
+        for values, value_buckets in zip(columns, buckets):
+            bucket = value_buckets.setdefault(values[row], [])
+            earlier.extend(bucket[-MAX_CANDIDATES:])
+            bucket.append(row)
+        if earlier:
+            best[row] = max(Counter(earlier).values()) / NUM_PERMUTATIONS
+    return best
+
+def estimate_similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERMUTATIONS
+
+def band_keys(sig: Sequence[int]) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'<B{ROWS_PER_BAND}I', band, *rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+def _pack(sig: Sequence[int]) -> bytes:
+    return array('I', sig).tobytes()
+
+def _unpack(blob: bytes) -> Tuple[int, ...]:
+    values = array('I')
+    values.frombytes(blob)
+    return tuple(values)
+
+class NearDuplicateIndex:
+    """Persistent MinHash/LSH index of review texts, shared through SQLite"""
+
+    def __init__(self, db_path: str, busy_timeout: int = SQLITE_BUSY_TIMEOUT):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    @classmethod
+    def open(cls, db_path: str = REVIEW_SIMILARITY_DB,
+             busy_timeout: int = SQLITE_BUSY_TIMEOUT) -> 'NearDuplicateIndex':
+        """Open the shared index, closing it at exit"""
+        index = cls(db_path, busy_timeout)
+        atexit.register(index.close)
+        return index
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened in forked worker processes"""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._local = threading.local()
+            self._pid = pid
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._migrate(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Bring the schema up to SCHEMA_VERSION, taking the write lock only when it is behind"""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another connection may have migrated while this one waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _insert(self, conn: sqlite3.Connection, sig: Tuple[int, ...]) -> bool:
+        """Store a signature and its bands; identical signatures are stored once"""
+        packed = _pack(sig)
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO review_signatures (digest, signature) VALUES (?, ?)",
+            (hashlib.blake2b(packed, digest_size=16).digest(), packed)
+        )
+        if not cursor.rowcount:
+            return False
+        review_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO review_bands (band_key, review_id) VALUES (?, ?)",
+            [(key, review_id) for key in band_keys(sig)]
+        )
+        return True
+
+    def add(self, text: str) -> bool:
+        """Index a review text, returning False for empty or already indexed texts"""
+        return self.add_many([text]) == 1
+
+    def add_many(self, texts: Iterable[str]) -> int:
+        """Index many review texts in one transaction, returning how many were new"""
+        signatures = [sig for sig in (signature(text) for text in texts if text) if sig]
+        if not signatures:
+            return 0
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = sum(1 for sig in signatures if self._insert(conn, sig))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return added
+
+    def candidates(self, sig: Sequence[int]) -> List[Tuple[int, ...]]:
+        """Signatures of the most recently indexed reviews sharing at least one band with sig"""
+        keys = band_keys(sig)
+        rows = self._connection().execute(
+            f"""SELECT signature FROM review_signatures WHERE id IN (
+                    SELECT review_id FROM review_bands
+                    WHERE band_key IN ({','.join('?' * len(keys))})
+                    ORDER BY review_id DESC LIMIT ?
+                )""",
+            (*keys, MAX_CANDIDATES)
+        )
+        return [_unpack(row[0]) for row in rows]
+
+    def max_similarity(self, text: str) -> float:
+        """Highest estimated similarity of a text to any indexed review (0.0 if none is close)"""
+        sig = signature(text) if text else None
+        if sig is None:
+            return 0.0
+        best = 0.0
+        for other in self.candidates(sig):
+            best = max(best, estimate_similarity(sig, other))
+            if best == 1.0:
+                break
+        return best
+
+    def max_similarities(self, signatures: Sequence[Optional[Sequence[int]]]) -> List[float]:
+        """max_similarity() for many precomputed signatures (None for texts without words)
+
+        Looks up the band buckets of all signatures together, a few queries per
+        thousand reviews instead of one per review.
+        """
+        keys_per_signature = [band_keys(sig) if sig is not None else [] for sig in signatures]
+        unique_keys = list({key for keys in keys_per_signature for key in keys})
+        if not unique_keys:
+            return [0.0] * len(signatures)
+
+        conn = self._connection()
+        bucket_ids: Dict[int, List[int]] = {}
+        for start in range(0, len(unique_keys), LOOKUP_CHUNK_KEYS):
+            chunk = unique_keys[start:start + LOOKUP_CHUNK_KEYS]
+            rows = conn.execute(
+                f"""SELECT band_key, review_id FROM (
+                        SELECT band_key, review_id,
+                               ROW_NUMBER() OVER (PARTITION BY band_key ORDER BY review_id DESC) AS position
+                        FROM review_bands WHERE band_key IN ({','.join('?' * len(chunk))})
+                    ) WHERE position <= ?""",
+                (*chunk, MAX_CANDIDATES)
+            )
+            for key, review_id in rows:
+                bucket_ids.setdefault(key, []).append(review_id)
+
+        candidate_ids = []
+        for keys in keys_per_signature:
+            ids = dict.fromkeys(review_id for key in keys for review_id in bucket_ids.get(key, ()))
+            candidate_ids.append(sorted(ids, reverse=True)[:MAX_CANDIDATES])
+
+        stored = {}
+        needed = list({review_id for ids in candidate_ids for review_id in ids})
+        for start in range(0, len(needed), LOOKUP_CHUNK_KEYS):
+            chunk = needed[start:start + LOOKUP_CHUNK_KEYS]
+            rows = conn.execute(
+                f"SELECT id, signature FROM review_signatures WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            stored.update((review_id, _unpack(blob)) for review_id, blob in rows)
+
+        similarities = []
+        for sig, ids in zip(signatures, candidate_ids):
+            best = 0.0
+            for review_id in ids:
+                best = max(best, estimate_similarity(sig, stored[review_id]))
+                if best == 1.0:
+                    break
+            similarities.append(best)
+        return similarities
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM review_signatures").fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+# Process-wide index, opened on first use
+_shared_index: Optional[NearDuplicateIndex] = None
+_shared_index_lock = threading.Lock()
+
+def get_similarity_index() -> NearDuplicateIndex:
+    """Get the process-wide similarity index, opening it once"""
+    global _shared_index
+    index = _shared_index
+    if index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = NearDuplicateIndex.open(REVIEW_SIMILARITY_DB)
+            index = _shared_index
+    return index
+
+@contextmanager
+def use_similarity_index(index: NearDuplicateIndex):
+    """Use another index as the process-wide one, e.g. a temporary one in tests
+
+    Process-wide rather than per thread, so the client pool's threads and
+    forked bulk workers see it as well.
+    """
+    global _shared_index
+    with _shared_index_lock:
+        previous, _shared_index = _shared_index, index
+    try:
+        yield index
+    finally:
+        with _shared_index_lock:
+            _shared_index = previous
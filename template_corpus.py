@@ -0,0 +1,56 @@
+"""
+Review Template Corpus
+Per-language phrase packs, loaded on first use and kept as tuples
+
+Each review_corpus/<language>.json file holds every phrase table for one
+language. A worker only loads the languages it actually generates, once,
+instead of building all of them on import.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'review_corpus')
+DEFAULT_LANGUAGE = 'en'
+
+def _freeze(value):
+    """Lists become tuples and numeric keys (ratings) become ints"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return {(int(key) if key.isdigit() else key): _freeze(item) for key, item in value.items()}
+    return value
+
+@lru_cache(maxsize=None)
+def available_languages() -> frozenset:
+    """Languages that have a phrase pack"""
+    return frozenset(
+        name[:-len('.json')] for name in os.listdir(CORPUS_DIR) if name.endswith('.json')
+    )
+
+@lru_cache(maxsize=None)
+def load_language_pack(language: str) -> Dict[str, Any]:
+    """All phrase tables for a language; empty for languages without a pack"""
+    if language not in available_languages():
+        return {}
+    with open(os.path.join(CORPUS_DIR, f'{language}.json'), 'r', encoding='utf-8') as f:
+        return _freeze(json.load(f))
+
+def language_table(language: str, table: str, fallback: Optional[str] = DEFAULT_LANGUAGE):
+    """A phrase table for a language, or the fallback language's table if it has none"""
+    pack = load_language_pack(language)
+    if table in pack:
+        return pack[table]
+    if fallback is None:
+        return None
+    return load_language_pack(fallback)[table]
+
+def build_table(table: str) -> Dict[str, Any]:
+    """One table across all languages, keyed by language like the old module-level dicts"""
+    tables = {}
+    for language in sorted(available_languages()):
+        pack = load_language_pack(language)
+        if table in pack:
+            tables[language] = pack[table]
+    return tables
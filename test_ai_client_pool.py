@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared async OpenAI client pool
+Runs AI generation against a local fake OpenAI-compatible server
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+openai = pytest.importorskip('openai')
+ai_review_generator = pytest.importorskip('ai_review_generator')
+import image_analysis_cache
+import review_generator
+from ai_review_generator import (AIClientPool, AIReviewGenerator, create_ai_review_request,
+                                 generate_ai_enhanced_reviews, pre_analyze_catalog_images)
+from image_analysis_cache import ImageAnalysisCache
+from phrase_tracking import PhraseTracker
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+REVIEW = {
+    'title': 'Love this dress', 'rating': 5, 'author_name': 'Sarah', 'author_location': 'Chicago',
+    'content': 'The quality of the fabric is great and the fit is perfect, I wore it to a concert and '
+               'got so many compliments. Shipping was fast and the price is fair for what you get.'
+}
+
+class FakeOpenAI(ThreadingHTTPServer):
+    """Chat completions server that counts concurrent requests and rate-limits the first ones"""
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, rate_limited=0, content=None):
+        super().__init__(('127.0.0.1', 0), FakeOpenAIHandler)
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.content = content or json.dumps(REVIEW)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.models = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/v1'
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        with server.lock:
+            server.models.append(body['model'])
+            server.requests += 1
+            limited = server.requests <= server.rate_limited
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+
+        if limited:
+            body = {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}}
+            self._send(429, body, {'retry-after': '0'})
+        else:
+            self._send(200, {
+                'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': 'gpt-4-turbo',
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': server.content}}],
+                'usage': {'prompt_tokens': 10, 'completion_tokens': 10, 'total_tokens': 20}
+            })
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+@pytest.fixture(autouse=True)
+def isolated_generation_state(tmp_path):
+    """In-memory phrase tracking and a temporary similarity index for template fallbacks
+
+    The process-wide tracker is replaced, not just this thread's, as the client
+    pool's fallbacks run on other threads.
+    """
+    saved = review_generator.PHRASE_TRACKER
+    review_generator.PHRASE_TRACKER = PhraseTracker()
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    try:
+        with use_similarity_index(index):
+            yield index
+    finally:
+        review_generator.PHRASE_TRACKER = saved
+        index.close()
+
+@contextmanager
+def fake_openai(**options):
+    server = FakeOpenAI(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@contextmanager
+def client_pool(server, **options):
+    pool = AIClientPool(api_key='test-key', base_url=server.base_url, backoff=0.01, **options)
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+@contextmanager
+def shared_pool_and_image_cache(pool):
+    """Use pool and a temporary image analysis cache as the process-wide ones"""
+    originals = ai_review_generator._client_pool, image_analysis_cache._shared_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageAnalysisCache(os.path.join(tmp, 'images.db'))
+        ai_review_generator._client_pool, image_analysis_cache._shared_cache = pool, cache
+        try:
+            yield cache
+        finally:
+            ai_review_generator._client_pool, image_analysis_cache._shared_cache = originals
+            cache.close()
+
+@contextmanager
+def openai_key():
+    """An API key in the environment, which generate_review() checks before trying AI"""
+    saved = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+    try:
+        yield
+    finally:
+        if saved is None:
+            os.environ.pop('OPENAI_API_KEY')
+        else:
+            os.environ['OPENAI_API_KEY'] = saved
+
+def _completion(pool):
+    return pool.chat_completion(model='gpt-4-turbo', messages=[{'role': 'user', 'content': 'Hi'}])
+
+def test_requests_run_concurrently_under_limit():
+    """Calls overlap, but never more than max_concurrency at once"""
+    with fake_openai(latency=0.2) as server, client_pool(server, max_concurrency=3) as pool:
+        async def run_all():
+            return await asyncio.gather(*[_completion(pool) for _ in range(9)])
+        started = time.perf_counter()
+        responses = pool.run(run_all())
+        elapsed = time.perf_counter() - started
+        assert len(responses) == 9
+        assert server.max_in_flight == 3 == pool.get_stats()['max_in_flight']
+        assert elapsed < 9 * 0.2 * 0.6  # Far below one call after another
+
+def test_rate_limits_are_retried():
+    """429 responses are retried until the server lets the call through"""
+    with fake_openai(rate_limited=2) as server, client_pool(server, max_retries=3) as pool:
+        response = pool.run(_completion(pool))
+        assert json.loads(response.choices[0].message.content)['title'] == REVIEW['title']
+        stats = pool.get_stats()
+        assert (stats['requests'], stats['rate_limited'], stats['retries']) == (3, 2, 2)
+
+def test_retries_give_up():
+    """After max_retries the rate-limit error reaches the caller"""
+    with fake_openai(rate_limited=10) as server, client_pool(server, max_retries=1) as pool:
+        with pytest.raises(openai.RateLimitError):
+            pool.run(_completion(pool))
+        assert pool.get_stats()['failures'] == 1
+
+def test_reviews_generated_through_shared_pool():
+    """Reviews for several products come back per product, in the review format"""
+    pytest.importorskip('textblob')
+    with fake_openai(latency=0.05) as server, client_pool(server, max_concurrency=4) as pool:
+        with shared_pool_and_image_cache(pool):
+            products = [{'id': 1, 'title': 'Velvet Dress'}, {'id': 2, 'title': 'Mesh Shirt'}]
+            reviews = generate_ai_enhanced_reviews([(products[0], 5), (products[1], 3)])
+        assert [len(job) for job in reviews] == [5, 3]
+        assert all(review['author'] and review['content'] for job in reviews for review in job)
+        assert AIReviewGenerator(pool).pool is pool
+        assert server.max_in_flight <= 4
+
+def test_image_analyzed_once():
+    """Concurrent reviews of one image share a vision call, later ones use the cache"""
+    pytest.importorskip('textblob')
+    product = {'id': 3, 'title': 'Lace Gown', 'images': [
+        {'src': 'https://cdn.shopify.com/gown.jpg', 'updated_at': '2024-05-01T10:00:00Z'}
+    ]}
+    with fake_openai(latency=0.05) as server, client_pool(server) as pool:
+        with shared_pool_and_image_cache(pool) as cache:
+            generate_ai_enhanced_reviews([(product, 6)])
+            assert server.models.count('gpt-4-vision-preview') == 1
+            generate_ai_enhanced_reviews([(product, 3)])
+            assert server.models.count('gpt-4-vision-preview') == 1
+            assert cache.stats()['hits'] >= 3
+
+def test_pre_analyze_catalog_images():
+    """Pre-analysis fills the cache once per image version"""
+    products = [
+        {'id': 4, 'images': [{'src': 'https://cdn.shopify.com/a.jpg', 'updated_at': '1'},
+                             {'src': 'https://cdn.shopify.com/b.jpg', 'updated_at': '1'}]},
+        {'id': 5, 'images': [{'src': 'https://cdn.shopify.com/c.jpg', 'updated_at': '1'}]},
+        {'id': 6, 'images': []}
+    ]
+    with fake_openai() as server, client_pool(server) as pool:
+        with shared_pool_and_image_cache(pool) as cache:
+            assert pre_analyze_catalog_images(products) == {'images': 2, 'cached': 0, 'analyzed': 2, 'failed': 0}
+            assert pre_analyze_catalog_images(products, all_images=True) == {
+                'images': 3, 'cached': 2, 'analyzed': 1, 'failed': 0
+            }
+            assert len(cache) == 3 and server.requests == 3
+
+def test_multi_review_response_parsing():
+    """Arrays are read from plain, fenced and wrapped JSON and padded to the requested count"""
+    parse = AIReviewGenerator._parse_multi_review_response
+    assert parse(json.dumps([REVIEW, REVIEW]), 2) == [REVIEW, REVIEW]
+    assert parse('```json\n' + json.dumps([REVIEW]) + '\n```', 2) == [REVIEW, None]
+    assert parse(json.dumps({'reviews': [REVIEW, REVIEW, REVIEW]}), 2) == [REVIEW, REVIEW]
+    assert parse('Sorry, I cannot help with that', 2) == [None, None]
+
+def test_multi_review_items_validated_one_by_one():
+    """One call yields all reviews; a bad item alone falls back to templates"""
+    pytest.importorskip('textblob')
+    product = {'id': 7, 'title': 'Velvet Dress', 'body_html': 'Soft velvet dress'}
+    requests = [create_ai_review_request(product, 'en', rating) for rating in (5, 5, 4)]
+    items = [dict(REVIEW, rating=5), dict(REVIEW, rating=2), dict(REVIEW, rating=4, title=None)]
+    with fake_openai(content=json.dumps(items)) as server, client_pool(server) as pool:
+        with shared_pool_and_image_cache(pool):
+            reviews = AIReviewGenerator(pool).generate_ai_reviews(requests)
+            batched = generate_ai_enhanced_reviews([(product, 4)], reviews_per_call=4)
+        assert server.requests == 2
+    assert [review['generation_method'] for review in reviews] == [
+        'gpt4_multi', 'template_fallback', 'template_fallback'
+    ]
+    assert reviews[0]['rating'] == 5 and reviews[0]['persona'] == 'millennial'
+    assert len(batched[0]) == 4
+
+def test_deadline_falls_back_to_template():
+    """A slow model call loses to the template written meanwhile and is cancelled"""
+    pytest.importorskip('textblob')
+    product = {'id': 8, 'title': 'Velvet Dress', 'body_html': 'Soft velvet dress'}
+    with fake_openai(latency=2.0) as server, client_pool(server) as pool:
+        with shared_pool_and_image_cache(pool), openai_key():
+            started = time.perf_counter()
+            review = review_generator.generate_review(product, deadline_ms=300)
+            elapsed = time.perf_counter() - started
+            reviews = review_generator.generate_reviews_batch(product, 3, deadline_ms=300)
+            time.sleep(0.1)
+            assert pool.get_stats()['in_flight'] == 0
+    assert review['generation_method'] == 'template_based'
+    assert elapsed < 1.0
+    assert [review['generation_method'] for review in reviews] == ['template_based'] * 3
+
+def test_deadline_keeps_ai_reviews_in_time():
+    """Model answers within the budget win over the templates"""
+    pytest.importorskip('textblob')
+    product = {'id': 9, 'title': 'Velvet Dress', 'body_html': 'Soft velvet dress'}
+    with fake_openai(latency=0.05) as server, client_pool(server) as pool:
+        with shared_pool_and_image_cache(pool), openai_key():
+            review = review_generator.generate_review(product, deadline_ms=5000)
+    # The canned review may not suit the drawn rating, so it can be regenerated
+    assert review['generation_method'] in ('gpt4_primary', 'gpt4_fallback')
+    assert review['ai_enabled']
+
+if __name__ == "__main__":
+    test_requests_run_concurrently_under_limit()
+    test_rate_limits_are_retried()
+    test_retries_give_up()
+    test_reviews_generated_through_shared_pool()
+    test_image_analyzed_once()
+    test_pre_analyze_catalog_images()
+    test_multi_review_response_parsing()
+    test_multi_review_items_validated_one_by_one()
+    test_deadline_falls_back_to_template()
+    test_deadline_keeps_ai_reviews_in_time()
+    print("✅ AI client pool tests passed")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the benchmark harness
+Checks fixture coverage, percentiles and baseline comparison
+"""
+
+import os
+import tempfile
+from benchmark import (PRODUCT_AGES, build_products, compare_results, percentile,
+                       run_benchmarks)
+from review_generator import get_product_age_days, get_product_category, PRODUCT_CATEGORY_KEYWORDS
+
+def test_fixtures_cover_categories_and_ages():
+    """Every category, both description lengths and every age bucket appear"""
+    products = build_products()
+    categories = {category for product in products for category in get_product_category(product)}
+    assert set(PRODUCT_CATEGORY_KEYWORDS) | {'general'} <= categories
+
+    ages = {get_product_age_days(product) for product in products}
+    assert ages == set(PRODUCT_AGES)
+    lengths = sorted(len(product['body_html']) for product in products)
+    assert lengths[0] < 100 < lengths[-1]
+
+def test_percentile_nearest_rank():
+    """Percentiles pick an actual sample"""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+def test_compare_flags_regressions():
+    """Slower p50 or lower throughput beyond the threshold is a regression"""
+    baseline = {'results': {'a': {'p50_ms': 1.0, 'items_per_second': 100.0},
+                            'b': {'p50_ms': 1.0, 'items_per_second': 100.0}}}
+    current = {'results': {'a': {'p50_ms': 1.5, 'items_per_second': 70.0},
+                           'b': {'p50_ms': 1.0, 'items_per_second': 101.0},
+                           'c': {'skipped': 'missing'}}}
+    comparison = {entry['benchmark']: entry for entry in compare_results(baseline, current)}
+    assert comparison['a']['regression']
+    assert not comparison['b']['regression']
+    assert 'c' not in comparison
+
+def test_run_benchmarks_document():
+    """A short run reports every hot path, indexing reviews in the given scratch database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        document = run_benchmarks(iterations=5, index_path=os.path.join(tmp, 'review_similarity.db'))
+    assert set(document['results']) == {
+        'generate_review', 'extract_product_features', 'generate_review_content',
+        'assess_review_quality', 'batch_assess_reviews'
+    }
+    assert document['results']['generate_review']['calls'] == 5
+    assert document['meta']['seed'] is not None
+
+if __name__ == "__main__":
+    test_fixtures_cover_categories_and_ages()
+    test_percentile_nearest_rank()
+    test_compare_flags_regressions()
+    test_run_benchmarks_document()
+    print("✅ Benchmark harness tests passed")
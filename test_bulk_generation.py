@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel bulk generation
+Checks phrase tracking across products and reproducible worker output
+"""
+
+import pytest
+from bulk_generation import generate_bulk, iter_generate_bulk, requested_worker_count, resolve_worker_count
+from phrase_tracking import PhraseTracker
+from review_generator import generate_reviews_batch, make_rng, use_phrase_tracker
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+PRODUCTS = [
+    {
+        'id': 1000 + i,
+        'title': title,
+        'body_html': '<p>Soft cotton with zipper details. Perfect for parties.</p>',
+        'handle': title.lower().replace(' ', '-'),
+        'created_at': '2024-01-15T10:00:00Z'
+    }
+    for i, title in enumerate([
+        'Gothic Lace Midi Dress', 'Black Mesh Top', 'Platform Boots',
+        'Oversized Band Hoodie', 'Chain Belt', 'Velvet Mini Skirt'
+    ])
+]
+
+@pytest.fixture(autouse=True)
+def temporary_similarity_index(tmp_path):
+    """Index generated reviews in a temporary database instead of the working directory's"""
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    with use_similarity_index(index):
+        yield index
+    index.close()
+
+def _run_bulk(workers):
+    """Bulk run from empty phrase tracking, returning results and the merged state"""
+    tracker = PhraseTracker()
+    jobs = [(product, 4 + i) for i, product in enumerate(PRODUCTS)]
+    with use_phrase_tracker(tracker):
+        results = generate_bulk(jobs, workers=workers, seed=1234, use_ai=False)
+    return results, tracker.to_dict()
+
+def test_sequential_uses_live_tracker():
+    """With one worker, every product sees the phrases drawn for the products before it"""
+    results, state = _run_bulk(1)
+
+    tracker = PhraseTracker()
+    with use_phrase_tracker(tracker):
+        expected = [
+            generate_reviews_batch(product, 4 + i, use_ai=False, rng=make_rng(1234, product['id']), record=False)
+            for i, product in enumerate(PRODUCTS)
+        ]
+    assert [r['reviews'] for r in results] == expected
+    assert state == tracker.to_dict()
+
+def test_parallel_is_reproducible():
+    """A seeded job gives the same reviews and phrase usage for the same worker count"""
+    first, first_state = _run_bulk(3)
+    second, second_state = _run_bulk(3)
+
+    assert [r['reviews'] for r in first] == [r['reviews'] for r in second]
+    assert first_state == second_state
+
+def test_results_follow_job_order():
+    """Each result belongs to its job and phrase deltas were merged"""
+    results, state = _run_bulk(2)
+
+    assert [r['product']['id'] for r in results] == [p['id'] for p in PRODUCTS]
+    assert [len(r['reviews']) for r in results] == [4, 5, 6, 7, 8, 9]
+    assert all(r['error'] is None for r in results)
+    assert state
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_products_are_indexed_as_they_finish(workers, temporary_similarity_index):
+    """Later products are scored against the reviews of earlier ones in the same job"""
+    pytest.importorskip('numpy')
+    jobs = [(product, 3) for product in PRODUCTS[:3]]
+    with use_phrase_tracker(PhraseTracker()):
+        results = iter_generate_bulk(jobs, workers=workers, seed=99, use_ai=False)
+        first = next(results)
+        assert all(temporary_similarity_index.max_similarity(review['content']) == 1.0
+                   for review in first['reviews'])
+        indexed = len(temporary_similarity_index)
+        next(results)
+        assert len(temporary_similarity_index) > indexed
+        results.close()
+
+def test_requested_workers_are_clamped():
+    """Clients can ask for fewer workers than configured, never more, and only as an integer"""
+    assert requested_worker_count(None) is None
+    assert requested_worker_count(10000) == resolve_worker_count()
+    assert requested_worker_count(0) == requested_worker_count(-3) == 1
+    for invalid in ['8', 2.5, True, [2]]:
+        with pytest.raises(ValueError):
+            requested_worker_count(invalid)
+
+if __name__ == "__main__":
+    test_sequential_uses_live_tracker()
+    test_parallel_is_reproducible()
+    test_results_follow_job_order()
+    test_requested_workers_are_clamped()
+    print("✅ Bulk generation tests passed")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming CSV export
+Checks incremental writing, gzip output and chunked streaming
+"""
+
+import csv
+import gzip
+import io
+import os
+import tempfile
+from csv_export import ReviewCSVWriter, iter_csv_chunks, save_csv
+
+def _batches():
+    """Three products worth of review rows"""
+    return [
+        [{'product_id': str(p), 'review_title': f'Title {p}-{i}', 'review_content': 'Soft, "comfy"\nand cute'}
+         for i in range(3)]
+        for p in range(3)
+    ]
+
+def _read_rows(data: bytes):
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8'))))
+
+def test_writer_appends_batches():
+    """Batches written one by one form a single CSV with one header"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with ReviewCSVWriter('bulk.csv', export_dir=tmp) as writer:
+            for rows in _batches():
+                writer.write_rows(rows)
+
+        assert writer.rows_written == 9
+        with open(writer.path, 'rb') as f:
+            rows = _read_rows(f.read())
+        assert rows == [row for batch in _batches() for row in batch]
+
+def test_gzip_output():
+    """Compressed exports get a .gz name and decompress to the same CSV"""
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = save_csv(_batches()[0], 'reviews.csv', export_dir=tmp)
+        compressed = save_csv(_batches()[0], 'reviews.csv', compress=True, export_dir=tmp)
+
+        assert compressed == 'reviews.csv.gz'
+        with open(os.path.join(tmp, plain), 'rb') as f, gzip.open(os.path.join(tmp, compressed), 'rb') as gz:
+            assert f.read() == gz.read()
+
+def test_chunks_match_file():
+    """Streamed chunks concatenate to the same bytes as the written file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with ReviewCSVWriter('bulk.csv', export_dir=tmp) as writer:
+            for rows in _batches():
+                writer.write_rows(rows)
+        with open(writer.path, 'rb') as f:
+            expected = f.read()
+
+    chunks = list(iter_csv_chunks(_batches()))
+    assert len(chunks) == 3
+    assert b''.join(chunks) == expected
+    assert gzip.decompress(b''.join(iter_csv_chunks(_batches(), compress=True))) == expected
+
+def test_empty_export():
+    """No rows give an empty stream"""
+    assert b''.join(iter_csv_chunks([[], []])) == b''
+
+if __name__ == "__main__":
+    test_writer_appends_batches()
+    test_gzip_output()
+    test_chunks_match_file()
+    test_empty_export()
+    print("✅ CSV export tests passed")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the fake OpenAI server and the AI load test driver
+Checks canned responses per prompt type, failure injection and a small load test
+"""
+
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+import pytest
+from fake_openai_server import IMAGE_ANALYSIS, FakeOpenAIServer, canned_review, completion_content
+from language_id import detect_language
+
+def _chat(prompt, model='gpt-4-turbo'):
+    return {'model': model, 'messages': [{'role': 'system', 'content': 'Write reviews'},
+                                         {'role': 'user', 'content': prompt}]}
+
+def _post(server, body):
+    request = urllib.request.Request(f'{server.base_url}/chat/completions', json.dumps(body).encode('utf-8'),
+                                     {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+def test_canned_reviews_follow_language_and_rating():
+    """Reviews are written in the requested language, with the rating clamped to 1-5"""
+    review = canned_review('de', 5)
+    assert detect_language(review['content']) == 'de'
+    assert review['rating'] == 5 and review['title'] and review['author_name']
+    assert canned_review('xx', 9)['rating'] == 5
+    assert canned_review('en', 1)['rating'] == 1
+
+def test_responses_match_prompt_type():
+    """Vision, single, multi-review and regeneration prompts each get the expected content"""
+    vision = {'model': 'gpt-4-vision-preview', 'messages': [{'role': 'user', 'content': [
+        {'type': 'text', 'text': 'Analyze this product image'},
+        {'type': 'image_url', 'image_url': {'url': 'https://cdn.shopify.com/a.jpg'}}
+    ]}]}
+    assert json.loads(completion_content(vision)) == IMAGE_ANALYSIS
+
+    single = json.loads(completion_content(_chat('Requirements:\n        - Language: fr\n        - Rating: 4/5 stars')))
+    assert single['rating'] == 4 and detect_language(single['content']) == 'fr'
+
+    multi = json.loads(completion_content(_chat(
+        'Reviews:\n        1. Language: en; Rating: 5/5 stars; Customer Persona: x\n'
+        '        2. Language: es; Rating: 3/5 stars; Customer Persona: y'
+    )))
+    assert [item['rating'] for item in multi] == [5, 3]
+
+    text = completion_content(_chat('Write a 4-star review for: Dress\n\n            Language: en', model='gpt-4'))
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    assert len(text) > 20
+
+def test_failures_are_injected():
+    """Rate-limited requests get a 429 with Retry-After, failing ones a 500, and both are counted"""
+    with FakeOpenAIServer(rate_limit_rate=1.0, retry_after=2) as server:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _post(server, _chat('Hi'))
+        assert error.value.code == 429 and error.value.headers['retry-after'] == '2'
+    with FakeOpenAIServer(error_rate=1.0) as server:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _post(server, _chat('Hi'))
+        assert error.value.code == 500
+        assert server.get_stats()['server_errors'] == 1
+    with FakeOpenAIServer(latency_ms=10) as server:
+        response = _post(server, _chat('- Language: en\n- Rating: 5/5 stars'))
+        assert json.loads(response['choices'][0]['message']['content'])['rating'] == 5
+        assert server.get_stats() == {'requests': 1, 'rate_limited': 0, 'server_errors': 0,
+                                      'by_model': {'gpt-4-turbo': 1}, 'max_in_flight': 1}
+
+def test_load_test_reports_fallbacks():
+    """The driver runs every scenario through the real generator and counts template fallbacks"""
+    pytest.importorskip('openai')
+    pytest.importorskip('textblob')
+    from ai_load_benchmark import run_load_test
+    with FakeOpenAIServer(latency_ms=5, error_rate=1.0) as server, tempfile.TemporaryDirectory() as tmp:
+        document = run_load_test(server.base_url, requests=4, concurrency=2, reviews_per_product=2,
+                                 max_concurrency=4, max_retries=0,
+                                 index_path=os.path.join(tmp, 'review_similarity.db'))
+    assert set(document['results']) == {'generate_review', 'generate_reviews_batch', 'generate_bulk'}
+    for result in document['results'].values():
+        assert result['reviews'] == 4
+        assert result['fallback_rate'] == 1.0
+        assert result['p50_ms'] <= result['p99_ms']
+    assert document['client_pool']['failures'] > 0
+
+if __name__ == "__main__":
+    test_canned_reviews_follow_language_and_rating()
+    test_responses_match_prompt_type()
+    test_failures_are_injected()
+    test_load_test_reports_fallbacks()
+    print("✅ Fake OpenAI server tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the image analysis cache
+Checks versions, expiry, size-bounded eviction and persistence
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from image_analysis_cache import ImageAnalysisCache, image_cache_key
+
+IMAGE = 'https://cdn.shopify.com/s/files/1/dress.jpg?v=1700000000'
+ANALYSIS = {'materials': 'velvet', 'style': 'gothic', 'features': ['lace trim']}
+
+def test_versions_have_their_own_entries():
+    """A replaced image (new updated_at) is a cache miss"""
+    assert image_cache_key(IMAGE) != image_cache_key(IMAGE, '2024-05-01T10:00:00Z')
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageAnalysisCache(os.path.join(tmp, 'images.db'))
+        cache.put(IMAGE, ANALYSIS, version='2024-05-01T10:00:00Z')
+        assert cache.get(IMAGE, version='2024-05-01T10:00:00Z') == ANALYSIS
+        assert cache.get(IMAGE, version='2024-06-01T10:00:00Z') is None
+        assert cache.get(IMAGE) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        cache.close()
+
+def test_entries_expire():
+    """Analyses older than the time to live are neither returned nor kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageAnalysisCache(os.path.join(tmp, 'images.db'), ttl_days=1)
+        cache.put(IMAGE, ANALYSIS)
+        cache._connection().execute("UPDATE image_analyses SET analyzed_at = ?", (time.time() - 2 * 86400,))
+        assert cache.get(IMAGE) is None
+        cache.put('https://cdn.shopify.com/other.jpg', ANALYSIS)
+        assert len(cache) == 1
+        cache.close()
+
+def test_least_recently_used_evicted():
+    """Beyond max_entries the entries used longest ago go first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageAnalysisCache(os.path.join(tmp, 'images.db'), max_entries=3, touch_seconds=0)
+        for i in range(3):
+            cache.put(f'https://cdn.shopify.com/{i}.jpg', {'index': i})
+            time.sleep(0.01)
+        assert cache.get('https://cdn.shopify.com/0.jpg') == {'index': 0}
+        cache.put('https://cdn.shopify.com/3.jpg', {'index': 3})
+        assert len(cache) == 3
+        assert cache.get('https://cdn.shopify.com/1.jpg') is None
+        assert cache.get('https://cdn.shopify.com/0.jpg') == {'index': 0}
+        cache.close()
+
+def test_recent_hits_only_read():
+    """Hits on an entry used within touch_seconds don't write, even while another worker holds the lock"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'images.db')
+        cache = ImageAnalysisCache(db_path, touch_seconds=3600, busy_timeout=50)
+        cache.put(IMAGE, ANALYSIS)
+        other = sqlite3.connect(db_path, isolation_level=None)
+        used = other.execute("SELECT last_used FROM image_analyses").fetchone()[0]
+        other.execute("BEGIN IMMEDIATE")
+        assert cache.get(IMAGE) == ANALYSIS
+        other.execute("ROLLBACK")
+        assert other.execute("SELECT last_used FROM image_analyses").fetchone()[0] == used
+
+        other.execute("UPDATE image_analyses SET last_used = ?", (used - 7200,))
+        assert cache.get(IMAGE) == ANALYSIS
+        assert other.execute("SELECT last_used FROM image_analyses").fetchone()[0] >= used
+        other.close()
+        cache.close()
+
+def test_cache_is_persistent():
+    """A second cache on the same database sees earlier analyses"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'images.db')
+        first = ImageAnalysisCache(db_path)
+        first.put(IMAGE, ANALYSIS)
+        second = ImageAnalysisCache(db_path)
+        assert second.get(IMAGE) == ANALYSIS
+        assert second.stats()['size'] == 1
+        first.close()
+        second.close()
+
+if __name__ == "__main__":
+    test_versions_have_their_own_entries()
+    test_entries_expire()
+    test_least_recently_used_evicted()
+    test_recent_hits_only_read()
+    test_cache_is_persistent()
+    print("✅ Image analysis cache tests passed")
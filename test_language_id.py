@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline language identifier
+Checks the shipped profile against generated reviews
+"""
+
+import random
+import review_generator
+from language_id import PROFILE_LANGUAGES, build_corpus_profiles, detect_language, get_language_identifier
+from phrase_tracking import PhraseTracker
+
+def test_detects_typical_reviews():
+    """Plain sentences in every profile language are recognized"""
+    samples = {
+        'de': "Die Qualität ist wirklich super und der Schnitt sitzt perfekt",
+        'en': "The quality is really great and the fit is perfect for concerts",
+        'es': "La calidad es increíble y me queda perfecto, lo recomiendo",
+        'fr': "La qualité est vraiment top et la coupe est parfaite pour moi",
+        'it': "La qualità è davvero ottima e la vestibilità è perfetta",
+        'pl': "Jakość jest naprawdę świetna i krój leży idealnie, polecam",
+        'cs': "Kvalita je opravdu skvělá a střih sedí perfektně, doporučuji"
+    }
+    for language, text in samples.items():
+        assert detect_language(text) == language, (language, detect_language(text))
+
+def test_generated_review_accuracy():
+    """Template reviews are identified correctly almost always"""
+    rng = random.Random(11)
+    product = {'id': 1, 'title': 'Gothic Mesh Dress', 'body_html': 'cotton mesh with zipper'}
+    correct = total = 0
+    with review_generator.use_phrase_tracker(PhraseTracker()):
+        for _ in range(700):
+            language = rng.choice(PROFILE_LANGUAGES)
+            content = review_generator.generate_review_content(product, rng.randint(1, 5), language, rng=rng)
+            if content:
+                total += 1
+                correct += detect_language(content) == language
+    assert correct / total > 0.93
+
+def test_unclassifiable_text():
+    assert detect_language("") is None
+    assert detect_language("1234 !!! 💖") is None
+
+def test_shipped_profile_matches_corpus():
+    """language_profiles.json was rebuilt after the last corpus change"""
+    assert get_language_identifier().ngrams == {
+        ngram: tuple(scores) for ngram, scores in build_corpus_profiles()['ngrams'].items()
+    }
+
+if __name__ == "__main__":
+    test_detects_typical_reviews()
+    test_generated_review_accuracy()
+    test_unclassifiable_text()
+    test_shipped_profile_matches_corpus()
+    print("✅ Language identification tests passed")
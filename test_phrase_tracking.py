@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for phrase usage tracking
+Checks anti-repetition pools and tracker persistence
+"""
+
+import multiprocessing
+import os
+import random
+import tempfile
+from phrase_tracking import PhrasePool, PhraseTracker, SQLitePhraseTracker
+
+PHRASES = [f"phrase {i}" for i in range(10)]
+
+def test_pool_never_repeats_recent_phrases():
+    """A phrase isn't drawn again until older phrases were recycled"""
+    pool = PhrasePool(PHRASES)
+    rng = random.Random(7)
+    drawn = [pool.draw(rng) for _ in range(500)]
+
+    last_seen = {}
+    for i, phrase in enumerate(drawn):
+        if phrase in last_seen:
+            assert i - last_seen[phrase] >= 5
+        last_seen[phrase] = i
+
+def test_pool_draws_all_phrases_before_recycling():
+    """The first draws use distinct phrases until the pool runs low"""
+    pool = PhrasePool(PHRASES)
+    drawn = [pool.draw() for _ in range(8)]
+    assert len(set(drawn)) == 8
+    assert pool.available_count == 2
+
+def test_recycle_oldest_order():
+    """Recycling returns the oldest used phrases first"""
+    pool = PhrasePool(PHRASES, used=["phrase 3", "phrase 1", "phrase 7"])
+    assert pool.recycle_oldest(2) == ["phrase 3", "phrase 1"]
+    assert pool.used_phrases() == ["phrase 7"]
+    assert pool.available_count == 9
+
+def test_tracker_keeps_loaded_state():
+    """Used phrases loaded from disk are applied once the list is known"""
+    tracker = PhraseTracker({'en_short': ['phrase 1', 'phrase 2', 'removed phrase']})
+    assert tracker.to_dict() == {'en_short': ['phrase 1', 'phrase 2', 'removed phrase']}
+
+    pool = tracker.get_pool('en_short', PHRASES)
+    assert pool.available_count == 8
+    assert tracker.to_dict() == {'en_short': ['phrase 1', 'phrase 2']}
+
+def test_single_phrase_pool():
+    """A pool with one phrase keeps returning it"""
+    pool = PhrasePool(["only one"])
+    assert [pool.draw() for _ in range(3)] == ["only one"] * 3
+
+def test_journal_replay_restores_state():
+    """Usage journaled by one tracker is restored by the next one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, 'tracking.json')
+        tracker = PhraseTracker.open(snapshot)
+        drawn = [tracker.draw('de_short', PHRASES) for _ in range(20)]
+        expected = tracker.to_dict()
+        tracker.close()
+
+        assert not os.path.exists(snapshot)  # Only deltas were written
+        reopened = PhraseTracker.open(snapshot)
+        assert reopened.to_dict() == expected
+        assert reopened.get_pool('de_short', PHRASES).used_phrases() == expected['de_short']
+        assert drawn[-1] == expected['de_short'][-1]
+        reopened.close()
+
+def test_compaction_writes_snapshot():
+    """Compaction folds the journal into the snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, 'tracking.json')
+        tracker = PhraseTracker.open(snapshot, compact_after=25)
+        for _ in range(60):
+            tracker.draw('en_title_5', PHRASES)
+        tracker.close()
+        expected = tracker.to_dict()
+
+        assert os.path.exists(snapshot)
+        assert not os.path.exists(tracker.journal.rotated_path)
+        assert PhraseTracker.open(snapshot).to_dict() == expected
+
+        tracker.compact()
+        assert not os.path.exists(tracker.journal.journal_path)
+        assert PhraseTracker.open(snapshot).to_dict() == expected
+
+def test_replaying_a_journal_twice_is_harmless():
+    """A rotated journal left over from a crashed compaction replays cleanly"""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, 'tracking.json')
+        tracker = PhraseTracker.open(snapshot)
+        for _ in range(30):
+            tracker.draw('it_short', PHRASES)
+        expected = tracker.to_dict()
+        tracker.close()
+
+        # Snapshot written, but the journal was never removed
+        with open(tracker.journal.journal_path, encoding='utf-8') as f:
+            journal = f.read()
+        tracker.journal.write_snapshot(expected)
+        with open(tracker.journal.rotated_path, 'w', encoding='utf-8') as f:
+            f.write(journal)
+
+        assert PhraseTracker.open(snapshot).to_dict() == expected
+
+def _draw_from_shared_db(db_path, phrases, count, results):
+    tracker = SQLitePhraseTracker(db_path)
+    results.put([tracker.draw('en_short', phrases) for _ in range(count)])
+    tracker.close()
+
+def test_sqlite_tracker_is_shared_between_trackers():
+    """A draw by one worker is seen by the next draw of another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        first = SQLitePhraseTracker(db_path)
+        second = SQLitePhraseTracker(db_path)
+
+        drawn = [tracker.draw('en_short', PHRASES) for tracker in (first, second) * 4]
+        assert len(set(drawn)) == 8
+        assert first.to_dict() == second.to_dict() == {'en_short': drawn}
+
+        second.reset()
+        assert first.to_dict() == {}
+        assert first.get_pool('en_short', PHRASES).available_count == 10
+        first.close()
+        second.close()
+
+def test_sqlite_tracker_across_processes():
+    """Concurrent worker processes never hand out a phrase that is in use"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        phrases = [f"phrase {i}" for i in range(200)]
+        SQLitePhraseTracker.open(db_path, {'en_short': phrases[:10]}).close()
+
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_draw_from_shared_db, args=(db_path, phrases, 30, results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        drawn = [phrase for _ in workers for phrase in results.get(timeout=30)]
+        for worker in workers:
+            worker.join()
+
+        # 120 draws from 190 unused phrases: no recycling, so no repeats
+        assert len(set(drawn)) == 120
+        assert not set(drawn) & set(phrases[:10])
+        assert len(SQLitePhraseTracker(db_path).to_dict()['en_short']) == 130
+
+if __name__ == "__main__":
+    test_pool_never_repeats_recent_phrases()
+    test_pool_draws_all_phrases_before_recycling()
+    test_recycle_oldest_order()
+    test_tracker_keeps_loaded_state()
+    test_single_phrase_pool()
+    test_journal_replay_restores_state()
+    test_compaction_writes_snapshot()
+    test_replaying_a_journal_twice_is_harmless()
+    test_sqlite_tracker_is_shared_between_trackers()
+    test_sqlite_tracker_across_processes()
+    print("✅ Phrase tracking tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled product feature matcher
+Checks extract_product_features against known product insights
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import review_generator
+from review_generator import extract_product_features
+
+def test_mesh_shirt_features():
+    """Keywords are found in title and HTML description"""
+    product = {
+        'title': 'Gothic Punk Mesh Shirt',
+        'body_html': '<p>Edgy mesh shirt featuring decorative chains, zipper details, and punk aesthetic. Made from premium polyester mesh with velvet accents. Perfect for concerts and clubbing. Oversized fit for comfort.</p>'
+    }
+
+    assert extract_product_features(product) == {
+        'material': ['polyester', 'mesh', 'velvet'],
+        'style': ['gothic', 'punk', 'casual', 'party'],
+        'features': ['zipper'],
+        'occasions': ['party', 'festival'],
+        'colors': [],
+        'fit': ['oversized', 'comfortable']
+    }
+
+def test_html_tags_are_ignored():
+    """Keywords inside tag attributes don't count, substrings of words do"""
+    product = {
+        'title': 'Schwarzes Samtkleid',
+        'body_html': '<div class="pink">Bequem und dehnbar, mit Reißverschluss</div>'
+    }
+
+    insights = extract_product_features(product)
+    assert insights['colors'] == ['black']
+    assert insights['material'] == ['velvet']
+    assert insights['features'] == ['zipper']
+    assert insights['fit'] == ['stretchy', 'comfortable']
+
+def test_empty_product():
+    """Missing description returns empty insights"""
+    insights = extract_product_features({'title': 'Dress', 'body_html': None})
+    assert all(values == [] for values in insights.values())
+    assert list(insights) == ['material', 'style', 'features', 'occasions', 'colors', 'fit']
+
+def test_words_survive_cache_clear():
+    """Words seen before still count when the caches are cleared for the rest of the description"""
+    product = {'title': 'velvet cotton aaa bbb ccc ddd'}
+    limit = review_generator._FEATURE_WORD_CACHE_LIMIT
+    review_generator._FEATURE_WORD_CACHE_LIMIT = 5
+    try:
+        extract_product_features({'title': 'velvet cotton'})
+        assert extract_product_features(product)['material'] == ['cotton', 'velvet']
+    finally:
+        review_generator._FEATURE_WORD_CACHE_LIMIT = limit
+
+def test_concurrent_extraction_while_cache_is_cleared():
+    """Threads sharing the word caches get the same insights even when the caches keep filling up"""
+    fillers = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet']
+    products = [
+        {'title': f'Velvet Lace Dress {fillers[i % 10]}{fillers[i // 10 % 10]}',
+         'body_html': f'<p>Soft cotton with zipper details, {fillers[i // 10 % 10]}{fillers[i % 10]}x</p>'}
+        for i in range(100)
+    ]
+    limit = review_generator._FEATURE_WORD_CACHE_LIMIT
+    review_generator._FEATURE_WORD_CACHE_LIMIT = 20
+    try:
+        expected = [extract_product_features(product) for product in products]
+        assert all(insights['material'] == ['cotton', 'lace', 'velvet'] for insights in expected)
+        assert all(insights['features'] == ['zipper'] for insights in expected)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(5):
+                assert list(pool.map(extract_product_features, products)) == expected
+                # 200 distinct filler words went through a cache of 20
+                assert len(review_generator._FEATURE_SEEN_WORDS) <= 20
+    finally:
+        review_generator._FEATURE_WORD_CACHE_LIMIT = limit
+
+if __name__ == "__main__":
+    test_mesh_shirt_features()
+    test_html_tags_are_ignored()
+    test_empty_product()
+    test_words_survive_cache_clear()
+    test_concurrent_extraction_while_cache_is_cleared()
+    print("✅ Product feature extraction tests passed")
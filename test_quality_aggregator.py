@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming quality aggregator
+Checks running statistics, summaries, merging and constant memory
+"""
+
+import random
+import statistics
+from types import SimpleNamespace
+from quality_aggregator import QualityAggregator, RunningStats
+
+ISSUES = ["Content too short for meaningful review", "Excessive punctuation usage"]
+RECOMMENDATIONS = ["Simplify sentence structure and use clearer language",
+                   "Include more specific details about quality, fit, and value"]
+
+def _scores(count, seed=1):
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(count)]
+
+def test_running_stats_match_statistics():
+    """Welford's mean and variance equal the two-pass results"""
+    values = [1e6 + value for value in _scores(5000)]  # Large offset, small spread
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert abs(stats.mean - statistics.fmean(values)) < 1e-6
+    assert abs(stats.std - statistics.pstdev(values)) < 1e-9
+    assert (stats.min, stats.max) == (min(values), max(values))
+    assert RunningStats().to_dict()['std'] == 0.0
+
+def test_summary_of_assessments():
+    """Counts, bands, histogram and top issues of the added reviews"""
+    aggregator = QualityAggregator()
+    assert aggregator.summary() == {}
+    for score, issues in ((0.95, ISSUES[:1]), (0.85, ISSUES), (0.7, []), (0.3, ISSUES[:1]), (1.0, [])):
+        aggregator.add(score, {'authenticity': score / 2}, issues, RECOMMENDATIONS[:1])
+    summary = aggregator.summary()
+    assert summary['total_reviews'] == len(aggregator) == 5
+    assert summary['quality_distribution'] == {'excellent': 2, 'good': 1, 'average': 1, 'poor': 1}
+    assert (summary['high_quality_count'], summary['low_quality_count']) == (3, 1)
+    assert abs(summary['average_authenticity'] - 0.38) < 1e-12
+    assert summary['common_issues'] == [(ISSUES[0], 3), (ISSUES[1], 1)]
+    assert summary['top_recommendations'] == [(RECOMMENDATIONS[0], 5)]
+    assert [bucket['count'] for bucket in summary['score_histogram']] == [0, 0, 0, 1, 0, 0, 0, 1, 1, 2]
+
+def test_add_quality_metrics():
+    """QualityMetrics objects are added with all their metric scores"""
+    quality = SimpleNamespace(
+        overall_score=0.8, authenticity_score=0.9, readability_score=0.7, language_consistency_score=1.0,
+        sentiment_appropriateness_score=0.6, content_depth_score=0.5, uniqueness_score=1.0,
+        demographic_alignment_score=0.8, commercial_value_score=0.4,
+        flagged_issues=[], recommendations=RECOMMENDATIONS
+    )
+    aggregator = QualityAggregator()
+    aggregator.add_quality(quality)
+    summary = aggregator.summary()
+    assert len(summary['metrics']) == 8
+    assert summary['metrics']['readability']['mean'] == 0.7
+
+def test_merge_equals_single_stream():
+    """Aggregators of parts merge into the aggregator of the whole"""
+    scores = _scores(3000, seed=4)
+    whole, first, second = QualityAggregator(), QualityAggregator(), QualityAggregator()
+    for i, score in enumerate(scores):
+        args = (score, {'uniqueness': 1 - score}, ISSUES[i % 2:], RECOMMENDATIONS[:i % 3])
+        whole.add(*args)
+        (first if i < 1000 else second).add(*args)
+    first.merge(second)
+    merged, expected = first.summary(), whole.summary()
+    for key in ('average_quality', 'quality_std'):
+        assert abs(merged[key] - expected[key]) < 1e-12
+    merged_metrics, expected_metrics = merged.pop('metrics'), expected.pop('metrics')
+    assert abs(merged_metrics['uniqueness']['std'] - expected_metrics['uniqueness']['std']) < 1e-12
+    merged.pop('average_quality'), merged.pop('quality_std')
+    expected.pop('average_quality'), expected.pop('quality_std')
+    assert merged == expected
+
+def test_memory_is_constant():
+    """A long run keeps no per-review state, and take_summary starts over"""
+    aggregator = QualityAggregator()
+    for i, score in enumerate(_scores(100000, seed=2)):
+        aggregator.add(score, {'authenticity': score}, ISSUES[i % 2:], RECOMMENDATIONS)
+    assert len(aggregator.issues) == len(ISSUES)
+    assert len(aggregator.histogram) == 10 and len(aggregator.metrics) == 1
+    assert abs(aggregator.summary()['average_quality'] - 0.5) < 0.01
+    assert aggregator.take_summary()['total_reviews'] == 100000
+    assert aggregator.summary() == {}
+
+if __name__ == "__main__":
+    test_running_stats_match_statistics()
+    test_summary_of_assessments()
+    test_add_quality_metrics()
+    test_merge_equals_single_stream()
+    test_memory_is_constant()
+    print("✅ Quality aggregator tests passed")
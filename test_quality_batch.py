@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for batch quality scoring
+Checks that assess_batch scores reviews like assess_review_quality
+"""
+
+import random
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('textblob')
+
+from ai_quality_scorer import ReviewQualityScorer, batch_assess_reviews, get_quality_summary
+from phrase_tracking import PhraseTracker
+from review_generator import generate_review, use_phrase_tracker
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+PRODUCT = {
+    'id': '12345',
+    'title': 'Gothic Punk Mesh Shirt',
+    'body_html': '<p>Edgy mesh shirt with chains and zipper details, made from polyester mesh.</p>',
+    'handle': 'gothic-punk-mesh-shirt'
+}
+
+@pytest.fixture(autouse=True)
+def temporary_similarity_index(tmp_path):
+    """Index generated reviews in a temporary database instead of the working directory's"""
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    with use_similarity_index(index):
+        yield index
+    index.close()
+
+def _reviews(count=120, seed=7):
+    rng = random.Random(seed)
+    with use_phrase_tracker(PhraseTracker()):
+        reviews = [generate_review(PRODUCT, use_ai=False, rng=rng) for _ in range(count)]
+    for review in reviews:
+        review['persona'] = rng.choice(['gen_z', 'millennial', 'gen_x', 'unknown'])
+    return reviews + [
+        {'title': '', 'content': '', 'rating': 3, 'language': 'en'},
+        {'title': 'WOW', 'content': 'I LOVE IT!!!! TODO', 'rating': 1, 'language': 'xx'},
+        dict(next(review for review in reviews if review['content']))
+    ]
+
+def _without_metadata(quality_metrics):
+    fields = dict(vars(quality_metrics))
+    fields.pop('generation_metadata')
+    return fields
+
+def test_batch_matches_single_assessments():
+    """Every metric, recommendation and issue equals the one-by-one assessment"""
+    reviews = _reviews()
+    scorer = ReviewQualityScorer()
+    expected = [
+        scorer.assess_review_quality(review, PRODUCT, historical_reviews=reviews[:i], check_index=False)
+        for i, review in enumerate(reviews)
+    ]
+    batch = scorer.assess_batch(reviews, PRODUCT)
+    assert len(batch) == len(reviews)
+    assert [_without_metadata(qm) for qm in batch.to_list()] == [_without_metadata(qm) for qm in expected]
+    assert batch.metrics['uniqueness'][-1] == 0.0  # Copy of the first review
+
+def test_batch_assess_reviews_uses_columns():
+    """The module helper returns QualityMetrics for every review, empty batches included"""
+    reviews = _reviews(20)
+    results = batch_assess_reviews(reviews)
+    assert len(results) == len(reviews)
+    assert all(0.0 <= qm.overall_score <= 1.0 for qm in results)
+    assert batch_assess_reviews([]) == []
+
+def test_batch_summary_matches_materialized_one():
+    """Aggregating the columns gives the summary of the QualityMetrics list"""
+    batch = ReviewQualityScorer().assess_batch(_reviews(60), PRODUCT)
+    summary = batch.aggregate().summary()
+    expected = get_quality_summary(batch.to_list())
+    assert summary['average_quality'] == pytest.approx(float(batch.overall_score.mean()))
+    assert summary['quality_std'] == pytest.approx(float(batch.overall_score.std()))
+    assert summary.keys() == expected.keys()
+    for key in ('total_reviews', 'high_quality_count', 'quality_distribution', 'common_issues',
+                'top_recommendations', 'score_histogram'):
+        assert summary[key] == expected[key]
+
+def test_batch_to_store():
+    """The compact store holds the batch's scores and messages"""
+    batch = ReviewQualityScorer().assess_batch(_reviews(40), PRODUCT)
+    store = batch.to_store()
+    assert len(store) == len(batch)
+    for index, quality_metrics in enumerate(batch.to_list()):
+        record = store[index]
+        assert record.overall_score == pytest.approx(quality_metrics.overall_score, abs=1e-6)
+        assert record.uniqueness_score == pytest.approx(quality_metrics.uniqueness_score, abs=1e-6)
+        # Masks keep which messages a review has, not their order
+        assert sorted(record.flagged_issues) == sorted(quality_metrics.flagged_issues)
+        assert sorted(record.recommendations) == sorted(quality_metrics.recommendations)
+
+if __name__ == "__main__":
+    test_batch_matches_single_assessments()
+    test_batch_assess_reviews_uses_columns()
+    test_batch_summary_matches_materialized_one()
+    test_batch_to_store()
+    print("✅ Batch quality scoring tests passed")
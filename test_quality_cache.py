@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the quality score cache
+Checks review keys, LRU eviction, statistics and persistence
+"""
+
+import os
+import tempfile
+from quality_cache import ScoreCache, review_key
+
+REVIEW = {'title': 'Great', 'content': 'I love this dress', 'rating': 5, 'language': 'en'}
+
+def test_review_key_covers_scored_fields():
+    """Only fields the cached scores depend on change the key"""
+    assert review_key(REVIEW) == review_key({**REVIEW, 'author': 'Anna', 'date': '2024-01-01'})
+    assert review_key(REVIEW) == review_key({**REVIEW, 'persona': 'millennial'})
+    for changed in ({'rating': 4}, {'rating': '5'}, {'language': 'de'}, {'persona': 'gen_z'},
+                    {'title': 'Great I'}, {'content': 'love this dress'}):
+        assert review_key(REVIEW) != review_key({**REVIEW, **changed})
+
+def test_lru_eviction_and_stats():
+    """Least recently used entries go first and every lookup is counted"""
+    cache = ScoreCache(max_size=2)
+    cache.put('a', {'score': 1})
+    cache.put('b', {'score': 2})
+    assert cache.get('a') == {'score': 1}  # 'b' is now the oldest
+    cache.put('c', {'score': 3})
+    assert cache.get('b') is None
+    assert cache.get('c') == {'score': 3}
+
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses'], stats['evictions']) == (2, 2, 1, 1)
+    assert abs(stats['hit_rate'] - 2 / 3) < 1e-9
+
+    disabled = ScoreCache(max_size=0)
+    disabled.put('a', {'score': 1})
+    assert disabled.get('a') is None
+
+def test_cache_persists_per_version():
+    """Saved entries come back in LRU order, unless the scoring version changed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quality_cache.json')
+        cache = ScoreCache(max_size=3, version='1', path=path)
+        for key in 'abc':
+            cache.put(key, {'score': key})
+        cache.get('a')
+        cache.save()
+
+        restored = ScoreCache(max_size=2, version='1', path=path)
+        assert restored.load() == 2
+        assert restored.get('b') is None  # Least recently used, dropped on load
+        assert restored.get('a') == {'score': 'a'}
+
+        assert ScoreCache(version='2', path=path).load() == 0
+
+if __name__ == "__main__":
+    test_review_key_covers_scored_fields()
+    test_lru_eviction_and_stats()
+    test_cache_persists_per_version()
+    print("✅ Quality cache tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the tiered quality gate
+Checks tier decisions against full assessments and the reported statistics
+"""
+
+import random
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('textblob')
+
+from ai_quality_scorer import GATE_TIERS, ReviewQualityScorer
+from phrase_tracking import PhraseTracker
+import review_generator
+from review_generator import generate_review, generate_reviews_batch, make_rng, use_phrase_tracker
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+PRODUCT = {
+    'id': '12345',
+    'title': 'Gothic Punk Mesh Shirt',
+    'body_html': '<p>Edgy mesh shirt with chains and zipper details, made from polyester mesh.</p>',
+    'handle': 'gothic-punk-mesh-shirt'
+}
+
+@pytest.fixture(autouse=True)
+def temporary_similarity_index(tmp_path):
+    """Index generated reviews in a temporary database instead of the working directory's"""
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    with use_similarity_index(index):
+        yield index
+    index.close()
+
+class RecordingDashboard:
+    """Collects logged performance metrics instead of writing analytics.db"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def log_performance_metric(self, metric_name, value, category='general', metadata=None):
+        self.metrics[metric_name] = (value, category)
+
+def _reviews(count=80, seed=11):
+    rng = random.Random(seed)
+    with use_phrase_tracker(PhraseTracker()):
+        return [generate_review(PRODUCT, use_ai=False, rng=rng) for _ in range(count)]
+
+def test_gate_decisions_match_full_scores():
+    """Exact tiers agree with the full score, the full tier returns it"""
+    gate, full = ReviewQualityScorer(), ReviewQualityScorer()
+    for review in _reviews():
+        decision = gate.gate_review(review, 0.6, band=1.0)  # Never trust the estimate
+        score = full.assess_review_quality(review).overall_score
+        assert decision.tier in ('bounds', 'full')
+        assert decision.passed == (score >= 0.6)
+        if decision.tier == 'full':
+            assert decision.score == score
+
+def test_gate_estimates_outside_band():
+    """Without a band, nothing needs a full assessment"""
+    scorer = ReviewQualityScorer()
+    decisions = [scorer.gate_review(review, 0.6, band=0.0) for review in _reviews(30)]
+    assert all(decision.tier != 'full' for decision in decisions)
+    assert all(decision.passed == (decision.score >= 0.6) for decision in decisions)
+    assert scorer.quality_summary.summary() == {}  # Estimates aren't measured quality
+
+def test_unseeded_generation_exits_early():
+    """Production streams without a job seed use the estimate tier, seeded ones never do"""
+    threshold = review_generator.QUALITY_THRESHOLD
+    review_generator.QUALITY_THRESHOLD = 0.4  # Most template reviews are well above it
+    try:
+        tiers = {}
+        for seed in (None, 7):
+            with use_phrase_tracker(PhraseTracker()):
+                reviews = generate_reviews_batch(PRODUCT, 40, use_ai=False, rng=make_rng(seed, PRODUCT['id']))
+            tiers[seed] = [review['quality_score_tier'] for review in reviews]
+    finally:
+        review_generator.QUALITY_THRESHOLD = threshold
+    assert tiers[None].count('estimate') > len(tiers[None]) // 2
+    assert 'estimate' not in tiers[7]
+
+def test_generated_reviews_record_score_tier():
+    """Generated reviews say whether their quality score was measured or estimated"""
+    for review in _reviews(20):
+        assert review['quality_score_tier'] in GATE_TIERS + ('basic',)
+
+def test_deterministic_gate_ignores_history():
+    """Deterministic decisions don't change once the scorer has cached and averaged other reviews"""
+    reviews = _reviews(30)
+    fresh = [ReviewQualityScorer().gate_review(review, 0.6, deterministic=True) for review in reviews]
+    scorer = ReviewQualityScorer()
+    for review in reviews:
+        scorer.assess_review_quality(review)
+    assert [scorer.gate_review(review, 0.6, deterministic=True) for review in reviews] == fresh
+    assert all(decision.tier != 'estimate' for decision in fresh)
+
+def test_gate_metrics_reported_once():
+    """Tier rates are logged for the decisions since the previous report"""
+    scorer = review_generator._get_quality_scorer()
+    scorer.gate_stats.take_report()
+    for review in _reviews(20):
+        scorer.gate_review(review, 0.6)
+
+    dashboard = RecordingDashboard()
+    review_generator.log_quality_gate_metrics(dashboard)
+    rates = [dashboard.metrics[f'quality_gate_{tier}_rate'][0] for tier in GATE_TIERS]
+    assert abs(sum(rates) - 1.0) < 1e-9
+    assert dashboard.metrics['quality_gate_time_saved_ms'][1] == 'quality_gate'
+
+    dashboard = RecordingDashboard()
+    review_generator.log_quality_gate_metrics(dashboard)
+    assert dashboard.metrics == {}
+
+if __name__ == "__main__":
+    test_gate_decisions_match_full_scores()
+    test_gate_estimates_outside_band()
+    test_unseeded_generation_exits_early()
+    test_generated_reviews_record_score_tier()
+    test_deterministic_gate_ignores_history()
+    test_gate_metrics_reported_once()
+    print("✅ Quality gate tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact quality result store
+Checks records, message codes, growth and the binary file format
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from quality_store import QUALITY_DTYPE, SCORE_FIELDS, CodeTable, QualityRecord, QualityStore
+
+ISSUES = ["WARNING: High similarity to existing reviews", "Excessive punctuation usage"]
+RECOMMENDATIONS = ["Use more unique phrasing to avoid similarity with existing reviews"]
+
+def _quality_metrics(overall_score, issues=(), recommendations=()):
+    scores = {name: overall_score for name in SCORE_FIELDS}
+    return SimpleNamespace(**scores, flagged_issues=list(issues), recommendations=list(recommendations),
+                           generation_metadata={'assessed_at': '2024-05-01T12:30:00'})
+
+def test_rows_are_compact():
+    """Nine float32 scores, two masks and a timestamp per review"""
+    assert QUALITY_DTYPE.itemsize == 52
+    record = QualityRecord([0.5] * 9)
+    assert not hasattr(record, '__dict__')
+
+def test_code_table():
+    """Messages get one bit each, in first-use order"""
+    table = CodeTable()
+    mask = table.encode([ISSUES[1], ISSUES[0]])
+    assert table.messages == [ISSUES[1], ISSUES[0]]
+    assert table.decode(mask) == (ISSUES[1], ISSUES[0])
+    assert table.decode(table.encode([])) == ()
+    with pytest.raises(ValueError):
+        CodeTable(f"message {i}" for i in range(33))
+
+def test_store_round_trip():
+    """Rows read back as the assessments that were added, while the store grows"""
+    store = QualityStore(capacity=2)
+    for i in range(100):
+        store.extend([_quality_metrics(i / 100, ISSUES[:i % 3], RECOMMENDATIONS[:i % 2])])
+    assert len(store) == 100
+    record = store[37]
+    assert record.overall_score == pytest.approx(0.37)
+    assert record.flagged_issues == tuple(ISSUES[:1])
+    assert record.recommendations == tuple(RECOMMENDATIONS)
+    assert store[-1].overall_score == pytest.approx(0.99)
+    with pytest.raises(IndexError):
+        store[100]
+    assert store.common_issues() == [(ISSUES[0], 66), (ISSUES[1], 33)]
+    assert float(store.column('uniqueness_score').mean()) == pytest.approx(0.495)
+
+    quality_metrics = record.to_quality_metrics()
+    assert quality_metrics.metrics_breakdown['commercial_value'] == record.commercial_value_score
+    assert quality_metrics.generation_metadata['assessed_at'] == '2024-05-01T12:30:00'
+
+def test_extend_columns():
+    """Whole score arrays are added at once"""
+    store = QualityStore()
+    scores = {name: np.linspace(0, 1, 5) for name in SCORE_FIELDS}
+    store.extend_columns(scores, [ISSUES] * 5, [[]] * 5)
+    assert np.allclose(store.column('overall_score'), np.linspace(0, 1, 5))
+    assert store[4].flagged_issues == tuple(ISSUES)
+
+def test_save_and_load():
+    """The binary file holds the rows and the message tables"""
+    store = QualityStore()
+    store.extend(_quality_metrics(score, ISSUES[1:], RECOMMENDATIONS) for score in (0.2, 0.9))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quality.fqs')
+        store.save(path)
+        loaded = QualityStore.load(path)
+        assert np.array_equal(loaded.rows, store.rows)
+        assert loaded[1].flagged_issues == (ISSUES[1],)
+        loaded.append([0.5] * 9, ISSUES)  # Loaded stores keep growing
+        assert len(loaded) == 3 and loaded.issue_codes.messages == [ISSUES[1], ISSUES[0]]
+
+        with open(path, 'r+b') as f:
+            f.write(b'XXXX')
+        with pytest.raises(ValueError):
+            QualityStore.load(path)
+
+if __name__ == "__main__":
+    test_rows_are_compact()
+    test_code_table()
+    test_store_round_trip()
+    test_extend_columns()
+    test_save_and_load()
+    print("✅ Quality store tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for batch review generation
+Checks generate_reviews_batch output shape and batch-level draws
+"""
+
+import pytest
+from phrase_tracking import PhraseTracker
+from review_generator import (
+    generate_reviews_batch, generate_ratings, select_languages, generate_review_dates,
+    SeededRandom, make_rng, use_phrase_tracker
+)
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+TEST_PRODUCT = {
+    'id': '12345',
+    'title': 'Gothic Lace Midi Dress',
+    'body_html': '<p>Black lace midi dress with velvet belt. Perfect for parties and concerts.</p>',
+    'handle': 'gothic-lace-midi-dress',
+    'created_at': '2023-05-01T10:00:00Z'
+}
+
+@pytest.fixture(autouse=True)
+def temporary_similarity_index(tmp_path):
+    """Index generated reviews in a temporary database instead of the working directory's"""
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    with use_similarity_index(index):
+        yield index
+    index.close()
+
+@pytest.fixture(autouse=True)
+def temporary_phrase_tracker(tmp_path):
+    """Journal phrase usage under tmp_path instead of the working directory's tracking file"""
+    tracker = PhraseTracker.open(str(tmp_path / 'phrase_usage_tracking.json'))
+    with use_phrase_tracker(tracker):
+        yield tracker
+    tracker.close()
+
+def test_batch_generates_requested_count():
+    """Batch returns n template reviews with the generate_review fields"""
+    reviews = generate_reviews_batch(TEST_PRODUCT, 12, use_ai=False)
+
+    assert len(reviews) == 12
+    for review in reviews:
+        assert review['rating'] in (3, 4, 5)
+        assert review['language'] in ('de', 'pl', 'en', 'it', 'fr', 'es', 'cs')
+        assert review['generation_method'] == 'template_based'
+        assert set(review) >= {'title', 'content', 'author', 'email', 'location', 'date', 'verified'}
+
+def test_empty_batch():
+    """Zero reviews requested gives an empty list"""
+    assert generate_reviews_batch(TEST_PRODUCT, 0, use_ai=False) == []
+
+def test_batch_draws():
+    """Vectorized draws return one value per review"""
+    assert len(generate_ratings(50)) == 50
+    assert set(select_languages(200)) <= {'de', 'pl', 'en', 'it', 'fr', 'es', 'cs'}
+    dates = generate_review_dates(20)
+    assert len(dates) == 20
+    assert all(len(date) == 10 for date in dates)
+
+def _generate_from_fresh_tracker(seed, product_id):
+    """Generate with a seeded stream and empty, in-memory phrase tracking"""
+    with use_phrase_tracker(PhraseTracker()):
+        return generate_reviews_batch(TEST_PRODUCT, 15, use_ai=False, rng=make_rng(seed, product_id))
+
+def test_seeded_generation_is_reproducible():
+    """The same job seed and product give the same reviews"""
+    first = _generate_from_fresh_tracker(42, TEST_PRODUCT['id'])
+    assert first == _generate_from_fresh_tracker(42, TEST_PRODUCT['id'])
+    assert first != _generate_from_fresh_tracker(42, 'another-product')
+    assert first != _generate_from_fresh_tracker(43, TEST_PRODUCT['id'])
+
+def test_make_rng_streams():
+    """Per-product streams are stable and independent of each other"""
+    assert make_rng(7, 'a').random() == make_rng(7, 'a').random()
+    assert make_rng(7, 'a').random() != make_rng(7, 'b').random()
+    assert make_rng(7).random() == make_rng(7).random()
+
+def test_only_seeded_streams_are_reproducible():
+    """Streams without a job seed keep the history-dependent quality checks"""
+    assert isinstance(make_rng(7), SeededRandom) and isinstance(make_rng(7, 'a'), SeededRandom)
+    assert not isinstance(make_rng(None, 'a'), SeededRandom)
+
+if __name__ == "__main__":
+    test_batch_generates_requested_count()
+    test_empty_batch()
+    test_batch_draws()
+    test_seeded_generation_is_reproducible()
+    test_make_rng_streams()
+    test_only_seeded_streams_are_reproducible()
+    print("✅ Batch generation tests passed")
@@ -3,7 +3,17 @@
 Test script to validate review quality improvements
 """
 
+import pytest
 from review_generator import test_language_consistency, generate_review
+from similarity_index import NearDuplicateIndex, use_similarity_index
+
+@pytest.fixture(autouse=True)
+def temporary_similarity_index(tmp_path):
+    """Index generated reviews in a temporary database instead of the working directory's"""
+    index = NearDuplicateIndex(str(tmp_path / 'review_similarity.db'))
+    with use_similarity_index(index):
+        yield index
+    index.close()
 
 def test_review_samples():
     """Generate sample reviews to check quality"""
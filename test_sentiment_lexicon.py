@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the multilingual sentiment lexicon
+Checks the shipped lexicon against the rating-tagged template phrases
+"""
+
+from sentiment_lexicon import (LEXICON_LANGUAGES, NEGATIVE_WORDS, POSITIVE_WORDS, build_corpus_lexicon,
+                               build_lexicon, get_sentiment_lexicon, rating_phrases, text_polarity)
+from template_corpus import load_language_pack
+
+def _average(values):
+    return sum(values) / len(values)
+
+def test_ratings_ordered_in_every_language():
+    """Five star phrases read more positive than three star ones in each language"""
+    for language in LEXICON_LANGUAGES:
+        by_rating = {}
+        for rating, phrase in rating_phrases(load_language_pack(language)):
+            polarity = text_polarity(phrase)
+            if polarity is not None:
+                by_rating.setdefault(rating, []).append(polarity)
+        assert _average(by_rating[5]) > _average(by_rating[3]), language
+
+def test_generic_words():
+    """The English seed words keep their sign"""
+    assert all(text_polarity(word) > 0 for word in POSITIVE_WORDS)
+    assert all(text_polarity(word) < 0 for word in NEGATIVE_WORDS)
+    assert text_polarity("") is None
+    assert text_polarity("1234 !!! 💖") is None
+
+def test_word_pairs_are_scored():
+    """Bigrams carry their own weight next to the words"""
+    weights = build_lexicon([(5, 'not bad at all'), (1, 'not good'), (3, 'good enough')], min_deviation=0.0)
+    assert 'not bad' in weights and 'not good' in weights
+    assert weights['not bad'] > weights['not good']
+
+def test_negative_reviews_in_other_languages():
+    """Negative German, Polish and Spanish reviews read negative, below their positive counterparts"""
+    pairs = [
+        ('Schlechte Qualität, sehr enttäuscht, nie wieder', 'Super Qualität, total begeistert!'),
+        ('Bardzo słaba jakość, nie polecam', 'Świetna jakość, polecam!'),
+        ('Muy mala calidad, no lo recomiendo', 'Excelente calidad, lo recomiendo')
+    ]
+    for negative, positive in pairs:
+        assert text_polarity(negative) < 0 < text_polarity(positive), negative
+
+def test_negation_turns_words_around():
+    """Words shortly after a negation in the same clause count with the opposite sign"""
+    assert text_polarity('nie polecam') < 0 < text_polarity('polecam')
+    assert text_polarity('no lo recomiendo') < 0 < text_polarity('lo recomiendo')
+    assert text_polarity('nicht schlecht') > 0 > text_polarity('schlecht')
+    assert text_polarity('nie. polecam') > 0
+
+def test_words_without_sentiment_are_neutral():
+    """Texts without sentiment-carrying words get no polarity instead of the corpus average"""
+    assert text_polarity('Lieferung am Dienstag') is None
+    assert text_polarity('nie') is None
+
+def test_shipped_lexicon_matches_corpus():
+    """sentiment_lexicon.json was rebuilt after the last corpus change"""
+    lexicon = get_sentiment_lexicon()
+    rebuilt = build_corpus_lexicon()
+    assert lexicon.languages == tuple(rebuilt['languages'])
+    assert lexicon.weights == rebuilt['weights']
+    assert lexicon.negations == frozenset(rebuilt['negations'])
+
+if __name__ == "__main__":
+    test_ratings_ordered_in_every_language()
+    test_generic_words()
+    test_word_pairs_are_scored()
+    test_negative_reviews_in_other_languages()
+    test_negation_turns_words_around()
+    test_words_without_sentiment_are_neutral()
+    test_shipped_lexicon_matches_corpus()
+    print("✅ Sentiment lexicon tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the review similarity index
+Checks MinHash estimates, LSH lookups and persistence
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import pytest
+from similarity_index import (SCHEMA_VERSION, NearDuplicateIndex, batch_max_similarities,
+                              estimate_similarity, signature, signature_matrix)
+
+REVIEW = ("Ordered this velvet dress for a concert and it fits perfectly, the fabric "
+          "feels soft and the black colour did not fade after washing it twice")
+WORDS = ("love dress quality fabric fit perfect black gothic concert wear comfortable "
+         "size true recommend shipping fast soft material great style boots").split()
+
+def _random_reviews(count, seed=3):
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 30))) for _ in range(count)]
+
+def test_signature_estimates():
+    """Identical texts match fully, unrelated texts not at all"""
+    assert estimate_similarity(signature(REVIEW), signature(REVIEW.upper())) == 1.0
+    assert estimate_similarity(signature(REVIEW), signature("Shipping took three weeks")) < 0.2
+    assert signature("") is None and signature("!!!") is None
+
+def test_near_duplicates_found_in_large_history():
+    """A lightly edited review is found among thousands of indexed ones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, 'similarity.db'))
+        assert index.add_many(_random_reviews(3000)) > 2900
+        assert index.max_similarity(REVIEW) < 0.3
+
+        assert index.add(REVIEW)
+        assert not index.add(REVIEW)  # Identical texts are stored once
+        edited = REVIEW.replace('concert', 'festival')
+        assert index.max_similarity(edited) > 0.6
+        assert index.max_similarity('') == 0.0
+        index.close()
+
+def test_recent_duplicates_found_in_crowded_buckets():
+    """Beyond MAX_CANDIDATES reviews per bucket, the most recent ones are compared"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, 'similarity.db'))
+        base = f"{REVIEW} {_random_reviews(1)[0]}"
+        assert index.add_many(f"{base} item{i}" for i in range(2000)) > 1000
+        latest = f"{base} latest"
+        assert index.add(latest)
+        query = signature(f"{base} query")
+        assert signature(latest) in index.candidates(query)
+        assert index.max_similarities([signature(latest)]) == [1.0]
+        index.close()
+
+def test_index_is_persistent():
+    """A second index on the same database sees earlier reviews"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'similarity.db')
+        first = NearDuplicateIndex(db_path)
+        first.add(REVIEW)
+        second = NearDuplicateIndex(db_path)
+        assert len(second) == 1
+        assert second.max_similarity(REVIEW) == 1.0
+        first.close()
+        second.close()
+
+def test_schema_migrated_once():
+    """Old databases are migrated, current ones are opened without taking the write lock"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'similarity.db')
+        old = sqlite3.connect(db_path, isolation_level=None)
+        old.executescript("""
+            CREATE TABLE review_signatures (id INTEGER PRIMARY KEY, digest BLOB NOT NULL UNIQUE,
+                                            signature BLOB NOT NULL);
+            CREATE TABLE review_bands (band_key INTEGER NOT NULL, review_id INTEGER NOT NULL);
+            CREATE INDEX idx_review_bands_key ON review_bands (band_key);
+        """)
+        first = NearDuplicateIndex(db_path)
+        first.add(REVIEW)
+        indexes = {row[0] for row in old.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'idx_review_bands_key' not in indexes and 'idx_review_bands_key_review' in indexes
+        assert old.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+        old.execute("BEGIN IMMEDIATE")  # Hold the write lock
+        second = NearDuplicateIndex(db_path, busy_timeout=50)
+        assert second.max_similarity(REVIEW) == 1.0
+        old.execute("ROLLBACK")
+        old.close()
+        first.close()
+        second.close()
+
+def test_signature_matrix_matches_signature():
+    """Batched signatures equal the per-text ones, rows without words stay empty"""
+    pytest.importorskip('numpy')
+    texts = _random_reviews(300) + [REVIEW, '', '!!!', 'two words']
+    matrix, has_words = signature_matrix(texts)
+    for text, row, words in zip(texts, matrix.tolist(), has_words.tolist()):
+        expected = signature(text)
+        assert words == (expected is not None)
+        assert tuple(row) == (expected or (0,) * len(row))
+
+def test_batch_similarities_match_pairwise():
+    """Each text's best match among the earlier ones, as compared pair by pair"""
+    pytest.importorskip('numpy')
+    texts = _random_reviews(200, seed=5) + [REVIEW, '', REVIEW.replace('concert', 'festival')]
+    matrix, has_words = signature_matrix(texts)
+    expected = []
+    for i, text in enumerate(texts):
+        sig = signature(text)
+        earlier = [signature(other) for other in texts[:i]]
+        expected.append(max([estimate_similarity(sig, other) for other in earlier if other] or [0.0])
+                        if sig else 0.0)
+    assert batch_max_similarities(matrix, has_words) == expected
+    assert expected[-1] > 0.6
+
+def test_batch_index_lookup():
+    """max_similarities gives max_similarity for many signatures at once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, 'similarity.db'))
+        index.add_many(_random_reviews(500) + [REVIEW])
+        queries = _random_reviews(50, seed=9) + [REVIEW.replace('concert', 'festival'), '']
+        assert index.max_similarities([signature(text) for text in queries]) == [
+            index.max_similarity(text) for text in queries
+        ]
+        index.close()
+
+if __name__ == "__main__":
+    test_signature_estimates()
+    test_near_duplicates_found_in_large_history()
+    test_recent_duplicates_found_in_crowded_buckets()
+    test_index_is_persistent()
+    test_schema_migrated_once()
+    test_signature_matrix_matches_signature()
+    test_batch_similarities_match_pairwise()
+    test_batch_index_lookup()
+    print("✅ Similarity index tests passed")
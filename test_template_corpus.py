@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-language template corpus
+Checks lazy pack loading, fallbacks and the legacy table names
+"""
+
+import review_generator
+from template_corpus import available_languages, build_table, language_table, load_language_pack
+
+def test_packs_are_frozen():
+    """Tables load as tuples and rating keys as ints"""
+    titles = language_table('de', 'titles')
+    assert titles and all(isinstance(rating, int) for rating in titles)
+    assert isinstance(titles[max(titles)], tuple)
+    assert load_language_pack('de') is load_language_pack('de')
+
+def test_language_fallback():
+    """Missing tables fall back to English unless no fallback is wanted"""
+    assert load_language_pack('xx') == {}
+    assert language_table('xx', 'short_reviews') == language_table('en', 'short_reviews')
+    assert language_table('xx', 'review_endings', fallback=None) is None
+
+def test_legacy_tables_still_importable():
+    """The old module-level dicts are built from the packs on first access"""
+    assert set(review_generator.REVIEW_TITLES) <= available_languages()
+    assert review_generator.REVIEW_TITLES['en'] == build_table('titles')['en']
+    assert review_generator.REVIEW_COMPONENTS['opening_reactions']['de'] == \
+        language_table('de', 'opening_reactions')
+
+if __name__ == "__main__":
+    test_packs_are_frozen()
+    test_language_fallback()
+    test_legacy_tables_still_importable()
+    print("✅ Template corpus tests passed")